@@ -1,10 +1,14 @@
 """The GEF API MODULE"""
 
 from datetime import UTC, datetime, timedelta
+import gzip
+import hashlib
 import hmac
+import json
 import logging
 import os
 import sys
+import threading
 import time as _time
 
 from flask import Flask, abort, got_request_exception, jsonify, request
@@ -174,7 +178,9 @@ def handle_compressed_request():
                     413,
                 )
 
-            # Replace the input stream with decompressed data
+            # Replace the input stream with decompressed data; the size as
+            # sent is kept for validate_execution_update's results limit
+            request.environ["gefapi.compressed_content_length"] = len(compressed_data)
             request._cached_data = decompressed_data
             request.environ["wsgi.input"] = BytesIO(decompressed_data)
             request.environ["CONTENT_LENGTH"] = str(len(decompressed_data))
@@ -350,18 +356,21 @@ def set_security_headers(response):
 app.config["SQLALCHEMY_DATABASE_URI"] = SETTINGS.get("SQLALCHEMY_DATABASE_URI")
 app.config["UPLOAD_FOLDER"] = SETTINGS.get("UPLOAD_FOLDER")
 
-# Configure SQLAlchemy engine options for robust database connection handling
+# Configure SQLAlchemy engine options for robust database connection handling.
+# Under gevent (see gefapi.utils.gevent_db) each worker's greenlets share this
+# pool; greenlets beyond pool_size + max_overflow wait for a free connection.
+db_pool_settings = SETTINGS.get("DB_POOL", {})
 app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     # Recycle connections after 1 hour to prevent stale connections
     "pool_recycle": 3600,
     # Enable connection pre-ping to test connections before use
     "pool_pre_ping": True,
-    # Connection pool size - adjust based on your needs
-    "pool_size": 10,
-    # Maximum overflow connections
-    "max_overflow": 20,
-    # Pool timeout in seconds
-    "pool_timeout": 30,
+    # Connections kept open per worker process
+    "pool_size": db_pool_settings.get("SIZE", 20),
+    # Extra connections opened under bursts
+    "max_overflow": db_pool_settings.get("MAX_OVERFLOW", 10),
+    # Seconds to wait for a free connection
+    "pool_timeout": db_pool_settings.get("TIMEOUT", 30),
     # Enable connection pooling reset on return
     "pool_reset_on_return": "commit",
 }
@@ -622,38 +631,58 @@ def debug_routes():
     )
 
 
-@app.route("/swagger.json", methods=["GET"])
-def swagger_spec():
-    """Serve the generated OpenAPI/Swagger specification"""
-    import os
+# Optional pre-built spec; generated from the URL map when absent
+_STATIC_SWAGGER_PATH = os.path.join(os.path.dirname(__file__), "static", "swagger.json")
+# Serialized OpenAPI spec, built once per process by _get_openapi_spec_payload
+_openapi_spec_payload = None
+_openapi_spec_lock = threading.Lock()
 
-    from flask import send_from_directory
 
-    if not SETTINGS.get("ENABLE_API_DOCS", True):
-        return jsonify({"status": 404, "detail": "Not Found"}), 404
+def _get_openapi_spec_payload():
+    """Return the OpenAPI spec as JSON bytes, gzipped bytes and strong ETags.
 
-    # Add debugging info
-    environment = os.getenv("ENVIRONMENT", "unknown")
-    logger.info(f"Swagger endpoint called. Environment: {environment}")
-    logger.info(f"Total registered routes: {len(list(app.url_map.iter_rules()))}")
+    Each representation has its own ETag (the gzipped one suffixed with
+    ``-gzip``), as strong validators must differ between encodings.
 
-    # Try to serve the generated swagger.json file from gefapi/static
-    swagger_path = os.path.join(os.path.dirname(__file__), "static")
-    swagger_file_path = os.path.join(swagger_path, "swagger.json")
+    The spec only changes with a deploy, so it is loaded from
+    ``gefapi/static/swagger.json`` (or generated from the URL map when that
+    file is absent) on the first request and reused for the life of the
+    process.
+    """
+    global _openapi_spec_payload
+    if _openapi_spec_payload is not None:
+        return _openapi_spec_payload
+
+    with _openapi_spec_lock:
+        if _openapi_spec_payload is None:
+            if os.path.exists(_STATIC_SWAGGER_PATH):
+                logger.info(f"Loading static swagger spec from {_STATIC_SWAGGER_PATH}")
+                with open(_STATIC_SWAGGER_PATH, "rb") as f:
+                    body = f.read()
+            else:
+                logger.info("Generating swagger spec from registered routes")
+                spec = generate_openapi_spec_from_app()
+                body = json.dumps(spec, separators=(",", ":")).encode("utf-8")
+
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            _openapi_spec_payload = {
+                "json": body,
+                # mtime=0 keeps the compressed bytes identical across workers
+                "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+                "etag": etag,
+                "gzip_etag": f"{etag}-gzip",
+            }
+    return _openapi_spec_payload
 
-    logger.info(f"Checking for static swagger file at: {swagger_file_path}")
-    if os.path.exists(swagger_file_path):
-        logger.info("Found static swagger.json file, serving it")
-        return send_from_directory(swagger_path, "swagger.json")
 
-    # Fallback: Generate swagger spec dynamically using current app context
+@app.route("/swagger.json", methods=["GET"])
+def swagger_spec():
+    """Serve the generated OpenAPI/Swagger specification"""
+    if not SETTINGS.get("ENABLE_API_DOCS", True):
+        return jsonify({"status": 404, "detail": "Not Found"}), 404
+
     try:
-        # Generate OpenAPI spec directly using current Flask app
-        logger.info("Attempting to generate swagger spec dynamically")
-        spec = generate_openapi_spec_from_app()
-        paths_count = len(spec.get("paths", {}))
-        logger.info(f"Successfully generated swagger spec with {paths_count} paths")
-        return jsonify(spec)
+        payload = _get_openapi_spec_payload()
     except Exception as e:
         logger.error(f"Failed to generate swagger spec dynamically: {e}")
         logger.error(f"Exception type: {type(e).__name__}")
@@ -678,6 +707,22 @@ def swagger_spec():
             }
         )
 
+    use_gzip = bool(request.accept_encodings["gzip"])
+    etag = payload["gzip_etag"] if use_gzip else payload["etag"]
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    elif use_gzip:
+        response = app.response_class(payload["gzip"], mimetype="application/json")
+        # Already compressed; flask-compress leaves encoded responses alone
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = app.response_class(payload["json"], mimetype="application/json")
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
 
 def generate_openapi_spec_from_app():
     """Generate OpenAPI specification from current Flask app routes"""
@@ -1096,7 +1141,7 @@ def check_if_token_in_blocklist(jwt_header, jwt_payload):
     return is_token_in_blocklist(jti)
 
 
-from gefapi.errors import AccountLockedError  # noqa:E402
+from gefapi.errors import AccountLockedError, PasswordHashingBusy  # noqa:E402
 from gefapi.models import User  # noqa:E402
 from gefapi.services import UserService  # noqa:E402
 from gefapi.utils import mask_email  # noqa:E402
@@ -1129,6 +1174,8 @@ def create_token():
     except AccountLockedError as e:
         logger.warning(f"[JWT]: Account locked for {mask_email(email)}")
         return jsonify(e.serialize), 401
+    except PasswordHashingBusy as e:
+        return jsonify(e.serialize), 429, {"Retry-After": str(e.retry_after)}
     except Exception as e:
         logger.error(f"[JWT]: Error during authentication: {e!s}")
         return jsonify({"msg": "Authentication failed"}), 500
@@ -1265,7 +1312,7 @@ def logout_all():
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
     identity = jwt_data["sub"]
-    return User.query.filter_by(id=identity).one_or_none()
+    return User.query.filter_by(id=identity, deleted_at=None).one_or_none()
 
 
 @jwt.expired_token_loader
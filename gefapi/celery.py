@@ -2,6 +2,8 @@ from celery import Celery
 from celery.signals import task_failure
 import rollbar
 
+from gefapi.config import SETTINGS
+
 
 def celery_base_data_hook(request, data):
     data["framework"] = "celery"
@@ -82,6 +84,11 @@ def make_celery(app):
         "gefapi.tasks.user_cleanup.cleanup_unverified_users": {"queue": "default"},
         "gefapi.tasks.user_cleanup.cleanup_never_logged_in_users": {"queue": "default"},
         "gefapi.tasks.user_cleanup.get_user_cleanup_stats": {"queue": "default"},
+        "gefapi.tasks.user_deletion.purge_deleted_user": {"queue": "default"},
+        "gefapi.tasks.user_deletion.resume_user_deletions": {"queue": "default"},
+        "gefapi.tasks.client_activity_flush.flush_client_activity": {
+            "queue": "default"
+        },
         "gefapi.tasks.docker_service_monitoring.monitor_failed_docker_services": {
             "queue": "build"
         },
@@ -103,6 +110,7 @@ def make_celery(app):
         },
         # Batch monitoring – no Docker access needed, runs on default queue
         "gefapi.tasks.batch_monitoring.monitor_batch_executions": {"queue": "default"},
+        "gefapi.tasks.batch_monitoring.consume_batch_job_events": {"queue": "default"},
         # openEO monitoring – polls openEO backends, no Docker access needed
         "gefapi.tasks.openeo_monitoring.monitor_openeo_jobs": {"queue": "default"},
         # Batch dispatch task – submit jobs to AWS Batch (no Docker needed)
@@ -111,6 +119,8 @@ def make_celery(app):
         "gefapi.tasks.queue_processor.process_queued_executions": {"queue": "default"},
         # Bulk email send – calls SparkPost over HTTPS, no Docker access needed
         "gefapi.tasks.bulk_email_send.send_bulk_email_task": {"queue": "default"},
+        # Admin CSV exports – database and S3 only, no Docker access needed
+        "gefapi.tasks.export_jobs.run_export_job": {"queue": "default"},
         "gefapi.tasks.sparkpost_suppression_sync.sync_sparkpost_suppressions": {
             "queue": "default"
         },
@@ -118,6 +128,7 @@ def make_celery(app):
     }
 
     # Configure periodic tasks
+    batch_monitoring = SETTINGS["BATCH_MONITORING"]
     celery.conf.beat_schedule = {
         "refresh-swarm-cache": {
             "task": "gefapi.tasks.status_monitoring.refresh_swarm_cache_task",
@@ -158,6 +169,16 @@ def make_celery(app):
             "task": "gefapi.tasks.user_cleanup.cleanup_never_logged_in_users",
             "schedule": 604800.0,  # Every week (7 days = 604800 seconds)
         },
+        # Write client tracking / last activity buffered in Redis
+        "flush-client-activity": {
+            "task": "gefapi.tasks.client_activity_flush.flush_client_activity",
+            "schedule": 60.0,  # Every minute (60 seconds)
+        },
+        # Re-queue user purges interrupted by worker loss
+        "resume-user-deletions": {
+            "task": "gefapi.tasks.user_deletion.resume_user_deletions",
+            "schedule": 600.0,  # Every 10 minutes (600 seconds)
+        },
         # GDPR compliance - clear expired email hashes from deletion audit
         "cleanup-expired-email-hashes": {
             "task": "gefapi.tasks.deletion_audit_cleanup.cleanup_expired_email_hashes",
@@ -178,9 +199,11 @@ def make_celery(app):
             "options": {"queue": "build"},  # Run on build queue with Docker access
         },
         # Batch execution monitoring – poll AWS Batch for status changes
+        # (every 2 minutes, or every 15 as a safety net when job state
+        # events are consumed)
         "monitor-batch-executions": {
             "task": "gefapi.tasks.batch_monitoring.monitor_batch_executions",
-            "schedule": 120.0,  # Every 2 minutes
+            "schedule": float(batch_monitoring["POLL_INTERVAL_SECONDS"]),
             "options": {"queue": "default"},
         },
         # openEO execution monitoring – poll openEO backends for status changes
@@ -219,6 +242,14 @@ def make_celery(app):
             "options": {"queue": "default"},  # Run on default queue
         },
     }
+    if batch_monitoring["EVENTS_BACKEND"]:
+        # Batch job state change events – each run long-polls the queue for
+        # up to EVENTS_CONSUME_SECONDS
+        celery.conf.beat_schedule["consume-batch-job-events"] = {
+            "task": "gefapi.tasks.batch_monitoring.consume_batch_job_events",
+            "schedule": 60.0,  # Every 60 seconds
+            "options": {"queue": "default"},
+        }
     celery.conf.timezone = "UTC"
 
     task_base = celery.Task
@@ -215,6 +215,166 @@ SETTINGS = {
         "GEE_TERMS_ENFORCEMENT_ENABLED", "false"
     ).lower()
     == "true",
+    # Maximum number of GEE tasks cancelled in parallel when an execution is
+    # cancelled (see GEEService.cancel_gee_tasks)
+    "GEE_TASK_CANCEL_CONCURRENCY": int(os.getenv("GEE_TASK_CANCEL_CONCURRENCY", "8")),
+    # Client tracking (X-TE-Client) and User.last_activity_at updates from
+    # logins and token refreshes are buffered in Redis and written by the
+    # flush_client_activity task, FLUSH_BATCH_SIZE user+client entries at a
+    # time. Disable to write them directly on each request.
+    "CLIENT_TRACKING_BUFFER": {
+        "ENABLED": os.getenv("CLIENT_TRACKING_BUFFER_ENABLED", "true").lower()
+        == "true",
+        "FLUSH_BATCH_SIZE": int(os.getenv("CLIENT_TRACKING_FLUSH_BATCH_SIZE", "5000")),
+    },
+    # SQLAlchemy connection pool per API worker process. With gevent workers
+    # up to SIZE + MAX_OVERFLOW greenlets run queries concurrently and the rest
+    # wait up to TIMEOUT seconds for a connection. Keep
+    # workers * (SIZE + MAX_OVERFLOW) below the server's max_connections.
+    "DB_POOL": {
+        "SIZE": int(os.getenv("DB_POOL_SIZE", "20")),
+        "MAX_OVERFLOW": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        "TIMEOUT": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    },
+    # Password hashing (see gefapi.utils.password_hashing) runs on THREADS
+    # native threads per process. Requests beyond MAX_PENDING running or
+    # queued hashes are rejected with 429 and Retry-After.
+    "PASSWORD_HASHING": {
+        "THREADS": int(os.getenv("PASSWORD_HASHING_THREADS", "4")),
+        "MAX_PENDING": int(os.getenv("PASSWORD_HASHING_MAX_PENDING", "16")),
+        "RETRY_AFTER_SECONDS": int(
+            os.getenv("PASSWORD_HASHING_RETRY_AFTER_SECONDS", "1")
+        ),
+    },
+    # Script images are cached in the registry under a tag derived from the
+    # tarball contents, environment and Dockerfile (see
+    # gefapi.services.docker_service.build_cache_key); publishing unchanged
+    # contents retags the cached image instead of rebuilding it.
+    "BUILD_CACHE": {
+        "ENABLED": os.getenv("BUILD_CACHE_ENABLED", "true").lower() == "true",
+    },
+    # Docker build/push logs (see gefapi.services.script_log_buffer) are
+    # written in one multi-row insert per MAX_LINES lines or
+    # FLUSH_INTERVAL_SECONDS, whichever comes first.
+    "SCRIPT_LOG_BUFFER": {
+        "MAX_LINES": int(os.getenv("SCRIPT_LOG_BUFFER_MAX_LINES", "200")),
+        "FLUSH_INTERVAL_SECONDS": float(
+            os.getenv("SCRIPT_LOG_BUFFER_FLUSH_INTERVAL_SECONDS", "2")
+        ),
+    },
+    # boto3 clients are shared per process and region (see
+    # gefapi.utils.aws_clients). MAX_POOL_CONNECTIONS bounds concurrent
+    # requests per client; throttled or failed calls are retried up to
+    # MAX_ATTEMPTS times using RETRY_MODE.
+    "AWS_CLIENTS": {
+        "MAX_POOL_CONNECTIONS": int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "20")),
+        "MAX_ATTEMPTS": int(os.getenv("AWS_MAX_ATTEMPTS", "5")),
+        "RETRY_MODE": os.getenv("AWS_RETRY_MODE", "standard"),
+        "CONNECT_TIMEOUT": int(os.getenv("AWS_CONNECT_TIMEOUT", "10")),
+        "READ_TIMEOUT": int(os.getenv("AWS_READ_TIMEOUT", "60")),
+    },
+    # Managed S3 transfers (see gefapi.s3.get_transfer_config): objects above
+    # MULTIPART_THRESHOLD_MB move as CHUNK_SIZE_MB ranged parts,
+    # MAX_CONCURRENCY at a time.
+    "S3_TRANSFER": {
+        "MULTIPART_THRESHOLD_MB": int(
+            os.getenv("S3_TRANSFER_MULTIPART_THRESHOLD_MB", "16")
+        ),
+        "CHUNK_SIZE_MB": int(os.getenv("S3_TRANSFER_CHUNK_SIZE_MB", "8")),
+        "MAX_CONCURRENCY": int(os.getenv("S3_TRANSFER_MAX_CONCURRENCY", "8")),
+    },
+    # Execution change feed (see ExecutionService.get_execution_changes): rows
+    # changed within the last SAFETY_LAG_SECONDS are held back until the next
+    # poll so that slow concurrent transactions are not skipped; pages hold at
+    # most MAX_PAGE_SIZE executions.
+    "EXECUTION_SYNC": {
+        "SAFETY_LAG_SECONDS": float(
+            os.getenv("EXECUTION_SYNC_SAFETY_LAG_SECONDS", "5")
+        ),
+        "MAX_PAGE_SIZE": int(os.getenv("EXECUTION_SYNC_MAX_PAGE_SIZE", "500")),
+    },
+    # Tiered execution results (see gefapi.services.results_storage_service):
+    # results above OFFLOAD_THRESHOLD_BYTES of JSON are stored gzipped under
+    # their SHA-256 in S3 ("s3") or a shared directory ("local") and the
+    # execution row keeps a small manifest. An empty BACKEND keeps every
+    # result inline.
+    "RESULTS_STORAGE": {
+        "BACKEND": os.getenv("RESULTS_STORAGE_BACKEND", ""),
+        "OFFLOAD_THRESHOLD_BYTES": int(
+            os.getenv("RESULTS_OFFLOAD_THRESHOLD_BYTES", "65536")
+        ),
+        "S3_BUCKET": os.getenv("RESULTS_S3_BUCKET") or os.getenv("PARAMS_S3_BUCKET"),
+        "S3_PREFIX": os.getenv("RESULTS_S3_PREFIX", "execution_results"),
+        "LOCAL_PATH": os.getenv(
+            "RESULTS_STORAGE_LOCAL_PATH", "/data/execution_results"
+        ),
+    },
+    # OAuth2 client_credentials (see OAuth2Service.authenticate): a successful
+    # secret check is cached in Redis for up to TTL_SECONDS as a keyed HMAC of
+    # the presented secret, so repeat token requests skip the scrypt KDF.
+    # 0 disables the cache.
+    "OAUTH2_SECRET_CACHE": {
+        "TTL_SECONDS": int(os.getenv("OAUTH2_SECRET_CACHE_TTL_SECONDS", "300")),
+    },
+    # Resolved pages of the public news feed are cached in Redis for up to
+    # TTL_SECONDS, or until the next item is published or expires.
+    "NEWS_FEED_CACHE": {
+        "TTL_SECONDS": int(os.getenv("NEWS_FEED_CACHE_TTL_SECONDS", "300")),
+    },
+    # Admin CSV exports submitted with POST /<resource>/export run as Celery
+    # jobs that write a gzipped CSV in CHUNK_SIZE-row batches to S3 ("s3") or
+    # to LOCAL_PATH ("local"). The API serves local files itself, so "local"
+    # only works when LOCAL_PATH is a volume shared by the worker and API
+    # containers (the default compose files share none). Download links are
+    # signed and expire after LINK_TTL_SECONDS.
+    "EXPORTS": {
+        "BACKEND": os.getenv("EXPORT_STORAGE_BACKEND", "s3"),
+        "S3_BUCKET": os.getenv("EXPORT_S3_BUCKET") or os.getenv("PARAMS_S3_BUCKET"),
+        "S3_PREFIX": os.getenv("EXPORT_S3_PREFIX", "admin_exports"),
+        "LOCAL_PATH": os.getenv("EXPORT_STORAGE_LOCAL_PATH", "/data/exports"),
+        "CHUNK_SIZE": int(os.getenv("EXPORT_CHUNK_SIZE", "5000")),
+        "LINK_TTL_SECONDS": int(os.getenv("EXPORT_LINK_TTL_SECONDS", "3600")),
+    },
+    # AWS Batch execution monitoring (see gefapi.tasks.batch_monitoring).
+    # With EVENTS_BACKEND "sqs", Batch Job State Change events that
+    # EventBridge routes to EVENTS_SQS_QUEUE_URL update executions as they
+    # arrive, and describe_jobs polling drops to POLL_INTERVAL_SECONDS as a
+    # safety net. "local" reads an in-process queue instead (development and
+    # tests). Results of finished jobs are downloaded from S3 by
+    # RESULTS_WORKERS threads, apart from the status updates.
+    "BATCH_MONITORING": {
+        "EVENTS_BACKEND": os.getenv("BATCH_EVENTS_BACKEND", ""),
+        "EVENTS_SQS_QUEUE_URL": os.getenv("BATCH_EVENTS_SQS_QUEUE_URL", ""),
+        "EVENTS_WAIT_SECONDS": int(os.getenv("BATCH_EVENTS_WAIT_SECONDS", "20")),
+        "EVENTS_CONSUME_SECONDS": int(os.getenv("BATCH_EVENTS_CONSUME_SECONDS", "50")),
+        "POLL_INTERVAL_SECONDS": int(
+            os.getenv(
+                "BATCH_POLL_INTERVAL_SECONDS",
+                "900" if os.getenv("BATCH_EVENTS_BACKEND") else "120",
+            )
+        ),
+        "RESULTS_WORKERS": int(os.getenv("BATCH_RESULTS_WORKERS", "8")),
+    },
+    # Periodic retention jobs (see gefapi.utils.retention) delete or update
+    # expired rows BATCH_SIZE at a time and stop starting new batches after
+    # TIME_BUDGET_SECONDS; the remainder is handled by the next run.
+    "RETENTION": {
+        "BATCH_SIZE": int(os.getenv("RETENTION_BATCH_SIZE", "5000")),
+        "TIME_BUDGET_SECONDS": float(os.getenv("RETENTION_TIME_BUDGET_SECONDS", "120")),
+    },
+    # User deletion purge (see UserDeletionService). Rows are deleted in
+    # batches of BATCH_SIZE, each committed separately. Deletion requests
+    # purge inline for up to INLINE_SECONDS before handing over to the
+    # background task, which runs for up to TASK_SECONDS per invocation. A
+    # purge whose heartbeat is older than LEASE_SECONDS is taken over by
+    # another worker; after MAX_ATTEMPTS failures it is marked failed.
+    "USER_DELETION": {
+        "BATCH_SIZE": int(os.getenv("USER_DELETION_BATCH_SIZE", "5000")),
+        "INLINE_SECONDS": float(os.getenv("USER_DELETION_INLINE_SECONDS", "2")),
+        "TASK_SECONDS": float(os.getenv("USER_DELETION_TASK_SECONDS", "240")),
+        "LEASE_SECONDS": int(os.getenv("USER_DELETION_LEASE_SECONDS", "600")),
+        "MAX_ATTEMPTS": int(os.getenv("USER_DELETION_MAX_ATTEMPTS", "5")),
+    },
     # Bulk Email configuration
     # BULK_EMAIL_APPROVED_SENDERS: comma-separated superadmin emails
     # allowed to send bulk emails. Empty = all superadmins may send.
@@ -43,6 +43,10 @@ class ExecutionNotFound(Error):
     pass
 
 
+class InvalidSyncToken(Error):
+    """Raised when an execution change-feed token cannot be decoded."""
+
+
 class ScriptStateNotValid(Error):
     pass
 
@@ -78,6 +82,22 @@ class AccountLockedError(Error):
         }
 
 
+class PasswordHashingBusy(Error):
+    """Raised when too many password hashes are already running or queued."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def serialize(self):
+        return {
+            "message": self.message,
+            "error_code": "password_hashing_busy",
+            "retry_after": self.retry_after,
+        }
+
+
 class VerificationRequiredError(Error):
     """Raised when a bulk email send requires OTP verification (HTTP 428).
 
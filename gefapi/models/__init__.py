@@ -59,7 +59,10 @@ from gefapi.models.bulk_email_verification_token import (  # noqa: E402
     BulkEmailVerificationToken,
 )
 from gefapi.models.execution import Execution  # noqa: E402
+from gefapi.models.execution_gee_task import ExecutionGEETask  # noqa: E402
 from gefapi.models.execution_log import ExecutionLog  # noqa: E402
+from gefapi.models.execution_tombstone import ExecutionTombstone  # noqa: E402
+from gefapi.models.export_job import ExportJob  # noqa: E402
 from gefapi.models.news import NewsItem, NewsItemTranslation  # noqa: E402
 from gefapi.models.password_reset_token import PasswordResetToken  # noqa: E402
 from gefapi.models.rate_limit_event import RateLimitEvent  # noqa: E402
@@ -72,6 +75,7 @@ from gefapi.models.user import User  # noqa: E402
 from gefapi.models.user_client_metadata import UserClientMetadata  # noqa: E402
 from gefapi.models.user_deletion_audit import (  # noqa: E402
     DeletionReason,
+    PurgeStatus,
     UserDeletionAudit,
 )
 
@@ -84,10 +88,14 @@ __all__ = [
     "BulkEmailVerificationToken",
     "DeletionReason",
     "Execution",
+    "ExecutionGEETask",
     "ExecutionLog",
+    "ExecutionTombstone",
+    "ExportJob",
     "NewsItem",
     "NewsItemTranslation",
     "PasswordResetToken",
+    "PurgeStatus",
     "RateLimitEvent",
     "RefreshToken",
     "Script",
@@ -39,7 +39,8 @@ class BulkEmail(db.Model):
     )
     # Set at send time after resolving the full recipient query
     recipient_count = db.Column(db.Integer, nullable=True)
-    created_by_id = db.Column(db.GUID(), db.ForeignKey("user.id"), nullable=False)
+    # NULL once the creating user has been deleted
+    created_by_id = db.Column(db.GUID(), db.ForeignKey("user.id"), nullable=True)
     sent_by_id = db.Column(db.GUID(), db.ForeignKey("user.id"), nullable=True)
     created_at = db.Column(db.DateTime(), default=utcnow)
     updated_at = db.Column(db.DateTime(), default=utcnow, onupdate=utcnow)
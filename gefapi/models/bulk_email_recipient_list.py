@@ -33,7 +33,8 @@ class BulkEmailRecipientList(db.Model):
     filter_criteria = db.Column(db.JSON, nullable=False, default=dict)
     # Cached count resolved at save time â€” may be stale
     estimated_count = db.Column(db.Integer, nullable=True)
-    created_by_id = db.Column(db.GUID(), db.ForeignKey("user.id"), nullable=False)
+    # NULL once the creating user has been deleted
+    created_by_id = db.Column(db.GUID(), db.ForeignKey("user.id"), nullable=True)
     created_at = db.Column(db.DateTime(), default=utcnow)
     updated_at = db.Column(db.DateTime(), default=utcnow, onupdate=utcnow)
 
@@ -12,9 +12,36 @@ from gefapi.utils.permissions import is_admin_or_higher
 db.GUID = GUID
 
 
+def _utcnow():
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+# Top-level fields of Execution.serialize(), in output order. All are plain
+# columns, so a listing that omits some can leave them out of the SELECT.
+SERIALIZED_COLUMNS = (
+    "id",
+    "script_id",
+    "user_id",
+    "start_date",
+    "end_date",
+    "status",
+    "progress",
+    "params",
+    "results",
+    "queued_at",
+    "dispatched_at",
+    "updated_at",
+)
+
+
 class Execution(db.Model):
     """Execution Model"""
 
+    __table_args__ = (
+        # Keyset index for the change feed (ExecutionService.get_execution_changes)
+        db.Index("ix_execution_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
+
     id = db.Column(
         db.GUID(),
         default=lambda: str(uuid.uuid4()),
@@ -36,6 +63,11 @@ class Execution(db.Model):
     # the execution. Used by the monitoring task's grace period to avoid killing
     # executions before their Docker service has been created.
     dispatched_at = db.Column(db.DateTime(), default=None, index=True)
+    # Bumped on every UPDATE issued through SQLAlchemy (ORM flushes and
+    # update() statements alike); drives the change feed
+    updated_at = db.Column(
+        db.DateTime(), default=_utcnow, onupdate=_utcnow, nullable=False
+    )
     params = db.Column(JSONB, default=dict)
     results = db.Column(JSONB, default=dict)
     logs = db.relationship(
@@ -44,6 +76,20 @@ class Execution(db.Model):
         cascade="all, delete-orphan",
         lazy="dynamic",
     )
+    # Loadable counterpart of ``logs`` for serialize(include=["logs"]);
+    # listings fetch it for all rows in one query with selectinload()
+    log_entries = db.relationship(
+        "ExecutionLog",
+        viewonly=True,
+        order_by="ExecutionLog.id",
+    )
+    gee_tasks = db.relationship(
+        "ExecutionGEETask",
+        backref=db.backref("execution"),
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="dynamic",
+    )
     script_id = db.Column(db.GUID(), db.ForeignKey("script.id"), index=True)
     user_id = db.Column(db.GUID(), db.ForeignKey("user.id"), index=True)
 
@@ -55,32 +101,37 @@ class Execution(db.Model):
     def __repr__(self):
         return f"<Execution {self.id!r}>"
 
-    def serialize(self, include=None, exclude=None, user=None):
+    @staticmethod
+    def serialized_columns(include=None, exclude=None, fields=None):
+        """Return the columns serialize() reads for these arguments.
+
+        ``fields`` limits the top-level fields to the ones listed and
+        ``exclude`` drops fields; ``id`` is always returned. Columns needed by
+        ``include`` extras (e.g. ``duration``) are added.
+        """
+        include = include if include else []
+        exclude = exclude if exclude else []
+        columns = [
+            name
+            for name in SERIALIZED_COLUMNS
+            if name == "id" or ((not fields or name in fields) and name not in exclude)
+        ]
+        if "duration" in include:
+            columns += [
+                name for name in ("start_date", "end_date") if name not in columns
+            ]
+        return columns
+
+    def serialize(self, include=None, exclude=None, user=None, fields=None):
         """Return object data in easily serializeable format"""
         include = include if include else []
         exclude = exclude if exclude else []
-        end_date_formatted = None
-        if self.end_date:
-            end_date_formatted = self.end_date.isoformat()
-        queued_at_formatted = None
-        if self.queued_at:
-            queued_at_formatted = self.queued_at.isoformat()
-        dispatched_at_formatted = None
-        if self.dispatched_at:
-            dispatched_at_formatted = self.dispatched_at.isoformat()
-        execution = {
-            "id": self.id,
-            "script_id": self.script_id,
-            "user_id": self.user_id,
-            "start_date": self.start_date.isoformat(),
-            "end_date": end_date_formatted,
-            "status": self.status,
-            "progress": self.progress,
-            "params": self.params,
-            "results": self.results,
-            "queued_at": queued_at_formatted,
-            "dispatched_at": dispatched_at_formatted,
-        }
+        execution = {}
+        for name in self.serialized_columns(exclude=exclude, fields=fields):
+            value = getattr(self, name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            execution[name] = value
         if "duration" in include:
             execution["duration"] = self.calculate_duration()
         if "logs" in include:
@@ -108,10 +159,6 @@ class Execution(db.Model):
             execution["script"] = self.script.serialize(user=user)
         if "script_name" in include:
             execution["script_name"] = getattr(self.script, "name", None)
-        if "params" in exclude:
-            del execution["params"]
-        if "results" in exclude:
-            del execution["results"]
         return execution
 
     def calculate_duration(self):
@@ -129,4 +176,4 @@ class Execution(db.Model):
     @property
     def serialize_logs(self):
         """Serialize Logs"""
-        return [item.serialize() for item in self.logs]
+        return [item.serialize() for item in self.log_entries]
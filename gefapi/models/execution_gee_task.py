@@ -0,0 +1,55 @@
+"""EXECUTION GEE TASK MODEL"""
+
+import datetime
+
+from gefapi import db
+from gefapi.models import GUID
+
+db.GUID = GUID
+
+
+class ExecutionGEETask(db.Model):
+    """Google Earth Engine task ID referenced by an execution's logs.
+
+    Rows are written when log lines are ingested (see
+    ``ExecutionService.create_execution_log``) so that cancellation can look
+    up the tasks to cancel with a single indexed query instead of re-scanning
+    every log line of the execution.
+    """
+
+    __tablename__ = "execution_gee_task"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "execution_id", "task_id", name="uq_execution_gee_task_execution_task"
+        ),
+    )
+
+    id = db.Column(db.Integer(), primary_key=True)
+    execution_id = db.Column(
+        db.GUID(),
+        db.ForeignKey("execution.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    task_id = db.Column(db.String(24), nullable=False)
+    created_at = db.Column(
+        db.DateTime(),
+        default=lambda: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+        nullable=False,
+    )
+
+    def __init__(self, execution_id, task_id):
+        self.execution_id = execution_id
+        self.task_id = task_id
+
+    def __repr__(self):
+        return f"<ExecutionGEETask {self.execution_id!r} {self.task_id!r}>"
+
+    def serialize(self):
+        """Return object data in easily serializeable format"""
+        return {
+            "id": self.id,
+            "execution_id": self.execution_id,
+            "task_id": self.task_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -0,0 +1,57 @@
+"""EXECUTION TOMBSTONE MODEL"""
+
+import datetime
+
+from sqlalchemy import event, insert
+
+from gefapi import db
+from gefapi.models import GUID
+from gefapi.models.execution import Execution
+
+db.GUID = GUID
+
+
+class ExecutionTombstone(db.Model):
+    """Record of a deleted execution, for the execution change feed.
+
+    Clients that sync executions incrementally (see
+    ``ExecutionService.get_execution_changes``) learn about deletions from
+    these rows. They are written by an ORM ``after_delete`` hook; bulk
+    deletes that bypass the ORM (the purge of a deleted user's data) do not
+    create tombstones, as nobody is left to sync that user's executions.
+    """
+
+    __tablename__ = "execution_tombstone"
+    __table_args__ = (
+        db.Index(
+            "ix_execution_tombstone_user_id_deleted_at_id",
+            "user_id",
+            "deleted_at",
+            "id",
+        ),
+    )
+
+    id = db.Column(db.Integer(), primary_key=True)
+    execution_id = db.Column(db.GUID(), nullable=False)
+    user_id = db.Column(db.GUID(), nullable=False)
+    deleted_at = db.Column(
+        db.DateTime(),
+        default=lambda: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<ExecutionTombstone {self.execution_id!r}>"
+
+
+@event.listens_for(Execution, "after_delete")
+def _record_execution_tombstone(mapper, connection, target):
+    if target.user_id is None:
+        return
+    connection.execute(
+        insert(ExecutionTombstone.__table__).values(
+            execution_id=target.id,
+            user_id=target.user_id,
+            deleted_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+        )
+    )
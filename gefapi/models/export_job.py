@@ -0,0 +1,85 @@
+"""EXPORT JOB MODEL"""
+
+import uuid
+
+from gefapi import db
+from gefapi.models import GUID
+from gefapi.utils import utcnow
+
+db.GUID = GUID
+
+
+class ExportJob(db.Model):
+    """
+    An admin CSV export run by a Celery worker.
+
+    Jobs go PENDING -> RUNNING -> FINISHED or FAILED. While running, the
+    worker updates rows_written so clients can show progress. The finished
+    file is a gzipped CSV stored under storage_key in the configured export
+    backend (see ExportService).
+    """
+
+    __tablename__ = "export_job"
+
+    id = db.Column(
+        db.GUID(),
+        default=lambda: str(uuid.uuid4()),
+        primary_key=True,
+        autoincrement=False,
+    )
+    # "executions", "users" or "scripts"
+    table = db.Column(db.String(20), nullable=False)
+    # "PENDING", "RUNNING", "FINISHED" or "FAILED"
+    status = db.Column(db.String(10), nullable=False, default="PENDING")
+    # date_field, date_from and date_to as given by the admin
+    filters = db.Column(db.JSON, nullable=True)
+    total_rows = db.Column(db.Integer, nullable=True)
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    storage_backend = db.Column(db.String(10), nullable=True)
+    storage_key = db.Column(db.String(255), nullable=True)
+    size_bytes = db.Column(db.BigInteger, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    created_by_id = db.Column(
+        db.GUID(), db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = db.Column(db.DateTime(), default=utcnow, nullable=False)
+    started_at = db.Column(db.DateTime(), nullable=True)
+    finished_at = db.Column(db.DateTime(), nullable=True)
+
+    created_by = db.relationship("User", foreign_keys=[created_by_id])
+
+    def __repr__(self):
+        return f"<ExportJob table={self.table!r} status={self.status!r} id={self.id!r}>"
+
+    @property
+    def filename(self):
+        """Download filename, stamped with the job's creation time."""
+        timestamp = (self.created_at or utcnow()).strftime("%Y%m%d_%H%M%S")
+        return f"{self.table}_export_{timestamp}.csv.gz"
+
+    @property
+    def progress(self):
+        """Percentage of rows written, or None before the total is known."""
+        if self.status == "FINISHED":
+            return 100
+        if not self.total_rows:
+            return None
+        return min(int(100 * (self.rows_written or 0) / self.total_rows), 99)
+
+    def serialize(self):
+        return {
+            "id": str(self.id),
+            "table": self.table,
+            "status": self.status,
+            "filters": self.filters or {},
+            "total_rows": self.total_rows,
+            "rows_written": self.rows_written or 0,
+            "progress": self.progress,
+            "filename": self.filename,
+            "size_bytes": self.size_bytes,
+            "error": self.error,
+            "created_by_id": str(self.created_by_id) if self.created_by_id else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -5,6 +5,9 @@ from typing import ClassVar
 import uuid
 
 import markdown
+from packaging import version as pkg_version
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import validates
 
 from gefapi import db
 from gefapi.models import GUID
@@ -12,6 +15,41 @@ from gefapi.utils import utcnow
 
 db.GUID = GUID
 
+# Each release component takes four decimal digits of a version key
+VERSION_KEY_COMPONENT_BASE = 10_000
+
+
+def version_key(version):
+    """Return a sortable integer for a plugin version string.
+
+    The first three release components are packed into one number
+    ("2.1.15" -> 200010015), so version ranges can be compared in SQL.
+    Pre-release and local suffixes are ignored. Returns None for an empty or
+    unparseable version.
+    """
+    if not version:
+        return None
+    try:
+        release = pkg_version.parse(str(version)).release
+    except ValueError:
+        # packaging.version.InvalidVersion is a ValueError subclass
+        return None
+    key = 0
+    for part in (*release, 0, 0, 0)[:3]:
+        key = key * VERSION_KEY_COMPONENT_BASE + min(
+            part, VERSION_KEY_COMPONENT_BASE - 1
+        )
+    return key
+
+
+def _split_targets(value, normalize):
+    """Split a comma-separated target list into sorted, unique values."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return sorted({normalize(v.strip()) for v in value if v and v.strip()})
+
 
 class NewsItem(db.Model):
     """
@@ -30,10 +68,14 @@ class NewsItem(db.Model):
         created_at: When the news item was created
         publish_at: When the news item should start being shown
         expires_at: When the news item should stop being shown (null = never)
-        target_platforms: Comma-separated list of platforms (app,webapp,api-ui)
+        target_platforms: Comma-separated platforms (app,webapp,api-ui) or empty
         target_roles: Comma-separated roles (USER,ADMIN,SUPERADMIN) or empty
         min_version: Minimum plugin version to show this news item
         max_version: Maximum plugin version to show this news item
+        platforms: Normalized target_platforms (lowercase, empty = all)
+        roles: Normalized target_roles (uppercase, empty = all)
+        min_version_key: Sortable version_key() of min_version
+        max_version_key: Sortable version_key() of max_version
         is_active: Whether the news item is active (can be toggled by admins)
         priority: Display priority (higher = more prominent, default 0)
         created_by_id: User ID of the admin who created this item
@@ -73,14 +115,21 @@ class NewsItem(db.Model):
 
     # Targeting fields
     target_platforms = db.Column(
-        db.String(100), nullable=False, default="app,webapp,api-ui"
-    )
+        db.String(100), nullable=True, default="app,webapp,api-ui"
+    )  # Comma-separated platforms: app,webapp,api-ui. None means all platforms.
     target_roles = db.Column(
         db.String(100), nullable=True, default=None
     )  # Comma-separated roles: USER,ADMIN,SUPERADMIN. None means all roles.
     min_version = db.Column(db.String(20), nullable=True)
     max_version = db.Column(db.String(20), nullable=True)
 
+    # Normalized copies of the targeting fields that the feed query filters
+    # on. They are kept in sync by the validators below.
+    platforms = db.Column(ARRAY(db.String(20)), nullable=False, default=list)
+    roles = db.Column(ARRAY(db.String(20)), nullable=False, default=list)
+    min_version_key = db.Column(db.BigInteger(), nullable=True)
+    max_version_key = db.Column(db.BigInteger(), nullable=True)
+
     # Status and display
     is_active = db.Column(db.Boolean(), default=True, nullable=False)
     priority = db.Column(db.Integer(), default=0, nullable=False)
@@ -123,13 +172,31 @@ class NewsItem(db.Model):
         self.news_type = news_type
         self.created_by_id = created_by_id
 
-    def serialize(self, include_translations=False, language=None):
+    @validates("target_platforms")
+    def _validate_target_platforms(self, key, value):
+        self.platforms = _split_targets(value, str.lower)
+        return ",".join(self.platforms) or None
+
+    @validates("target_roles")
+    def _validate_target_roles(self, key, value):
+        self.roles = _split_targets(value, str.upper)
+        return ",".join(self.roles) or None
+
+    @validates("min_version", "max_version")
+    def _validate_version(self, key, value):
+        setattr(self, f"{key}_key", version_key(value))
+        return value
+
+    def serialize(self, include_translations=False, language=None, translations=None):
         """Serialize news item to dictionary.
 
         Args:
             include_translations: If True, include all translations in response
             language: If specified, return translated content for this language
                       (falls back to English if translation not available)
+            translations: Translations in ``language`` preloaded for a list
+                          of items, keyed by news item ID; avoids a query
+                          per item
         """
         # Get title, message, link_text - use translation if requested
         title = self.title
@@ -137,7 +204,12 @@ class NewsItem(db.Model):
         link_text = self.link_text
 
         if language and language != "en":
-            translation = self.translations.filter_by(language_code=language).first()
+            if translations is not None:
+                translation = translations.get(str(self.id))
+            else:
+                translation = self.translations.filter_by(
+                    language_code=language
+                ).first()
             if translation:
                 # Only use translated values if they exist (fall back to English)
                 if translation.title:
@@ -187,10 +259,9 @@ class NewsItem(db.Model):
 
     def is_applicable_to_platform(self, platform):
         """Check if this news item applies to a specific platform."""
-        if not self.target_platforms:
+        if not self.platforms:
             return True
-        platforms = [p.strip().lower() for p in self.target_platforms.split(",")]
-        return platform.lower() in platforms
+        return platform.strip().lower() in self.platforms
 
     def is_applicable_to_role(self, role):
         """Check if this news item applies to a specific user role.
@@ -203,38 +274,21 @@ class NewsItem(db.Model):
             Empty/None target_roles means news applies to all users.
         """
         # No role restrictions means visible to everyone
-        if not self.target_roles:
+        if not self.roles:
             return True
         # Unauthenticated users can only see news with no role restrictions
         if not role:
             return False
-        roles = [r.strip().upper() for r in self.target_roles.split(",")]
-        return role.upper() in roles
+        return role.upper() in self.roles
 
     def is_applicable_to_version(self, version):
         """Check if this news item applies to a specific plugin version."""
-        if not version:
-            return True
-
-        from packaging import version as pkg_version
-
-        try:
-            v = pkg_version.parse(version)
-
-            if self.min_version:
-                min_v = pkg_version.parse(self.min_version)
-                if v < min_v:
-                    return False
-
-            if self.max_version:
-                max_v = pkg_version.parse(self.max_version)
-                if v > max_v:
-                    return False
-
-            return True
-        except ValueError:
-            # packaging.version.InvalidVersion is a ValueError subclass
+        key = version_key(version)
+        if key is None:
             return True
+        if self.min_version_key is not None and key < self.min_version_key:
+            return False
+        return not (self.max_version_key is not None and key > self.max_version_key)
 
     def is_currently_published(self):
         """Check if the news item is currently within its publish window."""
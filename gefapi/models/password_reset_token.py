@@ -11,6 +11,7 @@ import uuid
 
 from gefapi import db
 from gefapi.models import GUID
+from gefapi.utils.retention import delete_in_batches
 
 db.GUID = GUID
 
@@ -120,8 +121,7 @@ class PasswordResetToken(db.Model):
         cutoff = datetime.datetime.now(datetime.UTC).replace(
             tzinfo=None
         ) - datetime.timedelta(days=days_old)
-        result = cls.query.filter(cls.created_at < cutoff).delete(
-            synchronize_session=False
+        result = delete_in_batches(
+            cls, cls.created_at < cutoff, name="expired password reset tokens"
         )
-        db.session.commit()
-        return result
+        return result["rows"]
@@ -6,6 +6,7 @@ import uuid
 from gefapi import db
 from gefapi.models import GUID
 from gefapi.utils.permissions import is_admin_or_higher
+from gefapi.utils.query_filters import lower_index
 
 db.GUID = GUID
 
@@ -21,6 +22,13 @@ class Script(db.Model):
     )
     name = db.Column(db.String(120), nullable=False)
     slug = db.Column(db.String(80), unique=True, nullable=False)
+    # Admin search filters on these case-insensitively. Migration
+    # 9c1e3a5b7d8f adds pg_trgm GIN indexes on the same expressions for
+    # substring searches.
+    __table_args__ = (
+        lower_index("ix_script_name_lower", name),
+        lower_index("ix_script_slug_lower", slug),
+    )
     description = db.Column(db.Text(), default="")
     created_at = db.Column(
         db.DateTime(), default=lambda: datetime.datetime.now(datetime.UTC)
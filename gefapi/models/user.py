@@ -13,11 +13,12 @@ from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from flask_jwt_extended import create_access_token
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from gefapi import db
 from gefapi.models import GUID
 from gefapi.utils import mask_email, utcnow
+from gefapi.utils.password_hashing import hash_password, verify_password
+from gefapi.utils.query_filters import lower_index
 
 db.GUID = GUID
 
@@ -41,6 +42,13 @@ class User(db.Model):
     created_at = db.Column(db.DateTime(), default=utcnow)
     updated_at = db.Column(db.DateTime(), default=utcnow)
     role = db.Column(db.String(10))
+    # Admin search filters on these case-insensitively. Migration
+    # 9c1e3a5b7d8f adds pg_trgm GIN indexes on the same expressions for
+    # substring searches.
+    __table_args__ = (
+        lower_index("ix_user_email_lower", email),
+        lower_index("ix_user_name_lower", name),
+    )
     scripts = db.relationship(
         "Script",
         backref=db.backref("user"),
@@ -153,6 +161,11 @@ class User(db.Model):
     consent_given_at = db.Column(db.DateTime(), nullable=True)
     consent_source = db.Column(db.String(50), nullable=True)
 
+    # Tombstone set when the account is deleted. The row is anonymized at once
+    # and removed by the background purge (see UserDeletionService) after the
+    # user's executions, logs and scripts have been deleted in batches.
+    deleted_at = db.Column(db.DateTime(), nullable=True, index=True)
+
     def __init__(
         self,
         email,
@@ -333,7 +346,7 @@ class User(db.Model):
         return [item.serialize() for item in self.scripts]
 
     def set_password(self, password):
-        return generate_password_hash(password, method="scrypt")
+        return hash_password(password)
 
     def check_password(self, password):
         """Check if provided password matches stored hash"""
@@ -346,7 +359,7 @@ class User(db.Model):
             return False
 
         try:
-            return check_password_hash(self.password, password)
+            return verify_password(self.password, password)
         except ValueError as e:
             logger.error(
                 f"Invalid password hash for user {mask_email(self.email)}: {e}"
@@ -18,8 +18,11 @@ import hashlib
 import logging
 import uuid
 
+from sqlalchemy import and_
+
 from gefapi import db
 from gefapi.models import GUID
+from gefapi.utils.retention import update_in_batches
 
 db.GUID = GUID
 
@@ -49,6 +52,17 @@ class DeletionReason:
         return reason in (cls.USER_REQUEST,)
 
 
+class PurgeStatus:
+    """Constants for tracking the background purge of a deleted user's data."""
+
+    PENDING = "pending"  # User tombstoned, no rows purged yet
+    IN_PROGRESS = "in_progress"  # Some batches committed, more remain
+    COMPLETED = "completed"  # All dependent rows and the user row deleted
+    FAILED = "failed"  # Gave up after repeated errors (see purge_last_error)
+
+    ACTIVE = (PENDING, IN_PROGRESS)
+
+
 class UserDeletionAudit(db.Model):
     """Audit record for user deletions.
 
@@ -124,6 +138,33 @@ class UserDeletionAudit(db.Model):
     # Set to deleted_at + 30 days for user-requested deletions
     email_hash_expires_at = db.Column(db.DateTime(), nullable=True)
 
+    # Background purge progress (see UserDeletionService).
+    # purge_user_id points at the tombstoned user row while its data is being
+    # deleted in batches; it is cleared once the purge completes so that no
+    # identifier outlives the account.
+    purge_user_id = db.Column(db.GUID(), nullable=True, index=True)
+    purge_status = db.Column(
+        db.String(20),
+        nullable=False,
+        default=PurgeStatus.PENDING,
+        server_default=PurgeStatus.COMPLETED,
+        index=True,
+    )
+    # Name of the table currently being purged
+    purge_step = db.Column(db.String(50), nullable=True)
+    purge_rows_deleted = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
+    # Number of purge runs that ended in an error
+    purge_attempts = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
+    # Lease heartbeat, refreshed after every committed batch. A stale value
+    # means the worker was lost and the purge can be resumed by another one.
+    purge_heartbeat_at = db.Column(db.DateTime(), nullable=True)
+    purge_completed_at = db.Column(db.DateTime(), nullable=True)
+    purge_last_error = db.Column(db.Text(), nullable=True)
+
     def __init__(
         self,
         deletion_reason: str,
@@ -166,6 +207,9 @@ class UserDeletionAudit(db.Model):
         self.role = role
         self.deleted_by_admin_id = deleted_by_admin_id
         self.context = context
+        self.purge_status = PurgeStatus.PENDING
+        self.purge_rows_deleted = 0
+        self.purge_attempts = 0
 
         # Calculate derived fields
         if account_created_at:
@@ -196,6 +240,12 @@ class UserDeletionAudit(db.Model):
             "failed_executions": self.failed_executions,
             "email_verified": self.email_verified,
             "role": self.role,
+            "purge_status": self.purge_status,
+            "purge_step": self.purge_step,
+            "purge_rows_deleted": self.purge_rows_deleted,
+            "purge_completed_at": (
+                self.purge_completed_at.isoformat() if self.purge_completed_at else None
+            ),
         }
 
     @classmethod
@@ -255,13 +305,18 @@ class UserDeletionAudit(db.Model):
             Number of records updated
         """
         now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
-        result = cls.query.filter(
-            cls.email_hash.isnot(None),
-            cls.email_hash_expires_at.isnot(None),
-            cls.email_hash_expires_at < now,
-        ).update({cls.email_hash: None}, synchronize_session=False)
-        db.session.commit()
+        result = update_in_batches(
+            cls,
+            and_(
+                cls.email_hash.isnot(None),
+                cls.email_hash_expires_at.isnot(None),
+                cls.email_hash_expires_at < now,
+            ),
+            {"email_hash": None},
+            name="expired deletion audit email hashes",
+        )
         logger.info(
-            f"[AUDIT]: Cleared {result} expired email hashes from deletion audit"
+            f"[AUDIT]: Cleared {result['rows']} expired email hashes "
+            "from deletion audit"
         )
-        return result
+        return result["rows"]
@@ -7,11 +7,19 @@ def error(status=400, detail="Bad Request"):
     return jsonify({"status": status, "detail": detail}), status
 
 
+def password_hashing_busy(e):
+    """429 response for a PasswordHashingBusy error."""
+    response, status = error(status=429, detail=e.message)
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response, status
+
+
 endpoints = Blueprint("endpoints", __name__)
 import gefapi.routes.api.v1.admin  # noqa: E402
 import gefapi.routes.api.v1.boundaries  # noqa: E402
 import gefapi.routes.api.v1.bulk_email  # noqa: E402
 import gefapi.routes.api.v1.executions  # noqa: E402
+import gefapi.routes.api.v1.exports  # noqa: E402
 import gefapi.routes.api.v1.gee_credentials  # noqa: E402
 import gefapi.routes.api.v1.google_groups  # noqa: E402
 import gefapi.routes.api.v1.monitoring  # noqa: E402
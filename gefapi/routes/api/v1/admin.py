@@ -30,6 +30,12 @@ def get_rate_limit_status():
     **Purpose**: Provides visibility into current rate limiting state for monitoring
       and debugging.
 
+    **Query Parameters**:
+    - `type`: Only include limits of this type (`user`, `ip`, `auth`, ...)
+    - `endpoint`: Only include limits whose endpoint contains this string
+    - `page`: Page number (default: 1)
+    - `per_page`: Limits per page (1-500, default: 100)
+
     **Response Schema**:
     ```json
     {
@@ -38,6 +44,8 @@ def get_rate_limit_status():
         "enabled": true,
         "storage_type": "database",
         "total_active_limits": 1,
+        "page": 1,
+        "per_page": 100,
         "active_limits": [
           {
             "key": "user:123",
@@ -47,7 +55,7 @@ def get_rate_limit_status():
             "expires_at": "2025-11-02T10:16:30+00:00",
             "limit_definition": "5 per minute",
             "limit": 5,
-            "current_count": null,
+            "current_count": 6,
             "time_window_seconds": 60,
             "retry_after_seconds": 60,
             "user_info": {
@@ -65,7 +73,12 @@ def get_rate_limit_status():
     **Response Fields**:
     - `enabled`: Whether rate limiting is active.
         - `storage_type`: Backend storage type reported by the status endpoint.
-        - `total_active_limits`: Count of currently active rate limit entries.
+        - `total_active_limits`: Count of active rate limit entries matching the
+          filters (across all pages).
+        - `page` / `per_page`: Pagination of `active_limits`.
+        - `password_hashing`: Password hashing latency (`p50_ms`, `p95_ms`,
+          `max_ms`), load (`pending`, `rejected`) and `capacity_per_minute` for
+          the worker that served the request; use it to size `AUTH_LIMITS`.
         - `active_limits`: Array with metadata for each active rate limit, including:
       - `key`: Identifier used by the limiter storage (e.g., `user:<uuid>`).
       - `identifier`: User or IP identifier associated with the limit.
@@ -74,7 +87,8 @@ def get_rate_limit_status():
       - `expires_at`: Timestamp when the limit will automatically expire.
       - `limit_definition`: Human-readable description of the breached rule.
             - `limit`: Parsed numeric request limit when available.
-      - `current_count`: Latest known request count (may be null).
+      - `current_count`: Live request count in the current window, read from the
+        limiter storage (null once the window has expired).
       - `time_window_seconds`: Time window for the limit in seconds.
       - `retry_after_seconds`: Retry hint provided by the limiter, if available.
             - `user_info`: Contextual user information for user-type limits
@@ -94,7 +108,16 @@ def get_rate_limit_status():
     try:
         from gefapi.utils.rate_limiting import get_current_rate_limits
 
-        rate_limit_status = get_current_rate_limits()
+        page = max(request.args.get("page", default=1, type=int) or 1, 1)
+        per_page = request.args.get("per_page", default=100, type=int) or 100
+        per_page = max(1, min(per_page, 500))
+
+        rate_limit_status = get_current_rate_limits(
+            rate_limit_type=request.args.get("type") or None,
+            endpoint=request.args.get("endpoint") or None,
+            page=page,
+            per_page=per_page,
+        )
 
         return jsonify(
             {
@@ -15,11 +15,17 @@ from gefapi import limiter
 from gefapi.errors import (
     ExecutionNotFound,
     GeeTermsRequiredError,
+    InvalidSyncToken,
+    NotAllowed,
     ScriptNotFound,
     ScriptStateNotValid,
 )
 from gefapi.routes.api.v1 import endpoints, error
-from gefapi.services import ExecutionService
+from gefapi.services import ExecutionService, ResultsStorageService
+from gefapi.services.export_service import (
+    EXECUTION_EXPORT_COLUMNS,
+    EXECUTION_EXPORT_DATE_FIELDS,
+)
 from gefapi.utils.permissions import can_access_admin_features, is_admin_or_higher
 from gefapi.utils.rate_limiting import (
     RateLimitConfig,
@@ -31,6 +37,35 @@ from gefapi.validators import validate_execution_log_creation, validate_executio
 
 logger = logging.getLogger()
 
+# include= value that returns the manifest of results held in the results
+# store instead of loading them
+RESULTS_MANIFEST_INCLUDE = "results_manifest"
+
+
+def _serialize_execution(execution, include, exclude, fields, load_results=False):
+    """Serialize an execution.
+
+    Listings return results offloaded to the results store as their
+    manifest, since loading them would mean one storage read per row. With
+    ``load_results`` (a single execution) they are loaded back, unless the
+    client asked for ``include=results_manifest``. If they can't be read,
+    the manifest is returned with a ``results_error``.
+    """
+    serialized = execution.serialize(include, exclude, current_user, fields)
+    if (
+        load_results
+        and RESULTS_MANIFEST_INCLUDE not in include
+        and ResultsStorageService.is_offloaded(serialized.get("results"))
+    ):
+        try:
+            serialized["results"] = ResultsStorageService.load(serialized["results"])
+        except Exception as e:
+            logger.error(
+                f"[ROUTER]: Could not load results of execution {execution.id}: {e}"
+            )
+            serialized["results_error"] = "Results could not be loaded"
+    return serialized
+
 
 # SCRIPT EXECUTION
 @endpoints.route("/script/<script>/run", strict_slashes=False, methods=["POST"])
@@ -168,13 +203,19 @@ def get_user_executions():
     **Access**: Returns only executions belonging to the current user
     **Scope**: User-specific endpoint - users can only see their own executions
 
+    **Offloaded Results**: Results offloaded to the results store are
+    returned as their manifest (`{"results_manifest": {...}}`); get them
+    from `/execution/<id>` or `/execution/<id>/download-results`.
+
     **Query Parameters**:
     - `include`: Comma-separated list of additional fields to include in response
     - `exclude`: Comma-separated list of fields to exclude from response
+    - `fields`: Comma-separated list of the only top-level fields to return
+      (`id` is always returned); omitted columns are not read from the database
     - `filter`: Search/filter executions by script name, status, or other attributes
     - `sort`: Sort field (prefix with '-' for descending, e.g., '-created_at',
       '-updated_at')
-    - `updated_at`: Filter executions started after specific timestamp (ISO 8601)
+    - `updated_at`: Filter executions changed since a timestamp (ISO 8601)
     - `page`: Page number for pagination (triggers pagination when provided)
     - `per_page`: Items per page (1-100, default: 20)
 
@@ -233,10 +274,11 @@ def get_user_executions():
     - `?sort=status` - Sort by execution status
 
     **Timestamp Filtering**:
-    - `?updated_at=2025-01-15T10:30:00Z` - Find executions started after date
+    - `?updated_at=2025-01-15T10:30:00Z` - Find executions changed since date
     - `updated_at` parameter accepts ISO 8601 format
-    - Returns executions that started after the specified timestamp
-    - Useful for incremental synchronization and monitoring recent activity
+    - Returns executions created or modified at or after the timestamp
+    - For incremental synchronization use `/execution/user/changes`, which
+      also reports deletions and never skips concurrent updates
 
     **Pagination Examples**:
     - `?page=1&per_page=50` - Get first 50 executions with pagination
@@ -254,6 +296,8 @@ def get_user_executions():
 
     **Error Responses**:
     - `401 Unauthorized`: JWT token required
+    - `403 Forbidden`: Filter or sort by an admin-only field (`user_name`,
+      `user_email`) by a non-admin user
     - `500 Internal Server Error`: Failed to retrieve executions
     """
     logger.info(f"[ROUTER]: Getting executions for user: {current_user.id}")
@@ -261,6 +305,8 @@ def get_user_executions():
     include = include.split(",") if include else []
     exclude = request.args.get("exclude")
     exclude = exclude.split(",") if exclude else []
+    fields = request.args.get("fields")
+    fields = fields.split(",") if fields else []
     filter_param = request.args.get("filter", None)
     script_id = request.args.get("script_id", None)
     sort = request.args.get("sort", None)
@@ -302,14 +348,19 @@ def get_user_executions():
             filter_param=filter_param,
             sort=sort,
             include=include,
+            exclude=exclude,
+            fields=fields,
         )
 
         response_data = {
             "data": [
-                execution.serialize(include, exclude, current_user)
+                _serialize_execution(execution, include, exclude, fields)
                 for execution in executions
             ]
         }
+    except NotAllowed as e:
+        logger.error("[ROUTER]: " + e.message)
+        return error(status=403, detail=e.message)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -323,27 +374,96 @@ def get_user_executions():
     return jsonify(response_data), 200
 
 
+@endpoints.route("/execution/user/changes", strict_slashes=False, methods=["GET"])
+@jwt_required()
+@require_scope("execution:read")
+def get_user_execution_changes():
+    """
+    Incrementally sync the current user's executions.
+
+    **Authentication**: JWT token required
+    **Access**: Returns only executions belonging to the current user
+
+    **Offloaded Results**: Results offloaded to the results store are
+    returned as their manifest (`{"results_manifest": {...}}`); get them
+    from `/execution/<id>` or `/execution/<id>/download-results`.
+
+    **Query Parameters**:
+    - `since`: Opaque token from the `next` field of a previous response; omit
+      it on the first call to receive every execution
+    - `limit`: Maximum executions (and deletions) per response (default and
+      maximum: 500)
+    - `include`: Comma-separated list of additional fields to include
+    - `exclude`: Comma-separated list of fields to exclude
+    - `fields`: Comma-separated list of the only top-level fields to return
+
+    **Response Schema**:
+    ```json
+    {
+      "data": [
+        {"id": "exec-123", "status": "FINISHED", "updated_at": "..."}
+      ],
+      "deleted": ["exec-456"],
+      "next": "eyJ1IjpbIjIwMjUtMDEtMTVUMTE6NDU6MDAiLC...",
+      "has_more": false
+    }
+    ```
+
+    **Sync Protocol**:
+    - Apply `data` (insert or replace by `id`), then remove the `deleted` ids
+    - Store `next` and pass it as `since` on the next poll
+    - While `has_more` is true, call again straight away with the new token
+    - Changes from the last few seconds are returned on the following poll
+
+    **Error Responses**:
+    - `400 Bad Request`: Invalid `since` token or `limit`
+    - `401 Unauthorized`: JWT token required
+    - `500 Internal Server Error`: Failed to retrieve changes
+    """
+    logger.info(f"[ROUTER]: Getting execution changes for user: {current_user.id}")
+    include = request.args.get("include")
+    include = include.split(",") if include else []
+    exclude = request.args.get("exclude")
+    exclude = exclude.split(",") if exclude else []
+    fields = request.args.get("fields")
+    fields = fields.split(",") if fields else []
+    since = request.args.get("since", None)
+    limit = request.args.get("limit", None, type=int)
+    if "limit" in request.args and limit is None:
+        return error(status=400, detail="limit must be an integer")
+
+    try:
+        changes = ExecutionService.get_execution_changes(
+            user=current_user,
+            since=since,
+            limit=limit,
+            include=include,
+            exclude=exclude,
+            fields=fields,
+        )
+        data = [
+            _serialize_execution(execution, include, exclude, fields)
+            for execution in changes["executions"]
+        ]
+    except InvalidSyncToken as e:
+        logger.error("[ROUTER]: " + e.message)
+        return error(status=400, detail=e.message)
+    except Exception as e:
+        logger.error("[ROUTER]: " + str(e))
+        return error(status=500, detail="Generic Error")
+
+    return jsonify(
+        data=data,
+        deleted=changes["deleted"],
+        next=changes["next"],
+        has_more=changes["has_more"],
+    ), 200
+
+
 # ---------------------------------------------------------------------------
 # CSV export
 # ---------------------------------------------------------------------------
 
-_EXECUTION_EXPORT_COLUMNS = [
-    "id",
-    "script_id",
-    "script_name",
-    "user_id",
-    "user_name",
-    "user_email",
-    "status",
-    "progress",
-    "start_date",
-    "end_date",
-    "queued_at",
-    "dispatched_at",
-]
-
-_EXECUTION_EXPORT_DATE_FIELDS = {"start_date", "end_date"}
-
 
 @endpoints.route("/execution/export", strict_slashes=False, methods=["GET"])
 @jwt_required()
@@ -377,14 +497,22 @@ def export_executions_csv():
     date_from = _parse_date_param(request.args.get("date_from"))
     date_to = _parse_date_param(request.args.get("date_to"))
 
-    if date_field and date_field not in _EXECUTION_EXPORT_DATE_FIELDS:
+    if date_field and date_field not in EXECUTION_EXPORT_DATE_FIELDS:
         return error(status=400, detail=f"Invalid date_field '{date_field}'")
 
     try:
+        from sqlalchemy.orm import load_only
+
         from gefapi import db
         from gefapi.models import Execution, Script, User
         from gefapi.utils.csv_export import MAX_EXPORT_ROWS
 
+        # The export never reads params/results, so don't SELECT them
+        export_columns = [
+            getattr(Execution, col)
+            for col in EXECUTION_EXPORT_COLUMNS
+            if col in Execution.__table__.c
+        ]
         query = (
             db.session.query(
                 Execution,
@@ -392,6 +520,7 @@ def export_executions_csv():
                 User.name.label("user_name"),
                 User.email.label("user_email"),
             )
+            .options(load_only(*export_columns))
             .outerjoin(Script, Execution.script_id == Script.id)
             .outerjoin(User, Execution.user_id == User.id)
         )
@@ -422,7 +551,7 @@ def export_executions_csv():
 
     rows = []
     for exec_row, script_name, user_name, user_email in results:
-        row = {col: getattr(exec_row, col, None) for col in _EXECUTION_EXPORT_COLUMNS}
+        row = {col: getattr(exec_row, col, None) for col in EXECUTION_EXPORT_COLUMNS}
         row["script_name"] = script_name or ""
         row["user_name"] = user_name or ""
         row["user_email"] = user_email or ""
@@ -467,13 +596,19 @@ def get_executions():
     **Admin Features**: ADMIN+ users can filter by user_id to view other users'
       executions
 
+    **Offloaded Results**: Results offloaded to the results store are
+    returned as their manifest (`{"results_manifest": {...}}`); get them
+    from `/execution/<id>` or `/execution/<id>/download-results`.
+
     **Query Parameters**:
     - `user_id`: Filter executions by specific user ID (admin-only feature)
-    - `updated_at`: Filter executions started after specific timestamp (ISO 8601)
+    - `updated_at`: Filter executions changed since a timestamp (ISO 8601)
     - `status`: Filter by execution status (PENDING, RUNNING, SUCCESS, FAILED,
       CANCELLED)
     - `include`: Comma-separated list of additional fields to include
     - `exclude`: Comma-separated list of fields to exclude
+    - `fields`: Comma-separated list of the only top-level fields to return
+      (`id` is always returned); omitted columns are not read from the database
     - `filter`: General search/filter across execution attributes
     - `sort`: Sort field (prefix with '-' for descending, e.g., '-updated_at')
     - `page`: Page number for pagination (triggers pagination when provided)
@@ -543,6 +678,8 @@ def get_executions():
 
     **Error Responses**:
     - `401 Unauthorized`: JWT token required
+    - `403 Forbidden`: Filter or sort by an admin-only field (`user_name`,
+      `user_email`) by a non-admin user
     - `500 Internal Server Error`: Failed to retrieve executions
     """
     logger.info("[ROUTER]: Getting all executions: ")
@@ -556,6 +693,8 @@ def get_executions():
     include = include.split(",") if include else []
     exclude = request.args.get("exclude")
     exclude = exclude.split(",") if exclude else []
+    fields = request.args.get("fields")
+    fields = fields.split(",") if fields else []
     filter_param = request.args.get("filter", None)
     # Pagination parameters - only paginate if user requests it
     page_param = request.args.get("page", None)
@@ -590,14 +729,19 @@ def get_executions():
             filter_param=filter_param,
             sort=sort,
             include=include,
+            exclude=exclude,
+            fields=fields,
         )
 
         response_data = {
             "data": [
-                execution.serialize(include, exclude, current_user)
+                _serialize_execution(execution, include, exclude, fields)
                 for execution in executions
             ]
         }
+    except NotAllowed as e:
+        logger.error("[ROUTER]: " + e.message)
+        return error(status=403, detail=e.message)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -626,9 +770,13 @@ def get_execution(execution):
 
     **Query Parameters**:
     - `include`: Comma-separated list of additional fields to include
-      - Available: `script`, `script_name`, `user_name`, `user_email`, `logs`
+      - Available: `script`, `script_name`, `user_name`, `user_email`, `logs`,
+        `results_manifest` (the manifest of results offloaded to the results
+        store, instead of the results themselves; if offloaded results can't
+        be read, the manifest is returned along with a `results_error`)
     - `exclude`: Comma-separated list of fields to exclude
       - Available: `params`, `results`
+    - `fields`: Comma-separated list of the only top-level fields to return
 
     **Response Schema**:
     ```json
@@ -670,9 +818,13 @@ def get_execution(execution):
     include = include.split(",") if include else []
     exclude = request.args.get("exclude")
     exclude = exclude.split(",") if exclude else []
+    fields = request.args.get("fields")
+    fields = fields.split(",") if fields else []
     try:
         execution = ExecutionService.get_execution(execution, current_user)
-        serialized = execution.serialize(include, exclude, current_user)
+        serialized = _serialize_execution(
+            execution, include, exclude, fields, load_results=True
+        )
     except ExecutionNotFound as e:
         logger.error("[ROUTER]: " + e.message)
         return error(status=404, detail=e.message)
@@ -1039,6 +1191,8 @@ def get_download_results(execution):
     - **Content-Type**: `text/plain`
     - **Content-Disposition**: `attachment; filename=results.json`
     - **Body**: JSON-formatted execution results
+    - Results offloaded to the results store are streamed from it; clients
+      sending `Accept-Encoding: gzip` receive the stored gzip bytes as-is
 
     **Use Cases**:
     - Download analysis results for offline processing
@@ -1062,10 +1216,28 @@ def get_download_results(execution):
         return error(status=500, detail="Generic Error")
 
     results_payload = execution_obj.results or {}
+    headers = {"Content-Disposition": "attachment;filename=results.json"}
+    if not ResultsStorageService.is_offloaded(results_payload):
+        return Response(
+            json.dumps(results_payload), mimetype="text/plain", headers=headers
+        )
+
+    passthrough = "gzip" in request.accept_encodings
+    try:
+        content = ResultsStorageService.open_content(
+            results_payload, decompress=not passthrough
+        )
+    except Exception as exc:
+        logger.error("[ROUTER]: " + str(exc))
+        return error(status=500, detail="Generic Error")
+    if passthrough:
+        headers["Content-Encoding"] = "gzip"
+    headers["Vary"] = "Accept-Encoding"
     return Response(
-        json.dumps(results_payload),
+        content,
         mimetype="text/plain",
-        headers={"Content-Disposition": "attachment;filename=results.json"},
+        headers=headers,
+        direct_passthrough=True,
     )
 
 
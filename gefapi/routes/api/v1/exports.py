@@ -0,0 +1,208 @@
+"""Asynchronous admin CSV export routes for the Trends.Earth API.
+
+``POST`` to the export URLs queues an export job and returns immediately;
+the synchronous ``GET`` variants live next to each resource's other routes.
+"""
+
+import logging
+import os
+
+from flask import jsonify, request, send_file, url_for
+from flask_jwt_extended import current_user, get_jwt, jwt_required
+
+from gefapi.routes.api.v1 import endpoints, error
+from gefapi.services import ExportService
+from gefapi.utils.csv_export import _parse_date_param
+from gefapi.utils.permissions import is_admin_or_higher
+from gefapi.utils.scopes import _has_scope, require_scope
+
+logger = logging.getLogger()
+
+# OAuth2 scope needed to create or read an export of each table
+EXPORT_SCOPES = {
+    "executions": "execution:read",
+    "users": "user:read",
+    "scripts": "script:read",
+}
+
+
+def _submit_export(table):
+    if not is_admin_or_higher(current_user):
+        return error(status=403, detail="Forbidden")
+
+    params = request.get_json(silent=True) or request.args
+    date_field = params.get("date_field") or None
+    date_from = _parse_date_param(params.get("date_from"))
+    date_to = _parse_date_param(params.get("date_to"))
+
+    try:
+        job = ExportService.create_job(
+            table,
+            current_user,
+            date_field=date_field,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        return error(status=400, detail=str(e))
+    except Exception as e:
+        logger.error("[ROUTER]: " + str(e))
+        return error(status=500, detail="Generic Error")
+
+    logger.info(
+        "[AUDIT] CSV export job: table=%s job_id=%s "
+        "by user_id=%s email=%s role=%s "
+        "filter_field=%s filter_from=%s filter_to=%s "
+        "remote_addr=%s",
+        table,
+        job.id,
+        getattr(current_user, "id", None),
+        getattr(current_user, "email", None),
+        getattr(current_user, "role", None),
+        date_field,
+        params.get("date_from"),
+        params.get("date_to"),
+        request.remote_addr,
+    )
+    if job.status == "FAILED":
+        return error(status=503, detail=job.error)
+    return jsonify(data=job.serialize()), 202
+
+
+@endpoints.route("/execution/export", strict_slashes=False, methods=["POST"])
+@jwt_required()
+@require_scope("execution:read")
+def submit_execution_export():
+    """
+    Queue an export of executions as a gzipped CSV (admin only).
+
+    **Authentication**: JWT token required
+    **Authorization**: ADMIN or SUPERADMIN required
+
+    **Parameters** (JSON body or query string): ``date_field``, ``date_from``
+    and ``date_to``, as for ``GET /execution/export``. There is no row limit.
+
+    **Response**: ``202 Accepted`` with the export job; poll
+    ``GET /export/<job_id>`` for progress and the download link.
+
+    **Error Responses**:
+    - ``400`` – invalid ``date_field``
+    - ``403`` – insufficient privileges
+    - ``503`` – the job could not be queued; it is recorded as FAILED
+    """
+    return _submit_export("executions")
+
+
+@endpoints.route("/user/export", strict_slashes=False, methods=["POST"])
+@jwt_required()
+@require_scope("user:read")
+def submit_user_export():
+    """
+    Queue an export of users as a gzipped CSV (admin only).
+
+    Same parameters and responses as ``POST /execution/export``; the date
+    fields are those of ``GET /user/export``.
+    """
+    return _submit_export("users")
+
+
+@endpoints.route("/script/export", strict_slashes=False, methods=["POST"])
+@jwt_required()
+@require_scope("script:read")
+def submit_script_export():
+    """
+    Queue an export of scripts as a gzipped CSV (admin only).
+
+    Same parameters and responses as ``POST /execution/export``; the date
+    fields are those of ``GET /script/export``.
+    """
+    return _submit_export("scripts")
+
+
+@endpoints.route("/export/<job_id>", strict_slashes=False, methods=["GET"])
+@jwt_required()
+def get_export_job(job_id):
+    """
+    Get the status of an export job (admin only).
+
+    **Authentication**: JWT token required
+    **Authorization**: ADMIN or SUPERADMIN required
+
+    **Response**: The export job, with ``status`` (PENDING, RUNNING, FINISHED
+    or FAILED), ``rows_written``, ``total_rows`` and ``progress`` (percent).
+    Finished jobs also include ``download_url``, a signed link that needs no
+    authentication, and ``download_expires_at`` (UNIX timestamp).
+
+    **Error Responses**:
+    - ``403`` – insufficient privileges
+    - ``404`` – export job not found
+    """
+    if not is_admin_or_higher(current_user):
+        return error(status=403, detail="Forbidden")
+
+    try:
+        job = ExportService.get_job(job_id)
+    except Exception as e:
+        logger.error("[ROUTER]: " + str(e))
+        return error(status=404, detail="Export job not found")
+    if job is None:
+        return error(status=404, detail="Export job not found")
+    if not _has_scope(EXPORT_SCOPES[job.table], get_jwt()):
+        return error(status=403, detail="Forbidden")
+
+    data = job.serialize()
+    if job.status == "FINISHED":
+        try:
+            data["download_url"], data["download_expires_at"] = (
+                ExportService.get_download_url(
+                    job,
+                    lambda job_id, expires, signature: url_for(
+                        "endpoints.download_export",
+                        job_id=job_id,
+                        expires=expires,
+                        signature=signature,
+                        _external=True,
+                    ),
+                )
+            )
+        except Exception as e:
+            logger.error("[ROUTER]: " + str(e))
+            return error(status=500, detail="Generic Error")
+    return jsonify(data=data), 200
+
+
+@endpoints.route("/export/<job_id>/download", strict_slashes=False, methods=["GET"])
+def download_export(job_id):
+    """
+    Download a finished export stored on the API's volume.
+
+    **Authentication**: None; ``expires`` and ``signature`` come from the
+    ``download_url`` of ``GET /export/<job_id>``
+
+    **Response**: ``application/gzip`` attachment with the CSV
+
+    **Error Responses**:
+    - ``403`` – missing, invalid or expired signature
+    - ``404`` – export job or file not found
+    """
+    if not ExportService.verify_download(
+        job_id, request.args.get("expires"), request.args.get("signature")
+    ):
+        return error(status=403, detail="Invalid or expired download link")
+
+    job = ExportService.get_job(job_id)
+    if job is None or job.status != "FINISHED" or job.storage_backend != "local":
+        return error(status=404, detail="Export not found")
+
+    path = ExportService.local_file_path(job)
+    if not os.path.exists(path):
+        return error(status=404, detail="Export not found")
+
+    response = send_file(
+        path,
+        mimetype="application/gzip",
+        as_attachment=True,
+        download_name=job.filename,
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -103,10 +103,11 @@ def get_news():
         per_page = 20
 
     try:
-        news_items, total = NewsService.get_news_items(
+        feed = NewsService.get_news_feed(
             platform=platform,
             version=version,
             user_role=user_role,
+            language=lang,
             sort=sort,
             page=page,
             per_page=per_page,
@@ -114,10 +115,10 @@ def get_news():
 
         return jsonify(
             {
-                "data": [item.serialize(language=lang) for item in news_items],
+                "data": feed["data"],
                 "page": page,
                 "per_page": per_page,
-                "total": total,
+                "total": feed["total"],
             }
         )
 
@@ -205,6 +206,7 @@ def admin_get_news():
             version=version,
             include_inactive=include_inactive,
             include_expired=include_expired,
+            include_all_roles=True,
             sort=sort,
             page=page,
             per_page=per_page,
@@ -18,6 +18,10 @@ from gefapi.errors import InvalidFile, NotAllowed, ScriptDuplicated, ScriptNotFo
 from gefapi.routes.api.v1 import endpoints, error
 from gefapi.s3 import get_script_from_s3
 from gefapi.services import ScriptService
+from gefapi.services.export_service import (
+    SCRIPT_EXPORT_COLUMNS,
+    SCRIPT_EXPORT_DATE_FIELDS,
+)
 from gefapi.utils.permissions import can_access_admin_features, is_admin_or_higher
 from gefapi.utils.scopes import require_scope
 from gefapi.validators import validate_file
@@ -109,26 +113,6 @@ def create_script():
 # CSV export
 # ---------------------------------------------------------------------------
 
-_SCRIPT_EXPORT_COLUMNS = [
-    "id",
-    "name",
-    "slug",
-    "status",
-    "public",
-    "restricted",
-    "created_at",
-    "updated_at",
-    "environment",
-    "environment_version",
-    "compute_type",
-    "uses_gee",
-    "user_id",
-    "user_name",
-    "user_email",
-]
-
-_SCRIPT_EXPORT_DATE_FIELDS = {"created_at", "updated_at"}
-
 
 @endpoints.route("/script/export", strict_slashes=False, methods=["GET"])
 @jwt_required()
@@ -160,7 +144,7 @@ def export_scripts_csv():
     date_from = _parse_date_param(request.args.get("date_from"))
     date_to = _parse_date_param(request.args.get("date_to"))
 
-    if date_field and date_field not in _SCRIPT_EXPORT_DATE_FIELDS:
+    if date_field and date_field not in SCRIPT_EXPORT_DATE_FIELDS:
         return error(status=400, detail=f"Invalid date_field '{date_field}'")
 
     try:
@@ -200,7 +184,7 @@ def export_scripts_csv():
 
     rows = []
     for script_row, user_name, user_email in results:
-        row = {col: getattr(script_row, col, None) for col in _SCRIPT_EXPORT_COLUMNS}
+        row = {col: getattr(script_row, col, None) for col in SCRIPT_EXPORT_COLUMNS}
         row["user_name"] = user_name or ""
         row["user_email"] = user_email or ""
         for key, val in row.items():
@@ -308,6 +292,8 @@ def get_scripts():
 
     **Error Responses**:
     - `401 Unauthorized`: JWT token required
+    - `403 Forbidden`: Filter or sort by an admin-only field by a non-admin
+      user
     - `500 Internal Server Error`: Failed to retrieve scripts
     """
     logger.info("[ROUTER]: Getting all scripts")
@@ -353,6 +339,9 @@ def get_scripts():
                 script.serialize(include, exclude, current_user) for script in scripts
             ]
         }
+    except NotAllowed as e:
+        logger.error("[ROUTER]: " + e.message)
+        return error(status=403, detail=e.message)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -658,6 +647,12 @@ def get_script_logs(script):
     - `last-id`: Last log ID for pagination/incremental updates
       - Example: `?last-id=log-456`
 
+    **Live Build Logs**:
+    While the script is `BUILDING`, build and push output is written to the
+    database in batches. Lines not yet written are appended to the response with
+    `"id": null`; they are returned again with an ID once persisted. Poll with
+    `start` set to the last `register_date` seen to receive each line once.
+
     **Response Schema**:
     ```json
     {
@@ -10,12 +10,18 @@ from gefapi import limiter
 from gefapi.errors import (
     AuthError,
     EmailError,
+    NotAllowed,
+    PasswordHashingBusy,
     PasswordValidationError,
     UserDuplicated,
     UserNotFound,
 )
-from gefapi.routes.api.v1 import endpoints, error
+from gefapi.routes.api.v1 import endpoints, error, password_hashing_busy
 from gefapi.services import UserService
+from gefapi.services.export_service import (
+    USER_EXPORT_COLUMNS,
+    USER_EXPORT_DATE_FIELDS,
+)
 from gefapi.utils.permissions import (
     can_admin_change_user_password,
     can_change_user_password,
@@ -126,6 +132,8 @@ def create_user():
     except PasswordValidationError as e:
         logger.error("[ROUTER]: " + e.message)
         return error(status=422, detail=e.message)
+    except PasswordHashingBusy as e:
+        return password_hashing_busy(e)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -136,43 +144,6 @@ def create_user():
 # CSV export
 # ---------------------------------------------------------------------------
 
-# Columns included in the users CSV export (all non-sensitive profile fields)
-_USER_EXPORT_COLUMNS = [
-    "id",
-    "email",
-    "name",
-    "role",
-    "country",
-    "institution",
-    "role_title",
-    "sector",
-    "sector_other",
-    "gender_identity",
-    "gender_identity_description",
-    "purpose_of_use",
-    "purpose_of_use_other",
-    "email_verified",
-    "email_verified_at",
-    "created_at",
-    "updated_at",
-    "last_login_at",
-    "last_activity_at",
-    "gee_license_acknowledged",
-    "email_notifications_enabled",
-    "email_subscription_news",
-    "email_subscription_engagement",
-    "email_subscription_system_updates",
-]
-
-# Allowed date fields for filtering the user export
-_USER_EXPORT_DATE_FIELDS = {
-    "created_at",
-    "updated_at",
-    "email_verified_at",
-    "last_login_at",
-    "last_activity_at",
-}
-
 
 @endpoints.route("/user/export", strict_slashes=False, methods=["GET"])
 @jwt_required()
@@ -205,7 +176,7 @@ def export_users_csv():
     date_from = _parse_date_param(request.args.get("date_from"))
     date_to = _parse_date_param(request.args.get("date_to"))
 
-    if date_field and date_field not in _USER_EXPORT_DATE_FIELDS:
+    if date_field and date_field not in USER_EXPORT_DATE_FIELDS:
         return error(status=400, detail=f"Invalid date_field '{date_field}'")
 
     try:
@@ -213,7 +184,7 @@ def export_users_csv():
         from gefapi.models import User
         from gefapi.utils.csv_export import MAX_EXPORT_ROWS
 
-        query = db.session.query(User)
+        query = db.session.query(User).filter(User.deleted_at.is_(None))
 
         if date_field and (date_from or date_to):
             col = getattr(User, date_field)
@@ -239,7 +210,7 @@ def export_users_csv():
         logger.error("[ROUTER]: export_users_csv error: %s", exc)
         return error(status=500, detail="Generic Error")
 
-    rows = [{col: getattr(u, col, None) for col in _USER_EXPORT_COLUMNS} for u in users]
+    rows = [{col: getattr(u, col, None) for col in USER_EXPORT_COLUMNS} for u in users]
     # Normalise datetime objects → ISO strings for CSV serialisation
     for row in rows:
         for key, val in row.items():
@@ -379,6 +350,9 @@ def get_users():
             per_page=per_page,
             paginate=paginate,
         )
+    except NotAllowed as e:
+        logger.error("[ROUTER]: " + e.message)
+        return error(status=403, detail=e.message)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -704,6 +678,8 @@ def change_password():
     except PasswordValidationError as e:
         logger.error("[ROUTER]: " + e.message)
         return error(status=422, detail=e.message)
+    except PasswordHashingBusy as e:
+        return password_hashing_busy(e)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -880,6 +856,8 @@ def recover_password(user):
         # the real error for operators.
         logger.error("[ROUTER]: Email delivery failed during recovery: " + e.message)
         return jsonify(generic_response), 200
+    except PasswordHashingBusy as e:
+        return password_hashing_busy(e)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -966,6 +944,8 @@ def reset_password_with_token():
     except PasswordValidationError as e:
         logger.error("[ROUTER]: " + e.message)
         return error(status=422, detail=e.message)
+    except PasswordHashingBusy as e:
+        return password_hashing_busy(e)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
@@ -1269,6 +1249,8 @@ def admin_change_password(user):
     except PasswordValidationError as e:
         logger.error("[ROUTER]: " + e.message)
         return error(status=422, detail=e.message)
+    except PasswordHashingBusy as e:
+        return password_hashing_busy(e)
     except Exception as e:
         logger.error("[ROUTER]: " + str(e))
         return error(status=500, detail="Generic Error")
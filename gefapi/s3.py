@@ -1,14 +1,111 @@
+import gzip
+import hashlib
+import io
+import json
 import logging
 import posixpath
 
-import boto3
-import botocore
 import rollbar
 
 from gefapi.config import SETTINGS
+from gefapi.utils.aws_clients import get_aws_client
+from gefapi.utils.lazy_import import lazy_import
+
+boto3_s3_transfer = lazy_import("boto3.s3.transfer")
+botocore_exceptions = lazy_import("botocore.exceptions")
 
 logger = logging.getLogger()
 
+# Object metadata key holding the SHA-256 of the uncompressed params JSON
+PARAMS_HASH_METADATA_KEY = "params-sha256"
+
+
+def get_s3_client(region_name=None):
+    """Return this process's shared S3 client for ``region_name``."""
+    return get_aws_client("s3", region_name=region_name)
+
+
+def get_transfer_config():
+    """Return the ``TransferConfig`` for managed S3 downloads and uploads.
+
+    Objects above ``MULTIPART_THRESHOLD_MB`` are transferred as
+    ``CHUNK_SIZE_MB`` ranged parts, ``MAX_CONCURRENCY`` at a time.
+    """
+    settings = SETTINGS.get("S3_TRANSFER", {})
+    mb = 1024 * 1024
+    return boto3_s3_transfer.TransferConfig(
+        multipart_threshold=settings.get("MULTIPART_THRESHOLD_MB", 16) * mb,
+        multipart_chunksize=settings.get("CHUNK_SIZE_MB", 8) * mb,
+        max_concurrency=settings.get("MAX_CONCURRENCY", 8),
+    )
+
+
+def download_bytes(s3_client, bucket, key):
+    """Download ``s3://bucket/key`` into memory using parallel ranged GETs."""
+    buffer = io.BytesIO()
+    s3_client.download_fileobj(bucket, key, buffer, Config=get_transfer_config())
+    return buffer.getvalue()
+
+
+def encode_json(document):
+    """Serialise ``document`` to gzipped JSON in memory.
+
+    ``json`` output is streamed chunk by chunk through the compressor, so the
+    full uncompressed document is never held as one string.
+
+    Returns:
+        (gzipped bytes, hex SHA-256 of the uncompressed JSON,
+        size of the uncompressed JSON in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    buffer = io.BytesIO()
+    # mtime=0 so identical documents always produce identical bytes
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+        for chunk in json.JSONEncoder().iterencode(document):
+            data = chunk.encode("utf-8")
+            digest.update(data)
+            size += len(data)
+            gz.write(data)
+    return buffer.getvalue(), digest.hexdigest(), size
+
+
+def encode_params(params):
+    """Serialise ``params`` to gzipped JSON in memory.
+
+    Returns:
+        (gzipped bytes, hex SHA-256 of the uncompressed JSON)
+    """
+    body, params_hash, _size = encode_json(params)
+    return body, params_hash
+
+
+def upload_params(s3_client, params, bucket, key, extra_args=None):
+    """Upload ``params`` as gzipped JSON to ``s3://bucket/key``.
+
+    The upload is skipped when the object already exists with the same
+    params hash, e.g. when a dispatch is retried. ``upload_fileobj`` switches
+    to a multipart upload for large payloads.
+
+    Returns:
+        True if the object was uploaded, False if it was already current
+    """
+    body, params_hash = encode_params(params)
+
+    try:
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+        if head.get("Metadata", {}).get(PARAMS_HASH_METADATA_KEY) == params_hash:
+            logger.info(f"[SERVICE]: Params at {key} are unchanged, skipping upload")
+            return False
+    except botocore_exceptions.ClientError:
+        # Usually 404; any other problem surfaces from the upload below
+        pass
+
+    extra_args = dict(extra_args or {})
+    extra_args["Metadata"] = {PARAMS_HASH_METADATA_KEY: params_hash}
+    s3_client.upload_fileobj(io.BytesIO(body), bucket, key, ExtraArgs=extra_args)
+    return True
+
 
 def _sanitize_object_basename(object_basename: str) -> str:
     """Sanitize an S3 object basename to prevent path traversal attacks.
@@ -71,10 +168,10 @@ def push_script_to_s3(file_path, object_basename):
 
     object_name = prefix + "/" + object_basename
     logger.info("[SERVICE]: Saving %s to S3", object_name)
-    s3_client = boto3.client("s3")
+    s3_client = get_s3_client()
     try:
         _ = s3_client.upload_file(str(file_path), bucket, object_name)
-    except botocore.exceptions.ClientError as e:
+    except botocore_exceptions.ClientError as e:
         logger.error(e)
         rollbar.report_exc_info()
         return False
@@ -93,8 +190,30 @@ def get_script_from_s3(script_file, out_path):
         raise ValueError("SCRIPTS_S3_BUCKET configuration is required")
 
     object_name = prefix + "/" + script_file
-    s3 = boto3.client("s3")
-    s3.download_file(bucket, object_name, out_path)
+    s3 = get_s3_client()
+    s3.download_file(bucket, object_name, out_path, Config=get_transfer_config())
+
+
+def open_script_from_s3(script_file):
+    """Open a script tarball in S3 as a readable stream.
+
+    Lets callers unpack the tarball as it arrives (``tarfile`` mode
+    ``"r|gz"``) instead of saving the ``.tar.gz`` to disk first. The caller
+    must close the returned stream.
+    """
+    script_file = _sanitize_object_basename(script_file)
+
+    prefix = SETTINGS.get("SCRIPTS_S3_PREFIX")
+    bucket = SETTINGS.get("SCRIPTS_S3_BUCKET")
+
+    if not prefix:
+        raise ValueError("SCRIPTS_S3_PREFIX configuration is required")
+    if not bucket:
+        raise ValueError("SCRIPTS_S3_BUCKET configuration is required")
+
+    object_name = prefix + "/" + script_file
+    response = get_s3_client().get_object(Bucket=bucket, Key=object_name)
+    return response["Body"]
 
 
 def delete_script_from_s3(object_basename):
@@ -110,17 +229,18 @@ def delete_script_from_s3(object_basename):
 
     object_name = prefix + "/" + object_basename
     logger.info("[SERVICE]: Deleting %s from S3", object_name)
-    s3_client = boto3.client("s3")
+    s3_client = get_s3_client()
     try:
         s3_client.delete_object(Bucket=bucket, Key=object_name)
-    except botocore.exceptions.ClientError as e:
+    except botocore_exceptions.ClientError as e:
         logger.error(e)
         rollbar.report_exc_info()
         return False
     return True
 
 
-def push_params_to_s3(file_path, object_basename):
+def push_params_to_s3(params, object_basename):
+    """Upload execution ``params`` as gzipped JSON under ``PARAMS_S3_PREFIX``."""
     object_basename = _sanitize_object_basename(object_basename)
 
     prefix = SETTINGS.get("PARAMS_S3_PREFIX")
@@ -133,10 +253,9 @@ def push_params_to_s3(file_path, object_basename):
 
     object_name = prefix + "/" + object_basename
     logger.info("[SERVICE]: Saving %s to S3", object_name)
-    s3_client = boto3.client("s3")
     try:
-        _ = s3_client.upload_file(str(file_path), bucket, object_name)
-    except botocore.exceptions.ClientError as e:
+        upload_params(get_s3_client(), params, bucket, object_name)
+    except botocore_exceptions.ClientError as e:
         logger.error(e)
         rollbar.report_exc_info()
         return False
@@ -35,12 +35,15 @@ from gefapi.services.email_service import EmailService
 
 # Import last to avoid circular dependency
 from gefapi.services.execution_service import ExecutionService
+from gefapi.services.export_service import ExportService
 from gefapi.services.news_service import NewsService
 from gefapi.services.oauth2_service import OAuth2Service
 from gefapi.services.openeo_service import openeo_run
 from gefapi.services.rate_limit_event_service import RateLimitEventService
+from gefapi.services.results_storage_service import ResultsStorageService
 from gefapi.services.script_service import ScriptService
 from gefapi.services.status_service import StatusService
+from gefapi.services.user_deletion_service import UserDeletionService
 from gefapi.services.user_service import UserService
 
 __all__ = [
@@ -50,11 +53,14 @@ __all__ = [
     "DockerService",
     "EmailService",
     "ExecutionService",
+    "ExportService",
     "NewsService",
     "OAuth2Service",
     "RateLimitEventService",
+    "ResultsStorageService",
     "ScriptService",
     "StatusService",
+    "UserDeletionService",
     "UserService",
     "batch_run",
     "docker_build",
@@ -0,0 +1,154 @@
+"""Queues of AWS Batch job state change events.
+
+EventBridge emits a "Batch Job State Change" event whenever a Batch job
+changes status; its ``detail`` has the same shape as a job returned by
+``describe_jobs``. A rule routing those events to an SQS queue lets
+``consume_batch_job_events`` update executions as the events arrive instead
+of waiting for the next poll.
+
+Two queues are available, selected by ``BATCH_MONITORING.EVENTS_BACKEND``:
+
+- ``SQSJobEventQueue`` long-polls the configured SQS queue and deletes
+  messages once they have been applied.
+- ``LocalJobEventQueue`` is an in-process stand-in for development and
+  tests. Events are put on it with ``publish_local_job_event``.
+
+Messages are acknowledged only after the executions they touch have been
+committed, so a worker that dies mid-batch leaves them to be redelivered.
+"""
+
+import json
+import logging
+import os
+import queue
+
+from gefapi.config import SETTINGS
+from gefapi.utils.aws_clients import get_aws_client
+
+logger = logging.getLogger(__name__)
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+# At most this many messages are received per call (the SQS maximum)
+MAX_MESSAGES = 10
+
+
+def _monitoring_settings():
+    return SETTINGS.get("BATCH_MONITORING", {})
+
+
+def parse_job_event(body):
+    """Return the job detail of a Batch job state change event.
+
+    Accepts the EventBridge envelope, as a dict or JSON string, or a bare
+    job detail. Returns None for anything without a job ID and status.
+    """
+    try:
+        event = json.loads(body) if isinstance(body, str | bytes) else body
+    except ValueError:
+        return None
+    if not isinstance(event, dict):
+        return None
+    detail = event.get("detail", event)
+    if not isinstance(detail, dict):
+        return None
+    if not detail.get("jobId") or not detail.get("status"):
+        return None
+    return detail
+
+
+class SQSJobEventQueue:
+    """Batch job events delivered to an SQS queue by an EventBridge rule"""
+
+    def __init__(self, queue_url, wait_seconds=20):
+        self.queue_url = queue_url
+        self.wait_seconds = wait_seconds
+
+    def receive(self, max_messages=MAX_MESSAGES, max_wait_seconds=None):
+        """Long-poll for messages.
+
+        Waits up to ``wait_seconds``, or *max_wait_seconds* if that is
+        shorter.
+
+        Returns:
+            List of (receipt, job detail or None) tuples; None marks a
+            message that isn't a Batch job event
+        """
+        resp = get_aws_client("sqs", region_name=AWS_REGION).receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=self._wait_seconds(max_wait_seconds),
+        )
+        return [
+            (message["ReceiptHandle"], parse_job_event(message.get("Body")))
+            for message in resp.get("Messages", [])
+        ]
+
+    def _wait_seconds(self, max_wait_seconds):
+        if max_wait_seconds is None:
+            return self.wait_seconds
+        return max(0, min(self.wait_seconds, int(max_wait_seconds)))
+
+    def ack(self, receipts):
+        if not receipts:
+            return
+        resp = get_aws_client("sqs", region_name=AWS_REGION).delete_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[
+                {"Id": str(i), "ReceiptHandle": receipt}
+                for i, receipt in enumerate(receipts)
+            ],
+        )
+        for failure in resp.get("Failed", []):
+            logger.warning(
+                "[BATCH-EVENTS] Failed to delete message: %s", failure.get("Message")
+            )
+
+
+class LocalJobEventQueue:
+    """In-process stand-in for the SQS queue"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def publish(self, event):
+        self._queue.put(event)
+
+    def receive(self, max_messages=MAX_MESSAGES, max_wait_seconds=None):
+        # Never waits; returns whatever has been published so far
+        messages = []
+        while len(messages) < max_messages:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            messages.append((None, parse_job_event(event)))
+        return messages
+
+    def ack(self, receipts):
+        # Events are removed from the queue when they are received
+        pass
+
+
+_local_queue = LocalJobEventQueue()
+
+
+def publish_local_job_event(event):
+    """Put a job state change event on the in-process queue."""
+    _local_queue.publish(event)
+
+
+def get_job_event_queue():
+    """Return the configured job event queue, or None if events are off."""
+    settings = _monitoring_settings()
+    backend = settings.get("EVENTS_BACKEND")
+    if not backend:
+        return None
+    if backend == "local":
+        return _local_queue
+    if backend == "sqs":
+        queue_url = settings.get("EVENTS_SQS_QUEUE_URL")
+        if not queue_url:
+            raise ValueError("BATCH_EVENTS_SQS_QUEUE_URL configuration is required")
+        return SQSJobEventQueue(queue_url, settings.get("EVENTS_WAIT_SECONDS", 20))
+    raise ValueError(f"Unknown Batch events backend: {backend}")
@@ -58,20 +58,17 @@ array job.  Single-step executions omit the ``pipeline`` key altogether
 and the container runs the default command from its job definition.
 """
 
-import gzip
-import json
 import logging
 import os
-from pathlib import Path
-import tempfile
 
-import boto3
 import rollbar
 
 from gefapi import celery as celery_app  # Rename to avoid mypy confusion
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.models import Execution, ExecutionLog, Script
+from gefapi.s3 import get_s3_client, upload_params
+from gefapi.utils.aws_clients import get_aws_client
 
 logger = logging.getLogger(__name__)
 
@@ -115,15 +112,15 @@ ECR_REGISTRY = os.getenv("ECR_REGISTRY", "")
 
 
 def _get_s3_client():
-    return boto3.client("s3", region_name=AWS_REGION)
+    return get_s3_client(region_name=AWS_REGION)
 
 
 def _get_batch_client():
-    return boto3.client("batch", region_name=AWS_REGION)
+    return get_aws_client("batch", region_name=AWS_REGION)
 
 
 def _get_logs_client():
-    return boto3.client("logs", region_name=AWS_REGION)
+    return get_aws_client("logs", region_name=AWS_REGION)
 
 
 # ---------------------------------------------------------------------------
@@ -137,30 +134,20 @@ def push_params_to_s3(params_dict, execution_id):
     Returns the ``s3://`` URI of the uploaded object.
     """
     key = f"{PARAMS_S3_PREFIX}/{execution_id}.json.gz"
-    with tempfile.TemporaryDirectory() as d:
-        gz_path = Path(d) / f"{execution_id}.json.gz"
-        data = json.dumps(params_dict).encode()
-        with gzip.open(gz_path, "wb") as fp:
-            fp.write(data)
-
-        # Apply cost-allocation tags from the params["batch"]["tags"] dict
-        # if the caller provided them.  This lets downstream apps like
-        # avoided-emissions tag S3 objects without the API hard-coding
-        # project-specific values.
-        extra_args = {}
-        cost_tags = (params_dict.get("batch") or {}).get("tags")
-        if cost_tags and isinstance(cost_tags, dict):
-            from urllib.parse import quote
-
-            extra_args["Tagging"] = "&".join(
-                f"{quote(k)}={quote(v)}" for k, v in cost_tags.items()
-            )
-        _get_s3_client().upload_file(
-            str(gz_path),
-            PARAMS_S3_BUCKET,
-            key,
-            ExtraArgs=extra_args if extra_args else None,
+
+    # Apply cost-allocation tags from the params["batch"]["tags"] dict
+    # if the caller provided them.  This lets downstream apps like
+    # avoided-emissions tag S3 objects without the API hard-coding
+    # project-specific values.
+    extra_args = {}
+    cost_tags = (params_dict.get("batch") or {}).get("tags")
+    if cost_tags and isinstance(cost_tags, dict):
+        from urllib.parse import quote
+
+        extra_args["Tagging"] = "&".join(
+            f"{quote(k)}={quote(v)}" for k, v in cost_tags.items()
         )
+    upload_params(_get_s3_client(), params_dict, PARAMS_S3_BUCKET, key, extra_args)
     return f"s3://{PARAMS_S3_BUCKET}/{key}"
 
 
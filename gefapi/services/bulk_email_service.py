@@ -25,6 +25,7 @@ from gefapi.models.bulk_email_verification_token import (
 )
 from gefapi.services.email_service import EmailService
 from gefapi.utils import utcnow
+from gefapi.utils.query_filters import QueryFields
 from gefapi.utils.security_events import log_security_event
 
 logger = logging.getLogger(__name__)
@@ -254,6 +255,10 @@ _PREVIEW_ALLOWED_SORT_FIELDS = {
     "last_activity_at",
 }
 
+_PREVIEW_QUERY_FIELDS = QueryFields(
+    User, filter_fields=set(), sort_fields=_PREVIEW_ALLOWED_SORT_FIELDS
+)
+
 _KNOWN_ROLES = {"USER", "ADMIN", "SUPERADMIN"}
 
 
@@ -287,7 +292,7 @@ def _build_recipient_query(filter_criteria, subscription_type=None):
     Raises ValueError for unrecognised role names or malformed datetime strings
     so that callers can return HTTP 400 rather than a leaky 500.
     """
-    q = db.session.query(User)
+    q = db.session.query(User).filter(User.deleted_at.is_(None))
 
     roles = filter_criteria.get("roles")
     if roles:
@@ -487,16 +492,9 @@ class BulkEmailService:
         """Return total count and a page of recipients matching filter_criteria."""
         q = _build_recipient_query(filter_criteria)
         total = q.count()
-        if sort:
-            from gefapi.utils.query_filters import parse_sort_param
-
-            order_clauses = parse_sort_param(
-                sort,
-                allowed_fields=_PREVIEW_ALLOWED_SORT_FIELDS,
-                resolve_column=lambda field, _dir: getattr(User, field, None),
-            )
-            q = q.order_by(*order_clauses) if order_clauses else q.order_by(User.email)
-        else:
+        plan = _PREVIEW_QUERY_FIELDS.compile(sort=sort)
+        q = _PREVIEW_QUERY_FIELDS.apply(q, plan)
+        if not plan.order_by:
             q = q.order_by(User.email)
         offset = (max(page, 1) - 1) * per_page
         sample = q.offset(offset).limit(per_page).all()
@@ -1,17 +1,51 @@
 """Client statistics service for aggregating platform usage data."""
 
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 import logging
 
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 
 from gefapi import db
 from gefapi.models.user_client_metadata import UserClientMetadata
+from gefapi.services.stats_service import StatsService
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PERIOD = 30
 
+# Columns the report is grouped by, in the order passed to GROUPING()
+REPORT_DIMENSIONS = ("client_type", "client_version", "qgis_version", "os", "language")
+
+# Every aggregate the report needs, computed together in one GROUPING SETS
+# query so the number of queries doesn't grow with the number of versions
+REPORT_GROUPING_SETS = {
+    "platform": ("client_type",),
+    "version": ("client_type", "client_version"),
+    "version_qgis": ("client_type", "client_version", "qgis_version"),
+    "version_os": ("client_type", "client_version", "os"),
+    "qgis": ("client_type", "qgis_version"),
+    "os": ("client_type", "os"),
+    "language": ("language",),
+    "type_language": ("client_type", "language"),
+}
+
+
+def _grouping_id(dimensions):
+    """Return the GROUPING() bitmask PostgreSQL reports for a grouping set.
+
+    A bit is set for each REPORT_DIMENSIONS column that is not grouped, with
+    the first column as the most significant bit.
+    """
+    grouping_id = 0
+    for dimension in REPORT_DIMENSIONS:
+        grouping_id = (grouping_id << 1) | (dimension not in dimensions)
+    return grouping_id
+
+
+def _by_count(items, count_key):
+    return sorted(items, key=lambda item: -item[count_key])
+
 
 class ClientStatsService:
     """Service for aggregating client platform and version statistics."""
@@ -22,6 +56,8 @@ class ClientStatsService:
     ) -> dict:
         """Get comprehensive client usage statistics.
 
+        The report is cached with the same TTL as the dashboard statistics.
+
         Args:
             days: Number of days to look back (any positive integer)
             client_type: Optional filter for specific client type
@@ -32,282 +68,226 @@ class ClientStatsService:
         if days < 1:
             days = DEFAULT_PERIOD
 
-        cutoff_date = datetime.now(UTC) - timedelta(days=days)
+        cache_key = StatsService._get_cache_key(
+            "client_stats", days=days, client_type=client_type
+        )
 
-        try:
-            result = {
-                "period_days": days,
-                "generated_at": datetime.now(UTC).isoformat(),
-                "platform_summary": ClientStatsService._get_platform_summary(
-                    cutoff_date
-                ),
-                "language_stats": ClientStatsService._get_language_distribution(
-                    cutoff_date
-                ),
-            }
+        def execute_report():
+            try:
+                return ClientStatsService._build_report(days, client_type)
+            except Exception as e:
+                logger.error(f"[ClientStats] Error getting stats: {e}")
+                raise
 
-            # Add platform-specific stats
-            if client_type is None or client_type == "qgis_plugin":
-                result["plugin_stats"] = ClientStatsService._get_plugin_stats(
-                    cutoff_date
-                )
+        return StatsService._get_from_cache_or_execute(cache_key, execute_report)
 
-            if client_type is None or client_type == "api_ui":
-                result["api_ui_stats"] = ClientStatsService._get_simple_version_stats(
-                    "api_ui", cutoff_date
-                )
+    @staticmethod
+    def _build_report(days: int, client_type: str | None) -> dict:
+        """Compute the report from a single pass over user_client_metadata."""
+        cutoff_date = datetime.now(UTC) - timedelta(days=days)
+        sections = ClientStatsService._get_report_rows(cutoff_date)
+
+        result = {
+            "period_days": days,
+            "generated_at": datetime.now(UTC).isoformat(),
+            "platform_summary": ClientStatsService._get_platform_summary(sections),
+            "language_stats": ClientStatsService._get_language_distribution(
+                sections["language"]
+            ),
+        }
 
-            if client_type is None or client_type == "cli":
-                result["cli_stats"] = ClientStatsService._get_simple_version_stats(
-                    "cli", cutoff_date
-                )
+        # Add platform-specific stats
+        if client_type is None or client_type == "qgis_plugin":
+            result["plugin_stats"] = ClientStatsService._get_plugin_stats(sections)
+
+        if client_type is None or client_type == "api_ui":
+            result["api_ui_stats"] = ClientStatsService._get_simple_version_stats(
+                "api_ui", sections
+            )
 
-            return result
+        if client_type is None or client_type == "cli":
+            result["cli_stats"] = ClientStatsService._get_simple_version_stats(
+                "cli", sections
+            )
 
-        except Exception as e:
-            logger.error(f"[ClientStats] Error getting stats: {e}")
-            raise
+        return result
 
     @staticmethod
-    def _get_platform_summary(cutoff_date: datetime) -> dict:
-        """Get summary of active users per platform."""
-        # Query for active users (within period) and total users per platform
+    def _get_report_rows(cutoff_date: datetime) -> dict:
+        """Run the report query and split its rows by grouping set.
+
+        Every row carries the number of users (total and seen since
+        cutoff_date) and the number of distinct active users, for one group
+        of one REPORT_GROUPING_SETS entry.
+
+        Returns:
+            Dict mapping each REPORT_GROUPING_SETS name to its rows
+        """
+        columns = [getattr(UserClientMetadata, d) for d in REPORT_DIMENSIONS]
+        active = UserClientMetadata.last_seen_at >= cutoff_date
         query = db.session.query(
-            UserClientMetadata.client_type,
+            func.grouping(*columns).label("grouping_id"),
+            *columns,
             func.count().label("total_users"),
-            func.count()
-            .filter(UserClientMetadata.last_seen_at >= cutoff_date)
-            .label("active_users"),
-        ).group_by(UserClientMetadata.client_type)
+            func.count().filter(active).label("active_users"),
+            func.count(func.distinct(UserClientMetadata.user_id))
+            .filter(active)
+            .label("distinct_active_users"),
+        ).group_by(
+            func.grouping_sets(
+                *(
+                    tuple_(*(getattr(UserClientMetadata, d) for d in dimensions))
+                    for dimensions in REPORT_GROUPING_SETS.values()
+                )
+            )
+        )
 
-        result = {}
+        names = {
+            _grouping_id(dimensions): name
+            for name, dimensions in REPORT_GROUPING_SETS.items()
+        }
+        sections = defaultdict(list)
         for row in query.all():
-            result[row.client_type] = {
+            sections[names[row.grouping_id]].append(row)
+        return sections
+
+    @staticmethod
+    def _active_rows(rows, client_type):
+        return [
+            row
+            for row in rows
+            if row.client_type == client_type and row.active_users > 0
+        ]
+
+    @staticmethod
+    def _get_platform_summary(sections: dict) -> dict:
+        """Get summary of active users per platform."""
+        return {
+            row.client_type: {
                 "active_users": row.active_users,
                 "total_users": row.total_users,
             }
-
-        return result
+            for row in sections["platform"]
+        }
 
     @staticmethod
-    def _get_plugin_stats(cutoff_date: datetime) -> dict:
+    def _get_plugin_stats(sections: dict) -> dict:
         """Get detailed plugin statistics with cross-tabulation."""
-        # Plugin versions with QGIS and OS breakdown
-        by_plugin_version = ClientStatsService._get_plugin_version_breakdown(
-            cutoff_date
-        )
-
-        # QGIS versions with plugin version breakdown
-        by_qgis_version = ClientStatsService._get_qgis_version_breakdown(cutoff_date)
-
-        # OS distribution (simple)
-        by_os = ClientStatsService._get_os_distribution(cutoff_date)
-
-        # Language distribution (plugin users only)
-        by_language = ClientStatsService._get_language_distribution(
-            cutoff_date, client_type="qgis_plugin"
-        )
-
         return {
-            "by_plugin_version": by_plugin_version,
-            "by_qgis_version": by_qgis_version,
-            "by_os": by_os,
-            "by_language": by_language,
+            "by_plugin_version": ClientStatsService._get_plugin_version_breakdown(
+                sections
+            ),
+            "by_qgis_version": ClientStatsService._get_qgis_version_breakdown(sections),
+            "by_os": ClientStatsService._get_os_distribution(sections),
+            # Language distribution (plugin users only)
+            "by_language": ClientStatsService._get_language_distribution(
+                [
+                    row
+                    for row in sections["type_language"]
+                    if row.client_type == "qgis_plugin"
+                ]
+            ),
         }
 
     @staticmethod
-    def _get_plugin_version_breakdown(cutoff_date: datetime) -> list:
+    def _get_plugin_version_breakdown(sections: dict) -> list:
         """Get plugin version stats with QGIS version and OS breakdown."""
-        # First, get all plugin versions with counts
-        version_query = (
-            db.session.query(
-                UserClientMetadata.client_version,
-                func.count().label("user_count"),
-            )
-            .filter(
-                UserClientMetadata.client_type == "qgis_plugin",
-                UserClientMetadata.last_seen_at >= cutoff_date,
-            )
-            .group_by(UserClientMetadata.client_version)
-            .order_by(func.count().desc())
-        )
-
-        versions = []
-        for row in version_query.all():
-            version = row.client_version or "unknown"
-
-            # Get QGIS version breakdown for this plugin version
-            qgis_breakdown = (
-                db.session.query(
-                    UserClientMetadata.qgis_version,
-                    func.count().label("count"),
-                )
-                .filter(
-                    UserClientMetadata.client_type == "qgis_plugin",
-                    UserClientMetadata.client_version == row.client_version,
-                    UserClientMetadata.last_seen_at >= cutoff_date,
-                )
-                .group_by(UserClientMetadata.qgis_version)
-                .order_by(func.count().desc())
-                .all()
-            )
-
-            # Get OS breakdown for this plugin version
-            os_breakdown = (
-                db.session.query(
-                    UserClientMetadata.os,
-                    func.count().label("count"),
-                )
-                .filter(
-                    UserClientMetadata.client_type == "qgis_plugin",
-                    UserClientMetadata.client_version == row.client_version,
-                    UserClientMetadata.last_seen_at >= cutoff_date,
-                )
-                .group_by(UserClientMetadata.os)
-                .order_by(func.count().desc())
-                .all()
-            )
-
-            versions.append(
+        by_qgis = defaultdict(list)
+        for row in ClientStatsService._active_rows(
+            sections["version_qgis"], "qgis_plugin"
+        ):
+            by_qgis[row.client_version].append(
                 {
-                    "version": version,
-                    "user_count": row.user_count,
-                    "by_qgis_version": [
-                        {"qgis_version": r.qgis_version or "unknown", "count": r.count}
-                        for r in qgis_breakdown
-                    ],
-                    "by_os": [
-                        {"os": r.os or "unknown", "count": r.count}
-                        for r in os_breakdown
-                    ],
+                    "qgis_version": row.qgis_version or "unknown",
+                    "count": row.active_users,
                 }
             )
 
-        return versions
-
-    @staticmethod
-    def _get_qgis_version_breakdown(cutoff_date: datetime) -> list:
-        """Get QGIS version stats with plugin version breakdown."""
-        # Get all QGIS versions with counts
-        qgis_query = (
-            db.session.query(
-                UserClientMetadata.qgis_version,
-                func.count().label("user_count"),
+        by_os = defaultdict(list)
+        for row in ClientStatsService._active_rows(
+            sections["version_os"], "qgis_plugin"
+        ):
+            by_os[row.client_version].append(
+                {"os": row.os or "unknown", "count": row.active_users}
             )
-            .filter(
-                UserClientMetadata.client_type == "qgis_plugin",
-                UserClientMetadata.last_seen_at >= cutoff_date,
-            )
-            .group_by(UserClientMetadata.qgis_version)
-            .order_by(func.count().desc())
-        )
-
-        versions = []
-        for row in qgis_query.all():
-            qgis_version = row.qgis_version or "unknown"
 
-            # Get plugin version breakdown for this QGIS version
-            plugin_breakdown = (
-                db.session.query(
-                    UserClientMetadata.client_version,
-                    func.count().label("count"),
-                )
-                .filter(
-                    UserClientMetadata.client_type == "qgis_plugin",
-                    UserClientMetadata.qgis_version == row.qgis_version,
-                    UserClientMetadata.last_seen_at >= cutoff_date,
-                )
-                .group_by(UserClientMetadata.client_version)
-                .order_by(func.count().desc())
-                .all()
+        versions = [
+            {
+                "version": row.client_version or "unknown",
+                "user_count": row.active_users,
+                "by_qgis_version": _by_count(by_qgis[row.client_version], "count"),
+                "by_os": _by_count(by_os[row.client_version], "count"),
+            }
+            for row in ClientStatsService._active_rows(
+                sections["version"], "qgis_plugin"
             )
+        ]
+        return _by_count(versions, "user_count")
 
-            versions.append(
-                {
-                    "qgis_version": qgis_version,
-                    "user_count": row.user_count,
-                    "by_plugin_version": [
-                        {"version": r.client_version or "unknown", "count": r.count}
-                        for r in plugin_breakdown
-                    ],
-                }
+    @staticmethod
+    def _get_qgis_version_breakdown(sections: dict) -> list:
+        """Get QGIS version stats with plugin version breakdown."""
+        by_plugin = defaultdict(list)
+        for row in ClientStatsService._active_rows(
+            sections["version_qgis"], "qgis_plugin"
+        ):
+            by_plugin[row.qgis_version].append(
+                {"version": row.client_version or "unknown", "count": row.active_users}
             )
 
-        return versions
+        versions = [
+            {
+                "qgis_version": row.qgis_version or "unknown",
+                "user_count": row.active_users,
+                "by_plugin_version": _by_count(by_plugin[row.qgis_version], "count"),
+            }
+            for row in ClientStatsService._active_rows(sections["qgis"], "qgis_plugin")
+        ]
+        return _by_count(versions, "user_count")
 
     @staticmethod
-    def _get_os_distribution(cutoff_date: datetime) -> list:
+    def _get_os_distribution(sections: dict) -> list:
         """Get simple OS distribution for plugin users."""
-        query = (
-            db.session.query(
-                UserClientMetadata.os,
-                func.count().label("user_count"),
-            )
-            .filter(
-                UserClientMetadata.client_type == "qgis_plugin",
-                UserClientMetadata.last_seen_at >= cutoff_date,
-            )
-            .group_by(UserClientMetadata.os)
-            .order_by(func.count().desc())
+        return _by_count(
+            [
+                {"os": row.os or "unknown", "user_count": row.active_users}
+                for row in ClientStatsService._active_rows(
+                    sections["os"], "qgis_plugin"
+                )
+            ],
+            "user_count",
         )
 
-        return [
-            {"os": row.os or "unknown", "user_count": row.user_count}
-            for row in query.all()
-        ]
-
     @staticmethod
-    def _get_language_distribution(
-        cutoff_date: datetime, client_type: str | None = None
-    ) -> list:
+    def _get_language_distribution(rows: list) -> list:
         """Get language distribution, counting each user only once.
 
         Args:
-            cutoff_date: Only include records with last_seen_at >= this date
-            client_type: Optional filter for a specific client type
+            rows: Rows of the "language" or "type_language" grouping set
         """
-        query = db.session.query(
-            UserClientMetadata.language,
-            func.count(func.distinct(UserClientMetadata.user_id)).label("user_count"),
-        ).filter(
-            UserClientMetadata.last_seen_at >= cutoff_date,
-            UserClientMetadata.language.isnot(None),
-        )
-
-        if client_type:
-            query = query.filter(UserClientMetadata.client_type == client_type)
-
-        query = query.group_by(UserClientMetadata.language).order_by(
-            func.count(func.distinct(UserClientMetadata.user_id)).desc()
+        return _by_count(
+            [
+                {"language": row.language, "user_count": row.distinct_active_users}
+                for row in rows
+                if row.language is not None and row.distinct_active_users > 0
+            ],
+            "user_count",
         )
 
-        return [
-            {"language": row.language, "user_count": row.user_count}
-            for row in query.all()
-        ]
-
     @staticmethod
-    def _get_simple_version_stats(client_type: str, cutoff_date: datetime) -> dict:
+    def _get_simple_version_stats(client_type: str, sections: dict) -> dict:
         """Get simple version stats for non-plugin clients."""
-        query = (
-            db.session.query(
-                UserClientMetadata.client_version,
-                func.count().label("user_count"),
-            )
-            .filter(
-                UserClientMetadata.client_type == client_type,
-                UserClientMetadata.last_seen_at >= cutoff_date,
-            )
-            .group_by(UserClientMetadata.client_version)
-            .order_by(func.count().desc())
-        )
-
         return {
-            "by_version": [
-                {
-                    "version": row.client_version or "unknown",
-                    "user_count": row.user_count,
-                }
-                for row in query.all()
-            ]
+            "by_version": _by_count(
+                [
+                    {
+                        "version": row.client_version or "unknown",
+                        "user_count": row.active_users,
+                    }
+                    for row in ClientStatsService._active_rows(
+                        sections["version"], client_type
+                    )
+                ],
+                "user_count",
+            )
         }
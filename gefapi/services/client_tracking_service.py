@@ -1,11 +1,23 @@
 """Client tracking service for parsing and storing client metadata."""
 
+import datetime
+import json
 import logging
+import uuid
+from uuid import UUID
 
 from flask import has_request_context, request
+import redis
+import rollbar
+from sqlalchemy import column, func, or_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import GUID, User
 from gefapi.models.user_client_metadata import UserClientMetadata
+from gefapi.utils import utcnow
+from gefapi.utils.redis_cache import get_redis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +27,24 @@ CLIENT_HEADER_NAME = "X-TE-Client"
 # Valid client types
 VALID_CLIENT_TYPES = {"qgis_plugin", "api_ui", "cli"}
 
+# Redis buffer for client accesses and user activity (see
+# ClientTrackingService.flush_buffered_activity). One hash per user+client_type
+# holds the latest header fields and last-seen time; the pending set lists the
+# hashes waiting to be flushed. User activity is a single hash of
+# user_id -> last activity time.
+CLIENT_ACTIVITY_KEY_PREFIX = "client_tracking:client:"
+CLIENT_ACTIVITY_PENDING_KEY = "client_tracking:pending"
+USER_ACTIVITY_KEY = "client_tracking:user_activity"
+# Buffered entries are dropped if not flushed within this time
+BUFFER_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _get_buffer_client():
+    """Return the Redis client used for buffering, or None to write directly."""
+    if not SETTINGS.get("CLIENT_TRACKING_BUFFER", {}).get("ENABLED", True):
+        return None
+    return get_redis_cache().client
+
 
 class ClientTrackingService:
     """Service for tracking client platform and version usage."""
@@ -72,20 +102,37 @@ class ClientTrackingService:
 
         return ClientTrackingService.parse_client_header(header_value)
 
+    @staticmethod
+    def _client_fields(client_info: dict) -> dict:
+        """Map a parsed X-TE-Client header to UserClientMetadata columns."""
+        # Build extra_metadata from any unrecognized fields
+        known_fields = {"type", "version", "os", "qgis_version", "lang"}
+        extra = {k: v for k, v in client_info.items() if k not in known_fields}
+        return {
+            "client_version": client_info.get("version") or None,
+            "os": client_info.get("os") or None,
+            "qgis_version": client_info.get("qgis_version") or None,
+            "language": client_info.get("lang") or None,
+            "extra_metadata": extra if extra else None,
+        }
+
     @staticmethod
     def track_client_access(
         user_id, client_info: dict | None = None
     ) -> UserClientMetadata | None:
         """Track a client access for a user.
 
-        Creates or updates the UserClientMetadata row for this user+client_type.
+        The access is buffered in Redis and written to UserClientMetadata by
+        ``flush_buffered_activity``, so logins and token refreshes do not
+        commit telemetry. Without Redis the row is written directly.
 
         Args:
             user_id: The user's ID
             client_info: Parsed client info dict (if None, extracts from request)
 
         Returns:
-            The UserClientMetadata record, or None if no client info available
+            The UserClientMetadata record when written directly, or None if
+            the access was buffered or no client info is available
         """
         if client_info is None:
             client_info = ClientTrackingService.get_client_info_from_request()
@@ -97,6 +144,38 @@ class ClientTrackingService:
         if not client_type:
             return None
 
+        fields = ClientTrackingService._client_fields(client_info)
+
+        redis_client = _get_buffer_client()
+        if redis_client is not None:
+            mapping = {
+                key: json.dumps(value) if key == "extra_metadata" else value
+                for key, value in fields.items()
+                if value is not None
+            }
+            mapping["last_seen_at"] = utcnow().isoformat()
+            key = f"{CLIENT_ACTIVITY_KEY_PREFIX}{user_id}:{client_type}"
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, BUFFER_TTL_SECONDS)
+                pipe.sadd(CLIENT_ACTIVITY_PENDING_KEY, key)
+                pipe.execute()
+                return None
+            except redis.RedisError as e:
+                get_redis_cache().report_error(e)
+                logger.warning(
+                    f"[ClientTracking] Could not buffer client access, "
+                    f"writing directly: {e}"
+                )
+
+        return ClientTrackingService._write_client_access(user_id, client_type, fields)
+
+    @staticmethod
+    def _write_client_access(
+        user_id, client_type: str, fields: dict
+    ) -> UserClientMetadata | None:
+        """Create or update the UserClientMetadata row for this user+client_type."""
         try:
             # Find existing record for this user+client_type
             existing = UserClientMetadata.query.filter_by(
@@ -104,47 +183,24 @@ class ClientTrackingService:
                 client_type=client_type,
             ).first()
 
-            # Extract fields from client_info
-            client_version = client_info.get("version")
-            os_name = client_info.get("os")
-            qgis_version = client_info.get("qgis_version")
-            language = client_info.get("lang")
-
-            # Build extra_metadata from any unrecognized fields
-            known_fields = {"type", "version", "os", "qgis_version", "lang"}
-            extra = {k: v for k, v in client_info.items() if k not in known_fields}
-            extra_metadata = extra if extra else None
-
             if existing:
                 # Update existing record
-                existing.update_from_header(
-                    client_version=client_version,
-                    os=os_name,
-                    qgis_version=qgis_version,
-                    language=language,
-                    extra_metadata=extra_metadata,
-                )
+                existing.update_from_header(**fields)
                 db.session.commit()
                 logger.debug(
                     f"[ClientTracking] Updated metadata for user {user_id}, "
-                    f"client {client_type} v{client_version}"
+                    f"client {client_type} v{fields['client_version']}"
                 )
                 return existing
             # Create new record
             metadata = UserClientMetadata(
-                user_id=user_id,
-                client_type=client_type,
-                client_version=client_version,
-                os=os_name,
-                qgis_version=qgis_version,
-                language=language,
-                extra_metadata=extra_metadata,
+                user_id=user_id, client_type=client_type, **fields
             )
             db.session.add(metadata)
             db.session.commit()
             logger.info(
                 f"[ClientTracking] Created metadata for user {user_id}, "
-                f"client {client_type} v{client_version}"
+                f"client {client_type} v{fields['client_version']}"
             )
             return metadata
 
@@ -153,6 +209,190 @@ class ClientTrackingService:
             logger.error(f"[ClientTracking] Error tracking client access: {e}")
             return None
 
+    @staticmethod
+    def record_user_activity(user_id) -> None:
+        """Record that a user was active now (``User.last_activity_at``).
+
+        Buffered in Redis like ``track_client_access``; written directly
+        when Redis is unavailable.
+        """
+        now = utcnow()
+        redis_client = _get_buffer_client()
+        if redis_client is not None:
+            try:
+                redis_client.hset(USER_ACTIVITY_KEY, str(user_id), now.isoformat())
+                return
+            except redis.RedisError as e:
+                get_redis_cache().report_error(e)
+                logger.warning(
+                    f"[ClientTracking] Could not buffer user activity, "
+                    f"writing directly: {e}"
+                )
+
+        try:
+            User.query.filter_by(id=user_id).update(
+                {"last_activity_at": now}, synchronize_session=False
+            )
+            db.session.commit()
+        except Exception as e:  # noqa: BLE001  # SQLAlchemy can raise various exceptions; rollback needed
+            db.session.rollback()
+            logger.warning(f"[ClientTracking] Failed to update last_activity_at: {e}")
+
+    @staticmethod
+    def flush_buffered_activity(batch_size: int | None = None) -> dict:
+        """Write buffered client accesses and user activity to the database.
+
+        Buffered entries are taken out of Redis atomically and written in one
+        transaction: a single ``INSERT ... ON CONFLICT DO UPDATE`` for
+        UserClientMetadata and a single ``UPDATE ... FROM (VALUES ...)`` for
+        ``User.last_activity_at``. Entries for users deleted in the meantime
+        are dropped. If the write fails the popped entries are lost, which is
+        acceptable for telemetry; the next accesses are buffered again.
+
+        Args:
+            batch_size: Maximum number of user+client_type entries to flush
+                (defaults to ``CLIENT_TRACKING_BUFFER["FLUSH_BATCH_SIZE"]``)
+
+        Returns:
+            Dict with the number of ``clients`` and ``users`` rows written
+        """
+        redis_client = get_redis_cache().client
+        if redis_client is None:
+            return {"clients": 0, "users": 0}
+
+        if batch_size is None:
+            batch_size = SETTINGS.get("CLIENT_TRACKING_BUFFER", {}).get(
+                "FLUSH_BATCH_SIZE", 5000
+            )
+
+        client_rows = []
+        keys = redis_client.spop(CLIENT_ACTIVITY_PENDING_KEY, batch_size) or []
+        if keys:
+            pipe = redis_client.pipeline(transaction=True)
+            for key in keys:
+                pipe.hgetall(key)
+                pipe.delete(key)
+            results = pipe.execute()[::2]
+            for key, data in zip(keys, results, strict=True):
+                if not data:
+                    continue
+                user_id, _, client_type = key[
+                    len(CLIENT_ACTIVITY_KEY_PREFIX) :
+                ].partition(":")
+                extra = data.get("extra_metadata")
+                client_rows.append(
+                    {
+                        "user_id": UUID(user_id),
+                        "client_type": client_type,
+                        "client_version": data.get("client_version"),
+                        "os": data.get("os"),
+                        "qgis_version": data.get("qgis_version"),
+                        "language": data.get("language"),
+                        "extra_metadata": json.loads(extra) if extra else None,
+                        "last_seen_at": datetime.datetime.fromisoformat(
+                            data["last_seen_at"]
+                        ),
+                    }
+                )
+
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hgetall(USER_ACTIVITY_KEY)
+        pipe.delete(USER_ACTIVITY_KEY)
+        user_activity = pipe.execute()[0]
+        activity_rows = [
+            {"id": UUID(user_id), "ts": datetime.datetime.fromisoformat(ts)}
+            for user_id, ts in user_activity.items()
+        ]
+
+        if not client_rows and not activity_rows:
+            return {"clients": 0, "users": 0}
+
+        try:
+            written_clients = ClientTrackingService._upsert_client_rows(client_rows)
+            written_users = ClientTrackingService._update_last_activity(activity_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            rollbar.report_exc_info()
+            logger.error(
+                f"[ClientTracking] Failed to flush {len(client_rows)} client and "
+                f"{len(activity_rows)} activity entries"
+            )
+            raise
+
+        logger.info(
+            f"[ClientTracking] Flushed {written_clients} client and "
+            f"{written_users} user activity entries"
+        )
+        return {"clients": written_clients, "users": written_users}
+
+    @staticmethod
+    def _upsert_client_rows(rows: list[dict]) -> int:
+        if not rows:
+            return 0
+
+        live_users = {
+            user_id
+            for (user_id,) in db.session.query(User.id).filter(
+                User.id.in_({row["user_id"] for row in rows}),
+                User.deleted_at.is_(None),
+            )
+        }
+        rows = [row for row in rows if row["user_id"] in live_users]
+        if not rows:
+            return 0
+
+        now = utcnow()
+        for row in rows:
+            row["id"] = uuid.uuid4()
+            row["created_at"] = now
+
+        table = UserClientMetadata.__table__
+        stmt = pg_insert(table).values(rows)
+        # Like update_from_header: only non-empty header values overwrite
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_user_client_type",
+            set_={
+                column: func.coalesce(stmt.excluded[column], table.c[column])
+                for column in (
+                    "client_version",
+                    "os",
+                    "qgis_version",
+                    "language",
+                    "extra_metadata",
+                )
+            }
+            | {
+                "last_seen_at": func.greatest(
+                    stmt.excluded.last_seen_at, table.c.last_seen_at
+                )
+            },
+        )
+        db.session.execute(stmt)
+        return len(rows)
+
+    @staticmethod
+    def _update_last_activity(rows: list[dict]) -> int:
+        if not rows:
+            return 0
+
+        activity = values(
+            column("id", GUID()), column("ts", db.DateTime()), name="activity"
+        ).data([(row["id"], row["ts"]) for row in rows])
+        result = db.session.execute(
+            update(User)
+            .where(User.id == activity.c.id)
+            .where(
+                or_(
+                    User.last_activity_at.is_(None),
+                    User.last_activity_at < activity.c.ts,
+                )
+            )
+            .values(last_activity_at=activity.c.ts)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     @staticmethod
     def get_user_clients(user_id) -> list:
         """Get all client metadata records for a user.
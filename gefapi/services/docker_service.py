@@ -1,30 +1,35 @@
 """DOCKER SERVICE"""
 
-import gzip
-import json
+import contextlib
+import hashlib
 import logging
 import os
-from pathlib import Path
 from shutil import copy
 import socket
 import tarfile
 import tempfile
 from urllib.parse import urlparse
 
-import docker
-from docker import errors as docker_errors
-from docker import types as docker_types
 import rollbar
 
 from gefapi import celery as celery_app  # Rename to avoid mypy confusion
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.models import Execution, Script, ScriptLog
-from gefapi.s3 import get_script_from_s3, push_params_to_s3
+from gefapi.s3 import open_script_from_s3, push_params_to_s3
+from gefapi.services.script_log_buffer import ScriptLogBuffer, build_log_text
 from gefapi.utils import utcnow
+from gefapi.utils.lazy_import import lazy_import
+
+docker = lazy_import("docker")
+docker_errors = lazy_import("docker.errors")
+docker_types = lazy_import("docker.types")
 
 REGISTRY_URL = SETTINGS.get("REGISTRY_URL")
 DOCKER_HOST = SETTINGS.get("DOCKER_HOST")
+DOCKERFILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run/Dockerfile"
+)
 
 logger = logging.getLogger()
 
@@ -54,40 +59,32 @@ def _candidate_docker_hosts() -> list[str]:
     return unique_candidates
 
 
-# Initialize docker client with error handling and fallbacks
+# Connected on first use by get_docker_client(), not at import time: API
+# containers never talk to Docker and should not pay for probing the socket
 docker_client = None
 _active_docker_host: str | None = None
-try:
-    for base_url in _candidate_docker_hosts():
-        try:
-            temp_client = docker.DockerClient(base_url=base_url)
-            temp_client.ping()
-            docker_client = temp_client
-            _active_docker_host = base_url
-            logger.info(f"Connected to Docker daemon via {base_url}")
-            break
-        except Exception as conn_err:
-            logger.debug(f"Docker connection failed for {base_url}: {conn_err}")
-    if docker_client is None:
-        logger.warning(
-            "Docker daemon not reachable. Ensure the Docker socket is mounted and\n"
-            "DOCKER_HOST is set correctly (e.g., unix://var/run/docker.sock)."
-        )
-except Exception as e:
-    logger.warning(
-        f"Failed to initialize Docker client: {e}. "
-        "Docker functionality will be disabled"
-    )
-    docker_client = None
+# Process that opened docker_client; a forked Celery child must not share the
+# parent's keep-alive connection
+_docker_client_pid: int | None = None
+
+# Execution network resolved by _get_execution_network_id, as
+# (pid, environment, network id). Reused until Docker reports it missing.
+_execution_network_cache: tuple[int, str, str] | None = None
 
 
 def get_docker_client():
     """Get docker client with lazy initialization and Docker 28.x compatibility.
 
     Tries multiple base_urls for robustness when running in Swarm with a mounted
-    Unix socket.
+    Unix socket. The client (and its keep-alive connection) is reused for the
+    life of the worker process.
     """
-    global docker_client, _active_docker_host
+    global docker_client, _active_docker_host, _docker_client_pid
+    if docker_client is not None and _docker_client_pid != os.getpid():
+        # Inherited across a fork: drop the reference without closing the
+        # socket, which the parent process is still using
+        docker_client = None
+        _active_docker_host = None
     if docker_client is None:
         last_error: Exception | None = None
         for base_url in _candidate_docker_hosts():
@@ -133,6 +130,7 @@ def get_docker_client():
                 candidate.ping()
                 docker_client = candidate
                 _active_docker_host = base_url
+                _docker_client_pid = os.getpid()
                 logger.info(f"Connected to Docker daemon via {base_url}")
                 break
             except Exception as e:
@@ -151,6 +149,45 @@ def get_docker_client():
     return docker_client
 
 
+def _get_execution_network_id(client, refresh: bool = False) -> str | None:
+    """Return the ID of the network execution services attach to for API access.
+
+    Listing every Swarm network on each dispatch is slow on busy managers, so
+    the result is cached per process and environment. Pass ``refresh=True``
+    after Docker reports the cached network as missing.
+
+    Returns:
+        Network ID, or None if no execution network exists
+    """
+    global _execution_network_cache
+    current_env = os.getenv("ENVIRONMENT", "prod")
+    pid = os.getpid()
+    cached = _execution_network_cache
+    if not refresh and cached is not None and cached[:2] == (pid, current_env):
+        return cached[2]
+
+    _execution_network_cache = None
+    for network in client.networks.list():
+        network_name = str(network.name)
+
+        # For Docker Compose (only in development environment)
+        if current_env == "dev" and network_name == "execution":
+            logger.info(f"Found Docker Compose execution network: {network_name}")
+        # For Docker Swarm (production/staging/any non-dev environment)
+        # Match networks ending with "-{env}_execution"
+        elif network_name.endswith(f"-{current_env}_execution"):
+            logger.info(
+                f"Found environment-matched execution network: "
+                f"{network_name} for environment: {current_env}"
+            )
+        else:
+            continue
+
+        _execution_network_cache = (pid, current_env, network.id)
+        return network.id
+    return None
+
+
 def _parse_registry_host_port(registry: str) -> tuple[str, int | None]:
     """Parse REGISTRY_URL into (host, port).
 
@@ -306,6 +343,158 @@ def _registry_get_manifest_digest(
         return False, None, None, f"Manifest HEAD failed: {type(e).__name__}: {e}"
 
 
+def _registry_copy_manifest(
+    registry: str, repo: str, source_reference: str, target_reference: str
+) -> tuple[bool, str]:
+    """Point ``target_reference`` at the manifest of ``source_reference``.
+
+    Both tags are in the same repository, so the registry already holds every
+    layer and only the manifest is copied (GET then PUT). Never raises;
+    returns (ok, message).
+    """
+    import http.client as _http_client
+
+    host, port = _parse_registry_host_port(registry)
+    if not host:
+        return False, "REGISTRY_URL has no host"
+    port = port or 5000
+
+    accept = (
+        "application/vnd.docker.distribution.manifest.v2+json, "
+        "application/vnd.docker.distribution.manifest.list.v2+json, "
+        "application/vnd.oci.image.manifest.v1+json, "
+        "application/vnd.oci.image.index.v1+json"
+    )
+    try:
+        conn = _http_client.HTTPConnection(host, port, timeout=10)
+        conn.request(
+            "GET",
+            f"/v2/{repo}/manifests/{source_reference}",
+            headers={"Accept": accept},
+        )
+        resp = conn.getresponse()
+        body = resp.read()
+        content_type = resp.getheader("Content-Type")
+        conn.close()
+        if resp.status != 200:
+            return (
+                False,
+                f"Manifest GET returned {resp.status} for {repo}:{source_reference}",
+            )
+
+        conn = _http_client.HTTPConnection(host, port, timeout=10)
+        conn.request(
+            "PUT",
+            f"/v2/{repo}/manifests/{target_reference}",
+            body=body,
+            headers={"Content-Type": content_type},
+        )
+        resp = conn.getresponse()
+        resp.read()
+        digest = resp.getheader("Docker-Content-Digest")
+        conn.close()
+        if resp.status in (200, 201):
+            msg = (
+                f"Tagged {repo}:{source_reference} as {target_reference} "
+                f"(digest={digest})"
+            )
+            return True, msg
+        return (
+            False,
+            f"Manifest PUT returned {resp.status} for {repo}:{target_reference}",
+        )
+    except Exception as e:
+        return False, f"Manifest copy failed: {type(e).__name__}: {e}"
+
+
+def _member_digest(tar, member):
+    """Return (name, type, content digest) of a tar member for the cache key."""
+    content = hashlib.sha256()
+    if member.isfile():
+        member_file = tar.extractfile(member)
+        while chunk := member_file.read(1 << 20):
+            content.update(chunk)
+    return member.name, member.type, content.hexdigest()
+
+
+def _is_safe_member(member, path) -> bool:
+    """Check a tar member for path traversal (Zip Slip) before extraction."""
+    # Check for absolute paths
+    if os.path.isabs(member.name):
+        logger.warning(f"[SECURITY] Skipping absolute path: {member.name}")
+        return False
+    # Check for parent directory references
+    if ".." in member.name or member.name.startswith("/"):
+        logger.warning(f"[SECURITY] Skipping unsafe path: {member.name}")
+        return False
+    # Check for overly long paths
+    if len(member.name) > 255:
+        logger.warning(f"[SECURITY] Skipping overly long path: {member.name[:50]}...")
+        return False
+    # Resolve the full path and ensure it's within extraction dir
+    full_path = os.path.realpath(os.path.join(path, member.name))
+    if not full_path.startswith(os.path.realpath(path)):
+        logger.warning(
+            f"[SECURITY] Skipping path outside extraction dir: {member.name}"
+        )
+        return False
+    return True
+
+
+def safe_extract(tar, path) -> list[tuple[str, bytes, str]]:
+    """Safely extract a tar archive, preventing path traversal attacks.
+
+    Works on stream-mode archives (``tarfile.open(fileobj=..., mode="r|gz")``):
+    each member is checked, hashed and written as it is read, so the archive
+    itself never has to be stored.
+
+    Returns:
+        Member digests for ``build_cache_key_from_digests``
+    """
+    digests = []
+    for member in tar:
+        if not _is_safe_member(member, path):
+            digests.append(_member_digest(tar, member))
+            continue
+        # A stream-mode member can only be read once, so hash the file from
+        # disk after extracting it
+        tar.extract(member, path=path)  # nosec B202 - member validated above
+        content = hashlib.sha256()
+        if member.isfile():
+            with open(os.path.join(path, member.name), "rb") as extracted:
+                while chunk := extracted.read(1 << 20):
+                    content.update(chunk)
+        digests.append((member.name, member.type, content.hexdigest()))
+    return digests
+
+
+def build_cache_key_from_digests(digests, environment, environment_version) -> str:
+    """Return the build cache key for tarball member digests.
+
+    The key covers the names, types and contents of the tarball members (not
+    the gzip header or member timestamps, so re-uploading unchanged files
+    gives the same key), the environment image and the Dockerfile.
+    """
+    digest = hashlib.sha256()
+    for name, member_type, content in sorted(digests):
+        digest.update(f"{name}\0{member_type!r}\0{content}\0".encode())
+    digest.update(f"{environment}\0{environment_version}\0".encode())
+    with open(DOCKERFILE_PATH, "rb") as dockerfile:
+        digest.update(hashlib.sha256(dockerfile.read()).digest())
+    return digest.hexdigest()
+
+
+def build_cache_key(tar_path, environment, environment_version) -> str:
+    """Return the content-addressed build cache key for a script tarball."""
+    with tarfile.open(name=tar_path, mode="r:gz") as tar:
+        digests = [_member_digest(tar, member) for member in tar.getmembers()]
+    return build_cache_key_from_digests(digests, environment, environment_version)
+
+
+def _build_cache_tag(cache_key: str) -> str:
+    return f"build-{cache_key}"
+
+
 def _split_repo_ref(tag_image: str) -> tuple[str, str]:
     """Split a name[:tag] into (repo, reference). Defaults to latest."""
     if ":" in tag_image:
@@ -343,55 +532,14 @@ def docker_build(script_id):
     script_file = script.slug + ".tar.gz"
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        logger.info("[THREAD] Getting %s from S3", script_file)
-        temp_file_path = os.path.join(temp_dir, script.slug + ".tar.gz")
-        get_script_from_s3(script_file, temp_file_path)
+        logger.info("[THREAD] Streaming %s from S3", script_file)
         extract_path = temp_dir + "/" + script.slug
-        with tarfile.open(name=temp_file_path, mode="r:gz") as tar:
-            # Secure extraction to prevent path traversal attacks (Zip Slip)
-            def safe_extract(tar, path):
-                """Safely extract tar file, preventing path traversal attacks."""
-                for member in tar.getmembers():
-                    # Check for absolute paths
-                    if os.path.isabs(member.name):
-                        logger.warning(
-                            f"[SECURITY] Skipping absolute path: {member.name}"
-                        )
-                        continue
-                    # Check for parent directory references
-                    if ".." in member.name or member.name.startswith("/"):
-                        logger.warning(
-                            f"[SECURITY] Skipping unsafe path: {member.name}"
-                        )
-                        continue
-                    # Check for overly long paths
-                    if len(member.name) > 255:
-                        logger.warning(
-                            f"[SECURITY] Skipping overly long path: "
-                            f"{member.name[:50]}..."
-                        )
-                        continue
-                    # Resolve the full path and ensure it's within extraction dir
-                    full_path = os.path.realpath(os.path.join(path, member.name))
-                    if not full_path.startswith(os.path.realpath(path)):
-                        logger.warning(
-                            f"[SECURITY] Skipping path outside extraction dir: "
-                            f"{member.name}"
-                        )
-                        continue
-                tar.extractall(  # nosec B202 - members are validated above
-                    path=path,
-                    members=[
-                        m
-                        for m in tar.getmembers()
-                        if not os.path.isabs(m.name)
-                        and ".." not in m.name
-                        and not m.name.startswith("/")
-                        and len(m.name) <= 255
-                    ],
-                )
-
-            safe_extract(tar, extract_path)
+        # Unpack straight from the S3 response; the .tar.gz is never saved
+        with (
+            contextlib.closing(open_script_from_s3(script_file)) as body,
+            tarfile.open(fileobj=body, mode="r|gz") as tar,
+        ):
+            member_digests = safe_extract(tar, extract_path)
 
         logger.info("[THREAD] Running build")
         script.status = "BUILDING"
@@ -400,6 +548,13 @@ def docker_build(script_id):
         logger.info(f"[STATUS] Script {script_id} status set to BUILDING")
         db.session.add(ScriptLog(text="Build started.", script_id=script_id))
         db.session.commit()
+        try:
+            cache_key = build_cache_key_from_digests(
+                member_digests, script.environment, script.environment_version
+            )
+        except Exception as e:
+            logger.warning(f"Could not compute build cache key: {e}")
+            cache_key = None
         logger.debug("Building...")
         correct, log = DockerService.build(
             script_id=script_id,
@@ -407,6 +562,7 @@ def docker_build(script_id):
             tag_image=script.slug,
             environment=script.environment,
             environment_version=script.environment_version,
+            cache_key=cache_key,
         )
         logger.debug("Changing status")
         script = Script.query.get(script_id)
@@ -472,24 +628,19 @@ def docker_run(execution_id, image, environment, params):
     db.session.add(execution)
     db.session.commit()
 
-    logger.debug("Dumping parameters to json file...")
-    with tempfile.TemporaryDirectory() as temp_dir:
-        params_gz_file = Path(temp_dir) / (str(execution_id) + ".json.gz")
-        json_str = json.dumps(params)
-        json_bytes = json_str.encode("utf-8")
-        with gzip.open(params_gz_file, "w") as fout:
-            fout.write(json_bytes)
-        push_params_to_s3(params_gz_file, params_gz_file.name)
+    logger.debug("Uploading parameters...")
+    push_params_to_s3(params, f"{execution_id}.json.gz")
 
     logger.debug("Running...")
+    script = Script.query.get(execution.script_id)
     correct, _error = DockerService.run(
-        execution_id=execution_id, image=image, environment=environment
+        execution_id=execution_id,
+        image=image,
+        environment=environment,
+        execution=execution,
+        script=script,
     )
     logger.debug("Execution run - changing status")
-    execution = Execution.query.get(execution_id)
-    if not execution:
-        logger.error(f"Execution with id {execution_id} not found after run.")
-        return
     if not correct:
         logger.debug("Execution failed")
         try:
@@ -509,18 +660,17 @@ class DockerService:
     """Docker Service"""
 
     @staticmethod
-    def save_build_log(script_id, line):
-        """Save docker logs"""
-        text = None
-
-        if "stream" in line:
-            text = "Build: " + line["stream"]
-        elif "status" in line:
-            text = line["status"]
+    def save_build_log(script_id, line, build_log=None):
+        """Save docker logs
 
-            if "id" in line:
-                text += " " + line["id"]
+        With a ``build_log`` buffer the line is coalesced and written in a
+        batch; otherwise it is committed immediately.
+        """
+        if build_log is not None:
+            build_log.add(line)
+            return
 
+        text = build_log_text(line)
         logger.debug(text)
 
         if text is not None:
@@ -529,9 +679,12 @@ class DockerService:
             db.session.commit()
 
     @staticmethod
-    def push(script_id, tag_image):
+    def push(script_id, tag_image, build_log=None):
         """
         Push image to private docker registry
+
+        Push progress is written through ``build_log`` (a ``ScriptLogBuffer``)
+        when given.
         """
         import http.client
         import time
@@ -698,7 +851,9 @@ class DockerService:
 
                 # Save all logs after push attempt
                 for log_line in output_lines:
-                    DockerService.save_build_log(script_id=script_id, line=log_line)
+                    DockerService.save_build_log(
+                        script_id=script_id, line=log_line, build_log=build_log
+                    )
 
                 if (pushed or saw_digest) and not blob_unknown_error:
                     logger.info(
@@ -738,7 +893,9 @@ class DockerService:
                         )
                     # Save any collected logs for observability
                     for log_line in output_lines:
-                        DockerService.save_build_log(script_id=script_id, line=log_line)
+                        DockerService.save_build_log(
+                            script_id=script_id, line=log_line, build_log=build_log
+                        )
                     return True, {"digest": post_digest, "verified": True}
                 if post_exists and post_digest == pre_digest:
                     logger.warning(
@@ -805,7 +962,9 @@ class DockerService:
 
                 # Save logs for this failed attempt
                 for log_line in output_lines:
-                    DockerService.save_build_log(script_id=script_id, line=log_line)
+                    DockerService.save_build_log(
+                        script_id=script_id, line=log_line, build_log=build_log
+                    )
 
                 # If this was a transport-level interruption, check the
                 # registry to see if the manifest was actually created/updated.
@@ -879,7 +1038,9 @@ class DockerService:
             except Exception as error:
                 # Save logs for this failed attempt
                 for log_line in output_lines:
-                    DockerService.save_build_log(script_id=script_id, line=log_line)
+                    DockerService.save_build_log(
+                        script_id=script_id, line=log_line, build_log=build_log
+                    )
                 logger.error(f"Unexpected error during push: {error}")
                 rollbar.report_exc_info()
                 return False, error
@@ -936,7 +1097,9 @@ class DockerService:
         logger.error(f"Image push failed after {max_retries} attempts: {last_error}")
         # Save logs for the final failed attempt
         for log_line in output_lines:
-            DockerService.save_build_log(script_id=script_id, line=log_line)
+            DockerService.save_build_log(
+                script_id=script_id, line=log_line, build_log=build_log
+            )
         rollbar.report_exc_info()
         return False, last_error
 
@@ -947,20 +1110,47 @@ class DockerService:
         tag_image,
         environment,
         environment_version,
+        cache_key=None,
     ):
-        """Build image and push to private docker registry"""
+        """Build image and push to private docker registry
+
+        With a ``cache_key`` (see ``build_cache_key``) an image already built
+        from the same contents is retagged in the registry instead of being
+        rebuilt, and a fresh build is recorded under the key for next time.
+        """
 
         logger.info(f"Building new image in path {path} with tag {tag_image}")
         if not REGISTRY_URL:
             logger.error("REGISTRY_URL is not configured.")
             return False, Exception("REGISTRY_URL is not configured.")
+        if not SETTINGS.get("BUILD_CACHE", {}).get("ENABLED", True):
+            cache_key = None
+        repo_name, reference = _split_repo_ref(tag_image)
+
+        if cache_key:
+            cache_tag = _build_cache_tag(cache_key)
+            cached, cached_digest, _last_mod, msg = _registry_get_manifest_digest(
+                REGISTRY_URL, repo_name, cache_tag
+            )
+            logger.info(f"[SERVICE]: Build cache lookup: {msg}")
+            if cached:
+                ok, msg = _registry_copy_manifest(
+                    REGISTRY_URL, repo_name, cache_tag, reference
+                )
+                logger.info(f"[SERVICE]: {msg}")
+                if ok:
+                    db.session.add(
+                        ScriptLog(
+                            text=f"Build cache hit: reusing image {cached_digest}",
+                            script_id=script_id,
+                        )
+                    )
+                    db.session.commit()
+                    return True, {"digest": cached_digest, "cached": True}
+
         try:
             logger.debug("[SERVICE]: Copying dockerfile")
-            dockerfile = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                "run/Dockerfile",
-            )
-            copy(dockerfile, os.path.join(path, "Dockerfile"))
+            copy(DOCKERFILE_PATH, os.path.join(path, "Dockerfile"))
 
             tag_full = f"{REGISTRY_URL}/{tag_image}"
             logger.debug(f"[SERVICE]: tag is {tag_full}")
@@ -973,24 +1163,30 @@ class DockerService:
                 rm=True,
                 tag=tag_full,
                 forcerm=True,
+                # Layer cache stays on so the environment base image layers
+                # are reused across builds
                 pull=True,
-                nocache=True,
                 buildargs={
                     "ENVIRONMENT": environment,
                     "ENVIRONMENT_VERSION": environment_version,
                 },
             )
 
-            for line in logs:
-                # Only process if line is a dict
-                if not isinstance(line, dict):
-                    continue
-                if line.get("errorDetail"):
-                    return False, line["errorDetail"]
-                DockerService.save_build_log(script_id=script_id, line=line)
+            with ScriptLogBuffer(script_id) as build_log:
+                for line in logs:
+                    # Only process if line is a dict
+                    if not isinstance(line, dict):
+                        continue
+                    if line.get("errorDetail"):
+                        return False, line["errorDetail"]
+                    DockerService.save_build_log(
+                        script_id=script_id, line=line, build_log=build_log
+                    )
 
-            # Push the image (defaults to ':latest' if no tag provided)
-            push_result = DockerService.push(script_id=script_id, tag_image=tag_image)
+                # Push the image (defaults to ':latest' if no tag provided)
+                push_result = DockerService.push(
+                    script_id=script_id, tag_image=tag_image, build_log=build_log
+                )
 
             # Remove the image from the local Docker daemon after push
             try:
@@ -1001,6 +1197,12 @@ class DockerService:
                     f"Failed to remove local image {tag_full}: {remove_error}"
                 )
 
+            if cache_key and push_result[0]:
+                _ok, msg = _registry_copy_manifest(
+                    REGISTRY_URL, repo_name, reference, _build_cache_tag(cache_key)
+                )
+                logger.info(f"[SERVICE]: Build cache store: {msg}")
+
             return push_result
 
         except docker_errors.APIError as error:
@@ -1013,8 +1215,16 @@ class DockerService:
             return False, error
 
     @staticmethod
-    def run(execution_id, image, environment):
-        """Run image with environment"""
+    def run(execution_id, image, environment, execution=None, script=None):
+        """Run image with environment
+
+        Args:
+            execution_id: ID of the execution to run
+            image: Image name in the registry
+            environment: Environment variables for the execution
+            execution: Execution already loaded by the caller, if any
+            script: Script already loaded by the caller, if any
+        """
         logger.info(f"Running {image} image")
         try:
             environment["ENV"] = "prod"
@@ -1057,71 +1267,35 @@ class DockerService:
                     f"{execution_id}: {credential_env_vars}"
                 )
 
-                # Resolve execution and script safely
-                exec_obj = Execution.query.get(execution_id)
-                script = Script.query.get(exec_obj.script_id) if exec_obj else None
+                # Resolve execution and script, unless the caller loaded them
+                if execution is None:
+                    execution = Execution.query.get(execution_id)
+                if script is None and execution is not None:
+                    script = Script.query.get(execution.script_id)
 
                 client = get_docker_client()
+                if client is None:
+                    raise Exception("Docker client is not available")
 
                 # Create network spec to connect to execution network for API access
                 networks = []
                 try:
-                    # Autodetect execution network by matching environment
-                    execution_network = None
-                    current_env = os.getenv("ENVIRONMENT", "prod")
-
-                    # Ensure client is available
-                    if client is None:
-                        raise Exception("Docker client is not available")
-
-                    # Find the execution network for this environment
-                    all_networks = client.networks.list()
-                    for network in all_networks:
-                        network_name = str(network.name)
-
-                        # For Docker Compose (only in development environment)
-                        if current_env == "dev" and network_name == "execution":
-                            execution_network = network
-                            logger.info(
-                                f"Found Docker Compose execution network: "
-                                f"{network_name}"
-                            )
-                            break
-
-                        # For Docker Swarm (production/staging/any non-dev environment)
-                        # Match networks ending with "-{env}_execution"
-                        if network_name.endswith(f"-{current_env}_execution"):
-                            execution_network = network
-                            logger.info(
-                                f"Found environment-matched execution network: "
-                                f"{network_name} for environment: {current_env}"
-                            )
-                            break
-
-                    if execution_network:
-                        networks = [execution_network.id]
+                    network_id = _get_execution_network_id(client)
+                    if network_id:
+                        networks = [network_id]
                         logger.info(
                             f"Connecting execution-{execution_id} to execution "
-                            f"network {execution_network.name}"
+                            f"network {network_id}"
                         )
                     else:
-                        raise docker_errors.NotFound(
-                            f"No execution network found for environment: {current_env}"
+                        logger.warning(
+                            f"Execution network not found for environment "
+                            f"{os.getenv('ENVIRONMENT', 'prod')}, execution "
+                            "will use external API access"
                         )
-
-                except docker_errors.NotFound:
-                    logger.warning(
-                        f"Execution network not found for environment "
-                        f"{os.getenv('ENVIRONMENT', 'prod')}, execution "
-                        "will use external API access"
-                    )
                 except Exception as e:
                     logger.warning(f"Failed to autodetect execution network: {e}")
 
-                # Ensure Docker client is available (helps static analysis)
-                if client is None:
-                    raise Exception("Docker client is not available")
-
                 # Build hosts dict for EC2 metadata access (instance role credentials)
                 # This allows execution containers to use boto3 with instance roles
                 # For Docker Swarm services, hosts must be a dict {hostname: ip_address}
@@ -1166,7 +1340,19 @@ class DockerService:
                         mem_limit=script.memory_limit,
                     )
 
-                client.services.create(**create_kwargs)
+                try:
+                    client.services.create(**create_kwargs)
+                except docker_errors.NotFound as error:
+                    if not networks or isinstance(error, docker_errors.ImageNotFound):
+                        raise
+                    # The cached network was removed or recreated (e.g. stack
+                    # redeploy); resolve it again and retry once
+                    logger.info(
+                        f"Execution network {networks[0]} not found, refreshing"
+                    )
+                    network_id = _get_execution_network_id(client, refresh=True)
+                    create_kwargs["networks"] = [network_id] if network_id else []
+                    client.services.create(**create_kwargs)
             else:
                 logger.info(
                     "Creating container (running in "
@@ -5,9 +5,11 @@ import logging
 import os
 
 import rollbar
-from sparkpost import SparkPost
 
 from gefapi.errors import EmailError
+from gefapi.utils.lazy_import import lazy_import
+
+SparkPost = lazy_import("sparkpost", "SparkPost")
 
 logger = logging.getLogger(__name__)
 
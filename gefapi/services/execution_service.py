@@ -1,29 +1,43 @@
 """SCRIPT SERVICE"""
 
+import base64
+import binascii
 import datetime
+import json
 import logging
 import os
 from uuid import UUID
 
 import rollbar
-from sqlalchemy import case, func
+from sqlalchemy import case, func, tuple_
 
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.errors import (
     ExecutionNotFound,
     GeeTermsRequiredError,
+    InvalidSyncToken,
     ScriptNotFound,
     ScriptStateNotValid,
 )
-from gefapi.models import Execution, ExecutionLog, Script, StatusLog, User
+from gefapi.models import (
+    Execution,
+    ExecutionLog,
+    ExecutionTombstone,
+    Script,
+    StatusLog,
+    User,
+)
 from gefapi.services.batch_service import batch_run
 from gefapi.services.docker_service import docker_run
 from gefapi.services.email_service import EmailService
+from gefapi.services.gee_service import GEEService
+from gefapi.services.results_storage_service import ResultsStorageService
 from gefapi.services.script_service import ScriptService
 from gefapi.services.user_service import UserService
 from gefapi.utils import mask_email
 from gefapi.utils.permissions import is_admin_or_higher
+from gefapi.utils.query_filters import QueryFields
 
 
 def _get_user_active_execution_count(user_id):
@@ -94,6 +108,7 @@ EXECUTION_ALLOWED_FILTER_FIELDS = {
     "progress",
     "start_date",
     "end_date",
+    "updated_at",
     "script_id",
     "script_name",  # Via join
 }
@@ -103,6 +118,71 @@ EXECUTION_ALLOWED_SORT_FIELDS = (
     EXECUTION_ALLOWED_FILTER_FIELDS | EXECUTION_ADMIN_ONLY_FIELDS | {"duration"}
 )
 
+
+def _sort_by_end_date(direction):
+    # Handle NULLs explicitly so running executions (no end_date) always
+    # sort at the top when descending, and add start_date as a secondary
+    # sort for stable ordering.
+    if direction == "desc":
+        ordered = Execution.end_date.desc().nulls_first()
+    else:
+        ordered = Execution.end_date.asc().nulls_last()
+    return [ordered, Execution.start_date.desc()]
+
+
+def _sort_by_duration(direction):
+    duration = case(
+        (
+            Execution.end_date.isnot(None),
+            func.extract("epoch", Execution.end_date - Execution.start_date),
+        ),
+        else_=func.extract("epoch", func.now() - Execution.start_date),
+    )
+    return [duration.desc() if direction == "desc" else duration.asc()]
+
+
+EXECUTION_QUERY_FIELDS = QueryFields(
+    Execution,
+    filter_fields=EXECUTION_ALLOWED_FILTER_FIELDS | EXECUTION_ADMIN_ONLY_FIELDS,
+    sort_fields=EXECUTION_ALLOWED_SORT_FIELDS,
+    columns={
+        "script_name": Script.name,
+        "user_name": User.name,
+        "user_email": User.email,
+    },
+    joins={
+        Script: Execution.script_id == Script.id,
+        User: Execution.user_id == User.id,
+    },
+    admin_only={"user_name", "user_email"},
+    string_fields={"script_name", "user_name", "user_email"},
+    sort_expressions={"end_date": _sort_by_end_date, "duration": _sort_by_duration},
+)
+
+
+def _execution_load_options(include=None, exclude=None, fields=None, extra=()):
+    """Map serialize() arguments onto ORM loader options.
+
+    Only the columns Execution.serialize() will read are SELECTed, so omitted
+    params/results JSONB never leave the database. Related users and scripts
+    are joined in and logs are fetched for all rows in one extra query.
+    ``extra`` names further columns the caller itself needs.
+    """
+    from sqlalchemy.orm import joinedload, load_only, selectinload
+
+    include = include or []
+    columns = Execution.serialized_columns(include, exclude, fields)
+    columns += [name for name in extra if name not in columns]
+    options = [load_only(*(getattr(Execution, name) for name in columns))]
+    if {"user", "user_name", "user_email"} & set(include):
+        options.append(joinedload(Execution.user))
+    if {"script", "script_name"} & set(include):
+        options.append(joinedload(Execution.script))
+    if "logs" in include:
+        options.append(selectinload(Execution.log_entries))
+    return options
+
+
 # Import celery at module level for testing
 try:
     from gefapi import celery as celery_app
@@ -461,6 +541,8 @@ class ExecutionService:
         filter_param=None,
         sort=None,
         include=None,
+        exclude=None,
+        fields=None,
     ):
         """
         Retrieve executions with filtering, pagination, and permission controls.
@@ -468,7 +550,8 @@ class ExecutionService:
         Args:
             user: User object for permission checking
             target_user_id (str, optional): Filter by specific user ID (admin only)
-            updated_at (datetime, optional): Filter by start date
+            updated_at (datetime, optional): Only executions changed at or
+                after this time
             status (str, optional): Filter by execution status
             script_id (str, optional): Filter by script UUID
             page (int): Page number for pagination (default: 1)
@@ -478,8 +561,12 @@ class ExecutionService:
                 (date comparisons like start_date>='2024-01-01' are supported)
             sort (str, optional): SQL-style sort expressions
             include (list, optional): Fields to include in serialization. When
-                'user', 'user_name', 'user_email', 'script', or 'script_name'
-                are present, eager loading is applied to avoid N+1 queries.
+                'user', 'user_name', 'user_email', 'script', 'script_name' or
+                'logs' are present, eager loading is applied to avoid N+1 queries.
+            exclude (list, optional): Fields that will be excluded from
+                serialization; their columns are not loaded
+            fields (list, optional): Only these top-level fields will be
+                serialized; other columns are not loaded
 
         Returns:
             tuple: (executions list, total count)
@@ -487,10 +574,6 @@ class ExecutionService:
         Raises:
             Exception: If pagination parameters are invalid or filter permissions denied
         """
-        from sqlalchemy.orm import joinedload
-
-        from gefapi.utils.query_filters import parse_filter_param, parse_sort_param
-
         logger.info("[SERVICE]: Getting executions")
         logger.info("[DB]: QUERY")
 
@@ -503,15 +586,9 @@ class ExecutionService:
             if per_page < 1:
                 raise Exception("Per page must be greater than 0")
 
-        query = db.session.query(Execution)
-
-        # Eager-load relationships when include fields reference them
-        needs_user = bool({"user", "user_name", "user_email"} & set(include))
-        needs_script = bool({"script", "script_name"} & set(include))
-        if needs_user:
-            query = query.options(joinedload(Execution.user))
-        if needs_script:
-            query = query.options(joinedload(Execution.script))
+        query = db.session.query(Execution).options(
+            *_execution_load_options(include, exclude, fields)
+        )
 
         # Apply user filters
         if is_admin_or_higher(user):
@@ -544,138 +621,15 @@ class ExecutionService:
         if status:
             query = query.filter(func.lower(Execution.status) == status.lower())
         if updated_at:
-            # Filter by start_date since that's when executions begin
-            # and is more reliable than end_date for ongoing executions
-            query = query.filter(Execution.start_date >= updated_at)
+            query = query.filter(Execution.updated_at >= updated_at)
 
-        # Apply SQL-style filter_param if present (supports OR groups)
+        # Apply SQL-style filter_param (supports OR groups) and sort.
         # Date comparisons (e.g. start_date>='2024-01-01') are handled here.
-        join_scripts = False
-        join_users = False
-        filter_clauses = []
-
-        if filter_param:
-            from sqlalchemy import and_
-
-            all_allowed = EXECUTION_ALLOWED_FILTER_FIELDS | EXECUTION_ADMIN_ONLY_FIELDS
-
-            def _resolve_filter_column(field_name):
-                nonlocal join_scripts, join_users
-                if field_name == "script_name":
-                    join_scripts = True
-                    return Script.name
-                if field_name == "user_name":
-                    if not is_admin_or_higher(user):
-                        raise Exception(
-                            "Only admin or superadmin users can filter by user_name"
-                        )
-                    join_users = True
-                    return User.name
-                if field_name == "user_email":
-                    if not is_admin_or_higher(user):
-                        raise Exception(
-                            "Only admin or superadmin users can filter by user_email"
-                        )
-                    join_users = True
-                    return User.email
-                return getattr(Execution, field_name, None)
-
-            filter_clauses = parse_filter_param(
-                filter_param,
-                allowed_fields=all_allowed,
-                resolve_column=_resolve_filter_column,
-                string_field_names={"script_name", "user_name", "user_email"},
-            )
-
-        # Apply SQL-style sorting if present
-        order_clauses = []
-        if sort:
-
-            def _resolve_sort_column(field_name, direction):
-                nonlocal join_scripts, join_users
-                col = getattr(Execution, field_name, None)
-                if col is not None:
-                    # For end_date, handle NULLs explicitly so running
-                    # executions (no end_date) always sort at the top
-                    # when descending, and add start_date as a
-                    # secondary sort for stable ordering.
-                    if field_name == "end_date":
-                        if direction == "desc":
-                            ordered = Execution.end_date.desc().nulls_first()
-                        else:
-                            ordered = Execution.end_date.asc().nulls_last()
-                        # Return a composite: end_date then start_date
-                        return (
-                            [
-                                ordered,
-                                Execution.start_date.desc(),
-                            ],
-                            True,
-                        )
-                    return col
-                if field_name == "duration":
-                    duration_expr = case(
-                        (
-                            Execution.end_date.isnot(None),
-                            func.extract(
-                                "epoch", Execution.end_date - Execution.start_date
-                            ),
-                        ),
-                        else_=func.extract("epoch", func.now() - Execution.start_date),
-                    )
-                    ordered = (
-                        duration_expr.desc()
-                        if direction == "desc"
-                        else duration_expr.asc()
-                    )
-                    return (ordered, True)
-                if field_name == "script_name":
-                    join_scripts = True
-                    return Script.name
-                if field_name == "user_email":
-                    if not is_admin_or_higher(user):
-                        raise Exception(
-                            "Only admin or superadmin users can sort by user_email"
-                        )
-                    join_users = True
-                    return User.email
-                if field_name == "user_name":
-                    if not is_admin_or_higher(user):
-                        raise Exception(
-                            "Only admin or superadmin users can sort by user_name"
-                        )
-                    join_users = True
-                    return User.name
-                return None
-
-            order_clauses = parse_sort_param(
-                sort,
-                allowed_fields=EXECUTION_ALLOWED_SORT_FIELDS,
-                resolve_column=_resolve_sort_column,
-            )
-
-        # Apply JOINs once (after both filter and sort have been processed)
-        # to avoid duplicate joins when both reference the same table.
-        if join_scripts:
-            query = query.join(Script, Execution.script_id == Script.id)
-        if join_users:
-            query = query.join(User, Execution.user_id == User.id)
-
-        # Apply filter clauses
-        if filter_clauses:
-            from sqlalchemy import and_
-
-            query = query.filter(and_(*filter_clauses))
-
-        # Apply sort clauses
-        if order_clauses:
-            for clause in order_clauses:
-                if isinstance(clause, list):
-                    for sub in clause:
-                        query = query.order_by(sub)
-                else:
-                    query = query.order_by(clause)
-        else:
+        plan = EXECUTION_QUERY_FIELDS.compile(
+            filter_param, sort, admin=is_admin_or_higher(user)
+        )
+        query = EXECUTION_QUERY_FIELDS.apply(query, plan)
+        if not plan.order_by:
             # Default: running executions (NULL end_date) first, then
             # most-recently-finished.  Among running executions, show
             # the most-recently-started first.
@@ -803,6 +757,127 @@ class ExecutionService:
             raise
         return execution
 
+    @staticmethod
+    def _encode_sync_token(updated, deleted):
+        payload = json.dumps(
+            {
+                "u": [updated[0].isoformat(), str(updated[1])],
+                "d": [deleted[0].isoformat(), deleted[1]],
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_sync_token(token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            updated_at, execution_id = payload["u"]
+            deleted_at, tombstone_id = payload["d"]
+            return (
+                (
+                    datetime.datetime.fromisoformat(updated_at),
+                    UUID(execution_id),
+                ),
+                (datetime.datetime.fromisoformat(deleted_at), int(tombstone_id)),
+            )
+        except (binascii.Error, KeyError, TypeError, ValueError) as e:
+            raise InvalidSyncToken("Invalid sync token") from e
+
+    @staticmethod
+    def get_execution_changes(
+        user, since=None, limit=None, include=None, exclude=None, fields=None
+    ):
+        """
+        Return the user's executions changed since a sync token.
+
+        Changes are read in (updated_at, id) order from the
+        ix_execution_user_id_updated_at_id index, and deletions from
+        execution_tombstone in (deleted_at, id) order. Rows changed within the
+        last SAFETY_LAG_SECONDS are left for the next call, so a transaction
+        that commits late with an older timestamp is still picked up.
+
+        Args:
+            user: User whose executions are synced
+            since (str, optional): Token returned by a previous call; when
+                omitted, all executions are returned and deletions are
+                reported from now on
+            limit (int, optional): Maximum executions and deletions per call
+                (capped at MAX_PAGE_SIZE)
+            include, exclude, fields (list, optional): Serialization options,
+                used to load only the columns that will be returned
+
+        Returns:
+            dict: ``executions`` (list of Execution), ``deleted`` (list of
+            execution ids), ``next`` (token for the next call) and
+            ``has_more`` (whether another call would return more right away)
+
+        Raises:
+            InvalidSyncToken: If ``since`` cannot be decoded
+        """
+        logger.info(f"[SERVICE]: Getting execution changes for user {user.id}")
+        settings = SETTINGS.get("EXECUTION_SYNC", {})
+        max_page_size = settings.get("MAX_PAGE_SIZE", 500)
+        limit = min(max(limit or max_page_size, 1), max_page_size)
+        cutoff = datetime.datetime.now(datetime.UTC).replace(
+            tzinfo=None
+        ) - datetime.timedelta(seconds=settings.get("SAFETY_LAG_SECONDS", 5))
+
+        if since:
+            updated_mark, deleted_mark = ExecutionService._decode_sync_token(since)
+        else:
+            updated_mark = (datetime.datetime.min, UUID(int=0))
+            # A fresh client has nothing to delete
+            deleted_mark = (cutoff, 0)
+
+        logger.info("[DB]: QUERY")
+        executions = (
+            Execution.query.options(
+                *_execution_load_options(
+                    include, exclude, fields, extra=("updated_at",)
+                )
+            )
+            .filter(
+                Execution.user_id == user.id,
+                tuple_(Execution.updated_at, Execution.id) > tuple_(*updated_mark),
+                Execution.updated_at < cutoff,
+            )
+            .order_by(Execution.updated_at, Execution.id)
+            .limit(limit + 1)
+            .all()
+        )
+        more_updates = len(executions) > limit
+        executions = executions[:limit]
+        if executions:
+            updated_mark = (executions[-1].updated_at, executions[-1].id)
+
+        # Don't report a deletion before the updates that preceded it, or a
+        # client paging through a backlog would re-add the execution
+        deleted_before = updated_mark[0] if more_updates else cutoff
+        tombstones = (
+            ExecutionTombstone.query.filter(
+                ExecutionTombstone.user_id == user.id,
+                tuple_(ExecutionTombstone.deleted_at, ExecutionTombstone.id)
+                > tuple_(*deleted_mark),
+                ExecutionTombstone.deleted_at < deleted_before,
+            )
+            .order_by(ExecutionTombstone.deleted_at, ExecutionTombstone.id)
+            .limit(limit + 1)
+            .all()
+        )
+        more_deletions = len(tombstones) > limit
+        tombstones = tombstones[:limit]
+        if tombstones:
+            deleted_mark = (tombstones[-1].deleted_at, tombstones[-1].id)
+
+        return {
+            "executions": executions,
+            "deleted": [str(tombstone.execution_id) for tombstone in tombstones],
+            "next": ExecutionService._encode_sync_token(updated_mark, deleted_mark),
+            "has_more": more_updates or more_deletions,
+        }
+
     @staticmethod
     def get_execution(execution_id, user="fromservice"):
         """
@@ -907,7 +982,8 @@ class ExecutionService:
         if progress is not None:
             execution.progress = progress
         if results is not None:
-            execution.results = results
+            # Large results go to the results store; the row keeps a manifest
+            execution.results = ResultsStorageService.store(results)
 
         # Use the new helper function for status updates
         if status is not None:
@@ -994,6 +1070,8 @@ class ExecutionService:
         try:
             logger.info("[DB]: ADD")
             db.session.add(execution_log)
+            # Index GEE task IDs now so cancellation never has to scan the logs
+            GEEService.record_gee_task_ids(execution.id, text)
             db.session.commit()
         except Exception:
             rollbar.report_exc_info()
@@ -0,0 +1,435 @@
+"""Asynchronous admin CSV exports.
+
+``GET /execution/export``, ``/user/export`` and ``/script/export`` build the
+whole CSV inside the request, so they are capped at ``MAX_EXPORT_ROWS`` and
+can still run into the worker timeout. ``POST`` to the same URLs creates an
+``ExportJob`` instead. A Celery worker streams the rows in chunks into a
+gzipped CSV, records its progress on the job as it goes, and stores the file
+in S3 (the default) or, with the "local" backend, on a volume that must be
+shared by the worker and API containers. Once the job has
+finished, ``GET /export/<id>`` returns a signed download link that expires
+after ``LINK_TTL_SECONDS``.
+
+Removing old export files is left to bucket lifecycle rules or the
+volume's own housekeeping.
+"""
+
+import contextlib
+import csv
+import gzip
+import hashlib
+import hmac
+import io
+import logging
+import os
+import tempfile
+import time
+
+import dateutil.parser
+import rollbar
+from sqlalchemy import update
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import Execution, ExportJob, Script, User
+from gefapi.s3 import get_s3_client, get_transfer_config
+from gefapi.utils import utcnow
+from gefapi.utils.csv_export import _sanitize_csv_cell
+
+logger = logging.getLogger()
+
+EXECUTION_EXPORT_COLUMNS = [
+    "id",
+    "script_id",
+    "script_name",
+    "user_id",
+    "user_name",
+    "user_email",
+    "status",
+    "progress",
+    "start_date",
+    "end_date",
+    "queued_at",
+    "dispatched_at",
+]
+
+EXECUTION_EXPORT_DATE_FIELDS = {"start_date", "end_date"}
+
+# Columns included in the users CSV export (all non-sensitive profile fields)
+USER_EXPORT_COLUMNS = [
+    "id",
+    "email",
+    "name",
+    "role",
+    "country",
+    "institution",
+    "role_title",
+    "sector",
+    "sector_other",
+    "gender_identity",
+    "gender_identity_description",
+    "purpose_of_use",
+    "purpose_of_use_other",
+    "email_verified",
+    "email_verified_at",
+    "created_at",
+    "updated_at",
+    "last_login_at",
+    "last_activity_at",
+    "gee_license_acknowledged",
+    "email_notifications_enabled",
+    "email_subscription_news",
+    "email_subscription_engagement",
+    "email_subscription_system_updates",
+]
+
+# Allowed date fields for filtering the user export
+USER_EXPORT_DATE_FIELDS = {
+    "created_at",
+    "updated_at",
+    "email_verified_at",
+    "last_login_at",
+    "last_activity_at",
+}
+
+SCRIPT_EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "slug",
+    "status",
+    "public",
+    "restricted",
+    "created_at",
+    "updated_at",
+    "environment",
+    "environment_version",
+    "compute_type",
+    "uses_gee",
+    "user_id",
+    "user_name",
+    "user_email",
+]
+
+SCRIPT_EXPORT_DATE_FIELDS = {"created_at", "updated_at"}
+
+EXPORT_DATE_FIELDS = {
+    "executions": EXECUTION_EXPORT_DATE_FIELDS,
+    "users": USER_EXPORT_DATE_FIELDS,
+    "scripts": SCRIPT_EXPORT_DATE_FIELDS,
+}
+
+
+EXPORT_QUEUE_UNAVAILABLE = "The export could not be queued; try again later"
+
+
+def _export_settings():
+    return SETTINGS.get("EXPORTS", {})
+
+
+def _columns(model, names, joined):
+    return [
+        joined[name].label(name) if name in joined else getattr(model, name)
+        for name in names
+    ]
+
+
+def _export_query(table, filters):
+    """Return the row query for an export, with its filters and ordering."""
+    if table == "executions":
+        model, sort_column = Execution, Execution.start_date
+        query = (
+            db.session.query(
+                *_columns(
+                    Execution,
+                    EXECUTION_EXPORT_COLUMNS,
+                    {
+                        "script_name": Script.name,
+                        "user_name": User.name,
+                        "user_email": User.email,
+                    },
+                )
+            )
+            .outerjoin(Script, Execution.script_id == Script.id)
+            .outerjoin(User, Execution.user_id == User.id)
+        )
+    elif table == "users":
+        model, sort_column = User, User.created_at
+        query = db.session.query(*_columns(User, USER_EXPORT_COLUMNS, {})).filter(
+            User.deleted_at.is_(None)
+        )
+    elif table == "scripts":
+        model, sort_column = Script, Script.created_at
+        query = db.session.query(
+            *_columns(
+                Script,
+                SCRIPT_EXPORT_COLUMNS,
+                {"user_name": User.name, "user_email": User.email},
+            )
+        ).outerjoin(User, Script.user_id == User.id)
+    else:
+        raise ValueError(f"Unknown export table: {table}")
+
+    date_field = filters.get("date_field")
+    if date_field:
+        col = getattr(model, date_field)
+        if filters.get("date_from"):
+            query = query.filter(col >= dateutil.parser.parse(filters["date_from"]))
+        if filters.get("date_to"):
+            query = query.filter(col <= dateutil.parser.parse(filters["date_to"]))
+
+    return query.order_by(sort_column.desc())
+
+
+def _format_cell(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return _sanitize_csv_cell(value)
+
+
+def _link_signature(job_id, expires):
+    key = SETTINGS.get("SECRET_KEY") or SETTINGS.get("JWT_SECRET_KEY") or ""
+    message = f"export\0{job_id}\0{expires}"
+    return hmac.new(key.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def _s3_location(key):
+    settings = _export_settings()
+    bucket = settings.get("S3_BUCKET")
+    if not bucket:
+        raise ValueError("EXPORT_S3_BUCKET configuration is required")
+    prefix = (settings.get("S3_PREFIX") or "").strip("/")
+    return bucket, f"{prefix}/{key}" if prefix else key
+
+
+def _local_path(key):
+    return os.path.join(_export_settings().get("LOCAL_PATH"), key)
+
+
+class ExportService:
+    """Create admin export jobs, run them, and hand out download links"""
+
+    @staticmethod
+    def create_job(table, user, date_field=None, date_from=None, date_to=None):
+        """Create an export job and queue it on a Celery worker.
+
+        Args:
+            table: "executions", "users" or "scripts"
+            user: Admin requesting the export
+            date_field: Column to filter by, from EXPORT_DATE_FIELDS[table]
+            date_from: Inclusive start of the date range (datetime or None)
+            date_to: Inclusive end of the date range (datetime or None)
+
+        Returns:
+            The PENDING ExportJob, or the FAILED one if it could not be
+            queued (the broker is unavailable)
+        """
+        if table not in EXPORT_DATE_FIELDS:
+            raise ValueError(f"Unknown export table: {table}")
+        if date_field and date_field not in EXPORT_DATE_FIELDS[table]:
+            raise ValueError(f"Invalid date_field '{date_field}'")
+
+        job = ExportJob(
+            table=table,
+            status="PENDING",
+            filters={
+                "date_field": date_field,
+                "date_from": date_from.isoformat() if date_from else None,
+                "date_to": date_to.isoformat() if date_to else None,
+            },
+            created_by_id=str(user.id),
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        from gefapi.tasks.export_jobs import run_export_job
+
+        try:
+            run_export_job.delay(str(job.id))
+        except Exception as e:  # noqa: BLE001  # broker errors vary by transport
+            # Nothing resumes PENDING jobs, so don't leave this one waiting
+            logger.error(f"[SERVICE]: Could not queue export job {job.id}: {e}")
+            rollbar.report_exc_info()
+            job.status = "FAILED"
+            job.error = EXPORT_QUEUE_UNAVAILABLE
+            job.finished_at = utcnow()
+            db.session.commit()
+            return job
+
+        logger.info(f"[SERVICE]: Queued {table} export job {job.id}")
+        return job
+
+    @staticmethod
+    def get_job(job_id):
+        return db.session.get(ExportJob, job_id)
+
+    @staticmethod
+    def run_job(job_id):
+        """Write the CSV for an export job and store it.
+
+        Rows are read with a server-side cursor in CHUNK_SIZE batches, so
+        memory use doesn't depend on the size of the export. Progress is
+        committed on a separate connection after every chunk, because
+        committing the reading session would close its cursor.
+        """
+        job = db.session.get(ExportJob, job_id)
+        if job is None:
+            logger.warning(f"[SERVICE]: Export job {job_id} not found")
+            return None
+
+        settings = _export_settings()
+        chunk_size = settings.get("CHUNK_SIZE", 5000)
+        backend = settings.get("BACKEND") or "s3"
+        if backend not in ("s3", "local"):
+            raise ValueError(f"Unknown export storage backend: {backend}")
+
+        try:
+            query = _export_query(job.table, job.filters or {})
+            job.status = "RUNNING"
+            job.started_at = utcnow()
+            job.total_rows = query.order_by(None).count()
+            db.session.commit()
+            logger.info(
+                f"[SERVICE]: Running {job.table} export job {job.id} "
+                f"({job.total_rows} rows)"
+            )
+
+            key = f"{job.id}.csv.gz"
+            with ExportService._open_output(backend, key) as output:
+                rows_written = ExportService._write_csv(
+                    query, output, chunk_size, job.id
+                )
+                size = output.tell()
+                output.seek(0)
+                if backend == "s3":
+                    bucket, object_key = _s3_location(key)
+                    get_s3_client().upload_fileobj(
+                        output,
+                        bucket,
+                        object_key,
+                        ExtraArgs={"ContentType": "application/gzip"},
+                        Config=get_transfer_config(),
+                    )
+
+            job.status = "FINISHED"
+            job.rows_written = rows_written
+            job.storage_backend = backend
+            job.storage_key = key
+            job.size_bytes = size
+            job.finished_at = utcnow()
+            db.session.commit()
+            logger.info(
+                f"[SERVICE]: Finished export job {job.id}: {rows_written} rows, "
+                f"{size} bytes"
+            )
+            return job
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[SERVICE]: Export job {job_id} failed: {e}")
+            rollbar.report_exc_info()
+            job = db.session.get(ExportJob, job_id)
+            job.status = "FAILED"
+            job.error = str(e)[:500]
+            job.finished_at = utcnow()
+            db.session.commit()
+            raise
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _open_output(backend, key):
+        """Binary file for the export; local files appear only when complete."""
+        if backend == "s3":
+            with tempfile.TemporaryFile() as f:
+                yield f
+            return
+
+        path = _local_path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w+b") as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _write_csv(query, output, chunk_size, job_id):
+        columns = [c["name"] for c in query.column_descriptions]
+        rows_written = 0
+        with gzip.GzipFile(fileobj=output, mode="wb") as gz:
+            # BOM so that Excel detects the encoding
+            text = io.TextIOWrapper(gz, encoding="utf-8-sig", newline="")
+            writer = csv.writer(text)
+            writer.writerow(columns)
+            for row in query.yield_per(chunk_size):
+                writer.writerow([_format_cell(value) for value in row])
+                rows_written += 1
+                if rows_written % chunk_size == 0:
+                    ExportService._record_progress(job_id, rows_written)
+            text.flush()
+            text.detach()
+        return rows_written
+
+    @staticmethod
+    def _record_progress(job_id, rows_written):
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(ExportJob.__table__)
+                .where(ExportJob.__table__.c.id == job_id)
+                .values(rows_written=rows_written)
+            )
+
+    @staticmethod
+    def get_download_url(job, local_url_for):
+        """Return a signed, expiring link to a finished export's file.
+
+        Args:
+            job: FINISHED ExportJob
+            local_url_for: Callable building the API download URL from
+                (job_id, expires, signature), used for the local backend
+
+        Returns:
+            Tuple of (url, expires_at as a UNIX timestamp)
+        """
+        ttl = _export_settings().get("LINK_TTL_SECONDS", 3600)
+        expires = int(time.time()) + ttl
+        if job.storage_backend == "s3":
+            bucket, object_key = _s3_location(job.storage_key)
+            url = get_s3_client().generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": bucket,
+                    "Key": object_key,
+                    "ResponseContentDisposition": (
+                        f'attachment; filename="{job.filename}"'
+                    ),
+                },
+                ExpiresIn=ttl,
+            )
+            return url, expires
+        return (
+            local_url_for(str(job.id), expires, _link_signature(job.id, expires)),
+            expires,
+        )
+
+    @staticmethod
+    def verify_download(job_id, expires, signature):
+        """Check a local download link; returns False if forged or expired."""
+        try:
+            expires = int(expires)
+        except (TypeError, ValueError):
+            return False
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(
+            _link_signature(job_id, expires), str(signature or "")
+        )
+
+    @staticmethod
+    def local_file_path(job):
+        return _local_path(job.storage_key)
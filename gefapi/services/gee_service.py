@@ -1,6 +1,8 @@
 """Google Earth Engine Service for task management"""
 
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
+import datetime
 import json
 import logging
 import os
@@ -13,14 +15,12 @@ import rollbar
 
 from gefapi.config import SETTINGS
 from gefapi.utils import mask_email
+from gefapi.utils.lazy_import import lazy_import
 
 logger = logging.getLogger(__name__)
 
-# Import ee at module level for test mocking, but allow ImportError
-try:
-    import ee  # type: ignore
-except ImportError:
-    ee = None
+# Imported on first use; falsy when the earthengine-api is not installed
+ee = lazy_import("ee")
 
 # Import google.oauth2 at module level for test mocking, but allow ImportError
 try:
@@ -31,6 +31,10 @@ except ImportError:
     RefreshError = Exception  # type: ignore
 
 
+# A GEE task ID is a run of 24 upper-case letters and digits
+_GEE_TASK_ID_RE = re.compile(r"[A-Z0-9]{24}")
+
+
 class GEEService:
     """Service for managing Google Earth Engine tasks"""
 
@@ -67,7 +71,7 @@ class GEEService:
             True if initialization successful, False otherwise
         """
         try:
-            if ee is None:
+            if not ee:
                 logger.error("Google Earth Engine API not available")
                 return False
             # Check if already initialized by making a simple API call
@@ -124,7 +128,7 @@ class GEEService:
     def _initialize_ee_with_default_service_account() -> bool:
         """Initialize Google Earth Engine with the default service account"""
         try:
-            if ee is None:
+            if not ee:
                 logger.error("Google Earth Engine API not available")
                 return False
 
@@ -199,7 +203,7 @@ class GEEService:
     def _initialize_ee_with_oauth(user) -> bool:
         """Initialize Google Earth Engine with user OAuth credentials"""
         try:
-            if ee is None:
+            if not ee:
                 logger.error("Google Earth Engine API not available")
                 return False
 
@@ -272,7 +276,7 @@ class GEEService:
     def _initialize_ee_with_user_service_account(user) -> bool:
         """Initialize Google Earth Engine with user service account"""
         try:
-            if ee is None:
+            if not ee:
                 logger.error("Google Earth Engine API not available")
                 return False
 
@@ -371,42 +375,130 @@ class GEEService:
             return False
 
     @staticmethod
-    def extract_gee_task_ids_from_logs(execution_logs: list[str]) -> list[str]:
+    def extract_gee_task_ids(log_text: str | None) -> list[str]:
         """
-        Extract Google Earth Engine task IDs from execution logs.
+        Extract Google Earth Engine task IDs from a single log entry.
 
-        Looks for patterns like:
+        A task ID is the first run of 24 upper-case alphanumerics following the
+        word "task" on the same line, e.g.:
         - "Starting GEE task 6CIGR7EG2J45GJ2DN2J7X3WZ"
         - "Backing off ... for task YBKKBHM2V63JYBVIPCCRY7A2"
 
+        The scan is linear in the length of the text (no backtracking regex),
+        so it is cheap enough to run on every ingested log line.
+
+        Args:
+            log_text: Log text entry
+
+        Returns:
+            List of unique GEE task IDs in order of first appearance
+        """
+        if not log_text or "task" not in log_text:
+            return []
+
+        task_ids: dict[str, None] = {}
+        pos = 0
+        text_len = len(log_text)
+        while True:
+            start = log_text.find("task", pos)
+            if start == -1:
+                break
+            line_end = log_text.find("\n", start)
+            if line_end == -1:
+                line_end = text_len
+            match = _GEE_TASK_ID_RE.search(log_text, start + 4, line_end)
+            if match is None:
+                # No ID follows any later "task" on this line either
+                pos = line_end
+                continue
+            task_id = match.group()
+            # Reject all-digit runs, which cannot be GEE task IDs
+            if task_id.isupper():
+                task_ids[task_id] = None
+            pos = match.end()
+
+        return list(task_ids)
+
+    @staticmethod
+    def extract_gee_task_ids_from_logs(execution_logs: list[str]) -> list[str]:
+        """
+        Extract Google Earth Engine task IDs from execution logs.
+
         Args:
             execution_logs: List of log text entries
 
         Returns:
             List of unique GEE task IDs found in the logs
         """
-        task_ids = set()
+        task_ids: dict[str, None] = {}
+        for log_text in execution_logs:
+            for task_id in GEEService.extract_gee_task_ids(log_text):
+                task_ids[task_id] = None
+        return list(task_ids)
 
-        # Regex patterns to match GEE task IDs in various log formats
-        patterns = [
-            r"Starting GEE task ([A-Z0-9]{24})",
-            r"for task ([A-Z0-9]{24})",
-            r"task.*?([A-Z0-9]{24})",
-            r"GEE.*?task.*?([A-Z0-9]{24})",
-        ]
+    @staticmethod
+    def record_gee_task_ids(execution_id, log_text: str | None) -> list[str]:
+        """
+        Index the GEE task IDs mentioned in a log entry against its execution.
 
-        for log_text in execution_logs:
-            if not log_text:
-                continue
+        Rows are added to the current session (duplicates are ignored by the
+        database) and are committed together with the log entry by the caller.
 
-            for pattern in patterns:
-                matches = re.findall(pattern, log_text)
-                for match in matches:
-                    # Validate that the match looks like a valid GEE task ID
-                    if len(match) == 24 and match.isalnum() and match.isupper():
-                        task_ids.add(match)
+        Args:
+            execution_id: UUID of the execution the log belongs to
+            log_text: Log text entry being ingested
 
-        return list(task_ids)
+        Returns:
+            List of GEE task IDs found in the log entry
+        """
+        task_ids = GEEService.extract_gee_task_ids(log_text)
+        if not task_ids:
+            return []
+
+        from sqlalchemy.dialects.postgresql import insert
+
+        from gefapi import db
+        from gefapi.models import ExecutionGEETask
+
+        created_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        stmt = (
+            insert(ExecutionGEETask)
+            .values(
+                [
+                    {
+                        "execution_id": execution_id,
+                        "task_id": task_id,
+                        "created_at": created_at,
+                    }
+                    for task_id in task_ids
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["execution_id", "task_id"])
+        )
+        db.session.execute(stmt)
+        logger.debug("Indexed GEE task IDs %s for execution %s", task_ids, execution_id)
+        return task_ids
+
+    @staticmethod
+    def get_execution_gee_task_ids(execution_id) -> list[str]:
+        """
+        Return the GEE task IDs indexed for an execution.
+
+        Args:
+            execution_id: UUID of the execution
+
+        Returns:
+            List of GEE task IDs in the order they were first logged
+        """
+        from gefapi.models import ExecutionGEETask
+
+        rows = (
+            ExecutionGEETask.query.with_entities(ExecutionGEETask.task_id)
+            .filter(ExecutionGEETask.execution_id == execution_id)
+            .order_by(ExecutionGEETask.id)
+            .all()
+        )
+        return [row.task_id for row in rows]
 
     @staticmethod
     def cancel_gee_task(task_id: str, user=None) -> dict[str, Any]:
@@ -417,18 +509,35 @@ class GEEService:
             task_id: The GEE task ID to cancel
             user: Optional User model instance to use user-specific credentials
 
+        Returns:
+            Dictionary with cancellation result information
+        """
+        # Initialize Earth Engine
+        if not GEEService._initialize_ee(user):
+            return {
+                "task_id": task_id,
+                "success": False,
+                "error": "Failed to initialize Google Earth Engine",
+                "status": None,
+            }
+
+        return GEEService._cancel_initialized_gee_task(task_id)
+
+    @staticmethod
+    def _cancel_initialized_gee_task(task_id: str) -> dict[str, Any]:
+        """
+        Cancel a Google Earth Engine task, assuming Earth Engine is initialized.
+
+        Args:
+            task_id: The GEE task ID to cancel
+
         Returns:
             Dictionary with cancellation result information
         """
         result = {"task_id": task_id, "success": False, "error": None, "status": None}
 
         try:
-            # Initialize Earth Engine
-            if not GEEService._initialize_ee(user):
-                result["error"] = "Failed to initialize Google Earth Engine"
-                return result
-
-            if ee is None:
+            if not ee:
                 result["error"] = "Google Earth Engine API not available"
                 return result
 
@@ -577,6 +686,70 @@ class GEEService:
 
         return result
 
+    @staticmethod
+    def cancel_gee_tasks(task_ids: list[str], user=None) -> list[dict[str, Any]]:
+        """
+        Cancel several Google Earth Engine tasks concurrently.
+
+        Earth Engine is initialized once, then the tasks are cancelled on a
+        thread pool bounded by ``GEE_TASK_CANCEL_CONCURRENCY``.
+
+        Args:
+            task_ids: GEE task IDs to cancel
+            user: Optional User model instance to use user-specific credentials
+
+        Returns:
+            List of cancellation results, in the same order as ``task_ids``
+        """
+        if not task_ids:
+            return []
+
+        if not GEEService._initialize_ee(user):
+            return [
+                {
+                    "task_id": task_id,
+                    "success": False,
+                    "error": "Failed to initialize Google Earth Engine",
+                    "status": None,
+                }
+                for task_id in task_ids
+            ]
+
+        max_workers = max(
+            1, min(SETTINGS.get("GEE_TASK_CANCEL_CONCURRENCY", 8), len(task_ids))
+        )
+        if max_workers == 1:
+            return [GEEService._cancel_initialized_gee_task(t) for t in task_ids]
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gee-cancel"
+        ) as pool:
+            return list(pool.map(GEEService._cancel_initialized_gee_task, task_ids))
+
+    @staticmethod
+    def cancel_gee_tasks_for_execution(execution_id, user=None) -> list[dict[str, Any]]:
+        """
+        Cancel the GEE tasks indexed for an execution.
+
+        Args:
+            execution_id: UUID of the execution
+            user: Optional User model instance to use user-specific credentials
+
+        Returns:
+            List of cancellation results for each indexed task
+        """
+        task_ids = GEEService.get_execution_gee_task_ids(execution_id)
+
+        if not task_ids:
+            logger.info(f"No GEE task IDs indexed for execution {execution_id}")
+            return []
+
+        logger.info(
+            f"Found {len(task_ids)} GEE task IDs to cancel for execution "
+            f"{execution_id}: {task_ids}"
+        )
+        return GEEService.cancel_gee_tasks(task_ids, user)
+
     @staticmethod
     def cancel_gee_tasks_from_execution(
         execution_logs: list[str], user=None
@@ -584,6 +757,9 @@ class GEEService:
         """
         Extract GEE task IDs from execution logs and attempt to cancel them.
 
+        Prefer ``cancel_gee_tasks_for_execution``, which reads the task IDs
+        indexed at log ingestion time instead of re-scanning the logs.
+
         Args:
             execution_logs: List of log text entries from the execution
             user: Optional User model instance to use user-specific credentials
@@ -602,10 +778,4 @@ class GEEService:
 
         logger.info(f"Found {len(task_ids)} GEE task IDs to cancel: {task_ids}")
 
-        # Cancel each task
-        results = []
-        for task_id in task_ids:
-            result = GEEService.cancel_gee_task(task_id, user)
-            results.append(result)
-
-        return results
+        return GEEService.cancel_gee_tasks(task_ids, user)
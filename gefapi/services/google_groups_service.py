@@ -4,13 +4,14 @@ from datetime import UTC, datetime
 import json
 import logging
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.utils import mask_email
+from gefapi.utils.lazy_import import lazy_import
+
+service_account = lazy_import("google.oauth2.service_account")
+build = lazy_import("googleapiclient.discovery", "build")
+googleapiclient_errors = lazy_import("googleapiclient.errors")
 
 logger = logging.getLogger(__name__)
 
@@ -114,7 +115,7 @@ class GoogleGroupsService:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
-        except HttpError as e:
+        except googleapiclient_errors.HttpError as e:
             # Handle specific Google API errors
             error_details = e._get_reason() if hasattr(e, "_get_reason") else str(e)
 
@@ -178,7 +179,7 @@ class GoogleGroupsService:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
-        except HttpError as e:
+        except googleapiclient_errors.HttpError as e:
             error_details = e._get_reason() if hasattr(e, "_get_reason") else str(e)
 
             # If user is not a member, consider it success
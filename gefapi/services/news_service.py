@@ -1,16 +1,47 @@
 """NEWS SERVICE"""
 
 from datetime import UTC, datetime
+import json
 import logging
 from typing import Any
 
-from sqlalchemy import or_
+import redis
+from sqlalchemy import func, or_
 
 from gefapi import db
-from gefapi.models.news import NewsItem, NewsItemTranslation
+from gefapi.config import SETTINGS
+from gefapi.models.news import NewsItem, NewsItemTranslation, version_key
+from gefapi.utils import utcnow
+from gefapi.utils.redis_cache import get_redis_cache
 
 logger = logging.getLogger()
 
+# Cached feed pages are keyed under the current generation; bumping it on
+# every change makes all older pages unreachable
+NEWS_FEED_KEY_PREFIX = "news:feed:"
+NEWS_FEED_GENERATION_KEY = "news:feed:generation"
+
+
+def _feed_cache_ttl(now):
+    """Seconds to cache the feed, bounded by the next publish or expiry.
+
+    Items entering or leaving their publish window change the feed without a
+    write to the table, so a cached page must not outlive that moment.
+    """
+    ttl = SETTINGS.get("NEWS_FEED_CACHE", {}).get("TTL_SECONDS", 300)
+    next_publish, next_expiry = (
+        db.session.query(
+            func.min(NewsItem.publish_at).filter(NewsItem.publish_at > now),
+            func.min(NewsItem.expires_at).filter(NewsItem.expires_at > now),
+        )
+        .filter(NewsItem.is_active.is_(True))
+        .one()
+    )
+    for boundary in (next_publish, next_expiry):
+        if boundary is not None:
+            ttl = min(ttl, int((boundary - now).total_seconds()) + 1)
+    return max(ttl, 1)
+
 
 class NewsService:
     """
@@ -27,6 +58,7 @@ class NewsService:
         user_role: str | None = None,
         include_inactive: bool = False,
         include_expired: bool = False,
+        include_all_roles: bool = False,
         sort: str | None = None,
         page: int = 1,
         per_page: int = 20,
@@ -34,12 +66,15 @@ class NewsService:
         """
         Get news items with optional filtering.
 
+        All filters run in SQL, so the page and the total agree.
+
         Args:
             platform: Filter by target platform (app, webapp, api-ui)
             version: Filter by plugin version compatibility
             user_role: Filter by user role (USER, ADMIN, SUPERADMIN) or None for public
             include_inactive: Include inactive news items (admin only)
             include_expired: Include expired news items (admin only)
+            include_all_roles: Skip role filtering (admin only)
             sort: Sort field with optional '-' prefix for descending
             page: Page number for pagination (default: 1)
             per_page: Results per page (default: 20)
@@ -68,30 +103,35 @@ class NewsService:
                 or_(NewsItem.expires_at.is_(None), NewsItem.expires_at > now)
             )
 
-        # Filter by platform
+        # Filter by platform; no platforms means all platforms
         if platform:
-            # Use LIKE to match platform in comma-separated list
             query = query.filter(
                 or_(
-                    NewsItem.target_platforms.like(f"%{platform}%"),
-                    NewsItem.target_platforms.is_(None),
+                    func.cardinality(NewsItem.platforms) == 0,
+                    NewsItem.platforms.any(platform.strip().lower()),
                 )
             )
 
-        # Filter by version if provided
-        if version:
-            # Include items where version is in range or no version constraints
-            # Note: More complex version comparison handled in model method
-            # Here we just filter out obviously incompatible items
+        # Filter by version; an unparseable version matches every item
+        key = version_key(version)
+        if key is not None:
             query = query.filter(
                 or_(
-                    NewsItem.min_version.is_(None),
-                    NewsItem.max_version.is_(None),
-                    NewsItem.min_version.isnot(None),
-                    NewsItem.max_version.isnot(None),
-                )
+                    NewsItem.min_version_key.is_(None), NewsItem.min_version_key <= key
+                ),
+                or_(
+                    NewsItem.max_version_key.is_(None), NewsItem.max_version_key >= key
+                ),
             )
 
+        # Filter by role; user_role=None means unauthenticated user, who only
+        # sees unrestricted news
+        if not include_all_roles:
+            role_filter = func.cardinality(NewsItem.roles) == 0
+            if user_role:
+                role_filter = or_(role_filter, NewsItem.roles.any(user_role.upper()))
+            query = query.filter(role_filter)
+
         # Apply sorting
         if sort:
             sort_field = sort.removeprefix("-")
@@ -103,26 +143,124 @@ class NewsService:
         else:
             # Default: priority descending, then publish_at descending
             query = query.order_by(NewsItem.priority.desc(), NewsItem.publish_at.desc())
+        # Tie-break on ID so pages don't overlap or skip items
+        query = query.order_by(NewsItem.id)
 
         total = query.count()
         news_items = query.offset((page - 1) * per_page).limit(per_page).all()
 
-        # Post-filter by version compatibility (more accurate)
-        if version:
-            news_items = [
-                item for item in news_items if item.is_applicable_to_version(version)
-            ]
-            # Note: This affects total count accuracy, but is more accurate
-            # for version filtering
-
-        # Post-filter by role compatibility
-        # user_role=None means unauthenticated user, show only unrestricted news
-        news_items = [
-            item for item in news_items if item.is_applicable_to_role(user_role)
-        ]
-
         return news_items, total
 
+    @staticmethod
+    def get_news_feed(
+        platform: str | None = None,
+        version: str | None = None,
+        user_role: str | None = None,
+        language: str | None = None,
+        sort: str | None = None,
+        page: int = 1,
+        per_page: int = 20,
+    ) -> dict[str, Any]:
+        """
+        Get one serialized page of the public news feed.
+
+        Every client start fetches the feed, so resolved pages are cached in
+        Redis per platform, role, version, language and page. Versions share a
+        page when they have the same version_key(), and unsupported languages
+        share the English page. Any change to news items or translations
+        invalidates all cached pages.
+
+        Args:
+            platform: Target platform (app, webapp, api-ui)
+            version: Plugin version
+            user_role: User role (USER, ADMIN, SUPERADMIN) or None for public
+            language: Language code for translated content
+            sort: Sort field with optional '-' prefix for descending
+            page: Page number for pagination (default: 1)
+            per_page: Results per page (default: 20)
+
+        Returns:
+            dict: {"data": serialized news items, "total": total count}
+        """
+        page = max(page, 1)
+        if per_page < 1:
+            per_page = 20
+        platform = platform.strip().lower() if platform else None
+        user_role = user_role.upper() if user_role else None
+        if language not in NewsItemTranslation.SUPPORTED_LANGUAGES:
+            language = None
+        key = version_key(version)
+
+        redis_client = get_redis_cache().client
+        cache_key = None
+        if redis_client is not None:
+            try:
+                generation = redis_client.get(NEWS_FEED_GENERATION_KEY) or 0
+                cache_key = (
+                    f"{NEWS_FEED_KEY_PREFIX}{generation}:{platform or ''}:"
+                    f"{user_role or ''}:{key if key is not None else ''}:"
+                    f"{language or 'en'}:{sort or ''}:{page}:{per_page}"
+                )
+                cached = redis_client.get(cache_key)
+                if cached is not None:
+                    return json.loads(cached)
+            except redis.RedisError as e:
+                get_redis_cache().report_error(e)
+                logger.warning(f"[SERVICE]: News feed cache unavailable: {e}")
+                cache_key = None
+
+        now = utcnow()
+        news_items, total = NewsService.get_news_items(
+            platform=platform,
+            version=version,
+            user_role=user_role,
+            sort=sort,
+            page=page,
+            per_page=per_page,
+        )
+
+        # Load the requested translation of the whole page in one query
+        translations = None
+        if language and news_items:
+            translations = {
+                str(t.news_item_id): t
+                for t in db.session.query(NewsItemTranslation).filter(
+                    NewsItemTranslation.news_item_id.in_(
+                        [item.id for item in news_items]
+                    ),
+                    NewsItemTranslation.language_code == language,
+                )
+            }
+
+        feed = {
+            "data": [
+                item.serialize(language=language, translations=translations)
+                for item in news_items
+            ],
+            "total": total,
+        }
+
+        if cache_key is not None:
+            try:
+                redis_client.set(cache_key, json.dumps(feed), ex=_feed_cache_ttl(now))
+            except redis.RedisError as e:
+                get_redis_cache().report_error(e)
+                logger.warning(f"[SERVICE]: Failed to cache news feed: {e}")
+
+        return feed
+
+    @staticmethod
+    def invalidate_news_feed():
+        """Drop every cached news feed page."""
+        redis_client = get_redis_cache().client
+        if redis_client is None:
+            return
+        try:
+            redis_client.incr(NEWS_FEED_GENERATION_KEY)
+        except redis.RedisError as e:
+            get_redis_cache().report_error(e)
+            logger.warning(f"[SERVICE]: Failed to invalidate news feed cache: {e}")
+
     @staticmethod
     def get_news_item(news_id: str, include_inactive: bool = False) -> NewsItem | None:
         """
@@ -175,6 +313,7 @@ class NewsService:
 
         db.session.add(news_item)
         db.session.commit()
+        NewsService.invalidate_news_feed()
 
         logger.info(f"[SERVICE]: Created news item {news_item.id}")
         return news_item
@@ -206,6 +345,7 @@ class NewsService:
             "publish_at",
             "expires_at",
             "target_platforms",
+            "target_roles",
             "min_version",
             "max_version",
             "is_active",
@@ -218,6 +358,7 @@ class NewsService:
                 setattr(news_item, field, kwargs[field])
 
         db.session.commit()
+        NewsService.invalidate_news_feed()
         logger.info(f"[SERVICE]: Updated news item {news_id}")
         return news_item
 
@@ -240,6 +381,7 @@ class NewsService:
 
         db.session.delete(news_item)
         db.session.commit()
+        NewsService.invalidate_news_feed()
 
         logger.info(f"[SERVICE]: Deleted news item {news_id}")
         return True
@@ -312,6 +454,7 @@ class NewsService:
                     db.session.add(translation)
 
         db.session.commit()
+        NewsService.invalidate_news_feed()
 
         # Return updated translations
         return {t.language_code: t.serialize() for t in news_item.translations.all()}
@@ -346,6 +489,7 @@ class NewsService:
 
         db.session.delete(translation)
         db.session.commit()
+        NewsService.invalidate_news_feed()
 
         logger.info(
             f"[SERVICE]: Deleted {language_code} translation for news item {news_id}"
@@ -5,22 +5,54 @@ OAuth2 service clients using the Client Credentials grant (RFC 6749 §4.4).
 """
 
 import datetime
+import hashlib
+import hmac
 import logging
 
+import redis
 import rollbar
 
 from gefapi import db
+from gefapi.config import SETTINGS
 from gefapi.errors import AuthError, NotAllowed
 from gefapi.models.service_client import (
     CLIENT_SECRET_PREFIX,
     ServiceClient,
 )
+from gefapi.utils.redis_cache import get_redis_cache
 from gefapi.utils.scopes import validate_scopes
 
 logger = logging.getLogger(__name__)
 
 MAX_CLIENTS_PER_USER = 10
 
+# Redis key (+ client_id) holding the HMAC of the last verified secret
+VERIFIED_SECRET_KEY_PREFIX = "oauth2:verified_secret:"
+
+
+def _secret_digest(client, raw_secret):
+    """Keyed HMAC of a presented secret, or None when no key is configured.
+
+    The stored hash is part of the message, so a cached verification never
+    outlives a change of secret. The key never leaves the API, so a Redis
+    dump does not allow secrets to be checked offline.
+    """
+    key = SETTINGS.get("SECRET_KEY") or SETTINGS.get("JWT_SECRET_KEY")
+    if not key:
+        return None
+    message = f"{client.client_id}\0{client.client_secret_hash}\0{raw_secret}"
+    return hmac.new(key.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def _verified_secret_ttl(client):
+    ttl = SETTINGS.get("OAUTH2_SECRET_CACHE", {}).get("TTL_SECONDS", 300)
+    if client.expires_at is not None:
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        expires_at = client.expires_at.replace(tzinfo=None)
+        # Never vouch for a client past its expiry
+        ttl = min(ttl, int((expires_at - now).total_seconds()))
+    return ttl
+
 
 class OAuth2Service:
     """Manages OAuth2 service client lifecycle and authentication."""
@@ -139,6 +171,7 @@ class OAuth2Service:
             db.session.rollback()
             rollbar.report_exc_info()
             raise
+        OAuth2Service.forget_verified_secret(client.client_id)
         return client
 
     # ------------------------------------------------------------------
@@ -161,7 +194,7 @@ class OAuth2Service:
         if client is None:
             raise AuthError(message="Unknown client_id")
 
-        if not client.verify_secret(client_secret):
+        if not OAuth2Service._verify_secret(client, client_secret):
             raise AuthError(message="Invalid client_secret")
 
         if not client.is_valid():
@@ -178,3 +211,46 @@ class OAuth2Service:
             )
 
         return client.user, client
+
+    @staticmethod
+    def _verify_secret(client, raw_secret):
+        """``client.verify_secret`` backed by the verified-secret cache.
+
+        A cache hit costs one HMAC instead of a scrypt check. Only
+        verifications of valid clients are cached, and if Redis is
+        unavailable every request falls back to the full check.
+        """
+        digest = None
+        redis_client = None
+        if _verified_secret_ttl(client) > 0:
+            digest = _secret_digest(client, raw_secret)
+        if digest is not None:
+            redis_client = get_redis_cache().client
+        key = VERIFIED_SECRET_KEY_PREFIX + client.client_id
+
+        if redis_client is not None:
+            try:
+                cached = redis_client.get(key)
+                if cached is not None and hmac.compare_digest(cached, digest):
+                    return True
+            except redis.RedisError as e:
+                get_redis_cache().report_error(e)
+                logger.warning("Verified-secret cache lookup failed: %s", e)
+
+        if not client.verify_secret(raw_secret):
+            return False
+
+        if redis_client is not None and client.is_valid():
+            ttl = _verified_secret_ttl(client)
+            if ttl > 0:
+                try:
+                    redis_client.set(key, digest, ex=ttl)
+                except redis.RedisError as e:
+                    get_redis_cache().report_error(e)
+                    logger.warning("Verified-secret cache write failed: %s", e)
+        return True
+
+    @staticmethod
+    def forget_verified_secret(client_id):
+        """Drop the cached secret verification for *client_id*."""
+        get_redis_cache().delete(VERIFIED_SECRET_KEY_PREFIX + client_id)
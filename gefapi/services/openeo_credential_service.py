@@ -5,14 +5,12 @@ import logging
 import rollbar
 
 from gefapi.config import SETTINGS
+from gefapi.utils.lazy_import import lazy_import
 
 logger = logging.getLogger(__name__)
 
-# Import openeo at module level for test mocking, but allow ImportError
-try:
-    import openeo  # type: ignore
-except ImportError:
-    openeo = None
+# Imported on first use; falsy when openeo is not installed
+openeo = lazy_import("openeo")
 
 
 class OpenEOCredentialService:
@@ -83,7 +81,7 @@ class OpenEOCredentialService:
         Returns:
             An authenticated (or anonymous) openeo.Connection.
         """
-        if openeo is None:
+        if not openeo:
             raise ImportError(
                 "The 'openeo' package is not installed.  "
                 "Add it to pyproject.toml dependencies."
@@ -180,7 +178,7 @@ class OpenEOCredentialService:
 
         Returns True if a connection can be established successfully.
         """
-        if openeo is None:
+        if not openeo:
             logger.error("openeo package not available")
             return False
 
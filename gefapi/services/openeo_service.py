@@ -28,14 +28,12 @@ import rollbar
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.models import Execution, ExecutionLog
+from gefapi.utils.lazy_import import lazy_import
 
 logger = logging.getLogger(__name__)
 
-# Import openeo at module level for test mocking, but allow ImportError
-try:
-    import openeo  # type: ignore
-except ImportError:
-    openeo = None  # type: ignore
+# Imported on first use; falsy when openeo is not installed
+openeo = lazy_import("openeo")
 
 
 class OpenEOServiceTask(Task):
@@ -86,7 +84,7 @@ def _connect_openeo(backend_url, environment):
     """
     import json
 
-    if openeo is None:
+    if not openeo:
         raise ImportError(
             "The 'openeo' package is required for openEO execution support. "
             "Install it with: pip install openeo"
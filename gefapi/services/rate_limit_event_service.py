@@ -6,11 +6,11 @@ import datetime
 import logging
 import uuid
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 
 from gefapi import db
 from gefapi.models import RateLimitEvent
-from gefapi.utils.query_filters import parse_filter_param, parse_sort_param
+from gefapi.utils.query_filters import QueryFields
 
 logger = logging.getLogger(__name__)
 
@@ -187,6 +187,65 @@ class RateLimitEventService:
         # Order by expires_at descending to show most recently imposed limits first
         return list(base_query.order_by(RateLimitEvent.expires_at.desc()).all())
 
+    @staticmethod
+    def list_active_rate_limits_with_users(
+        *,
+        rate_limit_type: str | None = None,
+        endpoint: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[list[tuple], int]:
+        """Fetch a page of active rate limits joined with their users.
+
+        Uses a single ``LEFT JOIN`` on ``user`` instead of loading each
+        event's user separately.
+
+        Args:
+            rate_limit_type: Filter by rate limit category (case-insensitive).
+            endpoint: Filter by endpoint substring (case-insensitive).
+            limit: Maximum number of entries to return.
+            offset: Number of entries to skip (for pagination).
+
+        Returns:
+            Tuple of (rows, total_count) where each row is
+            ``(event, user_id, user_email, user_name, user_role)``; the user
+            columns are ``None`` when the event has no (live) user.
+        """
+        from gefapi.models import User
+
+        now = datetime.datetime.now(datetime.UTC)
+
+        base_query = db.session.query(
+            RateLimitEvent, User.id, User.email, User.name, User.role
+        ).outerjoin(
+            User,
+            and_(User.id == RateLimitEvent.user_id, User.deleted_at.is_(None)),
+        )
+        base_query = base_query.filter(
+            RateLimitEvent.expires_at.isnot(None),
+            RateLimitEvent.expires_at > now,
+        )
+
+        if rate_limit_type:
+            base_query = base_query.filter(
+                func.lower(RateLimitEvent.rate_limit_type) == rate_limit_type.lower()
+            )
+
+        if endpoint:
+            base_query = base_query.filter(
+                RateLimitEvent.endpoint.ilike(f"%{endpoint}%")
+            )
+
+        total = base_query.order_by(None).count()
+
+        rows = (
+            base_query.order_by(RateLimitEvent.expires_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return [tuple(row) for row in rows], int(total)
+
     @staticmethod
     def expire_events_for_identifier(identifier: str | None) -> int:
         """Force expire any active events tied to a specific identifier."""
@@ -276,19 +335,14 @@ class RateLimitEventService:
         "rate_limit_type",
     }
 
-    @staticmethod
-    def _resolve_filter_column(field_name: str):
-        """Map a filter field name to the corresponding SQLAlchemy column.
-
-        The virtual ``status`` field is handled via ``custom_filter_handlers``
-        in the route layer, so it is intentionally *not* resolved here.
-        """
-        return getattr(RateLimitEvent, field_name, None)
-
-    @staticmethod
-    def _resolve_sort_column(field_name: str, direction: str):
-        """Map a sort field name to the corresponding SQLAlchemy column."""
-        return getattr(RateLimitEvent, field_name, None)
+    # The virtual ``status`` field is handled via ``custom_filter_handlers``
+    # in the route layer; it isn't a column, so the filter parser skips it.
+    QUERY_FIELDS = QueryFields(
+        RateLimitEvent,
+        filter_fields=ALLOWED_FILTER_FIELDS,
+        sort_fields=ALLOWED_SORT_FIELDS,
+        string_fields=STRING_FIELD_NAMES,
+    )
 
     @staticmethod
     def list_events(
@@ -359,30 +413,15 @@ class RateLimitEventService:
                     )
                 )
 
-        # Parse the unified ``filter`` param (same pattern as executions/users)
-        if filter_param:
-            filter_clauses = parse_filter_param(
-                filter_param,
-                allowed_fields=RateLimitEventService.ALLOWED_FILTER_FIELDS,
-                resolve_column=RateLimitEventService._resolve_filter_column,
-                string_field_names=RateLimitEventService.STRING_FIELD_NAMES,
-            )
-            if filter_clauses:
-                base_query = base_query.filter(and_(*filter_clauses))
+        # Parse the unified ``filter`` and ``sort`` params (same pattern as
+        # executions/users)
+        plan = RateLimitEventService.QUERY_FIELDS.compile(filter_param, sort)
+        base_query = RateLimitEventService.QUERY_FIELDS.apply(base_query, plan)
 
         # Count before ordering/pagination
         total = base_query.order_by(None).count()
 
-        # Parse the ``sort`` param (same pattern as executions/users)
-        if sort:
-            order_clauses = parse_sort_param(
-                sort,
-                allowed_fields=RateLimitEventService.ALLOWED_SORT_FIELDS,
-                resolve_column=RateLimitEventService._resolve_sort_column,
-            )
-            for clause in order_clauses:
-                base_query = base_query.order_by(clause)
-        else:
+        if not plan.order_by:
             base_query = base_query.order_by(RateLimitEvent.occurred_at.desc())
 
         events = list(base_query.offset(offset).limit(limit).all())
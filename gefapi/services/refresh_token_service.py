@@ -8,6 +8,7 @@ from flask_jwt_extended import create_access_token
 from gefapi import db
 from gefapi.models.refresh_token import RefreshToken
 from gefapi.utils import mask_email, utcnow
+from gefapi.utils.retention import delete_in_batches
 
 logger = logging.getLogger(__name__)
 
@@ -59,20 +60,11 @@ class RefreshTokenService:
 
         user = refresh_token.user
 
-        # Update user's last_activity_at timestamp
-        try:
-            user.last_activity_at = utcnow()
-            db.session.commit()
-            logger.debug(
-                f"[SERVICE]: Updated last_activity_at for user {mask_email(user.email)}"
-            )
-        except Exception as e:
-            # Don't fail token validation if we can't update the timestamp
-            masked = mask_email(user.email)
-            logger.warning(
-                f"[SERVICE]: Failed to update last_activity_at for {masked}: {e}"
-            )
-            db.session.rollback()
+        # Update user's last_activity_at timestamp (buffered, see
+        # ClientTrackingService.flush_buffered_activity)
+        from gefapi.services.client_tracking_service import ClientTrackingService
+
+        ClientTrackingService.record_user_activity(user.id)
 
         logger.info(
             f"[SERVICE]: Refresh token validated for user {mask_email(user.email)}"
@@ -241,28 +233,28 @@ class RefreshTokenService:
             raise
 
     @staticmethod
-    def cleanup_expired_tokens():
-        """Clean up expired refresh tokens (should be run periodically)"""
-        logger.info("[SERVICE]: Cleaning up expired refresh tokens")
+    def cleanup_expired_tokens(time_budget=None):
+        """Clean up expired refresh tokens (should be run periodically)
 
-        expired_tokens = RefreshToken.query.filter(
-            RefreshToken.expires_at <= utcnow()
-        ).all()
-
-        for token in expired_tokens:
-            db.session.delete(token)
+        Deletes in bounded batches (see ``gefapi.utils.retention``); tokens
+        left when ``time_budget`` runs out are removed by the next run.
+        """
+        logger.info("[SERVICE]: Cleaning up expired refresh tokens")
 
         try:
-            db.session.commit()
-            logger.info(
-                f"[SERVICE]: Cleaned up {len(expired_tokens)} expired refresh tokens"
+            result = delete_in_batches(
+                RefreshToken,
+                RefreshToken.expires_at <= utcnow(),
+                name="expired refresh tokens",
+                time_budget=time_budget,
             )
-            return len(expired_tokens)
         except Exception as error:
-            db.session.rollback()
             logger.error(f"[SERVICE]: Error cleaning up expired tokens: {error}")
             raise
 
+        logger.info(f"[SERVICE]: Cleaned up {result['rows']} expired refresh tokens")
+        return result["rows"]
+
     @staticmethod
     def _get_device_info():
         """Extract device information from the request"""
@@ -0,0 +1,210 @@
+"""Tiered storage for execution results.
+
+Scripts report their results with ``PATCH /execution/<id>``. Small results
+stay inline in ``Execution.results``. Larger ones would bloat the
+``execution`` table and its TOAST, and every listing that reads them. They
+are gzipped and written once under their SHA-256, either to S3 or to a
+directory shared by the API containers. The row keeps only a manifest:
+
+    {"results_manifest": {"backend": "s3", "key": "...", "sha256": "...",
+                          "size": 1234567, "compressed_size": 98765,
+                          "encoding": "gzip"}}
+
+Listings return the manifest, to avoid a storage read per row.
+``GET /execution/<id>`` loads offloaded results back from the store, unless
+the client asks for ``include=results_manifest`` to get the manifest instead.
+``/execution/<id>/download-results`` streams the stored object back without
+loading it into memory. Objects are content-addressed and never rewritten.
+Cleaning up objects whose executions are gone is left to bucket lifecycle
+rules.
+"""
+
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import zlib
+
+from flask import json
+
+from gefapi.config import SETTINGS
+from gefapi.s3 import encode_json, get_s3_client, get_transfer_config
+from gefapi.utils.lazy_import import lazy_import
+
+botocore_exceptions = lazy_import("botocore.exceptions")
+
+logger = logging.getLogger()
+
+# Key of the manifest that replaces offloaded results in Execution.results
+RESULTS_MANIFEST_KEY = "results_manifest"
+# Read size when streaming stored results back to a client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _storage_settings():
+    return SETTINGS.get("RESULTS_STORAGE", {})
+
+
+def _object_key(sha256):
+    # Fan out by the first byte so the local backend doesn't put every file
+    # in one directory
+    return f"{sha256[:2]}/{sha256}.json.gz"
+
+
+def _local_path(key):
+    return os.path.join(_storage_settings().get("LOCAL_PATH"), key)
+
+
+def _s3_location(key):
+    settings = _storage_settings()
+    bucket = settings.get("S3_BUCKET")
+    if not bucket:
+        raise ValueError("RESULTS_S3_BUCKET configuration is required")
+    prefix = (settings.get("S3_PREFIX") or "").strip("/")
+    return bucket, f"{prefix}/{key}" if prefix else key
+
+
+def _iter_closing(chunks, handle):
+    with contextlib.closing(handle):
+        yield from chunks
+
+
+def _gunzip_chunks(chunks):
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+class ResultsStorageService:
+    """Store execution results inline or offloaded, and read them back"""
+
+    @staticmethod
+    def is_offloaded(results):
+        return isinstance(results, dict) and RESULTS_MANIFEST_KEY in results
+
+    @staticmethod
+    def store(results):
+        """Return the value to save in ``Execution.results`` for ``results``.
+
+        Results at or below ``OFFLOAD_THRESHOLD_BYTES`` of JSON, and all
+        results when no backend is configured, are returned unchanged.
+        Larger results are written to the configured backend and a manifest
+        is returned in their place.
+        """
+        settings = _storage_settings()
+        backend = settings.get("BACKEND")
+        if not backend or not results:
+            return results
+
+        body, sha256, size = encode_json(results)
+        if size <= settings.get("OFFLOAD_THRESHOLD_BYTES", 65536):
+            return results
+
+        key = _object_key(sha256)
+        if backend == "s3":
+            ResultsStorageService._put_s3(key, body)
+        elif backend == "local":
+            ResultsStorageService._put_local(key, body)
+        else:
+            raise ValueError(f"Unknown results storage backend: {backend}")
+
+        logger.info(
+            f"[SERVICE]: Offloaded {size} bytes of results to {backend} "
+            f"({len(body)} bytes gzipped)"
+        )
+        return {
+            RESULTS_MANIFEST_KEY: {
+                "backend": backend,
+                "key": key,
+                "sha256": sha256,
+                "size": size,
+                "compressed_size": len(body),
+                "encoding": "gzip",
+            }
+        }
+
+    @staticmethod
+    def _put_s3(key, body):
+        bucket, object_key = _s3_location(key)
+        client = get_s3_client()
+        try:
+            client.head_object(Bucket=bucket, Key=object_key)
+            # Same content hash, so the stored object is already current
+            return
+        except botocore_exceptions.ClientError:
+            pass
+        client.upload_fileobj(
+            io.BytesIO(body),
+            bucket,
+            object_key,
+            ExtraArgs={"ContentType": "application/json", "ContentEncoding": "gzip"},
+            Config=get_transfer_config(),
+        )
+
+    @staticmethod
+    def _put_local(key, body):
+        path = _local_path(key)
+        if os.path.exists(path):
+            return
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file and rename so readers never see a
+        # partially written object
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def open_content(results, decompress=True):
+        """Open the JSON of ``results`` for streaming.
+
+        The stored object is opened before returning, so a missing object
+        raises here rather than halfway through a response.
+
+        Args:
+            results: ``Execution.results`` of an execution, inline or manifest
+            decompress: Yield plain JSON; when False, offloaded results are
+                yielded gzipped as stored
+
+        Returns:
+            Iterator of bytes
+        """
+        if not ResultsStorageService.is_offloaded(results):
+            return iter([json.dumps(results or {}).encode("utf-8")])
+
+        chunks = ResultsStorageService._open_stored(results[RESULTS_MANIFEST_KEY])
+        if decompress:
+            chunks = _gunzip_chunks(chunks)
+        return chunks
+
+    @staticmethod
+    def _open_stored(manifest):
+        backend = manifest.get("backend")
+        if backend == "s3":
+            bucket, object_key = _s3_location(manifest["key"])
+            body = get_s3_client().get_object(Bucket=bucket, Key=object_key)["Body"]
+            return _iter_closing(body.iter_chunks(STREAM_CHUNK_SIZE), body)
+        if backend == "local":
+            f = open(_local_path(manifest["key"]), "rb")  # noqa: SIM115
+            return _iter_closing(iter(lambda: f.read(STREAM_CHUNK_SIZE), b""), f)
+        raise ValueError(f"Unknown results storage backend: {backend}")
+
+    @staticmethod
+    def load(results):
+        """Return the full results for ``Execution.results``, fetching
+        offloaded results from storage."""
+        if not ResultsStorageService.is_offloaded(results):
+            return results
+        return json.loads(b"".join(ResultsStorageService.open_content(results)))
@@ -0,0 +1,212 @@
+"""Buffered ScriptLog writer for Docker build and push streams.
+
+``client.images.build`` and the registry push stream emit a line for every
+build step and every progress tick of every layer. Writing each of them as
+its own ``ScriptLog`` row and commit costs thousands of round trips per
+build. ``ScriptLogBuffer`` collects the lines instead:
+
+- progress updates for the same layer (lines carrying an ``id``) collapse to
+  the latest status while they are buffered;
+- the buffer is written with a single multi-row ``INSERT`` once it holds
+  ``MAX_LINES`` entries or ``FLUSH_INTERVAL_SECONDS`` have passed, and when
+  the buffer is closed;
+- the unflushed entries are mirrored to Redis so ``/script/<id>/log`` can
+  show the live tail while the build is in flight.
+"""
+
+import datetime
+import json
+import logging
+import time
+
+import redis
+from sqlalchemy import insert
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import ScriptLog
+from gefapi.utils.redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+# Redis key holding the JSON list of buffered, not yet persisted entries
+LIVE_TAIL_KEY_PREFIX = "script_log:tail:"
+# The live tail is dropped if a worker dies before flushing it
+LIVE_TAIL_TTL_SECONDS = 3600
+
+
+def _buffer_settings():
+    return SETTINGS.get("SCRIPT_LOG_BUFFER", {})
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+def build_log_text(line):
+    """Return the log text for a Docker stream line, or None to skip it."""
+    text = None
+    if "stream" in line:
+        text = "Build: " + line["stream"]
+    elif "status" in line:
+        text = line["status"]
+        if "id" in line:
+            text += " " + line["id"]
+    return text
+
+
+class ScriptLogBuffer:
+    """Collect Docker stream lines for a script and persist them in batches.
+
+    Use as a context manager so the remaining lines are flushed when the
+    build or push finishes (or fails)::
+
+        with ScriptLogBuffer(script_id) as build_log:
+            for line in logs:
+                build_log.add(line)
+    """
+
+    def __init__(self, script_id, max_lines=None, flush_interval=None):
+        settings = _buffer_settings()
+        self.script_id = script_id
+        self.max_lines = max_lines or settings.get("MAX_LINES", 200)
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.get("FLUSH_INTERVAL_SECONDS", 2.0)
+        )
+        self._entries = []
+        # Layer id -> index in _entries of that layer's latest status
+        self._layers = {}
+        self._last_flush = time.monotonic()
+        self._redis = get_redis_cache().client
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add(self, line):
+        """Buffer one line from a Docker build or push stream."""
+        text = build_log_text(line)
+        logger.debug(text)
+        if text is None:
+            return
+
+        entry = {"text": text, "register_date": _utcnow()}
+        layer_id = line.get("id") if "stream" not in line else None
+        if layer_id and layer_id in self._layers:
+            self._entries[self._layers[layer_id]] = entry
+        else:
+            if layer_id:
+                self._layers[layer_id] = len(self._entries)
+            self._entries.append(entry)
+
+        if (
+            len(self._entries) >= self.max_lines
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        else:
+            self._publish_tail()
+
+    def flush(self):
+        """Write the buffered entries with one multi-row INSERT."""
+        entries = self._entries
+        self._entries = []
+        self._layers = {}
+        self._last_flush = time.monotonic()
+        if not entries:
+            return
+
+        try:
+            db.session.execute(
+                insert(ScriptLog).values(
+                    [
+                        {
+                            "text": entry["text"],
+                            "register_date": entry["register_date"],
+                            "script_id": self.script_id,
+                        }
+                        for entry in entries
+                    ]
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        self.rows_written += len(entries)
+        self._clear_tail()
+
+    def close(self):
+        """Flush whatever is still buffered."""
+        if self._entries:
+            self.flush()
+        else:
+            self._clear_tail()
+
+    def _publish_tail(self):
+        if self._redis is None:
+            return
+        payload = json.dumps(
+            [
+                {
+                    "text": entry["text"],
+                    "register_date": entry["register_date"].isoformat(),
+                }
+                for entry in self._entries
+            ]
+        )
+        try:
+            self._redis.set(
+                f"{LIVE_TAIL_KEY_PREFIX}{self.script_id}",
+                payload,
+                ex=LIVE_TAIL_TTL_SECONDS,
+            )
+        except redis.RedisError as error:
+            logger.debug(f"[SERVICE]: Could not publish build log tail: {error}")
+
+    def _clear_tail(self):
+        if self._redis is None:
+            return
+        try:
+            self._redis.delete(f"{LIVE_TAIL_KEY_PREFIX}{self.script_id}")
+        except redis.RedisError as error:
+            logger.debug(f"[SERVICE]: Could not clear build log tail: {error}")
+
+
+def get_live_tail(script_id, start_date=None):
+    """Return the not yet persisted build log lines of a script.
+
+    The entries are transient ``ScriptLog`` instances (``id`` is None) that
+    are never added to the session. Once flushed, the same lines are
+    returned from the database with the same ``register_date``, so clients
+    polling with ``start`` do not see them twice.
+    """
+    redis_client = get_redis_cache().client
+    if redis_client is None:
+        return []
+    try:
+        payload = redis_client.get(f"{LIVE_TAIL_KEY_PREFIX}{script_id}")
+    except redis.RedisError as error:
+        logger.debug(f"[SERVICE]: Could not read build log tail: {error}")
+        return []
+    if not payload:
+        return []
+
+    if start_date is not None and start_date.tzinfo is not None:
+        start_date = start_date.astimezone(datetime.UTC).replace(tzinfo=None)
+
+    tail = []
+    for entry in json.loads(payload):
+        register_date = datetime.datetime.fromisoformat(entry["register_date"])
+        if start_date is not None and register_date <= start_date:
+            continue
+        log = ScriptLog(text=entry["text"], script_id=script_id)
+        log.register_date = register_date
+        tail.append(log)
+    return tail
@@ -18,7 +18,9 @@ from gefapi.errors import InvalidFile, NotAllowed, ScriptDuplicated, ScriptNotFo
 from gefapi.models import Script, ScriptLog, User
 from gefapi.s3 import push_script_to_s3
 from gefapi.services.docker_service import docker_build
+from gefapi.services.script_log_buffer import get_live_tail
 from gefapi.utils.permissions import is_admin_or_higher
+from gefapi.utils.query_filters import QueryFields
 
 # Security: Explicitly allowed fields for filter and sort operations
 # to prevent unauthorized access to sensitive model fields
@@ -38,6 +40,16 @@ SCRIPT_ALLOWED_FILTER_FIELDS = {
 SCRIPT_ADMIN_ONLY_FIELDS = {"user_name", "user_email"}
 SCRIPT_ALLOWED_SORT_FIELDS = SCRIPT_ALLOWED_FILTER_FIELDS | SCRIPT_ADMIN_ONLY_FIELDS
 
+SCRIPT_QUERY_FIELDS = QueryFields(
+    Script,
+    filter_fields=SCRIPT_ALLOWED_FILTER_FIELDS | SCRIPT_ADMIN_ONLY_FIELDS,
+    sort_fields=SCRIPT_ALLOWED_SORT_FIELDS,
+    columns={"user_name": User.name, "user_email": User.email},
+    joins={User: Script.user_id == User.id},
+    admin_only=SCRIPT_ADMIN_ONLY_FIELDS,
+    string_fields={"user_name", "user_email"},
+)
+
 ROLES = SETTINGS.get("ROLES")
 
 logger = logging.getLogger()
@@ -259,81 +271,12 @@ class ScriptService:
 
             query = query.filter(or_(*access_conditions))
 
-        # SQL-style filter_param (supports OR groups)
-        join_users = False
-        filter_clauses = []
-        if filter_param:
-            from sqlalchemy import and_
-
-            from gefapi.utils.query_filters import parse_filter_param
-
-            allowed_fields = SCRIPT_ALLOWED_FILTER_FIELDS | SCRIPT_ADMIN_ONLY_FIELDS
-
-            def _resolve_script_filter_column(field_name):
-                nonlocal join_users
-                if field_name == "user_name":
-                    if not is_admin_or_higher(user):
-                        raise Exception("Only admin users can filter by user_name")
-                    join_users = True
-                    return User.name
-                if field_name == "user_email":
-                    if not is_admin_or_higher(user):
-                        raise Exception("Only admin users can filter by user_email")
-                    join_users = True
-                    return User.email
-                return getattr(Script, field_name, None)
-
-            filter_clauses = parse_filter_param(
-                filter_param,
-                allowed_fields=allowed_fields,
-                resolve_column=_resolve_script_filter_column,
-                string_field_names={"user_name", "user_email"},
-            )
-
-        # SQL-style sorting
-        order_clauses = []
-        if sort:
-            from gefapi.utils.query_filters import parse_sort_param
-
-            def _resolve_script_sort_column(field_name, direction):
-                nonlocal join_users
-                col = getattr(Script, field_name, None)
-                if col is not None:
-                    return col
-                if field_name == "user_email":
-                    if not is_admin_or_higher(user):
-                        raise Exception("Only admin users can sort by user_email")
-                    join_users = True
-                    return User.email
-                if field_name == "user_name":
-                    if not is_admin_or_higher(user):
-                        raise Exception("Only admin users can sort by user_name")
-                    join_users = True
-                    return User.name
-                return None
-
-            order_clauses = parse_sort_param(
-                sort,
-                allowed_fields=SCRIPT_ALLOWED_SORT_FIELDS,
-                resolve_column=_resolve_script_sort_column,
-            )
-
-        # Apply JOINs once (after both filter and sort have been processed)
-        # to avoid duplicate joins when both reference the same table.
-        if join_users:
-            query = query.join(User, Script.user_id == User.id)
-
-        # Apply filter clauses
-        if filter_clauses:
-            from sqlalchemy import and_
-
-            query = query.filter(and_(*filter_clauses))
-
-        # Apply sort clauses
-        if order_clauses:
-            for clause in order_clauses:
-                query = query.order_by(clause)
-        else:
+        # SQL-style filter_param (supports OR groups) and sorting
+        plan = SCRIPT_QUERY_FIELDS.compile(
+            filter_param, sort, admin=is_admin_or_higher(user)
+        )
+        query = SCRIPT_QUERY_FIELDS.apply(query, plan)
+        if not plan.order_by:
             query = query.order_by(Script.created_at.desc())
 
         if paginate:
@@ -412,7 +355,7 @@ class ScriptService:
 
         if start_date:
             logger.debug(start_date)
-            return (
+            logs = (
                 ScriptLog.query.filter(
                     ScriptLog.script_id == script.id,
                     ScriptLog.register_date > start_date,
@@ -420,15 +363,21 @@ class ScriptService:
                 .order_by(ScriptLog.register_date)
                 .all()
             )
-        if last_id:
-            return (
+        elif last_id:
+            logs = (
                 ScriptLog.query.filter(
                     ScriptLog.script_id == script.id, ScriptLog.id > last_id
                 )
                 .order_by(ScriptLog.register_date)
                 .all()
             )
-        return script.logs
+        else:
+            logs = list(script.logs)
+
+        if script.status == "BUILDING":
+            # Lines of the running build not yet flushed to the database
+            logs.extend(get_live_tail(script.id, start_date))
+        return logs
 
     @staticmethod
     def update_script(script_id, sent_file, user):
@@ -0,0 +1,435 @@
+"""USER DELETION SERVICE
+
+Deleting a user happens in two phases:
+
+1. Tombstone (synchronous, one small transaction): an audit record is written,
+   the user row is anonymized and marked with ``deleted_at``, and the user's
+   sessions and password reset tokens are removed so the account is unusable
+   immediately.
+2. Purge (batched, resumable): the user's status logs, execution logs,
+   executions, script logs, scripts, service clients and remaining tokens are
+   deleted in bounded ``DELETE ... WHERE id IN (SELECT ... LIMIT n)`` batches,
+   each in its own transaction. Rate limit events, news items and bulk emails
+   are kept, with their references to the user cleared in the same kind of
+   batches. Finally the user row itself is deleted. Progress is tracked
+   on the ``UserDeletionAudit`` record so a purge interrupted by worker loss is
+   picked up again by ``resume_user_deletions``.
+"""
+
+import datetime
+import logging
+import time
+
+import rollbar
+from sqlalchemy import String, cast, delete, or_, select, update
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import (
+    BulkEmail,
+    BulkEmailRecipientList,
+    BulkEmailVerificationToken,
+    Execution,
+    ExecutionGEETask,
+    ExecutionLog,
+    NewsItem,
+    PasswordResetToken,
+    PurgeStatus,
+    RateLimitEvent,
+    RefreshToken,
+    Script,
+    ScriptLog,
+    ServiceClient,
+    StatusLog,
+    User,
+    UserClientMetadata,
+    UserDeletionAudit,
+)
+from gefapi.utils import mask_email
+from gefapi.utils.retention import delete_batch, update_batch
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+def _deletion_settings():
+    return SETTINGS.get("USER_DELETION", {})
+
+
+def _user_execution_ids(user_id):
+    return select(Execution.id).where(Execution.user_id == user_id)
+
+
+def _user_script_ids(user_id):
+    return select(Script.id).where(Script.user_id == user_id)
+
+
+# Tables purged for a deleted user, in foreign-key order. Each entry maps a
+# step name to the model and a function building the WHERE clause selecting
+# that user's rows.
+PURGE_STEPS = (
+    (
+        "status_log",
+        StatusLog,
+        # StatusLog.execution_id is String(36), so compare against a cast
+        lambda user_id: StatusLog.execution_id.in_(
+            select(cast(Execution.id, String)).where(Execution.user_id == user_id)
+        ),
+    ),
+    (
+        "execution_gee_task",
+        ExecutionGEETask,
+        lambda user_id: ExecutionGEETask.execution_id.in_(_user_execution_ids(user_id)),
+    ),
+    (
+        "execution_log",
+        ExecutionLog,
+        lambda user_id: ExecutionLog.execution_id.in_(_user_execution_ids(user_id)),
+    ),
+    ("execution", Execution, lambda user_id: Execution.user_id == user_id),
+    (
+        "script_log",
+        ScriptLog,
+        lambda user_id: ScriptLog.script_id.in_(_user_script_ids(user_id)),
+    ),
+    ("script", Script, lambda user_id: Script.user_id == user_id),
+    (
+        "password_reset_token",
+        PasswordResetToken,
+        lambda user_id: PasswordResetToken.user_id == user_id,
+    ),
+    ("refresh_token", RefreshToken, lambda user_id: RefreshToken.user_id == user_id),
+    (
+        "user_client_metadata",
+        UserClientMetadata,
+        lambda user_id: UserClientMetadata.user_id == user_id,
+    ),
+    ("service_client", ServiceClient, lambda user_id: ServiceClient.user_id == user_id),
+    (
+        "bulk_email_verification_token",
+        BulkEmailVerificationToken,
+        lambda user_id: BulkEmailVerificationToken.user_id == user_id,
+    ),
+)
+
+# Rows that outlive a deleted user, run after PURGE_STEPS. Each entry maps a
+# step name to the model and the column referencing the user, which is set to
+# NULL.
+DETACH_STEPS = (
+    ("rate_limit_event", RateLimitEvent, RateLimitEvent.user_id),
+    ("news_item", NewsItem, NewsItem.created_by_id),
+    ("bulk_email_created_by", BulkEmail, BulkEmail.created_by_id),
+    ("bulk_email_sent_by", BulkEmail, BulkEmail.sent_by_id),
+    (
+        "bulk_email_recipient_list",
+        BulkEmailRecipientList,
+        BulkEmailRecipientList.created_by_id,
+    ),
+)
+
+
+def _purge_batches(user_id, batch_size):
+    """Yield ``(step name, run one batch, deletes rows)`` for each step"""
+    for step_name, model, build_where in PURGE_STEPS:
+        where_clause = build_where(user_id)
+        # Wait for rows locked by other transactions instead of skipping
+        # them, so a short batch means the step is done and no row is left
+        # to block the final user delete
+        yield (
+            step_name,
+            lambda model=model, where_clause=where_clause: delete_batch(
+                model, where_clause, batch_size, skip_locked=False
+            ),
+            True,
+        )
+    for step_name, model, column in DETACH_STEPS:
+        yield (
+            step_name,
+            lambda model=model, column=column: update_batch(
+                model, column == user_id, {column: None}, batch_size, skip_locked=False
+            ),
+            False,
+        )
+
+
+class UserDeletionService:
+    """Tombstone users and purge their data in bounded, committed batches"""
+
+    @staticmethod
+    def tombstone_user(
+        user,
+        deletion_reason: str,
+        deleted_by_admin_id: str | None = None,
+        context: str | None = None,
+    ) -> UserDeletionAudit:
+        """Write the audit record and make the account unusable immediately.
+
+        The user row is anonymized (email, name, password and stored
+        credentials) so its email can be registered again straight away, and
+        the user's refresh and password reset tokens are deleted. Nothing else
+        is deleted here; see ``purge``.
+
+        Args:
+            user: The User model instance being deleted
+            deletion_reason: One of DeletionReason constants
+            deleted_by_admin_id: ID of admin performing deletion (if applicable)
+            context: Additional JSON context for the audit record (no PII)
+
+        Returns:
+            The committed UserDeletionAudit record tracking the purge
+        """
+        logger.info("[DB]: Creating deletion audit record")
+        audit_record = UserDeletionAudit.create_from_user(
+            user=user,
+            deletion_reason=deletion_reason,
+            deleted_by_admin_id=deleted_by_admin_id,
+            context=context,
+        )
+        audit_record.purge_user_id = user.id
+
+        try:
+            db.session.add(audit_record)
+
+            logger.info("[DB]: Tombstoning user " + str(user.id))
+            user.deleted_at = _utcnow()
+            user.email = f"deleted-{user.id.hex}@deleted.invalid"
+            user.name = "Deleted user"
+            user.institution = None
+            # Not a valid hash, so no password can ever match it
+            user.password = "!"
+            user.gee_oauth_token = None
+            user.gee_refresh_token = None
+            user.gee_service_account_key = None
+            user.gee_credentials_type = None
+            user.gee_google_email = None
+            user.openeo_credentials_enc = None
+            user.email_notifications_enabled = False
+            user.email_subscription_news = False
+            user.email_subscription_engagement = False
+            user.email_subscription_system_updates = False
+            db.session.add(user)
+
+            # End all sessions now rather than when the purge gets to them
+            RefreshToken.query.filter(RefreshToken.user_id == user.id).delete(
+                synchronize_session=False
+            )
+            PasswordResetToken.query.filter(
+                PasswordResetToken.user_id == user.id
+            ).delete(synchronize_session=False)
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            rollbar.report_exc_info()
+            raise
+
+        return audit_record
+
+    @staticmethod
+    def _claim(audit_id) -> bool:
+        """Take the purge lease for an audit record.
+
+        The lease is free when no heartbeat is recorded or the last heartbeat
+        is older than ``LEASE_SECONDS`` (the previous worker was lost).
+        """
+        lease_seconds = _deletion_settings().get("LEASE_SECONDS", 600)
+        now = _utcnow()
+        result = db.session.execute(
+            update(UserDeletionAudit)
+            .where(
+                UserDeletionAudit.id == audit_id,
+                UserDeletionAudit.purge_status.in_(PurgeStatus.ACTIVE),
+                or_(
+                    UserDeletionAudit.purge_heartbeat_at.is_(None),
+                    UserDeletionAudit.purge_heartbeat_at
+                    < now - datetime.timedelta(seconds=lease_seconds),
+                ),
+            )
+            .values(purge_heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def purge(audit_id, time_budget: float | None = None) -> str:
+        """Delete a tombstoned user's data in bounded, committed batches.
+
+        Safe to call repeatedly: finished steps simply match no rows. Returns
+        without doing anything if another worker holds the lease.
+
+        Args:
+            audit_id: ID of the UserDeletionAudit record tracking the purge
+            time_budget: Seconds after which to stop (between batches) and
+                leave the rest for a later call. ``None`` runs to completion.
+
+        Returns:
+            The purge status after this call (see PurgeStatus)
+        """
+        if not UserDeletionService._claim(audit_id):
+            audit = db.session.get(UserDeletionAudit, audit_id)
+            status = audit.purge_status if audit else None
+            logger.info(
+                f"[SERVICE]: Purge for deletion {audit_id} not claimed "
+                f"(status {status})"
+            )
+            return status
+
+        settings = _deletion_settings()
+        batch_size = settings.get("BATCH_SIZE", 5000)
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+        audit = db.session.get(UserDeletionAudit, audit_id)
+        user_id = audit.purge_user_id
+        started = time.monotonic()
+        rows_this_run = 0
+
+        try:
+            for step_name, run_batch, deletes in _purge_batches(user_id, batch_size):
+                while True:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        audit.purge_heartbeat_at = None
+                        db.session.commit()
+                        logger.info(
+                            f"[SERVICE]: Purge for deletion {audit_id} paused at "
+                            f"{step_name} after {rows_this_run} rows"
+                        )
+                        return audit.purge_status
+
+                    changed = run_batch()
+                    rows_this_run += changed
+                    audit.purge_status = PurgeStatus.IN_PROGRESS
+                    audit.purge_step = step_name
+                    if deletes:
+                        audit.purge_rows_deleted = (
+                            audit.purge_rows_deleted or 0
+                        ) + changed
+                    audit.purge_heartbeat_at = _utcnow()
+                    db.session.commit()
+
+                    if changed < batch_size:
+                        break
+
+            db.session.execute(
+                delete(User)
+                .where(User.id == user_id)
+                .execution_options(synchronize_session=False)
+            )
+            audit.purge_status = PurgeStatus.COMPLETED
+            audit.purge_step = None
+            audit.purge_rows_deleted = (audit.purge_rows_deleted or 0) + 1
+            audit.purge_user_id = None
+            audit.purge_heartbeat_at = None
+            audit.purge_completed_at = _utcnow()
+            audit.purge_last_error = None
+            db.session.commit()
+        except Exception as error:
+            db.session.rollback()
+            rollbar.report_exc_info()
+            audit = db.session.get(UserDeletionAudit, audit_id)
+            audit.purge_heartbeat_at = None
+            audit.purge_last_error = str(error)[:1000]
+            audit.purge_attempts = (audit.purge_attempts or 0) + 1
+            if audit.purge_attempts >= settings.get("MAX_ATTEMPTS", 5):
+                audit.purge_status = PurgeStatus.FAILED
+            db.session.commit()
+            logger.error(
+                f"[SERVICE]: Purge for deletion {audit_id} failed at "
+                f"{audit.purge_step}: {error}"
+            )
+            raise
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"[SERVICE]: Purge for deletion {audit_id} completed: "
+            f"{rows_this_run} rows in {elapsed:.2f}s"
+        )
+        return PurgeStatus.COMPLETED
+
+    @staticmethod
+    def schedule_purge(audit_id):
+        """Queue the background purge for a tombstoned user.
+
+        If the broker is unavailable the purge is still picked up later by
+        the periodic ``resume_user_deletions`` task.
+        """
+        from gefapi.tasks.user_deletion import purge_deleted_user
+
+        try:
+            purge_deleted_user.delay(str(audit_id))
+        except Exception as error:  # noqa: BLE001  # broker errors vary by transport
+            logger.warning(
+                f"[SERVICE]: Could not queue purge for deletion {audit_id}, "
+                f"it will be resumed by the periodic task: {error}"
+            )
+
+    @staticmethod
+    def delete_user(
+        user,
+        deletion_reason: str,
+        deleted_by_admin_id: str | None = None,
+        context: str | None = None,
+        purge_inline: bool = True,
+    ) -> UserDeletionAudit:
+        """Tombstone a user and purge (or schedule purging of) their data.
+
+        With ``purge_inline`` the purge first runs in the caller for up to
+        ``INLINE_SECONDS``, which completes the deletion of typical accounts
+        before returning. Whatever remains is handed to a background task,
+        as is the whole purge if the inline run fails: the user is already
+        tombstoned by then, so the deletion itself has succeeded.
+
+        Returns:
+            The UserDeletionAudit record tracking the deletion
+        """
+        email = user.email
+        audit_record = UserDeletionService.tombstone_user(
+            user,
+            deletion_reason=deletion_reason,
+            deleted_by_admin_id=deleted_by_admin_id,
+            context=context,
+        )
+        audit_id = audit_record.id
+
+        status = PurgeStatus.PENDING
+        if purge_inline:
+            try:
+                status = UserDeletionService.purge(
+                    audit_id,
+                    time_budget=_deletion_settings().get("INLINE_SECONDS", 2.0),
+                )
+            except Exception as error:  # noqa: BLE001  # purge() already reported it
+                # The error is recorded on the audit record
+                logger.error(
+                    f"[SERVICE]: Inline purge for deletion {audit_id} failed, "
+                    f"leaving it to the background task: {error}"
+                )
+                status = db.session.get(UserDeletionAudit, audit_id).purge_status
+        if status in PurgeStatus.ACTIVE:
+            logger.info(
+                f"[SERVICE]: Scheduling background purge for {mask_email(email)}"
+            )
+            UserDeletionService.schedule_purge(audit_id)
+
+        return audit_record
+
+    @staticmethod
+    def get_resumable_deletions(limit: int = 100) -> list[UserDeletionAudit]:
+        """Return active purges with no live worker (lease free or expired)."""
+        lease_seconds = _deletion_settings().get("LEASE_SECONDS", 600)
+        stale_before = _utcnow() - datetime.timedelta(seconds=lease_seconds)
+        return (
+            UserDeletionAudit.query.filter(
+                UserDeletionAudit.purge_status.in_(PurgeStatus.ACTIVE),
+                or_(
+                    UserDeletionAudit.purge_heartbeat_at.is_(None),
+                    UserDeletionAudit.purge_heartbeat_at < stale_before,
+                ),
+            )
+            .order_by(UserDeletionAudit.deleted_at)
+            .limit(limit)
+            .all()
+        )
@@ -1,5 +1,6 @@
 """SCRIPT SERVICE"""
 
+import functools
 from html import escape
 import logging
 import re
@@ -8,13 +9,13 @@ import string
 from uuid import UUID
 
 import rollbar
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from gefapi import db
 from gefapi.config import SETTINGS
 from gefapi.errors import (
     AuthError,
     EmailError,
+    PasswordHashingBusy,
     PasswordValidationError,
     UserDuplicated,
     UserNotFound,
@@ -22,6 +23,8 @@ from gefapi.errors import (
 from gefapi.models import User
 from gefapi.services.email_service import EmailService
 from gefapi.utils import mask_email, utcnow
+from gefapi.utils.password_hashing import hash_password, verify_password
+from gefapi.utils.query_filters import QueryFields
 from gefapi.utils.security_events import (
     log_authentication_event,
     log_password_event,
@@ -31,11 +34,18 @@ ROLES = SETTINGS.get("ROLES")
 
 logger = logging.getLogger()
 
-# Pre-computed dummy hash used in the user-not-found path of authenticate_user
-# to equalise timing with the real password-check path (mitigates CWE-208).
-_DUMMY_PASSWORD_HASH = generate_password_hash(
-    "__dummy_password_for_timing_only__", method="scrypt"
-)
+
+@functools.cache
+def _dummy_password_hash():
+    """Dummy hash used in the user-not-found path of authenticate_user to
+    equalise timing with the real password-check path (mitigates CWE-208).
+
+    Computed on first use rather than at import, so that every worker
+    respawn does not pay for an scrypt hash up front, and on the hashing
+    pool like any other hash.
+    """
+    return hash_password("__dummy_password_for_timing_only__")
+
 
 MIN_PASSWORD_LENGTH = 12
 SPECIAL_CHARACTERS = "!@#$%^&*()-_=+[]{}|;:,.<>?/"
@@ -112,6 +122,12 @@ class UserService:
         "has_openeo_credentials",
     }
     USER_ALLOWED_SORT_FIELDS = USER_ALLOWED_FILTER_FIELDS
+    USER_QUERY_FIELDS = QueryFields(
+        User,
+        filter_fields=USER_ALLOWED_FILTER_FIELDS,
+        sort_fields=USER_ALLOWED_SORT_FIELDS,
+        columns={"has_openeo_credentials": User.openeo_credentials_enc.isnot(None)},
+    )
 
     @staticmethod
     def create_user(user):
@@ -262,6 +278,9 @@ class UserService:
                 rollbar.report_exc_info()
                 raise
 
+        except PasswordHashingBusy:
+            # Load shedding, answered with 429 by the route
+            raise
         except Exception:
             rollbar.report_exc_info()
             raise
@@ -335,47 +354,12 @@ class UserService:
             if per_page < 1:
                 raise ValueError("Per page must be greater than 0")
 
-        query = db.session.query(User)
-
-        # SQL-style filter_param with field allowlist for security
-        if filter_param:
-            from sqlalchemy import and_
-
-            from gefapi.utils.query_filters import parse_filter_param
-
-            def _resolve_user_column(field_name):
-                return getattr(User, field_name, None)
-
-            filter_clauses = parse_filter_param(
-                filter_param,
-                allowed_fields=UserService.USER_ALLOWED_FILTER_FIELDS,
-                resolve_column=_resolve_user_column,
-            )
-            if filter_clauses:
-                query = query.filter(and_(*filter_clauses))
-
-        # SQL-style sorting
-        if sort:
-            from gefapi.utils.query_filters import parse_sort_param
+        query = db.session.query(User).filter(User.deleted_at.is_(None))
 
-            def _resolve_user_sort_column(field_name, direction):
-                if field_name == "has_openeo_credentials":
-                    from sqlalchemy import case as sa_case
-
-                    return sa_case(
-                        (User.openeo_credentials_enc != None, 1),  # noqa: E711
-                        else_=0,
-                    )
-                return getattr(User, field_name, None)
-
-            order_clauses = parse_sort_param(
-                sort,
-                allowed_fields=UserService.USER_ALLOWED_SORT_FIELDS,
-                resolve_column=_resolve_user_sort_column,
-            )
-            for clause in order_clauses:
-                query = query.order_by(clause)
-        else:
+        # SQL-style filter_param and sorting with field allowlist for security
+        plan = UserService.USER_QUERY_FIELDS.compile(filter_param, sort)
+        query = UserService.USER_QUERY_FIELDS.apply(query, plan)
+        if not plan.order_by:
             query = query.order_by(User.created_at.desc())
 
         if paginate:
@@ -403,7 +387,8 @@ class UserService:
         except Exception:
             rollbar.report_exc_info()
             raise
-        if not user:
+        # Tombstoned users are awaiting purge and no longer exist to callers
+        if not user or user.deleted_at is not None:
             raise UserNotFound(message=f"User with id {user_id} does not exist")
         return user
 
@@ -662,6 +647,9 @@ class UserService:
 
             return user
 
+        except PasswordHashingBusy:
+            # Load shedding, answered with 429 by the route
+            raise
         except Exception:
             rollbar.report_exc_info()
             raise
@@ -776,11 +764,16 @@ class UserService:
         deletion_reason: str | None = None,
         deleted_by_admin_id: str | None = None,
         context: str | None = None,
+        purge_inline: bool = True,
     ):
         """Delete a user account and all associated data.
 
-        Creates an audit record before deletion to track the deletion
-        for compliance and analytics purposes.
+        Creates an audit record, then tombstones the user (the account is
+        anonymized and unusable from this point on) and purges the user's
+        data in bounded batches. With ``purge_inline`` the purge starts in the
+        caller and typical accounts are fully deleted before this returns;
+        large accounts are finished by a background task. See
+        ``UserDeletionService``.
 
         Args:
             user_id: The ID of the user to delete
@@ -788,6 +781,8 @@ class UserService:
                 Defaults to USER_REQUEST if not specified.
             deleted_by_admin_id: ID of admin performing the deletion (if applicable)
             context: Additional JSON context for the audit record (no PII)
+            purge_inline: Start purging in the caller rather than only
+                scheduling the background task
 
         Returns:
             Dict with the user's serialized data (before deletion)
@@ -795,7 +790,8 @@ class UserService:
         Raises:
             UserNotFound: If the user doesn't exist
         """
-        from gefapi.models import DeletionReason, UserDeletionAudit
+        from gefapi.models import DeletionReason
+        from gefapi.services.user_deletion_service import UserDeletionService
 
         # Default to user_request if no reason specified
         if deletion_reason is None:
@@ -811,93 +807,13 @@ class UserService:
         # Serialize user data before deletion
         user_data = user.serialize()
 
-        # Create audit record before deletion (captures user statistics)
-        logger.info("[DB]: Creating deletion audit record")
-        audit_record = UserDeletionAudit.create_from_user(
-            user=user,
+        UserDeletionService.delete_user(
+            user,
             deletion_reason=deletion_reason,
             deleted_by_admin_id=deleted_by_admin_id,
             context=context,
+            purge_inline=purge_inline,
         )
-
-        try:
-            from sqlalchemy import String, cast
-
-            from gefapi.models import Execution, ExecutionLog, Script, StatusLog
-            from gefapi.models.password_reset_token import PasswordResetToken
-            from gefapi.models.refresh_token import RefreshToken
-            from gefapi.models.script_log import ScriptLog
-
-            # Add audit record to session first
-            db.session.add(audit_record)
-
-            user_uuid = user.id
-
-            # Get execution IDs for this user (needed for related table deletions)
-            execution_ids_uuid = db.session.query(Execution.id).filter(
-                Execution.user_id == user_uuid
-            )
-            # Cast to string for StatusLog which uses String(36) for execution_id
-            execution_ids_str = db.session.query(cast(Execution.id, String)).filter(
-                Execution.user_id == user_uuid
-            )
-
-            # Get script IDs for this user (needed for script log deletions)
-            script_ids_uuid = db.session.query(Script.id).filter(
-                Script.user_id == user_uuid
-            )
-
-            # Delete status logs for user's executions
-            # StatusLog.execution_id is String(36), so use string-cast query
-            logger.info("[DB]: Deleting status logs for user's executions")
-            StatusLog.query.filter(
-                StatusLog.execution_id.in_(execution_ids_str)
-            ).delete(synchronize_session=False)
-
-            # Delete execution logs (uses UUID foreign key)
-            logger.info("[DB]: Deleting execution logs for user's executions")
-            ExecutionLog.query.filter(
-                ExecutionLog.execution_id.in_(execution_ids_uuid)
-            ).delete(synchronize_session=False)
-
-            # Delete executions
-            logger.info("[DB]: Deleting executions")
-            Execution.query.filter(Execution.user_id == user_uuid).delete(
-                synchronize_session=False
-            )
-
-            # Delete script logs for user's scripts
-            logger.info("[DB]: Deleting script logs for user's scripts")
-            ScriptLog.query.filter(ScriptLog.script_id.in_(script_ids_uuid)).delete(
-                synchronize_session=False
-            )
-
-            # Delete scripts
-            logger.info("[DB]: Deleting scripts")
-            Script.query.filter(Script.user_id == user_uuid).delete(
-                synchronize_session=False
-            )
-
-            # Delete password reset tokens
-            logger.info("[DB]: Deleting password reset tokens")
-            PasswordResetToken.query.filter(
-                PasswordResetToken.user_id == user_uuid
-            ).delete(synchronize_session=False)
-
-            # Delete refresh tokens
-            logger.info("[DB]: Deleting refresh tokens")
-            RefreshToken.query.filter(RefreshToken.user_id == user_uuid).delete(
-                synchronize_session=False
-            )
-
-            # Now delete the user
-            logger.info("[DB]: DELETE user")
-            db.session.delete(user)
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
-            rollbar.report_exc_info()
-            raise
         return user_data
 
     @staticmethod
@@ -919,7 +835,7 @@ class UserService:
         if not user:
             # Perform a constant-time dummy password check to prevent user
             # enumeration via response-time differences (CWE-208).
-            check_password_hash(_DUMMY_PASSWORD_HASH, password)
+            verify_password(_dummy_password_hash(), password)
             logger.warning(
                 f"[AUTH]: Failed login - user not found: {mask_email(email)}"
             )
@@ -4,15 +4,18 @@
 from gefapi.tasks import (
     batch_monitoring,  # noqa: F401
     bulk_email_send,  # noqa: F401
+    client_activity_flush,  # noqa: F401
     deletion_audit_cleanup,  # noqa: F401
     docker_completed_monitoring,  # noqa: F401
     docker_service_monitoring,  # noqa: F401
     execution_cancellation,  # noqa: F401
     execution_cleanup,  # noqa: F401
+    export_jobs,  # noqa: F401
     queue_processor,  # noqa: F401
     refresh_token_cleanup,  # noqa: F401
     sparkpost_suppression_sync,  # noqa: F401
     stats_cache_refresh,  # noqa: F401
     status_monitoring,  # noqa: F401
     user_cleanup,  # noqa: F401
+    user_deletion,  # noqa: F401
 )
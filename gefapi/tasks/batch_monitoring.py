@@ -1,8 +1,8 @@
-"""AWS Batch execution monitoring task.
+"""AWS Batch execution monitoring tasks.
 
-Periodically polls AWS Batch for the status of executions dispatched via
-``batch_run``.  When a Batch job reaches a terminal state, this task
-updates the ``Execution`` record in the database:
+Tracks the status of executions dispatched via ``batch_run``.  When a
+Batch job reaches a terminal state, the ``Execution`` record in the
+database is updated:
 
 * **SUCCEEDED** – downloads the results JSON from S3 and sets
   ``execution.status = "FINISHED"``.
@@ -13,6 +13,18 @@ This centralises lifecycle management in the API so that individual
 script containers do **not** need to authenticate with or call back to
 the API.  Containers only need S3 write access to deposit a results file.
 
+Status sources
+~~~~~~~~~~~~~~
+``monitor_batch_executions`` polls ``DescribeJobs`` for all active batch
+executions.  When ``BATCH_MONITORING.EVENTS_BACKEND`` is set,
+``consume_batch_job_events`` also applies Batch job state change events
+(see ``gefapi.services.batch_job_events``) as they arrive, and the poller
+runs every ``POLL_INTERVAL_SECONDS`` as a safety net for missed events.
+
+Both commit status changes before downloading any results; results of
+succeeded executions are then fetched by a pool of ``RESULTS_WORKERS``
+threads, so a slow S3 read does not hold up other executions.
+
 Results convention
 ~~~~~~~~~~~~~~~~~~
 The container writes its results payload to::
@@ -23,21 +35,26 @@ The monitor downloads that file and stores the parsed dict in
 ``execution.results``.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime
 import gzip
 import json
 import logging
 import os
-from pathlib import Path
-import tempfile
+import time
 
-import boto3
 from celery import Task
 import rollbar
-from sqlalchemy import and_
+from sqlalchemy import and_, cast, func, literal
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.orm import load_only
 
 from gefapi import db
+from gefapi.config import SETTINGS
 from gefapi.models import Execution, ExecutionLog, Script
+from gefapi.s3 import download_bytes
+from gefapi.services.batch_job_events import get_job_event_queue
+from gefapi.utils.aws_clients import get_aws_client
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +69,25 @@ PARAMS_S3_PREFIX = os.getenv("PARAMS_S3_PREFIX", "execution_params")
 # Batch terminal statuses
 _BATCH_TERMINAL = frozenset({"SUCCEEDED", "FAILED"})
 
+# Order in which a job moves through Batch statuses; a job's recorded
+# status never moves backwards when events arrive out of order.
+_BATCH_STATUS_ORDER = {
+    "SUBMITTED": 0,
+    "PENDING": 1,
+    "RUNNABLE": 2,
+    "STARTING": 3,
+    "RUNNING": 4,
+    "SUCCEEDED": 5,
+    "FAILED": 5,
+}
+
 # How far back to look for active batch executions (matches the stale
 # execution cleanup window).
 _LOOKBACK_DAYS = 3
 
+# Matches results whose batch_jobs map any job name to one of $ids
+_BATCH_JOB_IDS_PATH = "$.batch_jobs.* ? (@ == $ids[*])"
+
 
 # ---------------------------------------------------------------------------
 # Celery task boilerplate
@@ -80,11 +112,11 @@ from gefapi import celery  # noqa: E402
 
 
 def _batch_client():
-    return boto3.client("batch", region_name=AWS_REGION)
+    return get_aws_client("batch", region_name=AWS_REGION)
 
 
 def _s3_client():
-    return boto3.client("s3", region_name=AWS_REGION)
+    return get_aws_client("s3", region_name=AWS_REGION)
 
 
 # ---------------------------------------------------------------------------
@@ -96,7 +128,9 @@ def _s3_client():
 def monitor_batch_executions(self):
     """Poll AWS Batch for active batch executions and update the DB.
 
-    This task is designed to run every 2–3 minutes via Celery Beat.  It:
+    This task runs via Celery Beat every ``POLL_INTERVAL_SECONDS``: every
+    2 minutes by default, and as a low-frequency safety net when job state
+    events are consumed.  It:
 
     1. Queries the database for ``RUNNING`` or ``READY`` executions that
        belong to scripts with ``compute_type = "batch"``.
@@ -105,6 +139,8 @@ def monitor_batch_executions(self):
     3. Calls ``DescribeJobs`` (batched, up to 100 per API call).
     4. For each execution, determines the aggregate status across all
        jobs (single-job or pipeline) and updates the execution record.
+    5. Downloads the results of succeeded executions concurrently and
+       marks them ``FINISHED``.
     """
     logger.info("[BATCH-MONITOR] Starting batch execution monitoring")
 
@@ -112,24 +148,7 @@ def monitor_batch_executions(self):
 
     with app.app_context():
         try:
-            cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
-                days=_LOOKBACK_DAYS
-            )
-
-            active = (
-                db.session.query(Execution)
-                .join(Script, Execution.script_id == Script.id)
-                .filter(
-                    and_(
-                        Execution.status.in_(["READY", "RUNNING"]),
-                        Script.compute_type == "batch",
-                        Execution.start_date >= cutoff,
-                    ),
-                )
-                .order_by(Execution.start_date.desc())
-                .limit(200)
-                .all()
-            )
+            active = _active_batch_executions(limit=200)
 
             logger.info("[BATCH-MONITOR] Found %d active batch executions", len(active))
             if not active:
@@ -156,43 +175,8 @@ def monitor_batch_executions(self):
                 logger.info("[BATCH-MONITOR] No Batch job IDs found to check")
                 return {"checked": 0, "finished": 0, "failed": 0}
 
-            # --- describe jobs in chunks of 100 ---
-            client = _batch_client()
-            job_details: dict = {}
-            for i in range(0, len(all_job_ids), 100):
-                chunk = all_job_ids[i : i + 100]
-                try:
-                    resp = client.describe_jobs(jobs=chunk)
-                    for job in resp.get("jobs", []):
-                        job_details[job["jobId"]] = job
-                except Exception as exc:
-                    logger.error(
-                        "[BATCH-MONITOR] describe_jobs failed for chunk: %s", exc
-                    )
-
-            # --- update each execution ---
-            finished_count = 0
-            failed_count = 0
-
-            for execution in active:
-                batch_jobs = exec_jobs.get(execution.id)
-                if not batch_jobs:
-                    continue
-                try:
-                    result = _process_execution(execution, batch_jobs, job_details)
-                    if result == "FINISHED":
-                        finished_count += 1
-                    elif result == "FAILED":
-                        failed_count += 1
-                except Exception as exc:
-                    logger.error(
-                        "[BATCH-MONITOR] Error processing execution %s: %s",
-                        execution.id,
-                        exc,
-                    )
-                    rollbar.report_exc_info()
-
-            db.session.commit()
+            job_details = _describe_jobs(all_job_ids)
+            finished_count, failed_count = _reconcile(active, exec_jobs, job_details)
 
             logger.info(
                 "[BATCH-MONITOR] Done. checked=%d finished=%d failed=%d",
@@ -212,36 +196,244 @@ def monitor_batch_executions(self):
             return {"error": str(exc)}
 
 
+@celery.task(base=BatchMonitoringTask, bind=True)
+def consume_batch_job_events(self):
+    """Apply Batch job state change events to their executions.
+
+    Scheduled every minute when ``BATCH_MONITORING.EVENTS_BACKEND`` is
+    set.  Receives events in batches of up to ten for about
+    ``EVENTS_CONSUME_SECONDS``, updating the executions of each batch with
+    one query, and acknowledges a batch once it has been committed.  The
+    long-poll wait is capped at the time left, so a run ends before the
+    next one is due.
+    """
+    from gefapi import app
+
+    with app.app_context():
+        events_queue = get_job_event_queue()
+        if events_queue is None:
+            return {"events": 0, "finished": 0, "failed": 0}
+
+        consume_seconds = _monitoring_settings().get("EVENTS_CONSUME_SECONDS", 50)
+        deadline = time.monotonic() + consume_seconds
+        totals = {"events": 0, "finished": 0, "failed": 0}
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                messages = events_queue.receive(max_wait_seconds=remaining)
+                if not messages:
+                    break
+                details = [detail for _receipt, detail in messages if detail]
+                if len(details) < len(messages):
+                    logger.warning(
+                        "[BATCH-EVENTS] Dropping %d messages that are not "
+                        "Batch job events",
+                        len(messages) - len(details),
+                    )
+
+                finished, failed = _apply_job_events(details)
+                events_queue.ack([receipt for receipt, _detail in messages])
+
+                totals["events"] += len(details)
+                totals["finished"] += finished
+                totals["failed"] += failed
+        except Exception as exc:
+            # Unacknowledged messages are redelivered
+            db.session.rollback()
+            logger.error("[BATCH-EVENTS] Unexpected error: %s", exc)
+            rollbar.report_exc_info()
+            return {**totals, "error": str(exc)}
+
+        if totals["events"]:
+            logger.info(
+                "[BATCH-EVENTS] Applied %d events: finished=%d failed=%d",
+                totals["events"],
+                totals["finished"],
+                totals["failed"],
+            )
+        return totals
+
+
+def _monitoring_settings():
+    return SETTINGS.get("BATCH_MONITORING", {})
+
+
+def _active_batch_executions(limit=None, job_ids=None):
+    """Return READY and RUNNING batch executions, most recent first.
+
+    With *job_ids*, only executions with one of those jobs in their
+    ``batch_jobs`` are returned, and only the columns needed to apply job
+    statuses are loaded.
+    """
+    cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        days=_LOOKBACK_DAYS
+    )
+    query = (
+        db.session.query(Execution)
+        .join(Script, Execution.script_id == Script.id)
+        .filter(
+            and_(
+                Execution.status.in_(["READY", "RUNNING"]),
+                Script.compute_type == "batch",
+                Execution.start_date >= cutoff,
+            ),
+        )
+        .order_by(Execution.start_date.desc())
+    )
+    if job_ids:
+        query = query.filter(
+            func.jsonb_path_exists(
+                Execution.results,
+                cast(_BATCH_JOB_IDS_PATH, JSONPATH),
+                literal({"ids": list(job_ids)}, JSONB),
+            )
+        ).options(
+            load_only(
+                Execution.id, Execution.status, Execution.end_date, Execution.results
+            )
+        )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def _describe_jobs(job_ids):
+    """Describe jobs in chunks of 100; returns ``{job_id: job}``."""
+    client = _batch_client()
+    job_details: dict = {}
+    for i in range(0, len(job_ids), 100):
+        chunk = job_ids[i : i + 100]
+        try:
+            resp = client.describe_jobs(jobs=chunk)
+            for job in resp.get("jobs", []):
+                job_details[job["jobId"]] = job
+        except Exception as exc:
+            logger.error("[BATCH-MONITOR] describe_jobs failed for chunk: %s", exc)
+    return job_details
+
+
+def _apply_job_events(details):
+    """Update the executions whose jobs appear in *details*.
+
+    Returns:
+        Tuple of (finished, failed) execution counts
+    """
+    job_details: dict = {}
+    for detail in details:
+        # Events may arrive out of order; keep each job's latest status
+        current = job_details.get(detail["jobId"])
+        if current is None or _status_rank(detail["status"]) >= _status_rank(
+            current["status"]
+        ):
+            job_details[detail["jobId"]] = detail
+    if not job_details:
+        return 0, 0
+
+    executions = _active_batch_executions(job_ids=job_details)
+    exec_jobs = {
+        execution.id: execution.results["batch_jobs"] for execution in executions
+    }
+
+    # Jobs of executions that have already finished, or were not started
+    # by this API, are ignored
+    logger.info(
+        "[BATCH-EVENTS] %d job events touch %d executions",
+        len(job_details),
+        len(executions),
+    )
+    return _reconcile(executions, exec_jobs, job_details, partial=True)
+
+
+def _reconcile(executions, exec_jobs, job_details, partial=False):
+    """Apply job details to *executions* and finish the succeeded ones.
+
+    Status changes are committed together first; results of succeeded
+    executions are then downloaded concurrently, so a slow S3 read only
+    delays its own execution.
+
+    Returns:
+        Tuple of (finished, failed) execution counts
+    """
+    failed_count = 0
+    succeeded = []
+
+    for execution in executions:
+        batch_jobs = exec_jobs.get(execution.id)
+        if not batch_jobs:
+            continue
+        try:
+            result = _process_execution(
+                execution, batch_jobs, job_details, partial=partial
+            )
+            if result == "SUCCEEDED":
+                succeeded.append(execution.id)
+            elif result == "FAILED":
+                failed_count += 1
+        except Exception as exc:
+            logger.error(
+                "[BATCH-MONITOR] Error processing execution %s: %s",
+                execution.id,
+                exc,
+            )
+            rollbar.report_exc_info()
+
+    db.session.commit()
+
+    return _finish_succeeded(succeeded), failed_count
+
+
 # ---------------------------------------------------------------------------
 # Per-execution processing
 # ---------------------------------------------------------------------------
 
 
-def _process_execution(execution, batch_jobs, job_details):
+def _status_rank(status):
+    return _BATCH_STATUS_ORDER.get(status, -1)
+
+
+def _job_status(job):
+    attempts = job.get("attempts", [])
+    info = {
+        "status": job["status"],
+        "reason": job.get("statusReason"),
+        "started_at": str(job.get("startedAt", "")),
+        "stopped_at": str(job.get("stoppedAt", "")),
+        "log_stream_name": (job.get("container") or {}).get("logStreamName"),
+        "attempts": len(attempts),
+    }
+    # For array jobs, include the per-status summary so we can
+    # see how many children succeeded / are being retried.
+    if job.get("arrayProperties"):
+        info["array_size"] = job["arrayProperties"].get("size")
+        info["array_status"] = job["arrayProperties"].get("statusSummary", {})
+    return info
+
+
+def _process_execution(execution, batch_jobs, job_details, partial=False):
     """Evaluate Batch job statuses for *execution* and update the DB row.
 
-    Returns ``"FINISHED"``, ``"FAILED"``, or ``None`` (still running).
+    With *partial*, *job_details* only covers some of the jobs (as with
+    events): the others keep their last known status, and no job moves
+    back to an earlier status.
+
+    Returns ``"FAILED"``, ``"SUCCEEDED"`` (all jobs done; the execution is
+    finished once its results have been fetched), or ``None`` (still
+    running).
     """
+    known = (execution.results or {}).get("batch_statuses") or {} if partial else {}
     statuses = {}
     for name, job_id in batch_jobs.items():
         job = job_details.get(job_id)
-        if job:
-            attempts = job.get("attempts", [])
-            statuses[name] = {
-                "status": job["status"],
-                "reason": job.get("statusReason"),
-                "started_at": str(job.get("startedAt", "")),
-                "stopped_at": str(job.get("stoppedAt", "")),
-                "log_stream_name": (job.get("container") or {}).get("logStreamName"),
-                "attempts": len(attempts),
-            }
-            # For array jobs, include the per-status summary so we can
-            # see how many children succeeded / are being retried.
-            if job.get("arrayProperties"):
-                statuses[name]["array_size"] = job["arrayProperties"].get("size")
-                statuses[name]["array_status"] = job["arrayProperties"].get(
-                    "statusSummary", {}
-                )
+        previous = known.get(name)
+        if job and not (
+            previous
+            and _status_rank(job["status"]) < _status_rank(previous.get("status"))
+        ):
+            statuses[name] = _job_status(job)
+        elif previous:
+            statuses[name] = previous
         else:
             statuses[name] = {"status": "NOT_FOUND"}
 
@@ -281,54 +473,113 @@ def _process_execution(execution, batch_jobs, job_details):
         )
         return "FAILED"
 
-    # --- all succeeded → fetch results, mark FINISHED ---
+    # --- still in progress, or waiting for its results → update
+    # visibility info ---
+    current_results = dict(execution.results or {})
+    current_results["batch_statuses"] = statuses
+    execution.results = current_results
+    db.session.add(execution)
     if all(s == "SUCCEEDED" for s in all_job_statuses):
-        results = _fetch_results_from_s3(str(execution.id))
-        if results is not None:
-            # Preserve batch_jobs and batch_statuses in the results so that
-            # the batch-logs endpoint can still look up CloudWatch streams
-            # after the execution finishes.
-            if isinstance(results, dict):
-                results.setdefault("batch_jobs", batch_jobs)
-                results.setdefault("batch_statuses", statuses)
-            execution.results = results
-        else:
-            # Container succeeded but no results file – store batch info
-            execution.results = {
-                "batch_jobs": batch_jobs,
-                "batch_statuses": statuses,
-                "note": "Batch job succeeded but no results file found in S3",
-            }
-            warn_log = ExecutionLog(
-                text="Batch job succeeded but no results file was found in S3",
-                level="WARN",
-                execution_id=execution.id,
-            )
-            db.session.add(warn_log)
-            logger.warning(
-                "[BATCH-MONITOR] Execution %s succeeded but no results in S3",
-                execution.id,
-            )
+        return "SUCCEEDED"
+    return None
 
-        execution.status = "FINISHED"
-        execution.end_date = datetime.datetime.now(datetime.UTC)
 
-        log_entry = ExecutionLog(
-            text="Batch job completed successfully",
-            level="INFO",
+# ---------------------------------------------------------------------------
+# Results stage
+# ---------------------------------------------------------------------------
+
+
+def _finish_succeeded(execution_ids):
+    """Download results of succeeded executions concurrently and finish them.
+
+    Only the S3 downloads run in worker threads; each execution is updated
+    and committed on this thread as soon as its results arrive.
+
+    Returns:
+        Number of executions marked FINISHED
+    """
+    if not execution_ids:
+        return 0
+
+    workers = max(1, _monitoring_settings().get("RESULTS_WORKERS", 8))
+    finished_count = 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(execution_ids))) as pool:
+        futures = {
+            pool.submit(_fetch_results_from_s3, str(execution_id)): execution_id
+            for execution_id in execution_ids
+        }
+        for future in as_completed(futures):
+            execution_id = futures[future]
+            try:
+                if _finish_execution(execution_id, future.result()):
+                    finished_count += 1
+                db.session.commit()
+            except Exception as exc:
+                db.session.rollback()
+                logger.error(
+                    "[BATCH-MONITOR] Error finishing execution %s: %s",
+                    execution_id,
+                    exc,
+                )
+                rollbar.report_exc_info()
+    return finished_count
+
+
+def _finish_execution(execution_id, results):
+    """Store *results* on a succeeded execution and mark it FINISHED.
+
+    The row is locked and re-read first, so an execution finished by the
+    poller and the event consumer at the same time is only finished once.
+
+    Returns:
+        True if the execution was finished here
+    """
+    execution = db.session.get(
+        Execution, execution_id, with_for_update=True, populate_existing=True
+    )
+    if execution is None or execution.status not in ("READY", "RUNNING"):
+        return False
+
+    batch_jobs = (execution.results or {}).get("batch_jobs")
+    statuses = (execution.results or {}).get("batch_statuses")
+    if results is not None:
+        # Preserve batch_jobs and batch_statuses in the results so that
+        # the batch-logs endpoint can still look up CloudWatch streams
+        # after the execution finishes.
+        if isinstance(results, dict):
+            results.setdefault("batch_jobs", batch_jobs)
+            results.setdefault("batch_statuses", statuses)
+        execution.results = results
+    else:
+        # Container succeeded but no results file – store batch info
+        execution.results = {
+            "batch_jobs": batch_jobs,
+            "batch_statuses": statuses,
+            "note": "Batch job succeeded but no results file found in S3",
+        }
+        warn_log = ExecutionLog(
+            text="Batch job succeeded but no results file was found in S3",
+            level="WARN",
             execution_id=execution.id,
         )
-        db.session.add(log_entry)
-        db.session.add(execution)
-        logger.info("[BATCH-MONITOR] Execution %s → FINISHED", execution.id)
-        return "FINISHED"
+        db.session.add(warn_log)
+        logger.warning(
+            "[BATCH-MONITOR] Execution %s succeeded but no results in S3",
+            execution.id,
+        )
 
-    # --- still in progress → update visibility info ---
-    current_results = dict(execution.results or {})
-    current_results["batch_statuses"] = statuses
-    execution.results = current_results
+    execution.status = "FINISHED"
+    execution.end_date = datetime.datetime.now(datetime.UTC)
+
+    log_entry = ExecutionLog(
+        text="Batch job completed successfully",
+        level="INFO",
+        execution_id=execution.id,
+    )
+    db.session.add(log_entry)
     db.session.add(execution)
-    return None
+    logger.info("[BATCH-MONITOR] Execution %s → FINISHED", execution.id)
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -353,12 +604,8 @@ def _fetch_results_from_s3(execution_id):
         "[BATCH-MONITOR] Fetching results from s3://%s/%s", PARAMS_S3_BUCKET, key
     )
     try:
-        s3 = _s3_client()
-        with tempfile.TemporaryDirectory() as tmp:
-            gz_path = Path(tmp) / "results.json.gz"
-            s3.download_file(PARAMS_S3_BUCKET, key, str(gz_path))
-            with gzip.open(gz_path, "r") as f:
-                return json.loads(f.read().decode("utf-8"))
+        body = download_bytes(_s3_client(), PARAMS_S3_BUCKET, key)
+        return json.loads(gzip.decompress(body).decode("utf-8"))
     except Exception as exc:
         error_code = ""
         if hasattr(exc, "response"):
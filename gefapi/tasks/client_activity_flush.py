@@ -0,0 +1,42 @@
+"""CLIENT ACTIVITY FLUSH TASK
+
+Writes client-tracking and last-activity updates buffered in Redis by
+``ClientTrackingService`` to the database in one batch.
+"""
+
+import logging
+
+from celery import Task
+import rollbar
+
+logger = logging.getLogger(__name__)
+
+
+class ClientActivityFlushTask(Task):
+    """Base task for flushing buffered client activity"""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        logger.error(f"Client activity flush task failed: {exc}")
+        rollbar.report_exc_info()
+
+
+# Import celery after other imports to avoid circular dependency
+from gefapi import celery  # noqa: E402
+
+
+@celery.task(base=ClientActivityFlushTask, bind=True, ignore_result=True)
+def flush_client_activity(self):
+    """Flush buffered client accesses and user activity to the database.
+
+    Should be scheduled to run every minute.
+    """
+    try:
+        from gefapi import app
+        from gefapi.services.client_tracking_service import ClientTrackingService
+
+        with app.app_context():
+            return ClientTrackingService.flush_buffered_activity()
+
+    except Exception as error:
+        logger.error(f"[TASK]: Error flushing client activity: {error!s}")
+        raise
@@ -132,14 +132,8 @@ def cancel_execution_workflow(self, execution_id):
 
         if not is_batch:
             try:
-                logs = (
-                    ExecutionLog.query.filter(ExecutionLog.execution_id == execution.id)
-                    .order_by(ExecutionLog.register_date)
-                    .all()
-                )
-                log_texts = [log.text for log in logs if log.text]
-                if log_texts:
-                    gee_results = GEEService.cancel_gee_tasks_from_execution(log_texts)
+                gee_results = GEEService.cancel_gee_tasks_for_execution(execution.id)
+                if gee_results:
                     cancellation_results["gee_tasks_cancelled"] = gee_results
                     for gee_result in gee_results:
                         if not gee_result.get("success", False):
@@ -0,0 +1,47 @@
+"""EXPORT JOB TASK
+
+Celery task that writes an admin CSV export.
+
+The HTTP route creates a PENDING ExportJob and dispatches this task,
+returning 202 Accepted immediately. The task streams the rows into a gzipped
+CSV, stores it and marks the job FINISHED, or FAILED on error.
+"""
+
+import logging
+
+from celery import Task
+import rollbar
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobTask(Task):
+    """Base task for export jobs."""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        logger.error("Export job task %s failed: %s", task_id, exc)
+        rollbar.report_exc_info()
+
+
+# Import celery after other imports to avoid circular dependency
+from gefapi import celery  # noqa: E402
+
+
+@celery.task(base=ExportJobTask, bind=True)
+def run_export_job(self, export_job_id: str) -> None:
+    """Run an export job, updating its record as it progresses.
+
+    Parameters
+    ----------
+    export_job_id:     UUID string of the ExportJob record (status=PENDING).
+    """
+    logger.info("[TASK]: Starting export job %s", export_job_id)
+
+    from gefapi import app
+    from gefapi.services.export_service import ExportService
+
+    with app.app_context():
+        # run_job marks the job FAILED before re-raising; not retried, since
+        # a retry would restart the export from the first row anyway
+        ExportService.run_job(export_job_id)
+        logger.info("[TASK]: Export job %s completed", export_job_id)
@@ -34,14 +34,12 @@ from sqlalchemy import and_
 
 from gefapi import db
 from gefapi.models import Execution, ExecutionLog, Script, User
+from gefapi.utils.lazy_import import lazy_import
 
 logger = logging.getLogger(__name__)
 
-# Import openeo at module level for test mocking, but allow ImportError
-try:
-    import openeo  # type: ignore
-except ImportError:
-    openeo = None  # type: ignore
+# Imported on first use; falsy when openeo is not installed
+openeo = lazy_import("openeo")
 
 # How far back to look for active openEO executions.
 _LOOKBACK_DAYS = 3
@@ -182,7 +180,7 @@ def _poll_execution(execution):
         return None
 
     try:
-        if openeo is None:
+        if not openeo:
             logger.error(
                 "[OPENEO-MONITOR]: openeo package not installed "
                 "— cannot poll execution %s",
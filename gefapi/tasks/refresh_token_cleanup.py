@@ -6,6 +6,7 @@ import os
 
 from celery import Task
 import rollbar
+from sqlalchemy import and_
 
 logger = logging.getLogger(__name__)
 
@@ -67,8 +68,9 @@ def cleanup_inactive_refresh_tokens(self):
     logger.info(f"[TASK]: Starting cleanup of tokens inactive for {inactive_days} days")
 
     try:
-        from gefapi import app, db
+        from gefapi import app
         from gefapi.models.refresh_token import RefreshToken
+        from gefapi.utils.retention import update_in_batches
 
         with app.app_context():
             cutoff_date = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
@@ -82,19 +84,17 @@ def cleanup_inactive_refresh_tokens(self):
             # before last_used_at tracking - we leave these alone for backwards
             # compatibility. They will eventually be cleaned up by the expired
             # token cleanup task.
-            inactive_tokens = RefreshToken.query.filter(
-                RefreshToken.is_revoked.is_(False),
-                RefreshToken.last_used_at.isnot(None),
-                RefreshToken.last_used_at < cutoff_date,
-            ).all()
-
-            revoked_count = 0
-            for token in inactive_tokens:
-                token.is_revoked = True
-                revoked_count += 1
-
-            if revoked_count > 0:
-                db.session.commit()
+            result = update_in_batches(
+                RefreshToken,
+                and_(
+                    RefreshToken.is_revoked.is_(False),
+                    RefreshToken.last_used_at.isnot(None),
+                    RefreshToken.last_used_at < cutoff_date,
+                ),
+                {"is_revoked": True},
+                name="inactive refresh tokens",
+            )
+            revoked_count = result["rows"]
 
             logger.info(
                 f"[TASK]: Revoked {revoked_count} inactive refresh tokens "
@@ -77,10 +77,12 @@ def cleanup_unverified_users(self):
             # 1. Have email_verified = False (explicitly unverified)
             # 2. Were created more than cleanup_days ago
             # 3. Have never logged in (no last_login_at)
+            # 4. Are not already tombstoned and waiting for their purge
             unverified_users = User.query.filter(
                 User.email_verified.is_(False),
                 User.created_at < cutoff_date,
                 User.last_login_at.is_(None),
+                User.deleted_at.is_(None),
             ).all()
 
             deleted_count = 0
@@ -89,6 +91,7 @@ def cleanup_unverified_users(self):
             for user in unverified_users:
                 try:
                     email = user.email
+                    created_at = user.created_at
                     # Create context for audit record
                     context = json.dumps(
                         {
@@ -105,7 +108,7 @@ def cleanup_unverified_users(self):
                     deleted_emails.append(email)
                     logger.info(
                         f"[TASK]: Deleted unverified user: {mask_email(email)} "
-                        f"(created: {user.created_at})"
+                        f"(created: {created_at})"
                     )
                 except Exception as e:
                     masked = mask_email(user.email)
@@ -175,9 +178,11 @@ def cleanup_never_logged_in_users(self):
             # Find users that:
             # 1. Have never logged in (last_login_at is NULL)
             # 2. Were created more than cleanup_days ago
+            # 3. Are not already tombstoned and waiting for their purge
             never_logged_in_users = User.query.filter(
                 User.last_login_at.is_(None),
                 User.created_at < cutoff_date,
+                User.deleted_at.is_(None),
             ).all()
 
             deleted_count = 0
@@ -186,6 +191,7 @@ def cleanup_never_logged_in_users(self):
             for user in never_logged_in_users:
                 try:
                     email = user.email
+                    created_at = user.created_at
                     # Create context for audit record
                     context = json.dumps(
                         {
@@ -202,7 +208,7 @@ def cleanup_never_logged_in_users(self):
                     deleted_emails.append(email)
                     logger.info(
                         f"[TASK]: Deleted never-logged-in user: {mask_email(email)} "
-                        f"(created: {user.created_at})"
+                        f"(created: {created_at})"
                     )
                 except Exception as e:
                     logger.error(
@@ -277,12 +283,14 @@ def get_user_cleanup_stats(self):
                 User.email_verified.is_(False),
                 User.created_at < unverified_cutoff,
                 User.last_login_at.is_(None),
+                User.deleted_at.is_(None),
             ).count()
 
             # Count never-logged-in users eligible for cleanup
             never_logged_in_eligible = User.query.filter(
                 User.last_login_at.is_(None),
                 User.created_at < inactive_cutoff,
+                User.deleted_at.is_(None),
             ).count()
 
             # Count verified users
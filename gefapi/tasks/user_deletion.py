@@ -0,0 +1,83 @@
+"""USER DELETION TASKS
+
+Background purge of tombstoned users (see ``UserDeletionService``).
+
+``purge_deleted_user`` deletes one user's data in bounded batches for up to
+``USER_DELETION["TASK_SECONDS"]`` and re-queues itself if work remains, so
+several users are purged in parallel across workers and no single task holds
+a worker for long. ``resume_user_deletions`` runs periodically and re-queues
+purges whose worker was lost or whose task was never queued.
+"""
+
+import logging
+
+from celery import Task
+import rollbar
+
+logger = logging.getLogger(__name__)
+
+
+class UserDeletionTask(Task):
+    """Base task for user deletion operations"""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        logger.error(f"User deletion task failed: {exc}")
+        rollbar.report_exc_info()
+
+
+# Import celery after other imports to avoid circular dependency
+from gefapi import celery  # noqa: E402
+
+
+@celery.task(base=UserDeletionTask, bind=True, ignore_result=True)
+def purge_deleted_user(self, audit_id):
+    """Purge a tombstoned user's data, continuing in a new task if needed."""
+    logger.info(f"[TASK]: Purging data for deletion {audit_id}")
+
+    try:
+        from gefapi import app
+        from gefapi.config import SETTINGS
+        from gefapi.models import PurgeStatus
+        from gefapi.services.user_deletion_service import UserDeletionService
+
+        with app.app_context():
+            time_budget = SETTINGS.get("USER_DELETION", {}).get("TASK_SECONDS", 240)
+            status = UserDeletionService.purge(audit_id, time_budget=time_budget)
+
+            if status == PurgeStatus.IN_PROGRESS:
+                # Budget used up; continue in a fresh task so other purges
+                # queued behind this one get a turn
+                purge_deleted_user.delay(audit_id)
+
+            return {"audit_id": audit_id, "status": status}
+
+    except Exception as error:
+        logger.error(f"[TASK]: Error purging deletion {audit_id}: {error!s}")
+        raise self.retry(exc=error, countdown=60, max_retries=3) from error
+
+
+@celery.task(base=UserDeletionTask, bind=True)
+def resume_user_deletions(self):
+    """Queue purges that are pending or whose worker stopped heartbeating.
+
+    Should be scheduled to run every few minutes.
+    """
+    logger.info("[TASK]: Checking for interrupted user deletions")
+
+    try:
+        from gefapi import app
+        from gefapi.services.user_deletion_service import UserDeletionService
+
+        with app.app_context():
+            audits = UserDeletionService.get_resumable_deletions()
+            for audit in audits:
+                purge_deleted_user.delay(str(audit.id))
+
+            if audits:
+                logger.info(f"[TASK]: Resumed {len(audits)} user deletion purges")
+
+            return {"status": "success", "resumed_count": len(audits)}
+
+    except Exception as error:
+        logger.error(f"[TASK]: Error resuming user deletions: {error!s}")
+        raise self.retry(exc=error, countdown=60, max_retries=3) from error
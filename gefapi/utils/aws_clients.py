@@ -0,0 +1,85 @@
+"""Process-wide registry of boto3 clients.
+
+Constructing a boto3 client loads the service's endpoint and model JSON,
+resolves credentials and opens a fresh connection pool, which costs tens of
+milliseconds per call and defeats HTTP keep-alive. The S3, Batch and
+CloudWatch Logs paths used to do this on every operation.
+
+``get_aws_client`` returns one shared client per (service, region) and
+process. boto3 clients are thread-safe, so the same client serves all
+threads and greenlets of a worker; its pool size, retry policy and TCP
+keep-alive come from ``AWS_CLIENTS`` in the settings. Clients are never
+shared across a fork: Celery prefork children and recycled gunicorn workers
+build their own on first use.
+"""
+
+import logging
+import os
+import threading
+
+from gefapi.config import SETTINGS
+from gefapi.utils.lazy_import import lazy_import
+
+boto3 = lazy_import("boto3")
+botocore_config = lazy_import("botocore.config")
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_clients_pid = None
+_lock = threading.Lock()
+
+
+def _client_config():
+    settings = SETTINGS.get("AWS_CLIENTS", {})
+    return botocore_config.Config(
+        max_pool_connections=settings.get("MAX_POOL_CONNECTIONS", 20),
+        retries={
+            "max_attempts": settings.get("MAX_ATTEMPTS", 5),
+            "mode": settings.get("RETRY_MODE", "standard"),
+        },
+        connect_timeout=settings.get("CONNECT_TIMEOUT", 10),
+        read_timeout=settings.get("READ_TIMEOUT", 60),
+        tcp_keepalive=True,
+    )
+
+
+def get_aws_client(service_name, region_name=None):
+    """Return this process's shared boto3 client for ``service_name``.
+
+    Args:
+        service_name: boto3 service name, e.g. ``"s3"`` or ``"batch"``
+        region_name: AWS region, or None for the default resolution chain
+
+    Returns:
+        boto3 client
+    """
+    global _clients_pid
+    key = (service_name, region_name)
+    pid = os.getpid()
+    if _clients_pid == pid:
+        client = _clients.get(key)
+        if client is not None:
+            return client
+
+    with _lock:
+        if _clients_pid != pid:
+            # First use in this process, or inherited across a fork
+            _clients.clear()
+            _clients_pid = pid
+        client = _clients.get(key)
+        if client is None:
+            logger.debug(f"[SERVICE]: Creating {service_name} client ({region_name})")
+            client = boto3.client(
+                service_name, region_name=region_name, config=_client_config()
+            )
+            _clients[key] = client
+    return client
+
+
+def reset_aws_clients():
+    """Drop all cached clients; the next call creates new ones."""
+    global _clients_pid
+    with _lock:
+        _clients.clear()
+        _clients_pid = None
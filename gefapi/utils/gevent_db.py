@@ -0,0 +1,54 @@
+"""Cooperative PostgreSQL I/O for gevent workers.
+
+Gunicorn's gevent worker monkey-patches the standard library, but psycopg2
+talks to the server from C and is not affected: every query blocks the whole
+worker, including all of its other greenlets. Registering a psycopg2 wait
+callback makes libpq run asynchronously and hand control back to the gevent
+hub whenever a connection would block, so other requests keep being served
+while a query is in flight.
+
+The SQLAlchemy pool (``DB_POOL`` in the settings) then bounds how many of a
+worker's greenlets hold a connection at once; the rest wait cooperatively
+for a free connection for up to ``DB_POOL["TIMEOUT"]`` seconds.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """psycopg2 wait callback that yields to the gevent hub while waiting."""
+    from gevent.socket import wait_read, wait_write
+    from psycopg2 import OperationalError, extensions
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f"Bad result from poll: {state!r}")
+
+
+def make_psycopg_green():
+    """Make psycopg2 cooperative with gevent.
+
+    Call once per process, after gevent has patched the standard library
+    (e.g. from the gunicorn ``post_worker_init`` hook).
+
+    Returns:
+        True if the wait callback was installed
+    """
+    try:
+        from psycopg2 import extensions
+    except ImportError:
+        logger.warning("[DB]: psycopg2 not available, database I/O stays blocking")
+        return False
+
+    extensions.set_wait_callback(gevent_wait_callback)
+    logger.info("[DB]: Installed gevent wait callback for psycopg2")
+    return True
@@ -0,0 +1,76 @@
+"""Deferred imports for heavy optional SDKs.
+
+boto3, docker, Earth Engine, openEO and the Google API client together take
+well over a second to import. Most processes only ever use one or two of
+them (API containers never talk to Docker, most Celery workers never touch
+Earth Engine), yet every service module used to import all of them at load
+time, which slowed down every gunicorn ``max_requests`` and Celery
+``worker_max_tasks_per_child`` respawn.
+
+``lazy_import`` returns a stand-in that imports the real module on first
+attribute access or call. Service modules bind it to the same module-level
+name they used before, so ``patch("gefapi.services.gee_service.ee")`` in the
+tests keeps working. The stand-in is falsy when the package is not
+installed, so ``if not ee:`` replaces the old ``if ee is None:`` checks.
+"""
+
+import importlib
+import importlib.util
+
+
+class LazyImport:
+    """Proxy for a module, or an attribute of a module, imported on first use."""
+
+    def __init__(self, module_name, attribute=None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            target = importlib.import_module(self._module_name)
+            if self._attribute is not None:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        if name.startswith("_") and self._target is None:
+            # Introspection (mock.patch, copy, asyncio) probes private names;
+            # it must not trigger the import or fail if the package is missing
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __bool__(self):
+        if self._target is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self._module_name) is not None
+        except ModuleNotFoundError:
+            # Parent package missing, e.g. "googleapiclient" for
+            # "googleapiclient.discovery"
+            return False
+
+    def __repr__(self):
+        name = self._module_name
+        if self._attribute is not None:
+            name = f"{name}.{self._attribute}"
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {name} ({state})>"
+
+
+def lazy_import(module_name, attribute=None):
+    """Return a proxy for ``module_name`` (or its ``attribute``) that imports
+    it on first use.
+
+    Args:
+        module_name: Dotted module name, e.g. ``"docker.errors"``
+        attribute: Optional name to fetch from the module once imported
+
+    Returns:
+        LazyImport proxy
+    """
+    return LazyImport(module_name, attribute)
@@ -0,0 +1,166 @@
+"""Password hashing off the event loop.
+
+scrypt is deliberately CPU- and memory-hard. Run inline on a gevent worker,
+each hash stalls every other greenlet of that worker for its full duration.
+The helpers here run ``generate_password_hash`` / ``check_password_hash`` on
+a small pool of native threads instead (``hashlib.scrypt`` releases the GIL),
+so the calling greenlet yields while the hash is computed.
+
+At most ``MAX_PENDING`` hashes may be running or queued per process. Beyond
+that ``PasswordHashingBusy`` is raised and routes answer 429, rather than
+letting a login storm build an unbounded queue. The time each hash takes
+and the time it waited for a pool thread are recorded separately; see
+``get_hashing_stats``.
+"""
+
+from collections import deque
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from gefapi.config import SETTINGS
+from gefapi.errors import PasswordHashingBusy
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_pending = 0
+_rejected = 0
+# (hash seconds, queue wait seconds) of the most recent hashes
+_latencies = deque(maxlen=1000)
+
+
+def _settings():
+    return SETTINGS.get("PASSWORD_HASHING", {})
+
+
+def _get_pool():
+    """Return this process's hashing pool, creating it after a fork."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        threads = _settings().get("THREADS", 4)
+        try:
+            from gevent.monkey import is_module_patched
+            from gevent.threadpool import ThreadPool
+
+            use_gevent = is_module_patched("threading")
+        except ImportError:
+            use_gevent = False
+
+        if use_gevent:
+            # With threading monkey-patched, ThreadPoolExecutor would run on
+            # greenlets; gevent's pool uses real threads and wakes the hub
+            # when a result is ready
+            _pool = ThreadPool(threads)
+        else:
+            _pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=threads, thread_name_prefix="password-hash"
+            )
+        _pool_pid = pid
+    return _pool
+
+
+def _timed(func, args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def _run(func, *args):
+    global _pending, _rejected
+    max_pending = _settings().get("MAX_PENDING", 16)
+    with _lock:
+        if _pending >= max_pending:
+            _rejected += 1
+            logger.warning(
+                f"[AUTH]: Password hashing at capacity ({_pending} pending), "
+                "rejecting request"
+            )
+            raise PasswordHashingBusy(
+                "Too many concurrent login attempts, please retry shortly",
+                retry_after=_settings().get("RETRY_AFTER_SECONDS", 1),
+            )
+        _pending += 1
+
+    hash_seconds = None
+    started = time.perf_counter()
+    try:
+        pool = _get_pool()
+        if isinstance(pool, concurrent.futures.Executor):
+            result, hash_seconds = pool.submit(_timed, func, args).result()
+        else:
+            result, hash_seconds = pool.spawn(_timed, func, args).get()
+        return result
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            _pending -= 1
+            if hash_seconds is not None:
+                _latencies.append((hash_seconds, max(elapsed - hash_seconds, 0.0)))
+
+
+def hash_password(password):
+    """Return the scrypt hash of ``password``."""
+    return _run(generate_password_hash, password, "scrypt")
+
+
+def verify_password(password_hash, password):
+    """Check ``password`` against a stored Werkzeug hash."""
+    return _run(check_password_hash, password_hash, password)
+
+
+def get_hashing_stats():
+    """Return latency and load figures for password hashing in this process.
+
+    ``p50_ms``/``p95_ms``/``max_ms`` are the time spent hashing and
+    ``queue_*_ms`` the time spent waiting for a pool thread beforehand.
+    ``capacity_per_minute`` is how many hashes this process's pool can
+    complete per minute at the observed p95 hash time. ``AUTH_LIMITS``
+    should be set so that the expected login rate per worker stays below it.
+    """
+    with _lock:
+        samples = sorted(hash_seconds for hash_seconds, _wait in _latencies)
+        waits = sorted(wait for _hash_seconds, wait in _latencies)
+        pending = _pending
+        rejected = _rejected
+
+    threads = _settings().get("THREADS", 4)
+    stats = {
+        "threads": threads,
+        "max_pending": _settings().get("MAX_PENDING", 16),
+        "pending": pending,
+        "rejected": rejected,
+        "samples": len(samples),
+        "p50_ms": None,
+        "p95_ms": None,
+        "max_ms": None,
+        "queue_p50_ms": None,
+        "queue_p95_ms": None,
+        "queue_max_ms": None,
+        "capacity_per_minute": None,
+    }
+    if samples:
+        p95 = _percentile(samples, 0.95)
+        stats.update(
+            {
+                "p50_ms": round(_percentile(samples, 0.5) * 1000, 1),
+                "p95_ms": round(p95 * 1000, 1),
+                "max_ms": round(samples[-1] * 1000, 1),
+                "queue_p50_ms": round(_percentile(waits, 0.5) * 1000, 1),
+                "queue_p95_ms": round(_percentile(waits, 0.95) * 1000, 1),
+                "queue_max_ms": round(waits[-1] * 1000, 1),
+                "capacity_per_minute": int(threads * 60 / p95) if p95 > 0 else None,
+            }
+        )
+    return stats
+
+
+def _percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
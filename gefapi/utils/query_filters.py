@@ -2,19 +2,43 @@
 
 This module centralises the logic for translating the SQL-style ``filter``
 and ``sort`` query strings sent by the UI into SQLAlchemy filter/order
-clauses.  It is used by the execution, user, and script services.
+clauses.  It is used by the execution, user, script, rate limit event and
+bulk email services.
+
+Parsing happens in two cached steps:
+
+* :func:`compile_filter` and :func:`compile_sort` turn a query string into a
+  normalised AST of plain tuples.  They only depend on the string, so
+  ``status = 'A'`` and ``status='A'`` share one entry.
+* :meth:`QueryFields.compile` binds an AST to the columns, joins and
+  permissions of one model and returns a :class:`QueryPlan`.  Plans are
+  cached by field set, AST and admin access, the only part of the caller's
+  role they depend on.
+
+The admin UI sends the same few filter strings over and over, so most
+requests skip both steps.  Values always end up in bound parameters, which
+means identical plans also produce identical SQL and hit SQLAlchemy's
+compiled statement cache.
 """
 
 from __future__ import annotations
 
+import functools
 import logging
 import re
-from typing import Any
+from typing import Any, NamedTuple
 
-from sqlalchemy import asc, desc, func, or_
+from sqlalchemy import Index, and_, asc, desc, func, or_
+from sqlalchemy.sql.functions import FunctionElement
+
+from gefapi.errors import NotAllowed
 
 logger = logging.getLogger(__name__)
 
+# Number of compiled ASTs and plans kept in each LRU cache
+AST_CACHE_SIZE = 1024
+PLAN_CACHE_SIZE = 512
+
 # Pre-compiled patterns -------------------------------------------------
 
 # Matches a parenthesised OR group, e.g.
@@ -31,6 +55,95 @@ _SIMPLE_EXPR_RE = re.compile(
     re.IGNORECASE,
 )
 
+# LIKE wildcards and escape character; a pattern's literal prefix ends at
+# the first of them
+_LIKE_SPECIAL_RE = re.compile(r"[%_\\]")
+
+
+# AST ----------------------------------------------------------------------
+
+
+class FilterCondition(NamedTuple):
+    """One normalised ``field op value`` comparison."""
+
+    field: str
+    op: str
+    value: str
+
+
+# A compiled filter is a tuple of OR groups that are ANDed together; a plain
+# expression is a group of one condition.
+FilterAST = tuple[tuple[FilterCondition, ...], ...]
+
+# A compiled sort is a tuple of (field, "asc" | "desc") pairs
+SortAST = tuple[tuple[str, str], ...]
+
+
+def _parse_condition(expr: str) -> FilterCondition | None:
+    m = _SIMPLE_EXPR_RE.match(expr.strip())
+    if not m:
+        return None
+    field, op, value = m.groups()
+    return FilterCondition(
+        field.strip().lower(), op.strip().lower(), value.strip().strip("'\"")
+    )
+
+
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def compile_filter(filter_param: str) -> FilterAST:
+    """Parse a complete ``filter`` query-string value into its AST.
+
+    Supports:
+    * Simple comma-separated expressions: ``status='RUNNING',script_name like '%foo%'``
+    * Parenthesised OR groups: ``(status='PENDING' OR status='RUNNING')``
+    * Mixed: ``(status='PENDING' OR status='RUNNING'),script_name like '%foo%'``
+
+    Expressions that can't be parsed are dropped.  Field names are not
+    checked here; that happens when the AST is bound to a model.
+    """
+    groups: list[tuple[FilterCondition, ...]] = []
+
+    for raw_expr in _split_filter_expressions(filter_param):
+        raw_expr = raw_expr.strip()
+        if not raw_expr:
+            continue
+
+        or_match = _OR_GROUP_RE.match(raw_expr)
+        if or_match:
+            # Parenthesised OR group — split inner content on " OR "
+            sub_exprs = re.split(r"\s+OR\s+", or_match.group(1), flags=re.IGNORECASE)
+        else:
+            sub_exprs = [raw_expr]
+
+        conditions = tuple(
+            condition
+            for condition in map(_parse_condition, sub_exprs)
+            if condition is not None
+        )
+        if conditions:
+            groups.append(conditions)
+
+    return tuple(groups)
+
+
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def compile_sort(sort_param: str) -> SortAST:
+    """Parse a ``sort`` query-string value into its AST.
+
+    Format: ``"field direction[,field direction]"`` where *direction* is
+    ``asc`` or ``desc`` (default ``asc``).
+    """
+    terms: list[tuple[str, str]] = []
+
+    for sort_expr in sort_param.split(","):
+        parts = sort_expr.split()
+        if not parts:
+            continue
+        direction = parts[1].lower() if len(parts) > 1 else "asc"
+        terms.append((parts[0].lower(), "desc" if direction == "desc" else "asc"))
+
+    return tuple(terms)
+
 
 # Helper -------------------------------------------------------------------
 
@@ -54,7 +167,83 @@ def _is_string_column(
     return type_str.startswith(("VARCHAR", "TEXT", "STRING"))
 
 
-def _build_comparison(col: Any, op: str, value: str, *, is_string: bool) -> Any:
+def lower_index(name: str, column: Any) -> Index:
+    """Index ``lower(column)`` for case-insensitive filters on *column*.
+
+    The ``text_pattern_ops`` operator class serves both ``lower(col) = x``
+    and the prefix ranges :func:`_like_clause` adds once it sees the index.
+    """
+    label = f"{column.name}_lower"
+    return Index(
+        name,
+        func.lower(column).label(label),
+        postgresql_ops={label: "text_pattern_ops"},
+    )
+
+
+def _has_lower_index(col: Any) -> bool:
+    """Return True when *col*'s table has an index on ``lower(col)``."""
+    column = getattr(col, "expression", col)
+    table = getattr(column, "table", None)
+    name = getattr(column, "name", None)
+    for index in getattr(table, "indexes", ()):
+        for expr in index.expressions:
+            # Expressions given an operator class are wrapped in a label
+            expr = getattr(expr, "element", expr)
+            if (
+                isinstance(expr, FunctionElement)
+                and expr.name.lower() == "lower"
+                and [getattr(c, "name", None) for c in expr.clauses] == [name]
+            ):
+                return True
+    return False
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Return the smallest string greater than every string starting with
+    *prefix* in byte order, or None if there is none."""
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            # Surrogates can't be encoded; skip to the next code point
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def _like_clause(col: Any, pattern: str, *, lower_indexed: bool) -> Any:
+    """Build a case-insensitive LIKE clause.
+
+    Without a ``lower(col)`` index this is a plain ILIKE, which a trigram
+    index can serve.  With one, the clause is written against
+    ``lower(col)`` so that index applies, and a pattern with a literal
+    prefix also gets an explicit range on it.  PostgreSQL only derives that
+    range itself when it can see the pattern at plan time, not for the
+    generic plans of parameterised statements.  The ``~>=~``/``~<~``
+    operators compare bytes, matching ``text_pattern_ops`` indexes.
+    """
+    if not lower_indexed:
+        return col.ilike(pattern)
+
+    lowered = func.lower(col)
+    pattern = pattern.lower()
+    clause = lowered.like(pattern)
+    prefix = _LIKE_SPECIAL_RE.split(pattern, maxsplit=1)[0]
+    if not prefix:
+        return clause
+
+    bounds = [lowered.op("~>=~", is_comparison=True)(prefix)]
+    upper = _prefix_upper_bound(prefix)
+    if upper is not None:
+        bounds.append(lowered.op("~<~", is_comparison=True)(upper))
+    return and_(*bounds, clause)
+
+
+def _build_comparison(
+    col: Any, op: str, value: str, *, is_string: bool, lower_indexed: bool = False
+) -> Any:
     """Build a single SQLAlchemy comparison clause."""
     if op == "=":
         return func.lower(col) == value.lower() if is_string else col == value
@@ -69,10 +258,180 @@ def _build_comparison(col: Any, op: str, value: str, *, is_string: bool) -> Any:
     if op == "<=":
         return col <= value
     if op == "like":
-        return col.ilike(value)
+        return _like_clause(col, value, lower_indexed=is_string and lower_indexed)
     return None
 
 
+def _order_by(col_or_ordered: Any, direction: str) -> list[Any]:
+    """Apply *direction* to what a sort resolver returned.
+
+    A resolver signals an already-ordered expression by returning a tuple
+    ``(expr, True)``; the first element may be a single clause or a list of
+    clauses.
+    """
+    if isinstance(col_or_ordered, tuple):
+        expr = col_or_ordered[0]
+        return list(expr) if isinstance(expr, list) else [expr]
+    return [desc(col_or_ordered) if direction == "desc" else asc(col_or_ordered)]
+
+
+# Per-model field sets -----------------------------------------------------
+
+
+class QueryPlan(NamedTuple):
+    """Filter and order clauses compiled for one model, plus their joins."""
+
+    filters: tuple[Any, ...]
+    order_by: tuple[Any, ...]
+    joins: tuple[Any, ...]
+
+
+class QueryFields:
+    """The filterable and sortable fields of one model.
+
+    Parameters
+    ----------
+    model:
+        Model queried; fields not listed in *columns* are its attributes.
+    filter_fields, sort_fields:
+        Lowercase field names that may be filtered and sorted on.
+    columns:
+        Columns or expressions for fields that aren't model attributes,
+        such as ``script_name`` or computed flags.
+    joins:
+        ``{model: onclause}`` for the related models *columns* refer to.
+        A plan joins a model only when one of its fields uses it.
+    admin_only:
+        Fields only admins may filter or sort on.
+    string_fields:
+        Fields always compared case-insensitively.
+    sort_expressions:
+        ``{field: callable(direction) -> [order clauses]}`` for fields that
+        need more than ``column ASC|DESC``.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        *,
+        filter_fields: set[str],
+        sort_fields: set[str],
+        columns: dict[str, Any] | None = None,
+        joins: dict[Any, Any] | None = None,
+        admin_only: set[str] | None = None,
+        string_fields: set[str] | None = None,
+        sort_expressions: dict[str, Any] | None = None,
+    ):
+        self.model = model
+        self.filter_fields = frozenset(filter_fields)
+        self.sort_fields = frozenset(sort_fields)
+        self.columns = columns or {}
+        self.joins = joins or {}
+        self.admin_only = frozenset(admin_only or ())
+        self.string_fields = frozenset(string_fields or ())
+        self.sort_expressions = sort_expressions or {}
+
+    def __repr__(self):
+        return f"<QueryFields {self.model.__name__}>"
+
+    def compile(
+        self,
+        filter_param: str | None = None,
+        sort: str | None = None,
+        *,
+        admin: bool = False,
+    ) -> QueryPlan:
+        """Compile ``filter`` and ``sort`` query strings into a cached plan.
+
+        Disallowed or unknown fields are dropped, as are expressions that
+        can't be parsed.
+
+        Raises:
+            NotAllowed: If a non-admin uses an admin-only field
+        """
+        return _compile_plan(
+            self,
+            compile_filter(filter_param) if filter_param else (),
+            compile_sort(sort) if sort else (),
+            admin,
+        )
+
+    def apply(self, query: Any, plan: QueryPlan) -> Any:
+        """Add a plan's joins, filters and ordering to *query*."""
+        for target in plan.joins:
+            query = query.join(target, self.joins[target])
+        if plan.filters:
+            query = query.filter(and_(*plan.filters))
+        if plan.order_by:
+            query = query.order_by(*plan.order_by)
+        return query
+
+    def _column(self, field: str, action: str, admin: bool, joins: set) -> Any:
+        if field in self.admin_only and not admin:
+            raise NotAllowed(f"Only admin or superadmin users can {action} by {field}")
+        col = self.columns.get(field)
+        if col is None:
+            col = getattr(self.model, field, None)
+            # Plain Python methods and properties can't be queried
+            if col is None or not hasattr(col, "__clause_element__"):
+                return None
+        target = getattr(col, "class_", None)
+        if target in self.joins:
+            joins.add(target)
+        return col
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_plan(
+    fields: QueryFields, filter_ast: FilterAST, sort_ast: SortAST, admin: bool
+) -> QueryPlan:
+    joins: set = set()
+
+    filters = []
+    for group in filter_ast:
+        clauses = []
+        for field, op, value in group:
+            if field not in fields.filter_fields:
+                logger.warning(
+                    "[QUERY_FILTERS]: Rejected filter on disallowed field: %s", field
+                )
+                continue
+            col = fields._column(field, "filter", admin, joins)
+            if col is None:
+                continue
+            clause = _build_comparison(
+                col,
+                op,
+                value,
+                is_string=_is_string_column(field, col, fields.string_fields),
+                lower_indexed=_has_lower_index(col),
+            )
+            if clause is not None:
+                clauses.append(clause)
+        if clauses:
+            filters.append(clauses[0] if len(clauses) == 1 else or_(*clauses))
+
+    order_by = []
+    for field, direction in sort_ast:
+        if field not in fields.sort_fields:
+            logger.warning(
+                "[QUERY_FILTERS]: Rejected sort on disallowed field: %s", field
+            )
+            continue
+        if field in fields.sort_expressions:
+            order_by.extend(fields.sort_expressions[field](direction))
+            continue
+        col = fields._column(field, "sort", admin, joins)
+        if col is not None:
+            order_by.extend(_order_by(col, direction))
+
+    return QueryPlan(
+        tuple(filters),
+        tuple(order_by),
+        tuple(target for target in fields.joins if target in joins),
+    )
+
+
 # Public API ---------------------------------------------------------------
 
 
@@ -105,15 +464,25 @@ def parse_single_expression(
     A SQLAlchemy filter clause, or *None* if the expression was invalid or
     the field is not allowed.
     """
-    m = _SIMPLE_EXPR_RE.match(expr.strip())
-    if not m:
+    condition = _parse_condition(expr)
+    if condition is None:
         return None
+    return _bind_condition(
+        condition,
+        allowed_fields=allowed_fields,
+        resolve_column=resolve_column,
+        string_field_names=string_field_names,
+    )
 
-    field, op, value = m.groups()
-    field = field.strip().lower()
-    op = op.strip().lower()
-    value = value.strip().strip("'\"")
 
+def _bind_condition(
+    condition: FilterCondition,
+    *,
+    allowed_fields: set[str],
+    resolve_column: Any,
+    string_field_names: set[str] | None,
+) -> Any | None:
+    field, op, value = condition
     if field not in allowed_fields:
         logger.warning(
             "[QUERY_FILTERS]: Rejected filter on disallowed field: %s", field
@@ -125,7 +494,9 @@ def parse_single_expression(
         return None
 
     is_string = _is_string_column(field, col, string_field_names)
-    return _build_comparison(col, op, value, is_string=is_string)
+    return _build_comparison(
+        col, op, value, is_string=is_string, lower_indexed=_has_lower_index(col)
+    )
 
 
 def parse_filter_param(
@@ -137,46 +508,30 @@ def parse_filter_param(
 ) -> list[Any]:
     """Parse a complete ``filter`` query-string value.
 
-    Supports:
-    * Simple comma-separated expressions: ``status='RUNNING',script_name like '%foo%'``
-    * Parenthesised OR groups: ``(status='PENDING' OR status='RUNNING')``
-    * Mixed: ``(status='PENDING' OR status='RUNNING'),script_name like '%foo%'``
+    Accepts the syntax described in :func:`compile_filter`.  Services with
+    a :class:`QueryFields` should use :meth:`QueryFields.compile` instead,
+    which also caches the bound clauses.
 
     Returns a list of SQLAlchemy clauses suitable for
     ``query.filter(and_(*clauses))``.
     """
     clauses: list[Any] = []
 
-    for raw_expr in _split_filter_expressions(filter_param):
-        raw_expr = raw_expr.strip()
-        if not raw_expr:
-            continue
-
-        or_match = _OR_GROUP_RE.match(raw_expr)
-        if or_match:
-            # Parenthesised OR group — split inner content on " OR "
-            inner = or_match.group(1)
-            or_clauses: list[Any] = []
-            for sub_expr in re.split(r"\s+OR\s+", inner, flags=re.IGNORECASE):
-                clause = parse_single_expression(
-                    sub_expr,
-                    allowed_fields=allowed_fields,
-                    resolve_column=resolve_column,
-                    string_field_names=string_field_names,
-                )
-                if clause is not None:
-                    or_clauses.append(clause)
-            if or_clauses:
-                clauses.append(or_(*or_clauses))
-        else:
-            clause = parse_single_expression(
-                raw_expr,
+    for group in compile_filter(filter_param):
+        group_clauses = []
+        for condition in group:
+            clause = _bind_condition(
+                condition,
                 allowed_fields=allowed_fields,
                 resolve_column=resolve_column,
                 string_field_names=string_field_names,
             )
             if clause is not None:
-                clauses.append(clause)
+                group_clauses.append(clause)
+        if len(group_clauses) == 1:
+            clauses.append(group_clauses[0])
+        elif group_clauses:
+            clauses.append(or_(*group_clauses))
 
     return clauses
 
@@ -231,14 +586,7 @@ def parse_sort_param(
     """
     order_clauses: list[Any] = []
 
-    for sort_expr in sort_param.split(","):
-        sort_expr = sort_expr.strip()
-        if not sort_expr:
-            continue
-        parts = sort_expr.split()
-        field = parts[0].lower()
-        direction = parts[1].lower() if len(parts) > 1 else "asc"
-
+    for field, direction in compile_sort(sort_param):
         if field not in allowed_fields:
             logger.warning(
                 "[QUERY_FILTERS]: Rejected sort on disallowed field: %s", field
@@ -248,19 +596,6 @@ def parse_sort_param(
         col_or_ordered = resolve_column(field, direction)
         if col_or_ordered is None:
             continue
-
-        # If resolve_column already returned an ordered expression, use it
-        # directly (signalled by returning a tuple ``(expr, True)``).
-        # The first element may be a single clause or a list of clauses.
-        if isinstance(col_or_ordered, tuple):
-            expr = col_or_ordered[0]
-            if isinstance(expr, list):
-                order_clauses.extend(expr)
-            else:
-                order_clauses.append(expr)
-        else:
-            order_clauses.append(
-                desc(col_or_ordered) if direction == "desc" else asc(col_or_ordered)
-            )
+        order_clauses.extend(_order_by(col_or_ordered, direction))
 
     return order_clauses
@@ -82,6 +82,37 @@ def _normalise_limit_count(value):
     return None
 
 
+def _breached_limit_key(limit_details):
+    """Return the limiter storage key of the limit this request breached.
+
+    ``RateLimitExceeded`` only carries the limit definition; the key its
+    counter is stored under (``LIMITER/<key>/<scope>/<n>/<m>/<granularity>``)
+    is known to the limiter for the current request.
+    """
+    try:
+        from gefapi import limiter
+
+        current = limiter.current_limit
+        if current is not None and current.breached:
+            return current.key
+
+        # Rebuild the key the way the limiter does for this request
+        runtime_limit = getattr(limit_details, "limit", None)
+        key_func = getattr(runtime_limit, "key_func", None)
+        if key_func is None:
+            return None
+        args = [
+            key_func(),
+            runtime_limit.scope_for(limiter.identify_request(), request.method),
+        ]
+        if limiter._key_prefix:
+            args.insert(0, limiter._key_prefix)
+        return runtime_limit.limit.key_for(*args)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.debug("Could not determine rate limit storage key: %s", exc)
+        return None
+
+
 def _parse_limit_metadata(limit_details):
     """Derive structured rate limit metadata from limiter error objects."""
 
@@ -95,9 +126,7 @@ def _parse_limit_metadata(limit_details):
     if not limit_details:
         return metadata
 
-    metadata["limit_key"] = getattr(limit_details, "limit_key", None) or getattr(
-        limit_details, "key", None
-    )
+    metadata["limit_key"] = _breached_limit_key(limit_details)
 
     limit_obj = getattr(limit_details, "limit", None)
 
@@ -630,11 +659,71 @@ def rate_limit_error_handler(error):
     return create_rate_limit_response(retry_after=retry_after, limit_details=error)
 
 
-def get_current_rate_limits():
-    """Return the current rate limit status leveraging persisted events."""
+def _read_limit_counters(limit_keys) -> dict[str, int | None]:
+    """Read the live counter values for ``limit_keys`` from limiter storage.
+
+    Redis-backed storage is read with a single pipelined round trip; memory
+    storage is read in-process. Keys without a live counter (window expired
+    or not a fixed-window counter) map to ``None``.
+    """
+    counts: dict[str, int | None] = dict.fromkeys(limit_keys)
+    if not counts:
+        return counts
+
+    try:
+        from gefapi import limiter
+
+        storage = limiter._storage
+    except Exception:  # pragma: no cover - defensive
+        return counts
+
+    keys = list(counts)
+    try:
+        if hasattr(storage, "prefixed_key") and hasattr(storage, "get_connection"):
+            pipeline = storage.get_connection(True).pipeline(transaction=False)
+            for key in keys:
+                pipeline.get(storage.prefixed_key(key))
+            values = pipeline.execute(raise_on_error=False)
+        elif hasattr(storage, "get"):
+            values = [storage.get(key) for key in keys]
+        else:
+            return counts
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.debug("Failed to read rate limit counters: %s", exc)
+        return counts
+
+    for key, value in zip(keys, values, strict=False):
+        if isinstance(value, Exception) or value is None:
+            continue
+        try:
+            count = int(value)
+        except (TypeError, ValueError):
+            continue
+        counts[key] = count if count > 0 else None
+    return counts
+
+
+def get_current_rate_limits(
+    rate_limit_type: str | None = None,
+    endpoint: str | None = None,
+    page: int = 1,
+    per_page: int = 100,
+):
+    """Return the current rate limit status leveraging persisted events.
+
+    Events are loaded together with their users in one paginated query, and
+    ``current_count`` is filled from the limiter storage in one round trip.
+
+    Args:
+        rate_limit_type: Only include limits of this type (e.g. ``"user"``).
+        endpoint: Only include limits whose endpoint contains this string.
+        page: 1-based page number.
+        per_page: Number of limits per page.
+    """
 
     try:
-        from gefapi.services import RateLimitEventService, UserService
+        from gefapi.services import RateLimitEventService
+        from gefapi.utils.password_hashing import get_hashing_stats
 
         limiter_enabled = True
         try:
@@ -651,28 +740,36 @@ def get_current_rate_limits():
                 "active_limits": [],
             }
 
-        active_events = RateLimitEventService.list_active_rate_limits()
+        page = max(page, 1)
+        per_page = max(per_page, 1)
+        rows, total = RateLimitEventService.list_active_rate_limits_with_users(
+            rate_limit_type=rate_limit_type,
+            endpoint=endpoint,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+        )
+        current_counts = _read_limit_counters(
+            {event.limit_key for event, *_ in rows if event.limit_key}
+        )
         active_limits: list[dict[str, object]] = []
 
-        for event in active_events:
-            limit_key = event.limit_key
+        for event, user_id, user_email, user_name, user_role in rows:
+            # "key" is the identifier accepted by reset_rate_limit_by_key;
+            # the full storage key is reported as "limit_key"
+            limit_key = None
             identifier = None
             user_details = None
 
             if event.user_id:
                 identifier = f"user:{event.user_id}"
                 limit_key = limit_key or identifier
-                try:
-                    user = UserService.get_user(event.user_id)
-                    if user:
-                        user_details = {
-                            "id": user.id,
-                            "email": user.email,
-                            "name": user.name,
-                            "role": user.role,
-                        }
-                except Exception as exc:  # pragma: no cover - defensive logging
-                    logger.debug("Failed to load user %s: %s", event.user_id, exc)
+                if user_id is not None:
+                    user_details = {
+                        "id": user_id,
+                        "email": user_email,
+                        "name": user_name,
+                        "role": user_role,
+                    }
 
             if user_details is None and (event.user_email or event.user_role):
                 user_details = {
@@ -704,7 +801,7 @@ def get_current_rate_limits():
                 ),
                 "limit": event.limit_count,
                 "limit_count": event.limit_count,
-                "current_count": None,
+                "current_count": current_counts.get(event.limit_key),
                 "time_window_seconds": event.time_window_seconds,
                 "retry_after_seconds": event.retry_after_seconds,
                 "limit_definition": event.limit_definition,
@@ -719,8 +816,12 @@ def get_current_rate_limits():
         return {
             "enabled": True,
             "storage_type": "database",
-            "total_active_limits": len(active_limits),
+            "total_active_limits": total,
+            "page": page,
+            "per_page": per_page,
             "active_limits": active_limits,
+            # Observed hashing cost, for sizing AUTH_LIMITS
+            "password_hashing": get_hashing_stats(),
         }
 
     except Exception as exc:  # pragma: no cover - defensive logging
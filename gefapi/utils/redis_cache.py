@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+import time
 from typing import Any
 
 import redis
@@ -11,12 +12,17 @@ from gefapi.config import SETTINGS
 
 logger = logging.getLogger(__name__)
 
+# After a failed connection, callers get no client for this many seconds
+# instead of each waiting on a new connection attempt
+RECONNECT_BACKOFF_SECONDS = float(os.getenv("REDIS_RECONNECT_BACKOFF_SECONDS", "30"))
+
 
 class RedisCache:
     """Redis cache utility for storing and retrieving cached data"""
 
     def __init__(self):
         self._client = None
+        self._retry_at = 0.0
         self._initialize_client()
 
     def _initialize_client(self):
@@ -46,14 +52,32 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Failed to initialize Redis cache client: {e}")
             self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
 
     @property
     def client(self) -> redis.Redis | None:
-        """Get Redis client, reinitialize if needed"""
-        if self._client is None:
+        """Get Redis client, reinitialize if needed.
+
+        Returns None while backing off after a connection failure.
+        """
+        if self._client is None and time.monotonic() >= self._retry_at:
             self._initialize_client()
         return self._client
 
+    def report_error(self, error: Exception) -> None:
+        """Back off from Redis after a connection error on the client.
+
+        Request paths call this when a command fails, so that an outage
+        costs one timeout per backoff period rather than one per request.
+        """
+        if isinstance(error, redis.ConnectionError | redis.TimeoutError):
+            logger.warning(
+                f"Redis connection failed, retrying in "
+                f"{RECONNECT_BACKOFF_SECONDS:.0f}s: {error}"
+            )
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+
     def is_available(self) -> bool:
         """Check if Redis is available"""
         try:
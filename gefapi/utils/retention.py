@@ -0,0 +1,180 @@
+"""Batched retention helpers for periodic cleanup jobs.
+
+Retention jobs (expired tokens, expired audit hashes, purged user data) used
+to load every matching row and delete or update it through the ORM, so their
+cost and lock footprint grew with the size of the backlog. The helpers here
+work set-based instead: each batch is a single bounded statement of the form
+
+    DELETE FROM t WHERE id IN (SELECT id FROM t WHERE ... LIMIT n)
+
+committed on its own, and a run stops after ``time_budget`` seconds. Whatever
+is left is handled by the next scheduled run.
+
+Periodic jobs skip rows locked by other transactions, so a batch smaller
+than ``n`` does not mean nothing is left to do; a run only reports itself
+complete once no matching rows remain.
+"""
+
+import logging
+import time
+
+from sqlalchemy import delete, exists, select, update
+
+from gefapi import db
+from gefapi.config import SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+def _batch_ids(model, where_clause, batch_size: int, skip_locked: bool = True):
+    query = select(model.id).where(where_clause).limit(batch_size)
+    if skip_locked:
+        # SKIP LOCKED lets overlapping runs work on disjoint batches rather
+        # than queueing behind each other's row locks
+        query = query.with_for_update(skip_locked=True)
+    return query.scalar_subquery()
+
+
+def delete_batch(model, where_clause, batch_size: int, skip_locked: bool = True) -> int:
+    """Delete at most ``batch_size`` rows of ``model`` matching the clause.
+
+    The caller is responsible for committing. Instances of the deleted rows
+    already loaded in the session are not synchronized.
+
+    With ``skip_locked``, rows locked by other transactions are left out of
+    the batch, so fewer than ``batch_size`` rows may be deleted while
+    matching rows remain. Without it the statement waits for those locks.
+
+    Returns:
+        Number of rows deleted
+    """
+    result = db.session.execute(
+        delete(model)
+        .where(model.id.in_(_batch_ids(model, where_clause, batch_size, skip_locked)))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def update_batch(
+    model, where_clause, values: dict, batch_size: int, skip_locked: bool = True
+) -> int:
+    """Apply ``values`` to at most ``batch_size`` rows matching the clause.
+
+    The caller is responsible for committing. ``skip_locked`` works as for
+    ``delete_batch``.
+
+    Returns:
+        Number of rows updated
+    """
+    result = db.session.execute(
+        update(model)
+        .where(model.id.in_(_batch_ids(model, where_clause, batch_size, skip_locked)))
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _has_rows(model, where_clause) -> bool:
+    return db.session.execute(select(exists().where(where_clause))).scalar()
+
+
+def _run_batches(name, run_batch, has_rows, batch_size, time_budget) -> dict:
+    retention_settings = SETTINGS.get("RETENTION", {})
+    if batch_size is None:
+        batch_size = retention_settings.get("BATCH_SIZE", 5000)
+    if time_budget is None:
+        time_budget = retention_settings.get("TIME_BUDGET_SECONDS", 120)
+
+    started = time.monotonic()
+    rows = 0
+    batches = 0
+    complete = False
+
+    try:
+        while time.monotonic() - started < time_budget:
+            affected = run_batch(batch_size)
+            db.session.commit()
+            rows += affected
+            batches += 1
+            if affected < batch_size:
+                # A short batch may only mean the remaining rows are
+                # locked; those are left to the next run
+                complete = not has_rows()
+                break
+    except Exception:
+        db.session.rollback()
+        raise
+
+    seconds = time.monotonic() - started
+    rows_per_second = rows / seconds if seconds > 0 else 0.0
+    logger.info(
+        f"[RETENTION]: {name}: {rows} rows in {batches} batches, "
+        f"{seconds:.2f}s ({rows_per_second:.0f} rows/s)"
+        + ("" if complete else ", rows left for the next run")
+    )
+    return {
+        "rows": rows,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows_per_second, 1),
+        "complete": complete,
+    }
+
+
+def delete_in_batches(
+    model,
+    where_clause,
+    name: str,
+    batch_size: int | None = None,
+    time_budget: float | None = None,
+) -> dict:
+    """Delete rows matching ``where_clause`` in committed, bounded batches.
+
+    Args:
+        model: Model class with an ``id`` primary key
+        where_clause: SQLAlchemy clause selecting the rows to delete
+        name: Job name used in log messages
+        batch_size: Rows per batch (defaults to ``RETENTION["BATCH_SIZE"]``)
+        time_budget: Seconds after which no new batch is started (defaults
+            to ``RETENTION["TIME_BUDGET_SECONDS"]``)
+
+    Returns:
+        Dict with ``rows``, ``batches``, ``seconds``, ``rows_per_second`` and
+        ``complete`` (False when the time budget ran out first, or matching
+        rows were locked by other transactions)
+    """
+    return _run_batches(
+        name,
+        lambda size: delete_batch(model, where_clause, size),
+        lambda: _has_rows(model, where_clause),
+        batch_size,
+        time_budget,
+    )
+
+
+def update_in_batches(
+    model,
+    where_clause,
+    values: dict,
+    name: str,
+    batch_size: int | None = None,
+    time_budget: float | None = None,
+) -> dict:
+    """Apply ``values`` to rows matching ``where_clause`` in bounded batches.
+
+    ``values`` must make a row stop matching ``where_clause`` (for example
+    clearing the column the clause tests), otherwise the same rows are
+    selected again by every batch.
+
+    Returns:
+        Same as ``delete_in_batches``
+    """
+    return _run_batches(
+        name,
+        lambda size: update_batch(model, where_clause, values, size),
+        lambda: _has_rows(model, where_clause),
+        batch_size,
+        time_budget,
+    )
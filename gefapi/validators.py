@@ -2,15 +2,22 @@
 
 from functools import wraps
 from html.parser import HTMLParser
+import logging
 import re
 import unicodedata
+import zlib
 
 from flask import request
 
 from gefapi.config import SETTINGS
 from gefapi.routes.api.v1 import error
 
+logger = logging.getLogger(__name__)
+
 ROLES = SETTINGS.get("ROLES")
+# Set by handle_compressed_request to the size of a gzip-encoded request body
+COMPRESSED_LENGTH_ENVIRON_KEY = "gefapi.compressed_content_length"
+_BODY_CHUNK_SIZE = 64 * 1024
 EMAIL_REGEX = re.compile(r"^[A-Za-z0-9\.\+_-]+@[A-Za-z0-9\._-]+\.[a-zA-Z]*$")
 
 
@@ -687,13 +694,65 @@ def validate_file(func):
     return wrapper
 
 
+def _read_body_measuring_compressed_size(limit):
+    """Read the request body, measuring its gzip-compressed size as it arrives.
+
+    A body the client sent gzip-encoded is measured by its size on the wire,
+    as recorded by ``handle_compressed_request``. Otherwise chunks are fed
+    through a compressor while they are read, and compression stops as soon
+    as the compressed size passes ``limit``.
+
+    Returns:
+        (body bytes, compressed size); once the size passes ``limit`` it is
+        only a lower bound
+    """
+    compressed_length = request.environ.get(COMPRESSED_LENGTH_ENVIRON_KEY)
+    if compressed_length is not None:
+        return request.get_data(), compressed_length
+
+    cached = getattr(request, "_cached_data", None)
+    if cached is not None:
+        chunks = [cached]
+    else:
+        chunks = iter(lambda: request.stream.read(_BODY_CHUNK_SIZE), b"")
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    compressed_size = 0
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if compressor is not None:
+            compressed_size += len(compressor.compress(chunk))
+            if compressed_size > limit:
+                compressor = None
+    if compressor is not None:
+        compressed_size += len(compressor.flush())
+
+    body = bytes(body)
+    if cached is None:
+        # Let request.get_json() parse what was read here
+        request._cached_data = body
+    return body, compressed_size
+
+
 def validate_execution_update(func):
     """Enhanced Execution Update Validation"""
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # Results are limited by the compressed size of the body carrying
+        # them; allow for some overhead over MAX_RESULTS_SIZE
+        size_threshold = SETTINGS.get("MAX_RESULTS_SIZE", 50000) * 2
+        body, compressed_size = _read_body_measuring_compressed_size(size_threshold)
+
         json_data = request.get_json()
 
+        if "results" in json_data and compressed_size > size_threshold:
+            return error(
+                status=400,
+                detail="Results data too large (compressed: "
+                f"{compressed_size} bytes, limit: {size_threshold} bytes)",
+            )
+
         if (
             "status" not in json_data
             and "progress" not in json_data
@@ -729,58 +788,11 @@ def validate_execution_update(func):
                         status=400, detail="Progress must be between 0 and 100"
                     )
 
-            # Sanitize results if provided
             if json_data.get("results"):
-                # Limit results size to prevent abuse
-                import gzip
-                import json as json_lib
-
-                from gefapi.config import SETTINGS
-
-                max_results_size = SETTINGS.get("MAX_RESULTS_SIZE", 50000)
-
-                # Try to estimate compressed size for more accurate validation
-                results_data = json_data["results"]
-                results_str = json_lib.dumps(
-                    results_data, separators=(",", ":")
-                )  # Compact JSON
-
-                # Check compressed size instead of raw string size
-                try:
-                    compressed_size = len(gzip.compress(results_str.encode("utf-8")))
-                    # Use compressed size * 2 as threshold to allow for some overhead
-                    size_threshold = max_results_size * 2
-
-                    if compressed_size > size_threshold:
-                        return error(
-                            status=400,
-                            detail="Results data too large (compressed: "
-                            f"{compressed_size} bytes, limit: {size_threshold} bytes)",
-                        )
-
-                    # Log compression ratio for monitoring
-                    compression_ratio = (
-                        len(results_str) / compressed_size if compressed_size > 0 else 1
-                    )
-                    import logging
-
-                    logger = logging.getLogger(__name__)
-                    logger.debug(
-                        f"Results compression: {len(results_str)} -> {compressed_size} "
-                        f"bytes (ratio: {compression_ratio:.2f}x)"
-                    )
-
-                except Exception as e:
-                    # Fallback to original string-based validation if compression fails
-                    if len(results_str) > max_results_size:
-                        return error(status=400, detail="Results data too large")
-
-                    import logging
-
-                    logger = logging.getLogger(__name__)
-                    logger.warning(
-                        f"Could not compress results for size validation: {e}"
-                    )
+                logger.debug(
+                    f"Results compression: {len(body)} -> {compressed_size} "
+                    f"bytes (ratio: {len(body) / max(compressed_size, 1):.2f}x)"
+                )
 
         except ValueError as e:
             return error(status=400, detail=str(e))
@@ -51,6 +51,15 @@ def post_fork(server, worker):
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
 
+def post_worker_init(worker):
+    # psycopg2 is not covered by gevent's monkey-patching; without a wait
+    # callback every query blocks all greenlets of the worker
+    if worker_class == "gevent":
+        from gefapi.utils.gevent_db import make_psycopg_green
+
+        make_psycopg_green()
+
+
 def pre_fork(server, worker):
     pass
 
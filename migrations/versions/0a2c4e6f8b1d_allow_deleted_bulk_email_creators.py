@@ -0,0 +1,42 @@
+"""allow bulk emails to outlive the user who created them
+
+Revision ID: 0a2c4e6f8b1d
+Revises: 9c1e3a5b7d8f
+Create Date: 2026-10-19 00:00:00.000000
+
+The user deletion purge keeps bulk emails and recipient lists, clearing
+their reference to a deleted creator, so created_by_id becomes nullable.
+"""
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0a2c4e6f8b1d"
+down_revision = "9c1e3a5b7d8f"
+branch_labels = None
+depends_on = None
+
+TABLES = ("bulk_email", "bulk_email_recipient_list")
+
+
+def upgrade():
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "created_by_id",
+            existing_type=postgresql.UUID(as_uuid=True),
+            nullable=True,
+        )
+
+
+def downgrade():
+    # Fails while rows of deleted creators remain; assign them to another
+    # user first
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "created_by_id",
+            existing_type=postgresql.UUID(as_uuid=True),
+            nullable=False,
+        )
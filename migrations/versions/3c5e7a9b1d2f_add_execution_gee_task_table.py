@@ -0,0 +1,73 @@
+"""add execution_gee_task table
+
+Revision ID: 3c5e7a9b1d2f
+Revises: 0fa1182925f5
+Create Date: 2026-10-18 00:00:00.000000
+
+GEE task IDs are now extracted from execution log lines once, at ingestion
+time, and stored in execution_gee_task. Cancellation reads this table instead
+of scanning every log line of the execution with regexes.
+
+The table is backfilled for executions that are still active so that they
+remain cancellable after the upgrade. Terminal executions are never cancelled
+and are not backfilled.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3c5e7a9b1d2f"
+down_revision = "0fa1182925f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "execution_gee_task",
+        sa.Column("id", sa.Integer(), nullable=False, primary_key=True),
+        sa.Column(
+            "execution_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("execution.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.String(24), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "execution_id", "task_id", name="uq_execution_gee_task_execution_task"
+        ),
+    )
+    op.create_index(
+        "ix_execution_gee_task_execution_id",
+        "execution_gee_task",
+        ["execution_id"],
+        unique=False,
+    )
+
+    # Backfill task IDs for executions that can still be cancelled, using the
+    # same "first 24-character ID after 'task'" rule as the ingest path.
+    op.execute(
+        """
+        INSERT INTO execution_gee_task (execution_id, task_id, created_at)
+        SELECT DISTINCT l.execution_id, m[1], now() AT TIME ZONE 'UTC'
+        FROM execution_log l
+        JOIN execution e ON e.id = l.execution_id
+        CROSS JOIN LATERAL regexp_matches(
+            l.text, 'task[^\\n]*?([A-Z0-9]{24})', 'g'
+        ) AS m
+        WHERE e.status NOT IN ('FINISHED', 'FAILED', 'CANCELLED')
+          AND l.text LIKE '%task%'
+          AND m[1] ~ '[A-Z]'
+        ON CONFLICT ON CONSTRAINT uq_execution_gee_task_execution_task DO NOTHING
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_execution_gee_task_execution_id", table_name="execution_gee_task"
+    )
+    op.drop_table("execution_gee_task")
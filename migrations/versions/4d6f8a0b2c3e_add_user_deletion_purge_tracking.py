@@ -0,0 +1,100 @@
+"""add user tombstone and deletion purge tracking
+
+Revision ID: 4d6f8a0b2c3e
+Revises: 3c5e7a9b1d2f
+Create Date: 2026-10-18 00:00:00.000000
+
+User deletion now tombstones the user row (user.deleted_at) and purges the
+user's executions, logs and scripts in bounded batches, tracking progress on
+the user_deletion_audit record so that an interrupted purge can be resumed.
+
+Existing audit records describe deletions that already completed in a single
+transaction, so purge_status defaults to 'completed' for them.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "4d6f8a0b2c3e"
+down_revision = "3c5e7a9b1d2f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("user", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_user_deleted_at", "user", ["deleted_at"], unique=False)
+
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column(
+            "purge_status",
+            sa.String(length=20),
+            nullable=False,
+            server_default="completed",
+        ),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_step", sa.String(length=50), nullable=True),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column(
+            "purge_rows_deleted", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_heartbeat_at", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_completed_at", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "user_deletion_audit",
+        sa.Column("purge_last_error", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_user_deletion_audit_purge_user_id",
+        "user_deletion_audit",
+        ["purge_user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_user_deletion_audit_purge_status",
+        "user_deletion_audit",
+        ["purge_status"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_user_deletion_audit_purge_status", table_name="user_deletion_audit"
+    )
+    op.drop_index(
+        "ix_user_deletion_audit_purge_user_id", table_name="user_deletion_audit"
+    )
+    op.drop_column("user_deletion_audit", "purge_last_error")
+    op.drop_column("user_deletion_audit", "purge_completed_at")
+    op.drop_column("user_deletion_audit", "purge_heartbeat_at")
+    op.drop_column("user_deletion_audit", "purge_attempts")
+    op.drop_column("user_deletion_audit", "purge_rows_deleted")
+    op.drop_column("user_deletion_audit", "purge_step")
+    op.drop_column("user_deletion_audit", "purge_status")
+    op.drop_column("user_deletion_audit", "purge_user_id")
+
+    op.drop_index("ix_user_deleted_at", table_name="user")
+    op.drop_column("user", "deleted_at")
@@ -0,0 +1,64 @@
+"""add execution updated_at and deletion tombstones
+
+Revision ID: 5e7a9c1b3d4f
+Revises: 4d6f8a0b2c3e
+Create Date: 2026-10-18 00:00:00.000000
+
+Executions get an updated_at column, maintained by the ORM on every change,
+and a (user_id, updated_at, id) index so that clients can sync their
+execution list incrementally. Deleted executions are recorded in
+execution_tombstone so that the change feed can report them.
+
+Existing rows are backfilled with their most recent known timestamp.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5e7a9c1b3d4f"
+down_revision = "4d6f8a0b2c3e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("execution", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE execution SET updated_at = "
+        "COALESCE(end_date, start_date, (now() AT TIME ZONE 'utc'))"
+    )
+    op.alter_column("execution", "updated_at", nullable=False)
+    op.create_index(
+        "ix_execution_user_id_updated_at_id",
+        "execution",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "execution_tombstone",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("execution_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_execution_tombstone_user_id_deleted_at_id",
+        "execution_tombstone",
+        ["user_id", "deleted_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_execution_tombstone_user_id_deleted_at_id",
+        table_name="execution_tombstone",
+    )
+    op.drop_table("execution_tombstone")
+
+    op.drop_index("ix_execution_user_id_updated_at_id", table_name="execution")
+    op.drop_column("execution", "updated_at")
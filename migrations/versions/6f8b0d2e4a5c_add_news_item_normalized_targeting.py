@@ -0,0 +1,123 @@
+"""add normalized targeting columns to news_item
+
+Revision ID: 6f8b0d2e4a5c
+Revises: 5e7a9c1b3d4f
+Create Date: 2026-10-18 00:00:00.000000
+
+The news feed filtered platforms with LIKE over comma-separated text and
+compared plugin versions in Python after paginating, which made page sizes
+and totals wrong. news_item gets platform and role arrays and sortable
+integer version keys (see gefapi.models.news.version_key), so that every
+filter runs in SQL.
+
+Existing rows are backfilled, and their target_platforms and target_roles
+text is rewritten in the normalized form the model now stores, with NULL
+meaning "not targeted" for both (target_platforms becomes nullable).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from gefapi.models.news import version_key
+
+# revision identifiers, used by Alembic.
+revision = "6f8b0d2e4a5c"
+down_revision = "5e7a9c1b3d4f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "news_item",
+        sa.Column(
+            "platforms",
+            postgresql.ARRAY(sa.String(20)),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.add_column(
+        "news_item",
+        sa.Column(
+            "roles",
+            postgresql.ARRAY(sa.String(20)),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.add_column(
+        "news_item", sa.Column("min_version_key", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "news_item", sa.Column("max_version_key", sa.BigInteger(), nullable=True)
+    )
+
+    op.execute(
+        """
+        UPDATE news_item SET
+            platforms = ARRAY(
+                SELECT DISTINCT lower(trim(p))
+                FROM unnest(string_to_array(coalesce(target_platforms, ''), ',')) p
+                WHERE trim(p) <> ''
+                ORDER BY 1
+            ),
+            roles = ARRAY(
+                SELECT DISTINCT upper(trim(r))
+                FROM unnest(string_to_array(coalesce(target_roles, ''), ',')) r
+                WHERE trim(r) <> ''
+                ORDER BY 1
+            )
+        """
+    )
+    op.alter_column(
+        "news_item",
+        "target_platforms",
+        existing_type=sa.String(100),
+        nullable=True,
+    )
+    op.execute(
+        """
+        UPDATE news_item SET
+            target_platforms = nullif(array_to_string(platforms, ','), ''),
+            target_roles = nullif(array_to_string(roles, ','), '')
+        """
+    )
+
+    # Version keys use packaging's version parsing, so compute them here
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, min_version, max_version FROM news_item "
+            "WHERE min_version IS NOT NULL OR max_version IS NOT NULL"
+        )
+    ).fetchall()
+    for row in rows:
+        conn.execute(
+            sa.text(
+                "UPDATE news_item SET min_version_key = :min_key, "
+                "max_version_key = :max_key WHERE id = :id"
+            ),
+            {
+                "id": row.id,
+                "min_key": version_key(row.min_version),
+                "max_key": version_key(row.max_version),
+            },
+        )
+
+
+def downgrade():
+    op.execute(
+        "UPDATE news_item SET target_platforms = '' WHERE target_platforms IS NULL"
+    )
+    op.alter_column(
+        "news_item",
+        "target_platforms",
+        existing_type=sa.String(100),
+        nullable=False,
+    )
+    op.drop_column("news_item", "max_version_key")
+    op.drop_column("news_item", "min_version_key")
+    op.drop_column("news_item", "roles")
+    op.drop_column("news_item", "platforms")
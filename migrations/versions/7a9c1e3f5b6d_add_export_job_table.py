@@ -0,0 +1,49 @@
+"""add export_job table
+
+Revision ID: 7a9c1e3f5b6d
+Revises: 6f8b0d2e4a5c
+Create Date: 2026-10-18 00:00:00.000000
+
+Admin CSV exports can run as Celery jobs (see
+gefapi.services.export_service). export_job records each job's filters,
+progress and the location of the finished file.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from gefapi.models import GUID
+
+# revision identifiers, used by Alembic.
+revision = "7a9c1e3f5b6d"
+down_revision = "6f8b0d2e4a5c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "export_job",
+        sa.Column("id", GUID(), nullable=False),
+        sa.Column("table", sa.String(20), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=True),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("rows_written", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("storage_backend", sa.String(10), nullable=True),
+        sa.Column("storage_key", sa.String(255), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.String(500), nullable=True),
+        sa.Column("created_by_id", GUID(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"], ["user.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("export_job")
@@ -0,0 +1,44 @@
+"""add lower() indexes for case-insensitive filters
+
+Revision ID: 8b0d2f4a6c7e
+Revises: 7a9c1e3f5b6d
+Create Date: 2026-10-18 00:00:00.000000
+
+The filter parser (gefapi.utils.query_filters) compares string fields as
+lower(column), which plain indexes on user.email, user.name, script.name and
+script.slug can't serve. These expression indexes use text_pattern_ops so
+they also cover the prefix ranges the parser adds to LIKE filters.
+
+The indexes are built concurrently so the tables stay writable.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b0d2f4a6c7e"
+down_revision = "7a9c1e3f5b6d"
+branch_labels = None
+depends_on = None
+
+# (index name, table, column)
+LOWER_INDEXES = [
+    ("ix_user_email_lower", "user", "email"),
+    ("ix_user_name_lower", "user", "name"),
+    ("ix_script_name_lower", "script", "name"),
+    ("ix_script_slug_lower", "script", "slug"),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, column in LOWER_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON "{table}" '
+                f"(lower({column}) text_pattern_ops)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _table, _column in LOWER_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,83 @@
+"""add pg_trgm indexes for substring filters
+
+Revision ID: 9c1e3a5b7d8f
+Revises: 8b0d2f4a6c7e
+Create Date: 2026-10-18 00:00:00.000000
+
+Admin searches such as ``email like '%@example.org'`` have no literal prefix,
+so the lower() btree indexes can't help them. Trigram GIN indexes on the same
+lower(column) expressions let PostgreSQL answer LIKE patterns with a leading
+wildcard (of at least three characters) from the index.
+
+These indexes need the pg_trgm extension, so unlike the lower() indexes they
+are not declared on the models, and databases built with db.create_all()
+don't have them. When pg_trgm isn't installed and can't be installed (not
+available on the server, or the migrating role may not create extensions),
+the indexes are skipped with a warning; the filters still work, just without
+index support for leading-wildcard patterns.
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9c1e3a5b7d8f"
+down_revision = "8b0d2f4a6c7e"
+branch_labels = None
+depends_on = None
+
+# (index name, table, column)
+TRIGRAM_INDEXES = [
+    ("ix_user_email_trgm", "user", "email"),
+    ("ix_user_name_trgm", "user", "name"),
+    ("ix_script_name_trgm", "script", "name"),
+    ("ix_script_slug_trgm", "script", "slug"),
+]
+
+
+
+def _pg_trgm_usable():
+    """Whether pg_trgm is installed, or available and installable by us"""
+    installed, available, can_create = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT "
+                "EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'), "
+                "EXISTS (SELECT 1 FROM pg_available_extensions "
+                "WHERE name = 'pg_trgm'), "
+                "(SELECT rolsuper FROM pg_roles WHERE rolname = current_user) "
+                "OR has_database_privilege(current_database(), 'CREATE')"
+            )
+        )
+        .one()
+    )
+    return installed or (available and can_create)
+
+
+def upgrade():
+    logger = logging.getLogger("alembic.migration")
+    if not _pg_trgm_usable():
+        logger.warning(
+            "pg_trgm is not available or may not be installed by this role; "
+            "skipping trigram indexes. Install pg_trgm, then downgrade to "
+            "8b0d2f4a6c7e and upgrade again to add them."
+        )
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON "{table}" '
+                f"USING gin (lower({column}) gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _table, _column in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm is left installed; other objects may depend on it
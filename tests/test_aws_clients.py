@@ -0,0 +1,78 @@
+"""
+Tests for the process-wide boto3 client registry
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from gefapi.config import SETTINGS
+from gefapi.s3 import get_s3_client
+from gefapi.utils import aws_clients
+from gefapi.utils.aws_clients import get_aws_client, reset_aws_clients
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    reset_aws_clients()
+    yield
+    reset_aws_clients()
+
+
+@pytest.fixture
+def boto3(monkeypatch):
+    """boto3 stand-in returning a new client object per construction"""
+    fake = MagicMock()
+    fake.client.side_effect = lambda *args, **kwargs: MagicMock()
+    monkeypatch.setattr(aws_clients, "boto3", fake)
+    return fake
+
+
+class TestAWSClientRegistry:
+    """Test that clients are shared per process, service and region"""
+
+    def test_clients_shared_per_service_and_region(self, boto3):
+        s3_client = get_aws_client("s3", region_name="us-east-1")
+
+        assert get_aws_client("s3", region_name="us-east-1") is s3_client
+        assert get_s3_client("us-east-1") is s3_client
+        assert get_aws_client("s3", region_name="eu-west-1") is not s3_client
+        assert get_aws_client("batch", region_name="us-east-1") is not s3_client
+        assert boto3.client.call_count == 3
+
+    def test_client_config_from_settings(self, boto3, monkeypatch):
+        monkeypatch.setitem(
+            SETTINGS,
+            "AWS_CLIENTS",
+            {"MAX_POOL_CONNECTIONS": 7, "MAX_ATTEMPTS": 3, "RETRY_MODE": "adaptive"},
+        )
+
+        get_aws_client("logs", region_name="us-east-1")
+
+        config = boto3.client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 7
+        assert config.retries == {"max_attempts": 3, "mode": "adaptive"}
+        assert config.tcp_keepalive is True
+
+    def test_clients_recreated_after_fork(self, boto3, monkeypatch):
+        parent_client = get_aws_client("batch", region_name="us-east-1")
+
+        # Simulate running in a Celery prefork child
+        monkeypatch.setattr(aws_clients.os, "getpid", lambda: -1)
+        child_client = get_aws_client("batch", region_name="us-east-1")
+
+        assert child_client is not parent_client
+        assert get_aws_client("batch", region_name="us-east-1") is child_client
+
+    def test_cached_lookup_is_cheaper_than_construction(self):
+        started = time.perf_counter()
+        client = get_aws_client("batch", region_name="us-east-1")
+        construction = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(100):
+            assert get_aws_client("batch", region_name="us-east-1") is client
+        lookup = (time.perf_counter() - started) / 100
+
+        assert lookup * 10 < construction
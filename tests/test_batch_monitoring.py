@@ -0,0 +1,286 @@
+"""
+Tests for AWS Batch execution monitoring
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import inspect
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import Execution, ExecutionLog, Script
+from gefapi.services import batch_job_events
+from gefapi.services.batch_job_events import (
+    SQSJobEventQueue,
+    parse_job_event,
+    publish_local_job_event,
+)
+from gefapi.tasks import batch_monitoring
+
+
+@pytest.fixture
+def events_settings(monkeypatch):
+    settings = {
+        "EVENTS_BACKEND": "local",
+        "EVENTS_SQS_QUEUE_URL": "",
+        "EVENTS_WAIT_SECONDS": 0,
+        "EVENTS_CONSUME_SECONDS": 5,
+        "POLL_INTERVAL_SECONDS": 900,
+        "RESULTS_WORKERS": 4,
+    }
+    monkeypatch.setitem(SETTINGS, "BATCH_MONITORING", settings)
+    monkeypatch.setattr(
+        batch_job_events, "_local_queue", batch_job_events.LocalJobEventQueue()
+    )
+    return settings
+
+
+@pytest.fixture
+def fetch_results(monkeypatch):
+    fetch = MagicMock(side_effect=lambda execution_id: {"output": execution_id})
+    monkeypatch.setattr(batch_monitoring, "_fetch_results_from_s3", fetch)
+    return fetch
+
+
+@pytest.fixture
+def batch_executions(app, regular_user, sample_script):
+    """Two running batch executions, with jobs job-0 and job-1"""
+    with app.app_context():
+        script = Script.query.filter_by(slug="test-script").first()
+        script.compute_type = "batch"
+        ids = []
+        for i in range(2):
+            execution = Execution(
+                script_id=script.id, params={}, user_id=regular_user.id
+            )
+            execution.status = "RUNNING"
+            execution.results = {"batch_jobs": {"job_id": f"job-{i}"}}
+            db.session.add(execution)
+            db.session.flush()
+            ids.append(str(execution.id))
+        db.session.commit()
+        return ids
+
+
+def _event(job_id, status, **detail):
+    return {
+        "detail-type": "Batch Job State Change",
+        "source": "aws.batch",
+        "detail": {"jobId": job_id, "status": status, **detail},
+    }
+
+
+def _consume():
+    return batch_monitoring.consume_batch_job_events.apply().get()
+
+
+def _execution(app, execution_id):
+    with app.app_context():
+        execution = db.session.get(Execution, execution_id)
+        db.session.expunge(execution)
+        return execution
+
+
+class TestParseJobEvent:
+    """Test unwrapping job state change events"""
+
+    def test_envelope_and_bare_detail(self):
+        event = _event("job-0", "RUNNING")
+
+        assert parse_job_event(event) == event["detail"]
+        assert parse_job_event('{"jobId": "job-0", "status": "FAILED"}') == {
+            "jobId": "job-0",
+            "status": "FAILED",
+        }
+
+    def test_invalid_events(self):
+        assert parse_job_event("not json") is None
+        assert parse_job_event({"detail": {"jobId": "job-0"}}) is None
+        assert parse_job_event([1, 2]) is None
+
+
+class TestJobEvents:
+    """Test applying job state change events"""
+
+    def test_disabled_without_backend(self, app, batch_executions, monkeypatch):
+        monkeypatch.setitem(SETTINGS["BATCH_MONITORING"], "EVENTS_BACKEND", "")
+
+        assert _consume() == {"events": 0, "finished": 0, "failed": 0}
+
+    def test_succeeded_event_finishes_execution(
+        self, app, batch_executions, events_settings, fetch_results
+    ):
+        publish_local_job_event(_event("job-0", "RUNNING"))
+        publish_local_job_event(_event("job-0", "SUCCEEDED"))
+        publish_local_job_event({"unrelated": True})
+
+        assert _consume() == {"events": 2, "finished": 1, "failed": 0}
+        fetch_results.assert_called_once_with(batch_executions[0])
+
+        finished = _execution(app, batch_executions[0])
+        assert finished.status == "FINISHED"
+        assert finished.end_date is not None
+        assert finished.results["output"] == batch_executions[0]
+        assert finished.results["batch_jobs"] == {"job_id": "job-0"}
+        assert finished.results["batch_statuses"]["job_id"]["status"] == "SUCCEEDED"
+        # Executions without events are left alone
+        assert _execution(app, batch_executions[1]).status == "RUNNING"
+
+    def test_failed_event(self, app, batch_executions, events_settings, fetch_results):
+        publish_local_job_event(
+            _event("job-1", "FAILED", statusReason="Essential container exited")
+        )
+
+        assert _consume()["failed"] == 1
+        fetch_results.assert_not_called()
+        failed = _execution(app, batch_executions[1])
+        assert failed.status == "FAILED"
+        assert "Essential container exited" in failed.results["error"]
+        with app.app_context():
+            log = ExecutionLog.query.filter_by(execution_id=failed.id).one()
+            assert log.level == "ERROR"
+
+    def test_stale_event_does_not_regress_status(
+        self, app, batch_executions, events_settings, fetch_results
+    ):
+        publish_local_job_event(_event("job-0", "RUNNING"))
+        _consume()
+        publish_local_job_event(_event("job-0", "RUNNABLE"))
+        _consume()
+
+        execution = _execution(app, batch_executions[0])
+        assert execution.status == "RUNNING"
+        assert execution.results["batch_statuses"]["job_id"]["status"] == "RUNNING"
+
+    def test_pipeline_waits_for_all_jobs(
+        self, app, batch_executions, events_settings, fetch_results
+    ):
+        with app.app_context():
+            execution = db.session.get(Execution, batch_executions[0])
+            execution.results = {"batch_jobs": {"extract": "job-a", "load": "job-b"}}
+            db.session.commit()
+
+        publish_local_job_event(_event("job-a", "SUCCEEDED"))
+        _consume()
+        assert _execution(app, batch_executions[0]).status == "RUNNING"
+
+        publish_local_job_event(_event("job-b", "SUCCEEDED"))
+        assert _consume()["finished"] == 1
+        execution = _execution(app, batch_executions[0])
+        assert execution.status == "FINISHED"
+        assert set(execution.results["batch_statuses"]) == {"extract", "load"}
+
+    def test_only_executions_with_event_jobs_are_loaded(self, app, batch_executions):
+        with app.app_context():
+            execution = db.session.get(Execution, batch_executions[0])
+            execution.results = {"batch_jobs": {"extract": "job-a", "load": "job-b"}}
+            db.session.commit()
+            db.session.expunge_all()
+
+            executions = batch_monitoring._active_batch_executions(
+                job_ids=["job-b", "job-1", "job-unknown"]
+            )
+
+            assert {str(execution.id) for execution in executions} == set(
+                batch_executions
+            )
+            assert "params" in inspect(executions[0]).unloaded
+            assert batch_monitoring._active_batch_executions(job_ids=["job"]) == []
+
+    def test_receive_wait_is_capped_at_deadline(
+        self, app, events_settings, monkeypatch
+    ):
+        events_settings["EVENTS_CONSUME_SECONDS"] = 50
+        clock = [1000.0]
+        monkeypatch.setattr(batch_monitoring.time, "monotonic", lambda: clock[0])
+        waits = []
+
+        def receive(max_wait_seconds=None):
+            waits.append(max_wait_seconds)
+            clock[0] += 30  # each long poll waits out its full time
+            return [("receipt", {"jobId": "job-unknown", "status": "RUNNING"})]
+
+        events_queue = MagicMock()
+        events_queue.receive.side_effect = receive
+        monkeypatch.setattr(
+            batch_monitoring, "get_job_event_queue", lambda: events_queue
+        )
+
+        assert _consume()["events"] == 2
+        assert waits == [50, 20]
+
+    def test_sqs_wait_seconds(self, monkeypatch):
+        sqs = MagicMock()
+        sqs.receive_message.return_value = {}
+        monkeypatch.setattr(
+            batch_job_events, "get_aws_client", lambda *args, **kwargs: sqs
+        )
+        events_queue = SQSJobEventQueue("https://sqs/queue", wait_seconds=20)
+
+        for max_wait_seconds, expected in ((None, 20), (45, 20), (7.9, 7), (-1, 0)):
+            events_queue.receive(max_wait_seconds=max_wait_seconds)
+            kwargs = sqs.receive_message.call_args.kwargs
+            assert kwargs["WaitTimeSeconds"] == expected
+
+
+class TestPolling:
+    """Test the describe_jobs safety net"""
+
+    def test_poll_finishes_executions_once(
+        self, app, batch_executions, events_settings, fetch_results, monkeypatch
+    ):
+        client = MagicMock()
+        client.describe_jobs.return_value = {
+            "jobs": [
+                {"jobId": "job-0", "status": "SUCCEEDED"},
+                {"jobId": "job-1", "status": "RUNNING"},
+            ]
+        }
+        monkeypatch.setattr(batch_monitoring, "_batch_client", lambda: client)
+
+        result = batch_monitoring.monitor_batch_executions.apply().get()
+        assert result == {"checked": 2, "finished": 1, "failed": 0}
+
+        # A late event for an execution the poller already finished is ignored
+        publish_local_job_event(_event("job-0", "SUCCEEDED"))
+        assert _consume()["finished"] == 0
+        fetch_results.assert_called_once_with(batch_executions[0])
+        assert _execution(app, batch_executions[1]).status == "RUNNING"
+
+    def test_results_fetched_concurrently(
+        self, app, batch_executions, events_settings, monkeypatch
+    ):
+        # Each download waits for the other one, so they only complete when
+        # run at the same time
+        barrier = threading.Barrier(2, timeout=10)
+
+        def fetch(execution_id):
+            barrier.wait()
+            return {"output": execution_id}
+
+        monkeypatch.setattr(batch_monitoring, "_fetch_results_from_s3", fetch)
+        publish_local_job_event(_event("job-0", "SUCCEEDED"))
+        publish_local_job_event(_event("job-1", "SUCCEEDED"))
+
+        assert _consume()["finished"] == 2
+        for execution_id in batch_executions:
+            assert _execution(app, execution_id).status == "FINISHED"
+
+    def test_failed_download_does_not_block_others(
+        self, app, batch_executions, events_settings, monkeypatch
+    ):
+        def fetch(execution_id):
+            if execution_id == batch_executions[0]:
+                raise RuntimeError("S3 unavailable")
+            return {"output": execution_id}
+
+        monkeypatch.setattr(batch_monitoring, "_fetch_results_from_s3", fetch)
+        publish_local_job_event(_event("job-0", "SUCCEEDED"))
+        publish_local_job_event(_event("job-1", "SUCCEEDED"))
+
+        assert _consume()["finished"] == 1
+        # The status change is committed; the next run retries the download
+        assert _execution(app, batch_executions[0]).status == "RUNNING"
+        assert _execution(app, batch_executions[1]).status == "FINISHED"
@@ -0,0 +1,133 @@
+"""
+Tests for the single-pass client statistics report
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from gefapi import db
+from gefapi.models import User, UserClientMetadata
+from gefapi.services.client_stats_service import ClientStatsService
+
+# (client_type, client_version, qgis_version, os, language, days since seen)
+CLIENTS = [
+    ("qgis_plugin", "2.2.4", "3.34", "Windows", "en", 1),
+    ("qgis_plugin", "2.2.4", "3.34", "Linux", "es", 2),
+    ("qgis_plugin", "2.2.4", "3.28", "Windows", "en", 3),
+    ("qgis_plugin", "2.1.0", "3.28", "macOS", None, 4),
+    ("qgis_plugin", None, None, None, "fr", 5),
+    ("qgis_plugin", "1.0.0", "3.16", "Windows", "en", 90),
+    ("api_ui", "1.5.2", None, None, "en", 1),
+    ("cli", "1.0.0", None, None, None, 60),
+]
+
+
+def _seed_clients():
+    for i, (client_type, version, qgis, os_name, language, days) in enumerate(CLIENTS):
+        user = User(
+            email=f"client-stats-{i}@example.com",
+            password="password123",
+            name=f"Client {i}",
+            country="Test",
+            institution="Test",
+        )
+        db.session.add(user)
+        db.session.flush()
+        metadata = UserClientMetadata(
+            user_id=user.id,
+            client_type=client_type,
+            client_version=version,
+            os=os_name,
+            qgis_version=qgis,
+            language=language,
+        )
+        metadata.last_seen_at = datetime.now(UTC) - timedelta(days=days)
+        db.session.add(metadata)
+    db.session.commit()
+
+
+class TestClientStatsReport:
+    """Test that the report is built from one query"""
+
+    def test_report_contents(self, app):
+        with app.app_context():
+            _seed_clients()
+            stats = ClientStatsService.get_client_stats(days=30)
+
+            assert stats["platform_summary"] == {
+                "qgis_plugin": {"active_users": 5, "total_users": 6},
+                "api_ui": {"active_users": 1, "total_users": 1},
+                "cli": {"active_users": 0, "total_users": 1},
+            }
+
+            plugin = stats["plugin_stats"]
+            versions = {v["version"]: v for v in plugin["by_plugin_version"]}
+            assert plugin["by_plugin_version"][0]["version"] == "2.2.4"
+            assert set(versions) == {"2.2.4", "2.1.0", "unknown"}
+            assert versions["2.2.4"]["user_count"] == 3
+            assert versions["2.2.4"]["by_qgis_version"] == [
+                {"qgis_version": "3.34", "count": 2},
+                {"qgis_version": "3.28", "count": 1},
+            ]
+            assert versions["2.2.4"]["by_os"][0] == {"os": "Windows", "count": 2}
+            # Missing values are broken down too, as "unknown"
+            assert versions["unknown"]["by_os"] == [{"os": "unknown", "count": 1}]
+
+            qgis = {v["qgis_version"]: v for v in plugin["by_qgis_version"]}
+            assert sorted(
+                qgis["3.28"]["by_plugin_version"], key=lambda r: r["version"]
+            ) == [
+                {"version": "2.1.0", "count": 1},
+                {"version": "2.2.4", "count": 1},
+            ]
+            assert plugin["by_os"][0] == {"os": "Windows", "user_count": 2}
+            assert {r["language"]: r["user_count"] for r in plugin["by_language"]} == {
+                "en": 2,
+                "es": 1,
+                "fr": 1,
+            }
+
+            assert stats["language_stats"][0] == {"language": "en", "user_count": 3}
+            assert stats["api_ui_stats"] == {
+                "by_version": [{"version": "1.5.2", "user_count": 1}]
+            }
+            assert stats["cli_stats"] == {"by_version": []}
+
+    def test_single_query_and_client_type_filter(self, app):
+        with app.app_context():
+            _seed_clients()
+            statements = []
+
+            def capture(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", capture)
+            try:
+                stats = ClientStatsService.get_client_stats(
+                    days=30, client_type="api_ui"
+                )
+            finally:
+                event.remove(db.engine, "before_cursor_execute", capture)
+
+            report_queries = [s for s in statements if "user_client_metadata" in s]
+            assert len(report_queries) == 1
+            assert "GROUPING SETS" in report_queries[0]
+            assert "api_ui_stats" in stats
+            assert "plugin_stats" not in stats
+            assert "cli_stats" not in stats
+
+    def test_report_is_cached(self, app):
+        cached = {"period_days": 7, "cached": True}
+        with (
+            app.app_context(),
+            patch("gefapi.services.stats_service.get_redis_cache") as get_cache,
+        ):
+            get_cache.return_value.is_available.return_value = True
+            get_cache.return_value.get.return_value = cached
+
+            assert ClientStatsService.get_client_stats(days=7) == cached
+            key = get_cache.return_value.get.call_args.args[0]
+            assert "client_stats" in key
+            assert "days=7" in key
@@ -0,0 +1,151 @@
+"""
+Tests for buffered client tracking and last-activity updates
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import User, UserClientMetadata
+from gefapi.services.client_tracking_service import ClientTrackingService
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the buffer"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        entry = self.hashes.setdefault(key, {})
+        if mapping:
+            entry.update(mapping)
+        if field is not None:
+            entry[field] = value
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, seconds):
+        return True
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    def spop(self, key, count):
+        members = self.sets.get(key, set())
+        return [members.pop() for _ in range(min(count, len(members)))]
+
+    def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*a, **kw) for name, a, kw in self.calls]
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch(
+        "gefapi.services.client_tracking_service.get_redis_cache",
+        return_value=SimpleNamespace(client=fake),
+    ):
+        yield fake
+
+
+@pytest.mark.usefixtures("app")
+class TestClientTrackingBuffer:
+    """Test that auth-path telemetry is buffered and flushed in batches"""
+
+    def test_direct_write_when_buffer_disabled(self, app, regular_user):
+        """Without the buffer the row is written immediately"""
+        with (
+            app.app_context(),
+            patch.dict(SETTINGS["CLIENT_TRACKING_BUFFER"], {"ENABLED": False}),
+        ):
+            record = ClientTrackingService.track_client_access(
+                regular_user.id, {"type": "cli", "version": "1.0"}
+            )
+
+            assert record is not None
+            assert record.client_version == "1.0"
+
+    def test_access_is_buffered_then_flushed(self, app, regular_user, fake_redis):
+        """Accesses are only written to the database by the flush"""
+        with app.app_context():
+            user_id = regular_user.id
+            ClientTrackingService.track_client_access(
+                user_id,
+                {"type": "qgis_plugin", "version": "2.2.4", "os": "Windows"},
+            )
+            ClientTrackingService.record_user_activity(user_id)
+
+            assert (
+                UserClientMetadata.query.filter_by(
+                    user_id=user_id, client_type="qgis_plugin"
+                ).first()
+                is None
+            )
+
+            result = ClientTrackingService.flush_buffered_activity()
+            assert result == {"clients": 1, "users": 1}
+
+            metadata = UserClientMetadata.query.filter_by(
+                user_id=user_id, client_type="qgis_plugin"
+            ).one()
+            assert metadata.client_version == "2.2.4"
+            assert metadata.os == "Windows"
+            assert db.session.get(User, user_id).last_activity_at is not None
+
+            # A later access without os keeps the stored value
+            ClientTrackingService.track_client_access(
+                user_id, {"type": "qgis_plugin", "version": "2.3.0"}
+            )
+            assert ClientTrackingService.flush_buffered_activity() == {
+                "clients": 1,
+                "users": 0,
+            }
+            db.session.refresh(metadata)
+            assert metadata.client_version == "2.3.0"
+            assert metadata.os == "Windows"
+
+            # Nothing left to flush
+            assert ClientTrackingService.flush_buffered_activity() == {
+                "clients": 0,
+                "users": 0,
+            }
+
+    def test_flush_skips_deleted_users(self, app, fake_redis):
+        """Buffered entries for users deleted before the flush are dropped"""
+        with app.app_context():
+            import uuid
+
+            missing_user_id = uuid.uuid4()
+            ClientTrackingService.track_client_access(
+                missing_user_id, {"type": "cli", "version": "1.0"}
+            )
+            ClientTrackingService.record_user_activity(missing_user_id)
+
+            assert ClientTrackingService.flush_buffered_activity() == {
+                "clients": 0,
+                "users": 0,
+            }
@@ -0,0 +1,117 @@
+"""
+Tests for the content-addressed script image build cache
+"""
+
+import io
+import tarfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gefapi.services import docker_service
+from gefapi.services.docker_service import DockerService, build_cache_key
+
+
+def _write_tarball(path, files, mtime=0):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = mtime
+            tar.addfile(info, io.BytesIO(content))
+    return path
+
+
+FILES = {
+    "configuration.json": b'{"name": "cached"}',
+    "src/main.py": b"print('hello')\n",
+    "requirements.txt": b"",
+}
+
+
+class TestBuildCacheKey:
+    """Test that the cache key only depends on what ends up in the image"""
+
+    def test_key_ignores_timestamps(self, tmp_path):
+        first = _write_tarball(tmp_path / "a.tar.gz", FILES, mtime=1)
+        second = _write_tarball(tmp_path / "b.tar.gz", FILES, mtime=2)
+
+        assert build_cache_key(first, "trends.earth-environment", "2.1.0") == (
+            build_cache_key(second, "trends.earth-environment", "2.1.0")
+        )
+
+    def test_key_changes_with_contents_or_environment(self, tmp_path):
+        base = _write_tarball(tmp_path / "a.tar.gz", FILES)
+        changed = _write_tarball(
+            tmp_path / "b.tar.gz", {**FILES, "src/main.py": b"print('bye')\n"}
+        )
+        key = build_cache_key(base, "trends.earth-environment", "2.1.0")
+
+        assert key != build_cache_key(changed, "trends.earth-environment", "2.1.0")
+        assert key != build_cache_key(base, "trends.earth-environment", "2.1.1")
+
+
+@pytest.mark.usefixtures("app")
+class TestBuildCache:
+    """Test that DockerService.build reuses cached images"""
+
+    @patch.object(docker_service, "REGISTRY_URL", "registry.local:5000")
+    @patch.object(docker_service, "get_docker_client")
+    @patch.object(docker_service, "_registry_copy_manifest")
+    @patch.object(docker_service, "_registry_get_manifest_digest")
+    def test_cache_hit_retags_without_building(
+        self, mock_digest, mock_copy, mock_client, app, tmp_path
+    ):
+        mock_digest.return_value = (True, "sha256:cached", None, "exists")
+        mock_copy.return_value = (True, "tagged")
+
+        with app.app_context(), patch.object(docker_service.db.session, "add"):
+            ok, result = DockerService.build(
+                script_id=None,
+                path=str(tmp_path),
+                tag_image="my-script",
+                environment="trends.earth-environment",
+                environment_version="2.1.0",
+                cache_key="abc123",
+            )
+
+        assert ok is True
+        assert result == {"digest": "sha256:cached", "cached": True}
+        mock_digest.assert_called_once_with(
+            "registry.local:5000", "my-script", "build-abc123"
+        )
+        mock_copy.assert_called_once_with(
+            "registry.local:5000", "my-script", "build-abc123", "latest"
+        )
+        mock_client.assert_not_called()
+
+    @patch.object(docker_service, "REGISTRY_URL", "registry.local:5000")
+    @patch.object(DockerService, "push", return_value=(True, {"result": "ok"}))
+    @patch.object(docker_service, "get_docker_client")
+    @patch.object(docker_service, "_registry_copy_manifest")
+    @patch.object(docker_service, "_registry_get_manifest_digest")
+    def test_cache_miss_builds_and_stores(
+        self, mock_digest, mock_copy, mock_client, mock_push, app, tmp_path
+    ):
+        mock_digest.return_value = (False, None, None, "not found")
+        mock_copy.return_value = (True, "tagged")
+        client = MagicMock()
+        client.images.build.return_value = (MagicMock(), [])
+        mock_client.return_value = client
+
+        with app.app_context():
+            ok, _result = DockerService.build(
+                script_id=None,
+                path=str(tmp_path),
+                tag_image="my-script",
+                environment="trends.earth-environment",
+                environment_version="2.1.0",
+                cache_key="abc123",
+            )
+
+        assert ok is True
+        build_kwargs = client.images.build.call_args.kwargs
+        assert "nocache" not in build_kwargs
+        mock_copy.assert_called_once_with(
+            "registry.local:5000", "my-script", "latest", "build-abc123"
+        )
@@ -0,0 +1,112 @@
+"""
+Tests for Docker client reuse and execution network caching in DockerService.run
+"""
+
+from unittest.mock import MagicMock, patch
+
+from docker import errors as docker_errors
+import pytest
+
+from gefapi.services import docker_service
+from gefapi.services.docker_service import DockerService
+
+
+def _network(name, network_id):
+    network = MagicMock()
+    network.name = name
+    network.id = network_id
+    return network
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Docker client with one execution network for the test environment"""
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+    monkeypatch.setattr(docker_service, "_execution_network_cache", None)
+    client = MagicMock()
+    client.networks.list.return_value = [
+        _network("trends-staging_backend", "net-backend"),
+        _network("trends-staging_execution", "net-exec-1"),
+    ]
+    with patch.object(docker_service, "get_docker_client", return_value=client):
+        yield client
+
+
+def _run(execution_id="exec-1"):
+    script = MagicMock(id="script-1", cpu_reservation=None)
+    return DockerService.run(
+        execution_id=execution_id,
+        image="my-script",
+        environment={"EXECUTION_ID": execution_id},
+        execution=MagicMock(script_id="script-1"),
+        script=script,
+    )
+
+
+class TestDockerDispatch:
+    """Test that dispatching an execution is a single Docker API call"""
+
+    def test_network_resolved_once_and_reused(self, client):
+        with patch.object(docker_service, "Execution") as mock_execution:
+            assert _run("exec-1") == (True, None)
+            assert _run("exec-2") == (True, None)
+
+        client.networks.list.assert_called_once()
+        assert client.services.create.call_count == 2
+        for call in client.services.create.call_args_list:
+            assert call.kwargs["networks"] == ["net-exec-1"]
+        # The caller's ORM objects are used instead of querying again
+        mock_execution.query.get.assert_not_called()
+
+    def test_network_refreshed_when_missing(self, client):
+        assert _run("exec-1") == (True, None)
+
+        # The stack was redeployed and the network recreated with a new ID
+        client.networks.list.return_value = [
+            _network("trends-staging_execution", "net-exec-2")
+        ]
+        client.services.create.side_effect = [
+            docker_errors.NotFound("network net-exec-1 not found"),
+            MagicMock(),
+        ]
+
+        assert _run("exec-2") == (True, None)
+        assert client.networks.list.call_count == 2
+        assert client.services.create.call_args.kwargs["networks"] == ["net-exec-2"]
+
+        client.services.create.side_effect = None
+        assert _run("exec-3") == (True, None)
+        assert client.networks.list.call_count == 2
+
+
+class TestDockerClientReuse:
+    """Test that one Docker client is kept per worker process"""
+
+    def test_client_reused_until_fork(self, monkeypatch):
+        created = []
+
+        def make_client(**kwargs):
+            client = MagicMock()
+            client.version.return_value = {"Version": "27.0.0"}
+            created.append(client)
+            return client
+
+        monkeypatch.setattr(docker_service, "docker_client", None)
+        monkeypatch.setattr(docker_service, "_docker_client_pid", None)
+        monkeypatch.setattr(
+            docker_service, "_candidate_docker_hosts", lambda: ["unix://docker.sock"]
+        )
+        monkeypatch.setattr(
+            docker_service, "docker", MagicMock(DockerClient=make_client)
+        )
+
+        first = docker_service.get_docker_client()
+        assert docker_service.get_docker_client() is first
+        connections = len(created)
+
+        # A forked worker gets its own connection
+        monkeypatch.setattr(docker_service, "_docker_client_pid", -1)
+        second = docker_service.get_docker_client()
+        assert second is not first
+        assert len(created) > connections
+        first.close.assert_not_called()
@@ -561,3 +561,90 @@ class TestExecutionCancellationCeleryTasks:
                 ),
             ):
                 ExecutionService.cancel_execution(f"test-{state.lower()}-execution")
+
+
+class TestGEETaskIndex:
+    """Test ingest-time indexing of GEE task IDs and indexed cancellation"""
+
+    def test_extract_gee_task_ids_single_line(self):
+        """Task IDs must follow the word "task" on the same line"""
+        text = (
+            "Starting GEE task YBKKBHM2V63JYBVIPCCRY7A2 and for task "
+            "6CIGR7EG2J45GJ2DN2J7X3WZ\n"
+            "ID with no keyword AAAAAAAAAAAAAAAAAAAAAAAA\n"
+            "task number 123456789012345678901234"
+        )
+
+        assert GEEService.extract_gee_task_ids(text) == [
+            "YBKKBHM2V63JYBVIPCCRY7A2",
+            "6CIGR7EG2J45GJ2DN2J7X3WZ",
+        ]
+        assert GEEService.extract_gee_task_ids(None) == []
+        assert GEEService.extract_gee_task_ids("no identifiers here") == []
+
+    def test_extract_gee_task_ids_long_line_without_ids(self):
+        """Lines full of "task" with no IDs are scanned without backtracking"""
+        text = "task " * 50_000
+
+        assert GEEService.extract_gee_task_ids(text) == []
+
+    def test_create_execution_log_indexes_task_ids(self, app, sample_execution):
+        """Ingesting a log line stores its GEE task IDs exactly once"""
+        from gefapi import db
+        from gefapi.models import ExecutionGEETask
+
+        with app.app_context():
+            execution = db.session.merge(sample_execution)
+            for _ in range(2):
+                ExecutionService.create_execution_log(
+                    {
+                        "text": "Starting GEE task YBKKBHM2V63JYBVIPCCRY7A2",
+                        "level": "DEBUG",
+                    },
+                    str(execution.id),
+                )
+            ExecutionService.create_execution_log(
+                {"text": "Exporting results", "level": "INFO"}, str(execution.id)
+            )
+
+            assert GEEService.get_execution_gee_task_ids(execution.id) == [
+                "YBKKBHM2V63JYBVIPCCRY7A2"
+            ]
+            assert (
+                ExecutionGEETask.query.filter_by(execution_id=execution.id).count() == 1
+            )
+
+    @patch.object(GEEService, "_cancel_initialized_gee_task")
+    @patch.object(GEEService, "_initialize_ee", return_value=True)
+    @patch.object(GEEService, "get_execution_gee_task_ids")
+    def test_cancel_gee_tasks_for_execution_uses_index(
+        self, mock_get_ids, mock_init_ee, mock_cancel
+    ):
+        """Cancellation reads the index and initializes Earth Engine once"""
+        task_ids = [f"{i:024d}".replace("0", "A") for i in range(20)]
+        mock_get_ids.return_value = task_ids
+        mock_cancel.side_effect = lambda task_id: {
+            "task_id": task_id,
+            "success": True,
+            "status": "CANCELLED",
+            "error": None,
+        }
+
+        results = GEEService.cancel_gee_tasks_for_execution("test-execution-id")
+
+        mock_get_ids.assert_called_once_with("test-execution-id")
+        mock_init_ee.assert_called_once()
+        assert [r["task_id"] for r in results] == task_ids
+        assert mock_cancel.call_count == len(task_ids)
+
+    @patch.object(GEEService, "_cancel_initialized_gee_task")
+    @patch.object(GEEService, "_initialize_ee", return_value=False)
+    def test_cancel_gee_tasks_initialization_failed(self, mock_init_ee, mock_cancel):
+        """All tasks report failure when Earth Engine cannot be initialized"""
+        results = GEEService.cancel_gee_tasks(
+            ["YBKKBHM2V63JYBVIPCCRY7A2", "6CIGR7EG2J45GJ2DN2J7X3WZ"]
+        )
+
+        assert len(results) == 2
+        assert all(not r["success"] for r in results)
+        mock_cancel.assert_not_called()
@@ -0,0 +1,134 @@
+"""
+Tests for column projection and batched log loading in execution listings
+"""
+
+import contextlib
+
+import pytest
+from sqlalchemy import event
+
+from gefapi import db
+from gefapi.models import Execution, ExecutionLog, Script, User
+
+
+@contextlib.contextmanager
+def _capture_sql():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def executions_with_logs(app, regular_user, sample_script):
+    """Three executions with two logs each, owned by the regular user"""
+    with app.app_context():
+        user = User.query.filter_by(email=regular_user.email).first()
+        script = Script.query.filter_by(slug="test-script").first()
+        created = []
+        for i in range(3):
+            execution = Execution(
+                script_id=script.id, user_id=user.id, params={"big": "x" * 100}
+            )
+            execution.results = {"n": i}
+            db.session.add(execution)
+            db.session.flush()
+            for level in ("INFO", "ERROR"):
+                db.session.add(ExecutionLog(f"{level} {i}", level, execution.id))
+            created.append(str(execution.id))
+        db.session.commit()
+        return created
+
+
+def _execution_selects(statements):
+    return [
+        s
+        for s in statements
+        if s.lstrip().startswith("SELECT") and "FROM execution" in s
+    ]
+
+
+class TestExecutionProjection:
+    """Test that listings only load what they return"""
+
+    def test_excluded_jsonb_not_selected(
+        self, app, client, auth_headers_user, executions_with_logs
+    ):
+        with app.app_context(), _capture_sql() as statements:
+            response = client.get(
+                "/api/v1/execution/user?exclude=params,results",
+                headers=auth_headers_user,
+            )
+
+        assert response.status_code == 200
+        row = response.json["data"][0]
+        assert "params" not in row and "results" not in row
+        assert "status" in row
+        selects = _execution_selects(statements)
+        assert selects
+        assert not any(
+            "execution.params" in s or "execution.results" in s for s in selects
+        )
+
+    def test_fields_limits_columns(
+        self, app, client, auth_headers_user, executions_with_logs
+    ):
+        with app.app_context(), _capture_sql() as statements:
+            response = client.get(
+                "/api/v1/execution/user?fields=status,updated_at",
+                headers=auth_headers_user,
+            )
+
+        assert response.status_code == 200
+        for row in response.json["data"]:
+            assert set(row) == {"id", "status", "updated_at"}
+        select_list = _execution_selects(statements)[-1].split("FROM execution")[0]
+        assert "execution.status" in select_list
+        assert "execution.start_date" not in select_list
+
+    def test_logs_loaded_in_one_query(
+        self, app, client, auth_headers_user, executions_with_logs
+    ):
+        with app.app_context(), _capture_sql() as statements:
+            response = client.get(
+                "/api/v1/execution/user?include=logs&exclude=params",
+                headers=auth_headers_user,
+            )
+
+        assert response.status_code == 200
+        by_id = {row["id"]: row for row in response.json["data"]}
+        for execution_id in executions_with_logs:
+            assert [log["level"] for log in by_id[execution_id]["logs"]] == [
+                "INFO",
+                "ERROR",
+            ]
+        log_queries = [s for s in statements if "FROM execution_log" in s]
+        assert len(log_queries) == 1
+
+    def test_serialize_default_output_unchanged(self, app, executions_with_logs):
+        with app.app_context():
+            execution = db.session.get(Execution, executions_with_logs[0])
+            serialized = execution.serialize()
+
+        assert list(serialized) == [
+            "id",
+            "script_id",
+            "user_id",
+            "start_date",
+            "end_date",
+            "status",
+            "progress",
+            "params",
+            "results",
+            "queued_at",
+            "dispatched_at",
+            "updated_at",
+        ]
+        assert serialized["params"] == {"big": "x" * 100}
@@ -0,0 +1,142 @@
+"""
+Tests for the execution change feed (/execution/user/changes)
+"""
+
+import datetime
+
+import pytest
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import Execution, ExecutionTombstone, Script, User
+
+
+@pytest.fixture
+def no_lag(monkeypatch):
+    """Report changes immediately instead of after the safety lag"""
+    monkeypatch.setitem(
+        SETTINGS, "EXECUTION_SYNC", {"SAFETY_LAG_SECONDS": 0, "MAX_PAGE_SIZE": 500}
+    )
+
+
+@pytest.fixture
+def executions(app, regular_user, sample_script):
+    """Three executions owned by the regular user, with no others"""
+    with app.app_context():
+        user = User.query.filter_by(email=regular_user.email).first()
+        script = Script.query.filter_by(slug="test-script").first()
+        Execution.query.filter_by(user_id=user.id).delete()
+        ExecutionTombstone.query.filter_by(user_id=user.id).delete()
+        created = []
+        for _ in range(3):
+            execution = Execution(script_id=script.id, user_id=user.id, params={})
+            execution.status = "RUNNING"
+            db.session.add(execution)
+            db.session.commit()
+            created.append(str(execution.id))
+        return created
+
+
+def _changes(client, headers, **params):
+    response = client.get(
+        "/api/v1/execution/user/changes", headers=headers, query_string=params
+    )
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+class TestUpdatedAt:
+    """Test that Execution.updated_at follows every change"""
+
+    def test_updated_at_bumped_on_change(self, app, executions):
+        with app.app_context():
+            execution = db.session.get(Execution, executions[0])
+            before = execution.updated_at
+            assert before is not None
+
+            execution.status = "FINISHED"
+            db.session.commit()
+
+            assert execution.updated_at > before
+
+    def test_updated_at_filter_returns_old_executions_that_changed(
+        self, app, client, auth_headers_user, executions
+    ):
+        with app.app_context():
+            for execution_id in executions:
+                execution = db.session.get(Execution, execution_id)
+                execution.start_date = datetime.datetime(2020, 1, 1)
+                execution.updated_at = datetime.datetime(2020, 1, 1)
+            db.session.commit()
+            since = datetime.datetime(2024, 1, 1)
+
+            execution = db.session.get(Execution, executions[1])
+            execution.status = "FAILED"
+            db.session.commit()
+
+        response = client.get(
+            "/api/v1/execution/user",
+            headers=auth_headers_user,
+            query_string={"updated_at": since.isoformat()},
+        )
+
+        assert [e["id"] for e in response.json["data"]] == [executions[1]]
+
+
+class TestExecutionChanges:
+    """Test delta sync of a user's executions"""
+
+    def test_initial_sync_then_empty(
+        self, client, auth_headers_user, executions, no_lag
+    ):
+        first = _changes(client, auth_headers_user)
+
+        assert sorted(e["id"] for e in first["data"]) == sorted(executions)
+        assert first["deleted"] == []
+        assert first["has_more"] is False
+
+        second = _changes(client, auth_headers_user, since=first["next"])
+        assert second["data"] == []
+        assert second["deleted"] == []
+
+    def test_reports_updates_and_deletions(
+        self, app, client, auth_headers_user, executions, no_lag
+    ):
+        token = _changes(client, auth_headers_user)["next"]
+
+        with app.app_context():
+            db.session.get(Execution, executions[0]).status = "FINISHED"
+            db.session.delete(db.session.get(Execution, executions[2]))
+            db.session.commit()
+
+        changes = _changes(client, auth_headers_user, since=token)
+
+        assert [e["id"] for e in changes["data"]] == [executions[0]]
+        assert changes["data"][0]["status"] == "FINISHED"
+        assert changes["deleted"] == [executions[2]]
+
+    def test_pages_through_backlog(self, client, auth_headers_user, executions, no_lag):
+        seen = []
+        changes = _changes(client, auth_headers_user, limit=2)
+        seen += [e["id"] for e in changes["data"]]
+        assert changes["has_more"] is True
+
+        changes = _changes(client, auth_headers_user, limit=2, since=changes["next"])
+        seen += [e["id"] for e in changes["data"]]
+        assert changes["has_more"] is False
+        assert sorted(seen) == sorted(executions)
+
+    def test_recent_changes_held_back(self, client, auth_headers_user, executions):
+        # With the default safety lag, just-created rows wait for the next poll
+        changes = _changes(client, auth_headers_user)
+
+        assert changes["data"] == []
+        assert _changes(client, auth_headers_user, since=changes["next"])["data"] == []
+
+    def test_invalid_token_rejected(self, client, auth_headers_user):
+        response = client.get(
+            "/api/v1/execution/user/changes?since=not-a-token",
+            headers=auth_headers_user,
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,227 @@
+"""
+Tests for asynchronous admin CSV export jobs
+"""
+
+import csv
+from datetime import datetime
+import gzip
+import io
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlsplit
+
+import pytest
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import ExportJob, User
+from gefapi.services import export_service
+from gefapi.services.export_service import ExportService
+
+
+@pytest.fixture
+def export_settings(monkeypatch, tmp_path):
+    settings = {
+        "BACKEND": "local",
+        "LOCAL_PATH": str(tmp_path),
+        "S3_BUCKET": "exports-bucket",
+        "S3_PREFIX": "admin_exports",
+        "CHUNK_SIZE": 2,
+        "LINK_TTL_SECONDS": 600,
+    }
+    monkeypatch.setitem(SETTINGS, "EXPORTS", settings)
+    return settings
+
+
+@pytest.fixture
+def queued():
+    with patch("gefapi.tasks.export_jobs.run_export_job.delay") as delay:
+        yield delay
+
+
+def _read_csv(data):
+    text = gzip.decompress(data).decode("utf-8-sig")
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def _create_job(app, table="users", **filters):
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@test.com").first()
+        return str(ExportService.create_job(table, admin, **filters).id)
+
+
+class TestSubmitExport:
+    """Test queueing export jobs over the API"""
+
+    def test_admin_submits_job(self, client, auth_headers_admin, queued):
+        response = client.post(
+            "/api/v1/execution/export",
+            json={"date_field": "start_date", "date_from": "2024-01-01"},
+            headers=auth_headers_admin,
+        )
+
+        assert response.status_code == 202
+        data = response.json["data"]
+        assert data["status"] == "PENDING"
+        assert data["table"] == "executions"
+        assert data["filters"]["date_from"].startswith("2024-01-01")
+        queued.assert_called_once_with(data["id"])
+
+    def test_queue_unavailable(self, app, client, auth_headers_admin, queued):
+        queued.side_effect = ConnectionError("broker down")
+
+        response = client.post("/api/v1/user/export", headers=auth_headers_admin)
+
+        assert response.status_code == 503
+        job_id = queued.call_args.args[0]
+        with app.app_context():
+            job = db.session.get(ExportJob, job_id)
+            assert job.status == "FAILED"
+            assert job.error == export_service.EXPORT_QUEUE_UNAVAILABLE
+            assert job.finished_at is not None
+
+    def test_invalid_date_field(self, client, auth_headers_admin, queued):
+        response = client.post(
+            "/api/v1/user/export",
+            json={"date_field": "password"},
+            headers=auth_headers_admin,
+        )
+
+        assert response.status_code == 400
+        queued.assert_not_called()
+
+    def test_regular_user_forbidden(self, client, auth_headers_user, queued):
+        response = client.post("/api/v1/script/export", headers=auth_headers_user)
+
+        assert response.status_code == 403
+        queued.assert_not_called()
+
+
+class TestRunExport:
+    """Test writing export files"""
+
+    def test_streams_rows_to_gzipped_csv(
+        self, app, admin_user, regular_user, export_settings, queued
+    ):
+        job_id = _create_job(app, "users")
+
+        with (
+            app.app_context(),
+            patch.object(
+                ExportService,
+                "_record_progress",
+                wraps=ExportService._record_progress,
+            ) as progress,
+        ):
+            job = ExportService.run_job(job_id)
+
+            assert job.status == "FINISHED"
+            assert job.total_rows == job.rows_written == 2
+            assert job.progress == 100
+            # Progress is recorded after every CHUNK_SIZE rows
+            progress.assert_called_once()
+            assert progress.call_args.args[1] == 2
+
+            with open(ExportService.local_file_path(job), "rb") as f:
+                data = f.read()
+        assert job.size_bytes == len(data)
+        rows = _read_csv(data)
+        assert {row["email"] for row in rows} == {
+            "admin@test.com",
+            "user@test.com",
+        }
+        assert "password" not in rows[0]
+
+    def test_date_filter_and_joined_columns(
+        self, app, admin_user, sample_execution, export_settings, queued
+    ):
+        job_id = _create_job(app, "executions")
+        empty_job_id = _create_job(
+            app,
+            "executions",
+            date_field="start_date",
+            date_from=datetime(2999, 1, 1),
+        )
+
+        with app.app_context():
+            job = ExportService.run_job(job_id)
+            with open(ExportService.local_file_path(job), "rb") as f:
+                rows = _read_csv(f.read())
+            assert len(rows) == 1
+            assert rows[0]["script_name"] == "Test Script"
+            assert rows[0]["user_email"] == "user@test.com"
+
+            assert ExportService.run_job(empty_job_id).rows_written == 0
+
+    def test_failure_marks_job_failed(self, app, admin_user, export_settings, queued):
+        job_id = _create_job(app, "users")
+
+        with (
+            app.app_context(),
+            patch.object(
+                export_service, "_export_query", side_effect=RuntimeError("boom")
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            ExportService.run_job(job_id)
+
+        with app.app_context():
+            job = db.session.get(ExportJob, job_id)
+            assert job.status == "FAILED"
+            assert job.error == "boom"
+
+
+class TestDownloadExport:
+    """Test signed download links"""
+
+    def test_local_download_link(
+        self, app, client, auth_headers_admin, export_settings, queued
+    ):
+        job_id = _create_job(app, "scripts")
+        with app.app_context():
+            ExportService.run_job(job_id)
+
+        response = client.get(f"/api/v1/export/{job_id}", headers=auth_headers_admin)
+        assert response.status_code == 200
+        data = response.json["data"]
+        assert data["status"] == "FINISHED"
+        url = urlsplit(data["download_url"])
+
+        # The link works without authentication
+        download = client.get(f"{url.path}?{url.query}")
+        assert download.status_code == 200
+        assert download.mimetype == "application/gzip"
+        assert "scripts_export_" in download.headers["Content-Disposition"]
+        assert _read_csv(download.data) == []
+
+        tampered = url.query.replace("signature=", "signature=0")
+        assert client.get(f"{url.path}?{tampered}").status_code == 403
+
+    def test_expired_link_rejected(self, app, admin_user, export_settings, queued):
+        job_id = _create_job(app, "users")
+        expired = 1_000_000_000
+        signature = export_service._link_signature(job_id, expired)
+
+        assert not ExportService.verify_download(job_id, expired, signature)
+        assert not ExportService.verify_download(job_id, "soon", signature)
+
+    def test_s3_backend(self, app, admin_user, export_settings, queued):
+        # S3 is the default backend
+        del export_settings["BACKEND"]
+        s3 = MagicMock()
+        s3.generate_presigned_url.return_value = "https://s3.example.com/signed"
+        job_id = _create_job(app, "users")
+
+        with (
+            app.app_context(),
+            patch.object(export_service, "get_s3_client", return_value=s3),
+        ):
+            job = ExportService.run_job(job_id)
+            url, _expires = ExportService.get_download_url(job, None)
+
+        _fileobj, bucket, key = s3.upload_fileobj.call_args.args
+        assert (bucket, key) == ("exports-bucket", f"admin_exports/{job_id}.csv.gz")
+        assert url == "https://s3.example.com/signed"
+        params = s3.generate_presigned_url.call_args.kwargs["Params"]
+        assert params["Key"] == key
+        assert s3.generate_presigned_url.call_args.kwargs["ExpiresIn"] == 600
+        assert job.storage_backend == "s3"
@@ -0,0 +1,96 @@
+"""
+Tests for application import time and deferred SDK imports
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from gefapi.utils.lazy_import import lazy_import
+
+# Budget for the cumulative ``import gefapi`` time reported by
+# ``python -X importtime``. Locally this is under 2s; the margin absorbs slow
+# CI runners while still catching an SDK being pulled back in at import time.
+IMPORT_BUDGET_SECONDS = 4.0
+
+# SDKs that only some processes use and must not be loaded by ``import gefapi``
+DEFERRED_MODULES = ("boto3", "docker", "ee", "googleapiclient", "openeo", "sparkpost")
+
+IMPORT_SCRIPT = """
+import sys
+import gefapi
+from gefapi.services import docker_service
+loaded = [m for m in {modules!r} if m in sys.modules]
+print("LOADED=" + ",".join(loaded))
+print("DOCKER_CLIENT=" + repr(docker_service.docker_client))
+"""
+
+
+def _import_gefapi():
+    """Import the app in a fresh interpreter and return (stdout, stderr)."""
+    result = subprocess.run(  # noqa: S603  # fixed argv, no user input
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            IMPORT_SCRIPT.format(modules=DEFERRED_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env=os.environ.copy(),
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return result.stdout, result.stderr
+
+
+def _cumulative_import_us(importtime_output, module):
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() == module and name.startswith(" " + module):
+            return int(cumulative)
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+@pytest.mark.slow
+class TestImportTime:
+    """Test that importing the app stays within budget"""
+
+    def test_import_within_budget_without_heavy_sdks(self):
+        stdout, stderr = _import_gefapi()
+
+        assert "LOADED=\n" in stdout
+        # No Docker daemon probe at import; the client is created on first use
+        assert "DOCKER_CLIENT=None" in stdout
+
+        seconds = _cumulative_import_us(stderr, "gefapi") / 1_000_000
+        assert seconds < IMPORT_BUDGET_SECONDS, (
+            f"import gefapi took {seconds:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+        )
+
+
+class TestLazyImport:
+    """Test the deferred import proxy"""
+
+    def test_imports_on_first_attribute_access(self):
+        module = lazy_import("json")
+
+        assert "(not loaded)" in repr(module)
+        assert module.dumps({"a": 1}) == '{"a": 1}'
+        assert "(loaded)" in repr(module)
+
+    def test_attribute_proxy_is_callable(self):
+        ordered_dict = lazy_import("collections", "OrderedDict")
+
+        assert ordered_dict(a=1) == {"a": 1}
+
+    def test_missing_module_is_falsy(self):
+        assert not lazy_import("gefapi_no_such_module")
+        assert not lazy_import("gefapi_no_such_module.submodule")
+        assert lazy_import("json")
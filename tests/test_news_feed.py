@@ -0,0 +1,223 @@
+"""
+Tests for SQL-side news feed filtering and the cached feed
+"""
+
+import datetime
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask_jwt_extended import create_access_token
+import pytest
+
+from gefapi import db
+from gefapi.models.news import NewsItem, NewsItemTranslation, version_key
+from gefapi.services.news_service import NEWS_FEED_GENERATION_KEY, NewsService
+
+
+def _add_news(title, **kwargs):
+    news = NewsItem(title=title, message=f"{title} message", **kwargs)
+    db.session.add(news)
+    db.session.commit()
+    return news
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the feed cache"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch(
+        "gefapi.services.news_service.get_redis_cache",
+        return_value=SimpleNamespace(client=fake),
+    ):
+        yield fake
+
+
+class TestVersionKey:
+    """Tests for the sortable plugin version keys"""
+
+    def test_keys_sort_like_versions(self):
+        versions = ["1.9.9", "2.0", "2.0.1", "2.1.0", "2.10.0", "10.0.0"]
+        keys = [version_key(v) for v in versions]
+        assert keys == sorted(keys)
+        assert version_key("2.0") == version_key("2.0.0")
+
+    def test_invalid_and_empty_versions(self):
+        assert version_key(None) is None
+        assert version_key("") is None
+        assert version_key("not-a-version") is None
+
+    def test_model_keeps_keys_in_sync(self, app):
+        with app.app_context():
+            news = NewsItem(title="t", message="m", min_version="2.1")
+            assert news.min_version_key == version_key("2.1.0")
+            news.max_version = "3.0.0"
+            assert news.max_version_key == version_key("3.0.0")
+            news.min_version = None
+            assert news.min_version_key is None
+
+
+class TestNormalizedTargeting:
+    """Tests for normalized platforms and roles"""
+
+    def test_targets_are_normalized(self, app):
+        with app.app_context():
+            news = NewsItem(
+                title="t",
+                message="m",
+                target_platforms=" WebApp, app,app,",
+                target_roles="admin, User",
+            )
+            assert news.target_platforms == "app,webapp"
+            assert news.platforms == ["app", "webapp"]
+            assert news.target_roles == "ADMIN,USER"
+            assert news.roles == ["ADMIN", "USER"]
+
+            news.target_roles = ""
+            assert news.target_roles is None
+            assert news.roles == []
+            news.target_platforms = " , "
+            assert news.target_platforms is None
+            assert news.platforms == []
+
+    def test_platform_matches_whole_values(self, app):
+        with app.app_context():
+            _add_news("API UI only", target_platforms="api-ui")
+            _add_news("All platforms", target_platforms="")
+
+            items, total = NewsService.get_news_items(platform="api")
+            assert [item.title for item in items] == ["All platforms"]
+            assert total == 1
+
+            _items, total = NewsService.get_news_items(platform="API-UI")
+            assert total == 2
+
+    def test_role_targeted_news(self, client, app, admin_user):
+        with app.app_context():
+            admin_user = db.session.merge(admin_user)
+            _add_news("Admins only", target_roles="ADMIN,SUPERADMIN")
+            _add_news("Everyone")
+
+            response = client.get("/api/v1/news")
+            data = json.loads(response.data)
+            assert [item["title"] for item in data["data"]] == ["Everyone"]
+            assert data["total"] == 1
+
+            token = create_access_token(identity=admin_user.id)
+            headers = {"Authorization": f"Bearer {token}"}
+            data = json.loads(client.get("/api/v1/news", headers=headers).data)
+            assert data["total"] == 2
+
+            # Admins manage news for every role
+            _items, total = NewsService.get_news_items(include_all_roles=True)
+            assert total == 2
+
+
+class TestFeedPagination:
+    """Tests that pages and totals agree when filtering by version"""
+
+    def test_version_filter_applies_before_paging(self, client, app):
+        with app.app_context():
+            for i in range(3):
+                _add_news(f"In range {i}", min_version="2.0.0", max_version="3.0.0")
+            for i in range(3):
+                _add_news(f"Too new {i}", min_version="3.0.1")
+            _add_news("Any version")
+
+            response = client.get("/api/v1/news?version=2.5.0&per_page=2&page=1")
+            data = json.loads(response.data)
+            assert data["total"] == 4
+            assert len(data["data"]) == 2
+
+            response = client.get("/api/v1/news?version=2.5.0&per_page=2&page=2")
+            data = json.loads(response.data)
+            assert len(data["data"]) == 2
+            assert not any(item["title"].startswith("Too new") for item in data["data"])
+
+    def test_invalid_version_matches_everything(self, app):
+        with app.app_context():
+            _add_news("Versioned", min_version="2.0.0")
+            _add_news("Any version")
+
+            _items, total = NewsService.get_news_items(version="dev-build")
+            assert total == 2
+
+
+class TestFeedCache:
+    """Tests for the cached, translated news feed"""
+
+    def test_feed_is_cached_and_invalidated(self, app, fake_redis):
+        with app.app_context():
+            _add_news("First")
+
+            feed = NewsService.get_news_feed(platform="app")
+            assert [item["title"] for item in feed["data"]] == ["First"]
+            assert len(fake_redis.ttls) == 1
+
+            # Served from the cache while the table is unchanged
+            with patch.object(NewsService, "get_news_items") as get_items:
+                assert NewsService.get_news_feed(platform="APP") == feed
+                get_items.assert_not_called()
+
+            NewsService.create_news_item(title="Second", message="m", priority=1)
+            assert fake_redis.values[NEWS_FEED_GENERATION_KEY] == "1"
+            feed = NewsService.get_news_feed(platform="app")
+            assert [item["title"] for item in feed["data"]] == ["Second", "First"]
+
+    def test_cache_ttl_bounded_by_next_expiry(self, app, fake_redis):
+        with app.app_context():
+            _add_news(
+                "Expiring",
+                expires_at=datetime.datetime.now(datetime.UTC)
+                + datetime.timedelta(seconds=30),
+            )
+
+            NewsService.get_news_feed()
+            (ttl,) = fake_redis.ttls.values()
+            assert 1 <= ttl <= 31
+
+    def test_translations_preloaded(self, app, fake_redis):
+        with app.app_context():
+            translated = _add_news("Translated", priority=1)
+            _add_news("Untranslated")
+            db.session.add(
+                NewsItemTranslation(
+                    news_item_id=translated.id,
+                    language_code="es",
+                    title="Traducido",
+                    message="Mensaje",
+                )
+            )
+            db.session.commit()
+
+            with patch.object(NewsItem, "translations") as per_item:
+                feed = NewsService.get_news_feed(language="es")
+            per_item.filter_by.assert_not_called()
+            assert [item["title"] for item in feed["data"]] == [
+                "Traducido",
+                "Untranslated",
+            ]
+
+            NewsService.update_translations(
+                str(translated.id), {"es": {"title": "Nuevo", "message": "Mensaje"}}
+            )
+            feed = NewsService.get_news_feed(language="es")
+            assert feed["data"][0]["title"] == "Nuevo"
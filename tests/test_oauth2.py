@@ -2,6 +2,7 @@
 Tests for OAuth2 Client Credentials service client model, service, and routes.
 """
 
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 import uuid
 
@@ -14,7 +15,11 @@ from gefapi.models.service_client import (
     CLIENT_SECRET_PREFIX,
     ServiceClient,
 )
-from gefapi.services.oauth2_service import MAX_CLIENTS_PER_USER, OAuth2Service
+from gefapi.services.oauth2_service import (
+    MAX_CLIENTS_PER_USER,
+    VERIFIED_SECRET_KEY_PREFIX,
+    OAuth2Service,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -344,6 +349,96 @@ class TestOAuth2ServiceAuthenticate:
                 OAuth2Service.authenticate(client.client_id, raw_secret)
 
 
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the secret cache"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch(
+        "gefapi.services.oauth2_service.get_redis_cache",
+        return_value=SimpleNamespace(client=fake, delete=fake.delete),
+    ):
+        yield fake
+
+
+class TestVerifiedSecretCache:
+    """Tests for skipping the scrypt check on repeat authentications."""
+
+    def test_repeat_authentication_skips_kdf(self, app, regular_user, fake_redis):
+        with app.app_context():
+            user = db.session.merge(regular_user)
+            raw_secret, client = OAuth2Service.create_client(user=user, name="cached")
+            OAuth2Service.authenticate(client.client_id, raw_secret)
+
+            cached = fake_redis.values[VERIFIED_SECRET_KEY_PREFIX + client.client_id]
+            # Only an HMAC is stored, never the secret or its scrypt hash
+            assert raw_secret not in cached
+            assert cached != client.client_secret_hash
+
+            with patch.object(
+                ServiceClient, "verify_secret", side_effect=AssertionError
+            ):
+                authed_user, _ = OAuth2Service.authenticate(
+                    client.client_id, raw_secret
+                )
+            assert authed_user.id == user.id
+
+    def test_wrong_secret_not_accepted_from_cache(self, app, regular_user, fake_redis):
+        with app.app_context():
+            user = db.session.merge(regular_user)
+            raw_secret, client = OAuth2Service.create_client(user=user, name="wrong")
+            OAuth2Service.authenticate(client.client_id, raw_secret)
+
+            with pytest.raises(AuthError):
+                OAuth2Service.authenticate(client.client_id, raw_secret + "x")
+
+    def test_revoke_invalidates_cache(self, app, regular_user, fake_redis):
+        with app.app_context():
+            user = db.session.merge(regular_user)
+            raw_secret, client = OAuth2Service.create_client(user=user, name="revoke")
+            OAuth2Service.authenticate(client.client_id, raw_secret)
+            key = VERIFIED_SECRET_KEY_PREFIX + client.client_id
+            assert key in fake_redis.values
+
+            OAuth2Service.revoke_client(client.id, user)
+
+            assert key not in fake_redis.values
+            with pytest.raises(AuthError):
+                OAuth2Service.authenticate(client.client_id, raw_secret)
+
+    def test_ttl_bounded_by_client_expiry(self, app, regular_user, fake_redis):
+        import datetime
+
+        with app.app_context():
+            user = db.session.merge(regular_user)
+            raw_secret, client = OAuth2Service.create_client(user=user, name="expiry")
+            client.expires_at = datetime.datetime.now(
+                datetime.UTC
+            ) + datetime.timedelta(seconds=60)
+            db.session.commit()
+
+            OAuth2Service.authenticate(client.client_id, raw_secret)
+
+            ttl = fake_redis.ttls[VERIFIED_SECRET_KEY_PREFIX + client.client_id]
+            assert 0 < ttl <= 60
+
+
 # -------------------------------------------------------------------------
 # Route / endpoint tests
 # -------------------------------------------------------------------------
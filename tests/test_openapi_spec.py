@@ -0,0 +1,90 @@
+"""
+Tests for the cached, pre-compressed OpenAPI spec endpoint
+"""
+
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+
+import gefapi
+from gefapi import app
+
+
+class TestOpenAPISpecCache:
+    """Test that /swagger.json is built once and served with an ETag"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, tmp_path):
+        """Test client with an empty spec cache and no static swagger.json"""
+        monkeypatch.setattr(gefapi, "_openapi_spec_payload", None)
+        # Point the static lookup somewhere without a swagger.json
+        monkeypatch.setattr(
+            gefapi, "_STATIC_SWAGGER_PATH", str(tmp_path / "swagger.json")
+        )
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    def test_spec_generated_once_per_process(self, client):
+        with patch.object(
+            gefapi,
+            "generate_openapi_spec_from_app",
+            wraps=gefapi.generate_openapi_spec_from_app,
+        ) as mock_generate:
+            first = client.get("/swagger.json")
+            second = client.get("/swagger.json")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_generate.call_count == 1
+        assert first.data == second.data
+        assert "/api/v1/script" in first.get_json()["paths"]
+
+    def test_serves_precompressed_body_with_etag(self, client):
+        response = client.get("/swagger.json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        etag = response.headers["ETag"]
+        assert etag and not etag.startswith("W/")
+
+        spec = json.loads(gzip.decompress(response.data))
+        assert spec["openapi"] == "3.0.3"
+
+        plain = client.get("/swagger.json")
+        assert "Content-Encoding" not in plain.headers
+        # Each encoding is a different representation with its own validator
+        assert plain.headers["ETag"] == etag.replace("-gzip", "")
+        assert plain.headers["ETag"] != etag
+        assert json.loads(plain.data) == spec
+
+    def test_matching_etag_returns_not_modified(self, client):
+        etag = client.get("/swagger.json").headers["ETag"]
+
+        response = client.get("/swagger.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+        # The identity ETag does not validate the gzipped representation
+        response = client.get(
+            "/swagger.json",
+            headers={"If-None-Match": etag, "Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"].endswith('-gzip"')
+
+    def test_static_spec_file_is_preferred(self, client, tmp_path):
+        (tmp_path / "swagger.json").write_text(
+            json.dumps({"openapi": "3.0.3", "paths": {"/prebuilt": {}}})
+        )
+
+        with patch.object(gefapi, "generate_openapi_spec_from_app") as mock_generate:
+            response = client.get("/swagger.json")
+
+        assert response.get_json()["paths"] == {"/prebuilt": {}}
+        mock_generate.assert_not_called()
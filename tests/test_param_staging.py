@@ -0,0 +1,83 @@
+"""
+Tests for in-memory execution parameter staging to S3
+"""
+
+import gzip
+import json
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from gefapi.s3 import PARAMS_HASH_METADATA_KEY, encode_params, upload_params
+from gefapi.services import batch_service
+
+PARAMS = {
+    "geojsons": [{"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1]]]}],
+    "year_initial": 2001,
+    "year_final": 2023,
+}
+
+
+def _missing_object_client():
+    client = MagicMock()
+    client.head_object.side_effect = ClientError(
+        {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+    )
+    return client
+
+
+class TestEncodeParams:
+    """Test that params are encoded deterministically"""
+
+    def test_roundtrip_and_stable_hash(self):
+        body, params_hash = encode_params(PARAMS)
+
+        assert json.loads(gzip.decompress(body)) == PARAMS
+        assert encode_params(dict(PARAMS)) == (body, params_hash)
+        assert encode_params({**PARAMS, "year_final": 2024})[1] != params_hash
+
+
+class TestUploadParams:
+    """Test uploading params without temporary files"""
+
+    def test_uploads_with_hash_metadata(self):
+        client = _missing_object_client()
+
+        assert upload_params(client, PARAMS, "bucket", "params/1.json.gz") is True
+
+        fileobj, bucket, key = client.upload_fileobj.call_args.args
+        assert (bucket, key) == ("bucket", "params/1.json.gz")
+        assert json.loads(gzip.decompress(fileobj.read())) == PARAMS
+        metadata = client.upload_fileobj.call_args.kwargs["ExtraArgs"]["Metadata"]
+        assert metadata[PARAMS_HASH_METADATA_KEY] == encode_params(PARAMS)[1]
+
+    def test_skips_upload_when_hash_matches(self):
+        client = MagicMock()
+        client.head_object.return_value = {
+            "Metadata": {PARAMS_HASH_METADATA_KEY: encode_params(PARAMS)[1]}
+        }
+
+        assert upload_params(client, PARAMS, "bucket", "params/1.json.gz") is False
+        client.upload_fileobj.assert_not_called()
+
+    def test_reuploads_when_params_changed(self):
+        client = MagicMock()
+        client.head_object.return_value = {
+            "Metadata": {PARAMS_HASH_METADATA_KEY: "stale"}
+        }
+
+        assert upload_params(client, PARAMS, "bucket", "params/1.json.gz") is True
+        client.upload_fileobj.assert_called_once()
+
+    def test_batch_params_keep_cost_tags(self, monkeypatch):
+        client = _missing_object_client()
+        monkeypatch.setattr(batch_service, "_get_s3_client", lambda: client)
+        monkeypatch.setattr(batch_service, "PARAMS_S3_BUCKET", "bucket")
+        monkeypatch.setattr(batch_service, "PARAMS_S3_PREFIX", "execution_params")
+        params = {**PARAMS, "batch": {"tags": {"project": "avoided emissions"}}}
+
+        uri = batch_service.push_params_to_s3(params, "exec-1")
+
+        assert uri == "s3://bucket/execution_params/exec-1.json.gz"
+        extra_args = client.upload_fileobj.call_args.kwargs["ExtraArgs"]
+        assert extra_args["Tagging"] == "project=avoided%20emissions"
@@ -0,0 +1,173 @@
+"""
+Tests for password hashing on a bounded thread pool
+"""
+
+from collections import deque
+import concurrent.futures
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from gefapi.config import SETTINGS
+from gefapi.errors import PasswordHashingBusy
+from gefapi.utils import password_hashing
+from gefapi.utils.password_hashing import (
+    get_hashing_stats,
+    hash_password,
+    verify_password,
+)
+
+
+class TestPasswordHashingPool:
+    """Test that hashing runs off the calling thread and sheds load"""
+
+    def test_hash_and_verify_run_on_pool_thread(self):
+        """Hashes are computed on the pool, not the calling thread"""
+        threads = []
+        real_check = password_hashing.check_password_hash
+
+        def recording_check(password_hash, password):
+            threads.append(threading.current_thread().name)
+            return real_check(password_hash, password)
+
+        password_hash = hash_password("correct horse battery staple")
+        with patch.object(password_hashing, "check_password_hash", recording_check):
+            assert verify_password(password_hash, "correct horse battery staple")
+            assert not verify_password(password_hash, "wrong password")
+
+        assert threads
+        assert threading.current_thread().name not in threads
+
+        stats = get_hashing_stats()
+        assert stats["samples"] >= 3
+        assert stats["p95_ms"] > 0
+        assert stats["queue_p95_ms"] >= 0
+        assert stats["capacity_per_minute"] > 0
+
+    def test_queue_wait_recorded_apart_from_hash_time(self):
+        """Time spent waiting for a pool thread is not counted as hashing"""
+        started = threading.Event()
+
+        def check(password_hash, password):
+            if password == "slow":
+                started.set()
+                time.sleep(0.2)
+            return True
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        latencies = deque(maxlen=10)
+        with (
+            patch.object(password_hashing, "_get_pool", return_value=pool),
+            patch.object(password_hashing, "_latencies", latencies),
+            patch.object(password_hashing, "check_password_hash", check),
+        ):
+            holder = threading.Thread(target=verify_password, args=("hash", "slow"))
+            holder.start()
+            assert started.wait(5)
+            # Queues behind the slow hash on the only pool thread
+            assert verify_password("hash", "fast") is True
+            holder.join(5)
+
+            stats = get_hashing_stats()
+        pool.shutdown()
+
+        (slow_hash, slow_wait), (fast_hash, fast_wait) = latencies
+        assert slow_hash >= 0.2 and slow_wait < 0.1
+        assert fast_hash < 0.1 and fast_wait >= 0.1
+        assert stats["samples"] == 2
+        assert stats["max_ms"] >= 200
+        assert stats["queue_max_ms"] >= 100
+
+    def test_rejects_beyond_max_pending(self):
+        """Hashes beyond MAX_PENDING fail fast instead of queueing"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_check(password_hash, password):
+            started.set()
+            release.wait(5)
+            return True
+
+        rejected_before = get_hashing_stats()["rejected"]
+        with (
+            patch.dict(SETTINGS["PASSWORD_HASHING"], {"MAX_PENDING": 1}),
+            patch.object(password_hashing, "check_password_hash", slow_check),
+        ):
+            holder = threading.Thread(target=verify_password, args=("hash", "pw"))
+            holder.start()
+            try:
+                assert started.wait(5)
+                with pytest.raises(PasswordHashingBusy) as excinfo:
+                    verify_password("hash", "pw")
+                assert excinfo.value.retry_after == 1
+            finally:
+                release.set()
+                holder.join(5)
+
+            # Capacity is available again once the running hash completes
+            assert verify_password("hash", "pw") is True
+
+        assert get_hashing_stats()["rejected"] == rejected_before + 1
+
+    def test_dummy_hash_runs_on_pool(self, app):
+        """The user-not-found login path hashes on the pool too"""
+        from gefapi.services import user_service
+        from gefapi.services.user_service import UserService
+
+        threads = []
+        real_generate = password_hashing.generate_password_hash
+
+        def recording_generate(password, method):
+            threads.append(threading.current_thread().name)
+            return real_generate(password, method)
+
+        user_service._dummy_password_hash.cache_clear()
+        try:
+            with (
+                app.app_context(),
+                patch.object(
+                    password_hashing, "generate_password_hash", recording_generate
+                ),
+            ):
+                assert UserService.authenticate_user("nobody@test.com", "pw") is None
+        finally:
+            user_service._dummy_password_hash.cache_clear()
+
+        assert len(threads) == 1
+        assert threads[0] != threading.current_thread().name
+
+    def test_auth_returns_429_when_busy(self, client_no_rate_limiting):
+        """Login requests are shed with 429 and Retry-After at capacity"""
+        with patch.dict(SETTINGS["PASSWORD_HASHING"], {"MAX_PENDING": 0}):
+            response = client_no_rate_limiting.post(
+                "/auth",
+                json={"email": "user@test.com", "password": "any password"},
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert response.json["error_code"] == "password_hashing_busy"
+
+    def test_password_reset_returns_429_when_busy(
+        self, app, client_no_rate_limiting, regular_user
+    ):
+        """Password resets are shed with 429 rather than a generic 500"""
+        from gefapi import db
+        from gefapi.models import PasswordResetToken
+
+        with app.app_context():
+            token = PasswordResetToken(user_id=regular_user.id)
+            db.session.add(token)
+            db.session.commit()
+            token_string = token.token
+
+        with patch.dict(SETTINGS["PASSWORD_HASHING"], {"MAX_PENDING": 0}):
+            response = client_no_rate_limiting.post(
+                "/api/v1/user/reset-password",
+                json={"token": token_string, "password": "NewPassword123!"},
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,158 @@
+"""
+Tests for the shared filter/sort compiler
+"""
+
+import pytest
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, func
+from sqlalchemy.dialects import postgresql
+
+from gefapi.errors import NotAllowed
+from gefapi.services.execution_service import EXECUTION_QUERY_FIELDS
+from gefapi.services.user_service import UserService
+from gefapi.utils.query_filters import (
+    FilterCondition,
+    _build_comparison,
+    _has_lower_index,
+    _prefix_upper_bound,
+    compile_filter,
+    compile_sort,
+    parse_filter_param,
+)
+
+
+def _sql(clause):
+    sql = clause.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # psycopg2 escapes literal percent signs
+    return str(sql).replace("%%", "%")
+
+
+def _table(*indexes):
+    table = Table(
+        "item",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("name", String(100)),
+    )
+    for index in indexes:
+        index(table)
+    return table
+
+
+class TestCompileFilter:
+    """Test parsing filter and sort strings into ASTs"""
+
+    def test_normalises_expressions(self):
+        assert compile_filter("STATUS = 'RUNNING'") == compile_filter(
+            "status='RUNNING'"
+        )
+        assert compile_filter("(status='A' OR status='B'),name like '%x%',bad") == (
+            (FilterCondition("status", "=", "A"), FilterCondition("status", "=", "B")),
+            (FilterCondition("name", "like", "%x%"),),
+        )
+
+    def test_sort(self):
+        assert compile_sort("status DESC, progress,name sideways") == (
+            ("status", "desc"),
+            ("progress", "asc"),
+            ("name", "asc"),
+        )
+
+    def test_legacy_parser(self):
+        clauses = parse_filter_param(
+            "(name='A' OR name='B'),secret='x'",
+            allowed_fields={"name"},
+            resolve_column=lambda field: _table().c[field],
+        )
+
+        assert len(clauses) == 1
+        assert " OR " in _sql(clauses[0])
+
+
+class TestIndexFriendlyPredicates:
+    """Test predicates rewritten for functional indexes"""
+
+    def test_like_without_lower_index(self):
+        table = _table(lambda t: Index("ix_item_name", t.c.name))
+
+        assert not _has_lower_index(table.c.name)
+        sql = _sql(_build_comparison(table.c.name, "like", "Ab%", is_string=True))
+        assert sql == "item.name ILIKE 'Ab%'"
+
+    def test_prefix_like_becomes_range(self):
+        table = _table(lambda t: Index("ix_item_name_lower", func.lower(t.c.name)))
+        col = table.c.name
+
+        assert _has_lower_index(col)
+        sql = _sql(
+            _build_comparison(col, "like", "Ab%", is_string=True, lower_indexed=True)
+        )
+        assert "lower(item.name) ~>=~ 'ab'" in sql
+        assert "lower(item.name) ~<~ 'ac'" in sql
+        assert "lower(item.name) LIKE 'ab%'" in sql
+
+        # No literal prefix means no range
+        sql = _sql(
+            _build_comparison(col, "like", "%ab%", is_string=True, lower_indexed=True)
+        )
+        assert sql == "lower(item.name) LIKE '%ab%'"
+
+    def test_prefix_upper_bound(self):
+        assert _prefix_upper_bound("abc") == "abd"
+        assert _prefix_upper_bound("a\U0010ffff") == "b"
+        assert _prefix_upper_bound("퟿") == ""
+        assert _prefix_upper_bound("\U0010ffff") is None
+
+
+class TestQueryPlans:
+    """Test plans bound to a model's fields"""
+
+    def test_plans_are_cached(self):
+        plan = EXECUTION_QUERY_FIELDS.compile(
+            "script_name like '%x%'", "duration desc", admin=False
+        )
+
+        assert plan is EXECUTION_QUERY_FIELDS.compile(
+            "script_name  like '%x%'", "DURATION desc", admin=False
+        )
+        assert plan is not EXECUTION_QUERY_FIELDS.compile(
+            "script_name like '%x%'", "duration desc", admin=True
+        )
+        assert len(plan.filters) == len(plan.order_by) == len(plan.joins) == 1
+
+    def test_admin_only_fields(self):
+        with pytest.raises(NotAllowed):
+            EXECUTION_QUERY_FIELDS.compile(sort="user_email asc", admin=False)
+
+        plan = EXECUTION_QUERY_FIELDS.compile(sort="user_email asc", admin=True)
+        assert len(plan.joins) == 1
+
+    def test_admin_only_fields_forbidden_in_routes(
+        self, client, auth_headers_user, auth_headers_admin
+    ):
+        for url in (
+            "/api/v1/execution/user?sort=user_email asc",
+            "/api/v1/script?filter=user_name like 'x%'",
+        ):
+            response = client.get(url, headers=auth_headers_user)
+            assert response.status_code == 403, url
+            assert "admin" in response.json["detail"]
+
+            response = client.get(url, headers=auth_headers_admin)
+            assert response.status_code == 200, url
+
+    def test_disallowed_fields_dropped(self):
+        plan = EXECUTION_QUERY_FIELDS.compile("results='x'", "params desc")
+
+        assert plan.filters == plan.order_by == plan.joins == ()
+
+    def test_user_filters(self, app, admin_user, regular_user):
+        with app.app_context():
+            users, total = UserService.get_users(
+                filter_param="email like 'USER@%',has_openeo_credentials='false'",
+                sort="has_openeo_credentials desc",
+            )
+
+        assert total == 1
+        assert users[0].email == "user@test.com"
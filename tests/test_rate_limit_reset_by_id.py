@@ -184,3 +184,80 @@ class TestRateLimitStatusImprovements:
                     assert "id" in limit["user_info"]
                     assert "email" in limit["user_info"]
                     assert "role" in limit["user_info"]
+
+    def test_rate_limit_status_joins_users_and_paginates(
+        self, app, regular_user, rate_limiting_enabled
+    ):
+        """Status is built from one joined, filtered and paginated query"""
+        from unittest.mock import patch
+
+        from gefapi.services import RateLimitEventService
+        from gefapi.utils.rate_limiting import get_current_rate_limits
+
+        with app.app_context():
+            for i in range(3):
+                RateLimitEventService.record_event(
+                    rate_limit_type="USER",
+                    endpoint=f"/api/v1/status-join-test/{i}",
+                    user_id=str(regular_user.id),
+                    limit_definition="5 per 1 minute",
+                    time_window_seconds=60,
+                )
+            RateLimitEventService.record_event(
+                rate_limit_type="IP",
+                endpoint="/api/v1/status-join-test/ip",
+                ip_address="10.1.2.3",
+                time_window_seconds=60,
+            )
+
+            with patch(
+                "gefapi.services.UserService.get_user",
+                side_effect=AssertionError("users must come from the join"),
+            ):
+                status = get_current_rate_limits(
+                    rate_limit_type="user",
+                    endpoint="status-join-test",
+                    page=1,
+                    per_page=2,
+                )
+                second_page = get_current_rate_limits(
+                    rate_limit_type="user",
+                    endpoint="status-join-test",
+                    page=2,
+                    per_page=2,
+                )
+
+            assert status["enabled"] is True
+            assert status["total_active_limits"] == 3
+            assert status["page"] == 1
+            assert status["per_page"] == 2
+            assert len(status["active_limits"]) == 2
+            assert len(second_page["active_limits"]) == 1
+            for limit in status["active_limits"] + second_page["active_limits"]:
+                assert limit["type"] == "user"
+                assert limit["user_info"]["email"] == regular_user.email
+                assert limit["user_info"]["name"] == regular_user.name
+
+    def test_rate_limit_status_reads_live_counters(
+        self, app, client, rate_limiting_enabled
+    ):
+        """Events record the limiter's storage key, read back as current_count"""
+        from gefapi import limiter
+        from gefapi.utils.rate_limiting import get_current_rate_limits
+
+        # AUTH_LIMITS is "2 per minute" in the test config
+        for _ in range(3):
+            response = client.post(
+                "/auth", json={"email": "counter@example.com", "password": "wrong"}
+            )
+        assert response.status_code == 429
+
+        with app.app_context():
+            status = get_current_rate_limits(endpoint="/auth")
+
+            assert status["total_active_limits"] == 1
+            limit = status["active_limits"][0]
+            assert limit["limit_key"].startswith("LIMITER/")
+            assert limit["limit_key"].endswith("/2/1/minute")
+            assert limit["current_count"] == limiter._storage.get(limit["limit_key"])
+            assert limit["current_count"] >= 2
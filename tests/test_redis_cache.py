@@ -0,0 +1,52 @@
+"""
+Tests for the shared Redis cache client
+"""
+
+from unittest.mock import MagicMock, patch
+
+import redis
+
+from gefapi.utils import redis_cache as redis_cache_module
+from gefapi.utils.redis_cache import RedisCache
+
+
+class TestReconnectBackoff:
+    """Test that an unavailable Redis is not retried on every access"""
+
+    def test_failed_connection_is_not_retried_immediately(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(redis_cache_module.time, "monotonic", lambda: clock[0])
+        unreachable = MagicMock()
+        unreachable.ping.side_effect = redis.ConnectionError("refused")
+
+        with patch.object(
+            redis_cache_module.redis, "from_url", return_value=unreachable
+        ) as from_url:
+            cache = RedisCache()
+            assert cache.client is None
+            assert cache.get("key") is None
+            assert from_url.call_count == 1
+
+            clock[0] += redis_cache_module.RECONNECT_BACKOFF_SECONDS
+            assert cache.client is None
+            assert from_url.call_count == 2
+
+    def test_report_error_drops_client(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(redis_cache_module.time, "monotonic", lambda: clock[0])
+
+        with patch.object(redis_cache_module.redis, "from_url") as from_url:
+            cache = RedisCache()
+            client = cache.client
+
+            # Errors other than lost connections keep the client
+            cache.report_error(redis.ResponseError("WRONGTYPE"))
+            assert cache.client is client
+
+            cache.report_error(redis.TimeoutError("timed out"))
+            assert cache.client is None
+            assert from_url.call_count == 1
+
+            clock[0] += redis_cache_module.RECONNECT_BACKOFF_SECONDS
+            assert cache.client is not None
+            assert from_url.call_count == 2
@@ -284,6 +284,7 @@ class TestRefreshTokenSecurity:
 
             db.session.add(expired_token)
             db.session.commit()
+            expired_token_id = expired_token.id
 
             # Run cleanup
             cleaned_count = RefreshTokenService.cleanup_expired_tokens()
@@ -291,5 +292,5 @@ class TestRefreshTokenSecurity:
             assert cleaned_count >= 1
 
             # Verify token was deleted
-            remaining_token = RefreshToken.query.filter_by(id=expired_token.id).first()
+            remaining_token = RefreshToken.query.filter_by(id=expired_token_id).first()
             assert remaining_token is None
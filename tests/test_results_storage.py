@@ -0,0 +1,232 @@
+"""
+Tests for offloading large execution results to the results store
+"""
+
+import gzip
+import json
+import os
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+import pytest
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.models import Execution
+from gefapi.services import results_storage_service
+from gefapi.services.results_storage_service import (
+    RESULTS_MANIFEST_KEY,
+    ResultsStorageService,
+)
+
+LARGE_RESULTS = {
+    "type": "CloudResults",
+    "data": [{"band": i, "value": i * 0.5} for i in range(2000)],
+}
+
+
+@pytest.fixture
+def local_store(monkeypatch, tmp_path):
+    monkeypatch.setitem(
+        SETTINGS,
+        "RESULTS_STORAGE",
+        {
+            "BACKEND": "local",
+            "OFFLOAD_THRESHOLD_BYTES": 1024,
+            "LOCAL_PATH": str(tmp_path),
+        },
+    )
+    return tmp_path
+
+
+class TestResultsStorage:
+    """Test the inline/offloaded decision and reading results back"""
+
+    def test_small_results_stay_inline(self, local_store):
+        results = {"type": "CloudResults", "urls": ["s3://a/b.tif"]}
+
+        assert ResultsStorageService.store(results) is results
+        assert not list(local_store.iterdir())
+
+    def test_no_backend_keeps_results_inline(self, monkeypatch):
+        monkeypatch.setitem(SETTINGS, "RESULTS_STORAGE", {"BACKEND": ""})
+
+        assert ResultsStorageService.store(LARGE_RESULTS) is LARGE_RESULTS
+
+    def test_large_results_offloaded_locally(self, local_store):
+        stored = ResultsStorageService.store(LARGE_RESULTS)
+
+        manifest = stored[RESULTS_MANIFEST_KEY]
+        assert manifest["backend"] == "local"
+        assert manifest["size"] > manifest["compressed_size"]
+        assert (local_store / manifest["key"]).exists()
+        assert ResultsStorageService.load(stored) == LARGE_RESULTS
+
+        # Stored as-is for clients that accept gzip
+        raw = b"".join(ResultsStorageService.open_content(stored, decompress=False))
+        assert json.loads(gzip.decompress(raw)) == LARGE_RESULTS
+
+        # Content-addressed: storing the same results again reuses the object
+        assert ResultsStorageService.store(dict(LARGE_RESULTS)) == stored
+
+    def test_large_results_offloaded_to_s3(self, monkeypatch):
+        monkeypatch.setitem(
+            SETTINGS,
+            "RESULTS_STORAGE",
+            {
+                "BACKEND": "s3",
+                "OFFLOAD_THRESHOLD_BYTES": 1024,
+                "S3_BUCKET": "results-bucket",
+                "S3_PREFIX": "execution_results",
+            },
+        )
+        client = MagicMock()
+        client.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+        monkeypatch.setattr(results_storage_service, "get_s3_client", lambda: client)
+
+        stored = ResultsStorageService.store(LARGE_RESULTS)
+
+        fileobj, bucket, key = client.upload_fileobj.call_args.args
+        assert bucket == "results-bucket"
+        assert key == "execution_results/" + stored[RESULTS_MANIFEST_KEY]["key"]
+        body = fileobj.read()
+        assert json.loads(gzip.decompress(body)) == LARGE_RESULTS
+
+        client.get_object.return_value = {
+            "Body": MagicMock(iter_chunks=lambda size: iter([body[:100], body[100:]]))
+        }
+        assert ResultsStorageService.load(stored) == LARGE_RESULTS
+
+
+class TestResultsEndpoints:
+    """Test offloaded results through the execution endpoints"""
+
+    def test_patch_offloads_and_download_streams(
+        self,
+        app,
+        client,
+        auth_headers_admin,
+        auth_headers_user,
+        sample_execution,
+        local_store,
+    ):
+        execution_id = str(sample_execution.id)
+
+        response = client.patch(
+            f"/api/v1/execution/{execution_id}",
+            json={"results": LARGE_RESULTS},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 200
+
+        with app.app_context():
+            stored = db.session.get(Execution, execution_id).results
+        assert RESULTS_MANIFEST_KEY in stored
+
+        download = client.get(
+            f"/api/v1/execution/{execution_id}/download-results",
+            headers=auth_headers_user,
+        )
+        assert download.status_code == 200
+        assert "results.json" in download.headers["Content-Disposition"]
+        assert json.loads(download.data) == LARGE_RESULTS
+
+        gzipped = client.get(
+            f"/api/v1/execution/{execution_id}/download-results",
+            headers={**auth_headers_user, "Accept-Encoding": "gzip"},
+        )
+        assert gzipped.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(gzipped.data)) == LARGE_RESULTS
+
+        # Listings return the manifest rather than reading every row's results
+        for url, headers in (
+            ("/api/v1/execution/user", auth_headers_user),
+            ("/api/v1/execution", auth_headers_admin),
+        ):
+            listing = client.get(url, headers=headers)
+            row = next(e for e in listing.json["data"] if e["id"] == execution_id)
+            assert row["results"] == stored, url
+
+        # A single execution carries the results themselves, unless the
+        # client opts in to the manifest
+        url = f"/api/v1/execution/{execution_id}"
+        single = client.get(url, headers=auth_headers_user)
+        assert single.json["data"]["results"] == LARGE_RESULTS
+        single = client.get(
+            f"{url}?include=results_manifest", headers=auth_headers_user
+        )
+        assert single.json["data"]["results"] == stored
+
+    def test_missing_stored_results(
+        self,
+        client,
+        auth_headers_admin,
+        auth_headers_user,
+        sample_execution,
+        local_store,
+    ):
+        execution_id = str(sample_execution.id)
+        client.patch(
+            f"/api/v1/execution/{execution_id}",
+            json={"results": LARGE_RESULTS},
+            headers=auth_headers_admin,
+        )
+        # e.g. removed by a lifecycle rule
+        for path in local_store.rglob("*.json.gz"):
+            path.unlink()
+
+        listing = client.get("/api/v1/execution/user", headers=auth_headers_user)
+        assert listing.status_code == 200
+
+        single = client.get(
+            f"/api/v1/execution/{execution_id}", headers=auth_headers_user
+        )
+        assert single.status_code == 200
+        data = single.json["data"]
+        assert RESULTS_MANIFEST_KEY in data["results"]
+        assert data["results_error"] == "Results could not be loaded"
+
+    def test_gzip_body_measured_by_size_on_the_wire(
+        self, client, auth_headers_admin, sample_execution, monkeypatch
+    ):
+        # Compressed size well under the limit even though the JSON is not
+        monkeypatch.setitem(SETTINGS, "MAX_RESULTS_SIZE", 20000)
+        results = {"data": ["same_value"] * 20000}
+        body = gzip.compress(json.dumps({"results": results}).encode())
+        assert len(body) < 40000 < len(json.dumps(results))
+
+        response = client.patch(
+            f"/api/v1/execution/{sample_execution.id}",
+            data=body,
+            headers={
+                **auth_headers_admin,
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            },
+        )
+
+        assert response.status_code == 200
+
+    def test_size_limit_only_applies_to_results(
+        self, client, auth_headers_admin, sample_execution, monkeypatch
+    ):
+        monkeypatch.setitem(SETTINGS, "MAX_RESULTS_SIZE", 1000)
+        # Random hex barely compresses, so either body is over the limit
+        noise = os.urandom(4000).hex()
+
+        response = client.patch(
+            f"/api/v1/execution/{sample_execution.id}",
+            json={"results": {"data": noise}},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 400
+        assert "too large" in response.json["detail"]
+
+        response = client.patch(
+            f"/api/v1/execution/{sample_execution.id}",
+            json={"progress": 50, "note": noise},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 200
@@ -0,0 +1,129 @@
+"""
+Tests for the batched retention helpers used by periodic cleanup tasks
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from gefapi import db
+from gefapi.models import PasswordResetToken, RefreshToken
+from gefapi.services.refresh_token_service import RefreshTokenService
+from gefapi.utils.retention import delete_in_batches, update_in_batches
+
+
+def _add_tokens(user_id, count, expires_at):
+    tokens = [
+        RefreshToken(user_id=user_id, expires_at=expires_at) for _ in range(count)
+    ]
+    db.session.add_all(tokens)
+    db.session.commit()
+    return [t.id for t in tokens]
+
+
+@pytest.mark.usefixtures("app")
+class TestRetention:
+    """Test bounded DELETE/UPDATE batches with a time budget"""
+
+    def test_delete_in_batches_removes_backlog(self, app, regular_user):
+        """Rows are deleted over several bounded batches"""
+        with app.app_context():
+            now = datetime.now(tz=UTC).replace(tzinfo=None)
+            expired = _add_tokens(regular_user.id, 5, now - timedelta(days=1))
+            valid = _add_tokens(regular_user.id, 1, now + timedelta(days=1))
+
+            result = delete_in_batches(
+                RefreshToken,
+                RefreshToken.id.in_(expired + valid) & (RefreshToken.expires_at <= now),
+                name="test tokens",
+                batch_size=2,
+            )
+
+            assert result["rows"] == 5
+            assert result["batches"] == 3
+            assert result["complete"] is True
+            assert result["rows_per_second"] >= 0
+            assert RefreshToken.query.filter(RefreshToken.id.in_(expired)).count() == 0
+            assert RefreshToken.query.filter(RefreshToken.id.in_(valid)).count() == 1
+
+    def test_time_budget_stops_run(self, app, regular_user):
+        """No batch is started once the time budget is spent"""
+        with app.app_context():
+            now = datetime.now(tz=UTC).replace(tzinfo=None)
+            expired = _add_tokens(regular_user.id, 3, now - timedelta(days=1))
+
+            result = delete_in_batches(
+                RefreshToken,
+                RefreshToken.id.in_(expired),
+                name="test tokens",
+                time_budget=0,
+            )
+
+            assert result["rows"] == 0
+            assert result["complete"] is False
+            assert RefreshToken.query.filter(RefreshToken.id.in_(expired)).count() == 3
+
+            assert RefreshTokenService.cleanup_expired_tokens() >= 3
+            assert RefreshToken.query.filter(RefreshToken.id.in_(expired)).count() == 0
+
+    def test_locked_rows_leave_run_incomplete(self, app, regular_user):
+        """Rows skipped because another transaction holds them are not lost"""
+        with app.app_context():
+            now = datetime.now(tz=UTC).replace(tzinfo=None)
+            expired = _add_tokens(regular_user.id, 3, now - timedelta(days=1))
+
+            with db.engine.connect() as other:
+                other.execute(
+                    select(RefreshToken.id)
+                    .where(RefreshToken.id == expired[0])
+                    .with_for_update()
+                )
+                result = delete_in_batches(
+                    RefreshToken,
+                    RefreshToken.id.in_(expired),
+                    name="test tokens",
+                    batch_size=2,
+                )
+                other.rollback()
+
+            assert result["rows"] == 2
+            assert result["complete"] is False
+            assert RefreshToken.query.filter(RefreshToken.id.in_(expired)).count() == 1
+
+    def test_update_in_batches(self, app, regular_user):
+        """Updated rows drop out of the clause so batches terminate"""
+        with app.app_context():
+            now = datetime.now(tz=UTC).replace(tzinfo=None)
+            ids = _add_tokens(regular_user.id, 3, now + timedelta(days=1))
+
+            result = update_in_batches(
+                RefreshToken,
+                RefreshToken.id.in_(ids) & RefreshToken.is_revoked.is_(False),
+                {"is_revoked": True},
+                name="test revoke",
+                batch_size=2,
+            )
+
+            assert result["rows"] == 3
+            assert result["complete"] is True
+            assert (
+                RefreshToken.query.filter(
+                    RefreshToken.id.in_(ids), RefreshToken.is_revoked.is_(True)
+                ).count()
+                == 3
+            )
+
+    def test_password_reset_token_cleanup(self, app, regular_user):
+        """Old password reset tokens are removed by the batched cleanup"""
+        with app.app_context():
+            token = PasswordResetToken(user_id=regular_user.id)
+            token.created_at = datetime.now(tz=UTC).replace(tzinfo=None) - timedelta(
+                days=10
+            )
+            db.session.add(token)
+            db.session.commit()
+            token_id = token.id
+
+            assert PasswordResetToken.cleanup_expired_tokens(days_old=7) >= 1
+            assert db.session.get(PasswordResetToken, token_id) is None
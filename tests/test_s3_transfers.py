@@ -0,0 +1,117 @@
+"""
+Tests for streaming script extraction and ranged S3 result downloads
+"""
+
+import gzip
+import io
+import json
+import tarfile
+from unittest.mock import MagicMock
+
+from gefapi.config import SETTINGS
+from gefapi.s3 import download_bytes, get_transfer_config
+from gefapi.services.docker_service import (
+    build_cache_key,
+    build_cache_key_from_digests,
+    safe_extract,
+)
+from gefapi.tasks import batch_monitoring
+
+
+class _Unseekable(io.RawIOBase):
+    """Read-only stream without seek, like an S3 response body"""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def _tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+FILES = {
+    "configuration.json": b'{"name": "streamed"}',
+    "src/main.py": b"print('hello')\n",
+}
+
+
+class TestStreamingExtraction:
+    """Test unpacking a script tarball directly from a stream"""
+
+    def test_extracts_from_unseekable_stream(self, tmp_path):
+        data = _tarball(FILES)
+
+        with tarfile.open(fileobj=_Unseekable(data), mode="r|gz") as tar:
+            digests = safe_extract(tar, str(tmp_path))
+
+        assert (tmp_path / "src" / "main.py").read_bytes() == FILES["src/main.py"]
+        assert (tmp_path / "configuration.json").exists()
+
+        # The streamed key matches the key computed from a saved tarball
+        tar_path = tmp_path / "script.tar.gz"
+        tar_path.write_bytes(data)
+        assert build_cache_key_from_digests(
+            digests, "trends.earth-environment", "2.1.0"
+        ) == build_cache_key(str(tar_path), "trends.earth-environment", "2.1.0")
+
+    def test_skips_path_traversal_members(self, tmp_path):
+        data = _tarball({**FILES, "../escape.py": b"import os\n"})
+        extract_path = tmp_path / "script"
+
+        with tarfile.open(fileobj=_Unseekable(data), mode="r|gz") as tar:
+            digests = safe_extract(tar, str(extract_path))
+
+        assert not (tmp_path / "escape.py").exists()
+        assert (extract_path / "src" / "main.py").exists()
+        # Skipped members still count towards the cache key
+        assert "../escape.py" in [name for name, _type, _digest in digests]
+
+
+class TestRangedDownloads:
+    """Test managed downloads into memory"""
+
+    def test_download_uses_transfer_config(self, monkeypatch):
+        monkeypatch.setitem(
+            SETTINGS,
+            "S3_TRANSFER",
+            {"MULTIPART_THRESHOLD_MB": 4, "CHUNK_SIZE_MB": 2, "MAX_CONCURRENCY": 3},
+        )
+        client = MagicMock()
+        client.download_fileobj.side_effect = lambda bucket, key, fileobj, **kwargs: (
+            fileobj.write(b"payload")
+        )
+
+        assert download_bytes(client, "bucket", "key") == b"payload"
+
+        config = client.download_fileobj.call_args.kwargs["Config"]
+        assert config.multipart_chunksize == 2 * 1024 * 1024
+        assert config.max_concurrency == 3
+        assert get_transfer_config().multipart_threshold == 4 * 1024 * 1024
+
+    def test_batch_results_fetched_without_temp_files(self, monkeypatch):
+        results = {"type": "CloudResults", "data": {"year": 2023}}
+        client = MagicMock()
+        client.download_fileobj.side_effect = lambda bucket, key, fileobj, **kwargs: (
+            fileobj.write(gzip.compress(json.dumps(results).encode()))
+        )
+        monkeypatch.setattr(batch_monitoring, "_s3_client", lambda: client)
+        monkeypatch.setattr(batch_monitoring, "PARAMS_S3_BUCKET", "bucket")
+
+        assert batch_monitoring._fetch_results_from_s3("exec-1") == results
+        assert client.download_fileobj.call_args.args[1].endswith(
+            "exec-1_results.json.gz"
+        )
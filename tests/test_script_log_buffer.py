@@ -0,0 +1,141 @@
+"""
+Tests for the buffered Docker build log writer
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+import uuid
+
+import pytest
+
+from gefapi import db
+from gefapi.models import Script, ScriptLog
+from gefapi.services.script_log_buffer import ScriptLogBuffer
+from gefapi.services.script_service import ScriptService
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used for the live tail"""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch(
+        "gefapi.services.script_log_buffer.get_redis_cache",
+        return_value=SimpleNamespace(client=fake),
+    ):
+        yield fake
+
+
+def _create_script(user, status="BUILDING"):
+    script = Script(
+        name="Build Log Script",
+        slug=f"build-log-{uuid.uuid4().hex[:8]}",
+        user_id=user.id,
+    )
+    script.status = status
+    db.session.add(script)
+    db.session.commit()
+    return script
+
+
+def _texts(script_id):
+    return [
+        log.text
+        for log in ScriptLog.query.filter_by(script_id=script_id)
+        .order_by(ScriptLog.id)
+        .all()
+    ]
+
+
+PUSH_STREAM = [
+    {"stream": "Step 1/2 : FROM base\n"},
+    {"status": "Preparing", "id": "aaa"},
+    {"status": "Preparing", "id": "bbb"},
+    {"status": "Pushing", "id": "aaa", "progressDetail": {"current": 1}},
+    {"status": "Pushing", "id": "aaa", "progressDetail": {"current": 2}},
+    {"status": "Pushing", "id": "bbb", "progressDetail": {"current": 1}},
+    {"status": "Pushed", "id": "aaa"},
+    {"status": "Layer already exists", "id": "bbb"},
+    {"status": "latest: digest: sha256:abc size: 1234"},
+]
+
+
+@pytest.mark.usefixtures("app")
+class TestScriptLogBuffer:
+    """Test coalescing, batched flushing and the live tail of build logs"""
+
+    def test_layer_progress_coalesced_and_flushed_on_close(self, app, regular_user):
+        """Each layer keeps only its latest status, written in one insert"""
+        with app.app_context():
+            script = _create_script(regular_user)
+
+            with (
+                patch.object(
+                    db.session, "execute", wraps=db.session.execute
+                ) as execute,
+                ScriptLogBuffer(script.id, flush_interval=3600) as build_log,
+            ):
+                for line in PUSH_STREAM:
+                    build_log.add(line)
+                assert _texts(script.id) == []
+
+            assert execute.call_count == 1
+            assert _texts(script.id) == [
+                "Build: Step 1/2 : FROM base\n",
+                "Pushed aaa",
+                "Layer already exists bbb",
+                "latest: digest: sha256:abc size: 1234",
+            ]
+
+    def test_flush_on_size_threshold(self, app, regular_user):
+        """The buffer is written as soon as it holds max_lines entries"""
+        with app.app_context():
+            script = _create_script(regular_user)
+
+            with ScriptLogBuffer(
+                script.id, max_lines=2, flush_interval=3600
+            ) as build_log:
+                build_log.add({"stream": "one"})
+                assert _texts(script.id) == []
+                build_log.add({"stream": "two"})
+                assert _texts(script.id) == ["Build: one", "Build: two"]
+                build_log.add({"stream": "three"})
+
+            assert build_log.rows_written == 3
+            assert _texts(script.id)[-1] == "Build: three"
+
+    def test_live_tail_served_while_building(self, app, regular_user, fake_redis):
+        """Unflushed lines are returned by get_script_logs until persisted"""
+        with app.app_context():
+            script = _create_script(regular_user)
+            db.session.add(ScriptLog(text="Build started.", script_id=script.id))
+            db.session.commit()
+
+            build_log = ScriptLogBuffer(script.id, flush_interval=3600)
+            build_log.add({"status": "Pushing", "id": "aaa"})
+            build_log.add({"status": "Pushed", "id": "aaa"})
+
+            logs = ScriptService.get_script_logs(str(script.id), None, None)
+            assert [log.text for log in logs] == ["Build started.", "Pushed aaa"]
+            assert logs[-1].id is None
+
+            build_log.close()
+            assert fake_redis.values == {}
+
+            logs = ScriptService.get_script_logs(str(script.id), None, None)
+            assert [log.text for log in logs] == ["Build started.", "Pushed aaa"]
+            assert all(log.id is not None for log in logs)
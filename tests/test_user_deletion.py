@@ -0,0 +1,290 @@
+"""
+Tests for the batched, resumable user deletion pipeline
+"""
+
+import datetime
+from unittest.mock import patch
+import uuid
+
+from conftest import STRONG_GENERIC_PASSWORD
+import pytest
+
+from gefapi import db
+from gefapi.config import SETTINGS
+from gefapi.errors import UserNotFound
+from gefapi.models import (
+    BulkEmail,
+    BulkEmailRecipientList,
+    BulkEmailVerificationToken,
+    DeletionReason,
+    Execution,
+    ExecutionLog,
+    NewsItem,
+    PurgeStatus,
+    RateLimitEvent,
+    RefreshToken,
+    Script,
+    ScriptLog,
+    ServiceClient,
+    StatusLog,
+    User,
+    UserDeletionAudit,
+)
+from gefapi.services.user_deletion_service import UserDeletionService
+from gefapi.services.user_service import UserService
+
+
+def _create_user_with_data(executions=3, logs_per_execution=4):
+    """Create a user owning a script, executions and their logs."""
+    user = User(
+        email=f"purge-{uuid.uuid4().hex[:8]}@example.com",
+        password=STRONG_GENERIC_PASSWORD,
+        name="Purge Me",
+        country="Test",
+        institution="Test",
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    script = Script(
+        name="Purge Script",
+        slug=f"purge-script-{uuid.uuid4().hex[:8]}",
+        user_id=user.id,
+    )
+    db.session.add(script)
+    db.session.commit()
+    db.session.add(ScriptLog(text="build step", script_id=script.id))
+
+    for _ in range(executions):
+        execution = Execution(script_id=script.id, user_id=user.id, params={})
+        db.session.add(execution)
+        db.session.flush()
+        for i in range(logs_per_execution):
+            db.session.add(
+                ExecutionLog(text=f"line {i}", level="INFO", execution_id=execution.id)
+            )
+        db.session.add(
+            StatusLog(
+                status_from="PENDING",
+                status_to="RUNNING",
+                execution_id=str(execution.id),
+            )
+        )
+
+    db.session.add(RefreshToken(user_id=user.id))
+    db.session.commit()
+    return user
+
+
+def _remaining_rows(user_id, execution_ids):
+    return {
+        "execution": Execution.query.filter_by(user_id=user_id).count(),
+        "execution_log": ExecutionLog.query.filter(
+            ExecutionLog.execution_id.in_(execution_ids)
+        ).count(),
+        "status_log": StatusLog.query.filter(
+            StatusLog.execution_id.in_([str(e) for e in execution_ids])
+        ).count(),
+        "script": Script.query.filter_by(user_id=user_id).count(),
+    }
+
+
+def _execution_ids(user_id):
+    return [e.id for e in Execution.query.filter_by(user_id=user_id).all()]
+
+
+NOTHING_LEFT = {"execution": 0, "execution_log": 0, "status_log": 0, "script": 0}
+
+
+@pytest.mark.usefixtures("app")
+@patch.object(UserDeletionService, "schedule_purge")
+class TestUserDeletionPipeline:
+    """Test tombstoning and batched purging of deleted users"""
+
+    def test_delete_user_purges_inline(self, mock_schedule, app):
+        """Small accounts are fully deleted before delete_user returns"""
+        with app.app_context():
+            user = _create_user_with_data()
+            user_id = user.id
+            execution_ids = _execution_ids(user_id)
+
+            UserService.delete_user(user_id)
+
+            assert db.session.get(User, user_id) is None
+            assert _remaining_rows(user_id, execution_ids) == NOTHING_LEFT
+
+            audit = UserDeletionAudit.query.order_by(
+                UserDeletionAudit.deleted_at.desc()
+            ).first()
+            assert audit.purge_status == PurgeStatus.COMPLETED
+            assert audit.purge_user_id is None
+            assert audit.purge_completed_at is not None
+            # 3 executions + 12 execution logs + 3 status logs + 1 script
+            # + 1 script log + the user row (refresh token goes at tombstone)
+            assert audit.purge_rows_deleted == 21
+
+    def test_rows_outliving_the_user_are_detached(self, mock_schedule, app):
+        """Rows kept after deletion no longer block deleting the user row"""
+        with app.app_context():
+            user = _create_user_with_data(executions=0)
+            user_id = user.id
+            event = RateLimitEvent(
+                user_id=user_id, rate_limit_type="AUTH", endpoint="/auth"
+            )
+            news = NewsItem(title="News", message="Body", created_by_id=user_id)
+            recipients = BulkEmailRecipientList(name="All", created_by_id=user_id)
+            db.session.add_all([event, news, recipients])
+            db.session.flush()
+            email = BulkEmail(
+                name="Email",
+                subject="Subject",
+                html_content="<p>Hi</p>",
+                recipient_list_id=recipients.id,
+                created_by_id=user_id,
+                sent_by_id=user_id,
+            )
+            db.session.add(email)
+            db.session.flush()
+            db.session.add_all(
+                [
+                    BulkEmailVerificationToken(user_id=user_id, bulk_email_id=email.id),
+                    ServiceClient(
+                        name="Client",
+                        client_id=f"te_cid_{uuid.uuid4().hex}",
+                        client_secret_hash="x",
+                        secret_prefix="x",
+                        user_id=user_id,
+                    ),
+                ]
+            )
+            db.session.commit()
+            ids = (event.id, news.id, recipients.id, email.id)
+
+            UserService.delete_user(user_id)
+            db.session.expire_all()
+
+            assert db.session.get(User, user_id) is None
+            assert db.session.get(RateLimitEvent, ids[0]).user_id is None
+            assert db.session.get(NewsItem, ids[1]).created_by_id is None
+            assert db.session.get(BulkEmailRecipientList, ids[2]).created_by_id is None
+            email = db.session.get(BulkEmail, ids[3])
+            assert email.created_by_id is None
+            assert email.sent_by_id is None
+            assert ServiceClient.query.filter_by(user_id=user_id).count() == 0
+            assert (
+                BulkEmailVerificationToken.query.filter_by(user_id=user_id).count() == 0
+            )
+
+    def test_failed_inline_purge_is_scheduled(self, mock_schedule, app):
+        """A tombstoned user is deleted even if the inline purge fails"""
+        with app.app_context():
+            user = _create_user_with_data(executions=1, logs_per_execution=1)
+            user_id = user.id
+
+            with patch(
+                "gefapi.services.user_deletion_service.delete_batch",
+                side_effect=RuntimeError("database went away"),
+            ):
+                audit = UserDeletionService.delete_user(
+                    user, deletion_reason=DeletionReason.USER_REQUEST
+                )
+
+            mock_schedule.assert_called_once_with(audit.id)
+            db.session.expire_all()
+            assert db.session.get(User, user_id).deleted_at is not None
+            audit = db.session.get(UserDeletionAudit, audit.id)
+            assert audit.purge_last_error == "database went away"
+            assert UserDeletionService.purge(audit.id) == PurgeStatus.COMPLETED
+
+    def test_purge_resumes_in_batches(self, mock_schedule, app):
+        """An interrupted purge continues where it stopped"""
+        with app.app_context():
+            user = _create_user_with_data(executions=2, logs_per_execution=5)
+            user_id = user.id
+            email = user.email
+            execution_ids = _execution_ids(user_id)
+
+            with patch.dict(SETTINGS["USER_DELETION"], {"BATCH_SIZE": 3}):
+                audit = UserDeletionService.delete_user(
+                    user,
+                    deletion_reason=DeletionReason.ADMIN_REQUEST,
+                    purge_inline=False,
+                )
+                audit_id = audit.id
+
+                # Tombstoned: anonymized, hidden and its email released
+                tombstone = db.session.get(User, user_id)
+                assert tombstone.deleted_at is not None
+                assert tombstone.email != email
+                assert RefreshToken.query.filter_by(user_id=user_id).count() == 0
+                with pytest.raises(UserNotFound):
+                    UserService.get_user(str(user_id))
+                assert User.query.filter_by(email=email).first() is None
+
+                # No time budget left: nothing happens, lease is released
+                status = UserDeletionService.purge(audit_id, time_budget=0)
+                assert status == PurgeStatus.PENDING
+                assert (
+                    db.session.get(UserDeletionAudit, audit_id).purge_heartbeat_at
+                    is None
+                )
+
+                # Budget runs out after the first batch
+                with patch(
+                    "gefapi.services.user_deletion_service.time.monotonic",
+                    side_effect=[0, 0, 0, 1e9],
+                ):
+                    status = UserDeletionService.purge(audit_id, time_budget=1)
+                audit = db.session.get(UserDeletionAudit, audit_id)
+                assert status == PurgeStatus.IN_PROGRESS
+                assert audit.purge_rows_deleted == 2
+                assert audit.purge_step == "status_log"
+
+                assert UserDeletionService.purge(audit_id) == PurgeStatus.COMPLETED
+
+            assert db.session.get(User, user_id) is None
+            assert _remaining_rows(user_id, execution_ids) == NOTHING_LEFT
+
+    def test_purge_not_claimed_while_lease_held(self, mock_schedule, app):
+        """A live worker's purge is not taken over until its lease expires"""
+        with app.app_context():
+            user = _create_user_with_data(executions=1, logs_per_execution=1)
+            audit = UserDeletionService.delete_user(
+                user, deletion_reason=DeletionReason.ADMIN_REQUEST, purge_inline=False
+            )
+            audit_id = audit.id
+
+            audit.purge_heartbeat_at = datetime.datetime.now(datetime.UTC).replace(
+                tzinfo=None
+            )
+            db.session.commit()
+
+            assert UserDeletionService.purge(audit_id) == PurgeStatus.PENDING
+            assert audit_id not in [
+                a.id for a in UserDeletionService.get_resumable_deletions()
+            ]
+
+            # Worker lost: heartbeat older than the lease
+            audit = db.session.get(UserDeletionAudit, audit_id)
+            audit.purge_heartbeat_at -= datetime.timedelta(
+                seconds=SETTINGS["USER_DELETION"]["LEASE_SECONDS"] + 1
+            )
+            db.session.commit()
+
+            assert audit_id in [
+                a.id for a in UserDeletionService.get_resumable_deletions()
+            ]
+            assert UserDeletionService.purge(audit_id) == PurgeStatus.COMPLETED
+
+    def test_unfinished_purge_is_scheduled(self, mock_schedule, app):
+        """Work left after the inline budget is handed to the background task"""
+        with app.app_context():
+            user = _create_user_with_data(executions=1, logs_per_execution=1)
+
+            with patch.dict(SETTINGS["USER_DELETION"], {"INLINE_SECONDS": 0}):
+                audit = UserDeletionService.delete_user(
+                    user, deletion_reason=DeletionReason.USER_REQUEST
+                )
+
+            mock_schedule.assert_called_once_with(audit.id)
+            assert UserDeletionService.purge(audit.id) == PurgeStatus.COMPLETED